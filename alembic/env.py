@@ -78,6 +78,12 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # The search index (FTS5 virtual table and its shadow tables / tsvector table)
+    # is managed by its own migration, not by the ORM metadata
+    return not (type_ == "table" and name.startswith("search_index"))
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -93,7 +99,8 @@ def run_migrations_offline() -> None:
     # Use the determined database_url
     url = get_url()
     context.configure(
-        url=url, target_metadata=target_metadata, literal_binds=True, dialect_opts={"paramstyle": "named"}, render_as_batch=True
+        url=url, target_metadata=target_metadata, literal_binds=True, dialect_opts={"paramstyle": "named"}, render_as_batch=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -118,7 +125,9 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+        context.configure(
+            connection=connection, target_metadata=target_metadata, render_as_batch=True, include_object=include_object
+        )
 
         with context.begin_transaction():
             context.run_migrations()
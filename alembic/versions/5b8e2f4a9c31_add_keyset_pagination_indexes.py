@@ -0,0 +1,41 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 5b8e2f4a9c31
+Revises: e0d7d32125c1
+Create Date: 2025-09-02 10:12:40.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e2f4a9c31"
+down_revision: Union[str, None] = "e0d7d32125c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("notifications", schema=None) as batch_op:
+        batch_op.create_index("ix_notifications_user_id_id", ["user_id", "id"], unique=False)
+
+    with op.batch_alter_table("forum_topics", schema=None) as batch_op:
+        batch_op.create_index("ix_forum_topics_category_id_id", ["category_id", "id"], unique=False)
+
+    with op.batch_alter_table("forum_posts", schema=None) as batch_op:
+        batch_op.create_index("ix_forum_posts_topic_id_id", ["topic_id", "id"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("forum_posts", schema=None) as batch_op:
+        batch_op.drop_index("ix_forum_posts_topic_id_id")
+
+    with op.batch_alter_table("forum_topics", schema=None) as batch_op:
+        batch_op.drop_index("ix_forum_topics_category_id_id")
+
+    with op.batch_alter_table("notifications", schema=None) as batch_op:
+        batch_op.drop_index("ix_notifications_user_id_id")
@@ -0,0 +1,58 @@
+"""Add platform_counters and daily_platform_stats tables
+
+Revision ID: 9c4d7e1f2a63
+Revises: 5b8e2f4a9c31
+Create Date: 2025-09-03 09:41:27.530114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4d7e1f2a63"
+down_revision: Union[str, None] = "5b8e2f4a9c31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "platform_counters",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "daily_platform_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("new_users", sa.Integer(), nullable=False),
+        sa.Column("active_users", sa.Integer(), nullable=False),
+        sa.Column("lessons_completed", sa.Integer(), nullable=False),
+        sa.Column("subscriptions_started", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("gemini_requests", sa.Integer(), nullable=False),
+        sa.Column("stt_requests", sa.Integer(), nullable=False),
+        sa.Column("tts_characters", sa.Integer(), nullable=False),
+        sa.Column("totals", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("daily_platform_stats", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_daily_platform_stats_id"), ["id"], unique=False)
+        batch_op.create_index(batch_op.f("ix_daily_platform_stats_date"), ["date"], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("daily_platform_stats", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_daily_platform_stats_date"))
+        batch_op.drop_index(batch_op.f("ix_daily_platform_stats_id"))
+
+    op.drop_table("daily_platform_stats")
+    op.drop_table("platform_counters")
@@ -0,0 +1,29 @@
+"""Add user_ai_usage.quota_period
+
+Revision ID: a9f3c1d7e482
+Revises: c7d15e93a2f4
+Create Date: 2025-09-15 09:03:48.527716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9f3c1d7e482"
+down_revision: Union[str, None] = "c7d15e93a2f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("user_ai_usage", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("quota_period", sa.String(length=7), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("user_ai_usage", schema=None) as batch_op:
+        batch_op.drop_column("quota_period")
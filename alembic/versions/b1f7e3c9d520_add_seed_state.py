@@ -0,0 +1,33 @@
+"""Add seed_state table
+
+Revision ID: b1f7e3c9d520
+Revises: e8b4d2f6a913
+Create Date: 2025-09-17 11:26:05.381904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b1f7e3c9d520"
+down_revision: Union[str, None] = "e8b4d2f6a913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "seed_state",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("applied_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("seed_state")
@@ -0,0 +1,45 @@
+"""Add word_review_states table
+
+Revision ID: b4e8a2c6d913
+Revises: f3b1c7a9d254
+Create Date: 2025-09-09 11:12:05.402871
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e8a2c6d913"
+down_revision: Union[str, None] = "f3b1c7a9d254"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "word_review_states",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("word_id", sa.Integer(), nullable=False),
+        sa.Column("repetitions", sa.SmallInteger(), nullable=False),
+        sa.Column("lapses", sa.SmallInteger(), nullable=False),
+        sa.Column("ease", sa.Float(), nullable=False),
+        sa.Column("interval", sa.Integer(), nullable=False),
+        sa.Column("next_due_at", sa.DateTime(), nullable=False),
+        sa.Column("last_reviewed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["word_id"], ["words.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "word_id"),
+    )
+    with op.batch_alter_table("word_review_states", schema=None) as batch_op:
+        batch_op.create_index("ix_word_review_states_user_id_next_due_at", ["user_id", "next_due_at"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("word_review_states", schema=None) as batch_op:
+        batch_op.drop_index("ix_word_review_states_user_id_next_due_at")
+
+    op.drop_table("word_review_states")
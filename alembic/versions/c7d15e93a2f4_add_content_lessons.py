@@ -0,0 +1,42 @@
+"""Add content_lessons table
+
+Revision ID: c7d15e93a2f4
+Revises: b4e8a2c6d913
+Create Date: 2025-09-12 10:41:27.118305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d15e93a2f4"
+down_revision: Union[str, None] = "b4e8a2c6d913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "content_lessons",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("content_lessons", schema=None) as batch_op:
+        batch_op.create_index(batch_op.f("ix_content_lessons_position"), ["position"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("content_lessons", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_content_lessons_position"))
+
+    op.drop_table("content_lessons")
@@ -0,0 +1,40 @@
+"""Add composite indexes for hot per-user and per-course queries
+
+Revision ID: c8d4f1a7e259
+Revises: b1f7e3c9d520
+Create Date: 2025-09-22 09:41:17.502316
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d4f1a7e259"
+down_revision: Union[str, None] = "b1f7e3c9d520"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("exercise_attempts", "ix_exercise_attempts_user_id_exercise_id_created_at", ["user_id", "exercise_id", "created_at"]),
+    ("user_lesson_completions", "ix_user_lesson_completions_user_id_lesson_id", ["user_id", "lesson_id"]),
+    ("interactive_lessons", "ix_interactive_lessons_course_id_order", ["course_id", "order"]),
+    ("exercises", "ix_exercises_difficulty_is_active", ["difficulty", "is_active"]),
+    ("subscriptions", "ix_subscriptions_user_id_is_active_end_date", ["user_id", "is_active", "end_date"]),
+    ("notifications", "ix_notifications_user_id_created_at", ["user_id", "created_at"]),
+)
+
+
+def upgrade() -> None:
+    for table, name, columns in INDEXES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade() -> None:
+    for table, name, _ in reversed(INDEXES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(name)
@@ -0,0 +1,41 @@
+"""Add denormalized users.premium_until
+
+Revision ID: d2a6b8c4e017
+Revises: 9c4d7e1f2a63
+Create Date: 2025-09-04 14:22:03.671240
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a6b8c4e017"
+down_revision: Union[str, None] = "9c4d7e1f2a63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("premium_until", sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f("ix_users_premium_until"), ["premium_until"], unique=False)
+
+    # Backfill from the active subscriptions
+    op.execute(
+        """
+        UPDATE users SET premium_until = (
+            SELECT MAX(subscriptions.end_date) FROM subscriptions
+            WHERE subscriptions.user_id = users.id AND subscriptions.is_active = true
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_users_premium_until"))
+        batch_op.drop_column("premium_until")
@@ -0,0 +1,33 @@
+"""Add platform_counter_shards table
+
+Revision ID: d3a9e6b1c482
+Revises: c8d4f1a7e259
+Create Date: 2025-09-24 10:12:45.118093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a9e6b1c482"
+down_revision: Union[str, None] = "c8d4f1a7e259"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "platform_counter_shards",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("shard", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("name", "shard"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("platform_counter_shards")
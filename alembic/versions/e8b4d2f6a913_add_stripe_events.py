@@ -0,0 +1,48 @@
+"""Add stripe_events table
+
+Revision ID: e8b4d2f6a913
+Revises: a9f3c1d7e482
+Create Date: 2025-09-16 09:12:44.503127
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8b4d2f6a913"
+down_revision: Union[str, None] = "a9f3c1d7e482"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stripe_events",
+        sa.Column("id", sa.String(length=255), nullable=False),
+        sa.Column("type", sa.String(length=100), nullable=False),
+        sa.Column("customer", sa.String(length=255), nullable=False),
+        sa.Column("created", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    with op.batch_alter_table("stripe_events", schema=None) as batch_op:
+        batch_op.create_index("ix_stripe_events_customer_created", ["customer", "created"], unique=False)
+        batch_op.create_index(batch_op.f("ix_stripe_events_status"), ["status"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("stripe_events", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_stripe_events_status"))
+        batch_op.drop_index("ix_stripe_events_customer_created")
+
+    op.drop_table("stripe_events")
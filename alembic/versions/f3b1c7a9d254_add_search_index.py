@@ -0,0 +1,42 @@
+"""Add full-text search index
+
+Revision ID: f3b1c7a9d254
+Revises: d2a6b8c4e017
+Create Date: 2025-09-08 10:41:27.118304
+
+Postgres: table with a weighted tsvector column and a GIN index.
+SQLite: FTS5 virtual table. The index is filled on the first application
+start (or with the ``search.rebuild_index`` task).
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b1c7a9d254"
+down_revision: Union[str, None] = "d2a6b8c4e017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE TABLE search_index ("
+            "id BIGINT PRIMARY KEY, doc_type VARCHAR(20) NOT NULL, doc_id INTEGER NOT NULL, parent_id INTEGER, "
+            "title TEXT NOT NULL, body TEXT NOT NULL, document TSVECTOR NOT NULL)"
+        )
+        op.execute("CREATE INDEX ix_search_index_document ON search_index USING GIN (document)")
+        op.execute("CREATE INDEX ix_search_index_parent ON search_index (doc_type, parent_id)")
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE search_index USING fts5("
+            "title, body, doc_type UNINDEXED, doc_id UNINDEXED, parent_id UNINDEXED, "
+            "display_title UNINDEXED, display_body UNINDEXED, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -4,11 +4,12 @@ from app.api.api_v1.endpoints import (
     login,
     users, subscription_plans, words, subscriptions,
     statistics, user_progress, feedback, forum, ai, notifications, tests,
-    admin, courses, lessons, certificates, content, profile, ai_sessions, pronunciation
+    admin, courses, lessons, certificates, content, profile, ai_sessions, pronunciation, search,
+    reviews
 )
 from app.api.endpoints import (
     interactive_lessons, homework, lesson_interactions, lesson_sessions, payments, webrtc,
-    metrics, avatars, recommendations, exercises
+    metrics, avatars, recommendations, exercises, jobs
 )
 
 api_router = APIRouter()
@@ -34,6 +35,8 @@ api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 api_router.include_router(content.router, prefix="/content", tags=["content"])
 api_router.include_router(profile.router, prefix="/profile", tags=["profile"])
 api_router.include_router(pronunciation.router, prefix="/pronunciation", tags=["pronunciation"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(reviews.router, prefix="/reviews", tags=["reviews"])
 
 # Interactive lessons endpoints
 api_router.include_router(interactive_lessons.router, prefix="/interactive-lessons", tags=["interactive-lessons"])
@@ -52,3 +55,4 @@ api_router.include_router(avatars.router, prefix="/avatars", tags=["avatars"])
 api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
 api_router.include_router(exercises.router, prefix="/exercises", tags=["exercises"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
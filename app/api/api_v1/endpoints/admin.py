@@ -1,6 +1,6 @@
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
@@ -9,6 +9,7 @@ from app.api import deps
 from app.core.role_checker import RoleChecker
 from app.schemas import UserRole
 from app.schemas.user import UserRoleUpdate, UserUpdateProfile, UserInDBBase
+from app.services.content_catalog import content_catalog
 
 import logging
 logging.basicConfig(level=logging.INFO)
@@ -50,16 +51,48 @@ def get_admin_dashboard_stats(
     stats = crud.statistics.get_dashboard_stats(db)
     return stats
 
+@router.get("/statistics/daily", response_model=List[schemas.DailyPlatformStats])
+def get_admin_daily_stats(
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+    ip_check_result: None = Depends(deps.ip_check),
+) -> Any:
+    """
+    Daily platform statistics (one row per UTC day, rolled up nightly) for dashboard charts.
+    Superusers only.
+    """
+    return crud.platform_stats.get_daily(db, days=days)
+
+@router.get("/content-catalog", response_model=Dict[str, Any])
+def get_content_catalog_stats(
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+    ip_check_result: None = Depends(deps.ip_check),
+) -> Any:
+    """
+    Size (rows, approximate memory) and hit counts of the in-process content catalog
+    on the worker serving the request. Each lookup replaces at least one SELECT.
+    Superusers only.
+    """
+    content_catalog.warm(db)
+    return content_catalog.describe()
+
 @router.get("/users", response_model=List[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     role: Optional[UserRole] = None,
+    cursor: Optional[str] = None,
     current_admin: models.User = Depends(get_current_admin_user),
 ) -> Any:
     """Retrieve all users. Only for admins. Can be filtered by role."""
-    users = crud.user.get_multi(db, skip=skip, limit=limit, role=role)
+    if skip:
+        return crud.user.get_multi(db, skip=skip, limit=limit, role=role)
+    users, next_cursor = crud.user.get_page(db, cursor=cursor, limit=limit, role=role)
+    deps.set_next_cursor(response, next_cursor)
     return users
 
 @router.post("/users", response_model=UserInDBBase)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, status
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from sqlalchemy.sql.functions import current_user
@@ -12,10 +12,11 @@ from typing import Optional
 from app import models, schemas, settings
 from app.api import deps
 from app.services import ai_service
+from app.core.jobs import enqueue
 from app.core.limiter import limiter
 from app.crud import crud_user_ai_usage
-from gtts import gTTS
-from gtts.lang import tts_langs
+from app.services.tts_executor import gtts_language, gtts_provider, tts_executor
+from app.tasks.quotas import reset_ai_quotas
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -71,15 +72,8 @@ async def ask_question(
                 filename = f"ask_{current_user.id}_{int(datetime.utcnow().timestamp())}.mp3"
                 filepath = tts_dir / filename
                 # Resolve language with fallback based on supported gTTS langs
-                requested = language.split('-')[0]
-                supported_langs = tts_langs()
-                fallback_order = [requested, "uz", "tr", "ru", "en"]
-                chosen = next((lc for lc in fallback_order if lc in supported_langs), None)
-                if not chosen:
-                    # last resort: any supported language key
-                    chosen = next(iter(supported_langs.keys()))
-                tts = gTTS(text=f"Echo: {payload.prompt}", lang=chosen, slow=False)
-                tts.save(str(filepath))
+                chosen = gtts_language(language)
+                await tts_executor.save(f"Echo: {payload.prompt}", gtts_provider(chosen), filepath)
                 audio_url = f"/uploads/tts/{filename}"
             except Exception as e:
                 logger.error(f"Testing TTS generation failed: {e}")
@@ -114,14 +108,8 @@ async def ask_question(
                 filename = f"ask_{current_user.id}_{int(datetime.utcnow().timestamp())}.mp3"
                 filepath = tts_dir / filename
                 # Resolve language with fallback based on supported gTTS langs
-                requested = language.split('-')[0]
-                supported_langs = tts_langs()
-                fallback_order = [requested, "uz", "tr", "ru", "en"]
-                chosen = next((lc for lc in fallback_order if lc in supported_langs), None)
-                if not chosen:
-                    chosen = next(iter(supported_langs.keys()))
-                tts = gTTS(text=full_response, lang=chosen, slow=False)
-                tts.save(str(filepath))
+                chosen = gtts_language(language)
+                await tts_executor.save(full_response, gtts_provider(chosen), filepath)
                 audio_url = f"/uploads/tts/{filename}"
             except Exception as e:
                 logger.error(f"TTS generation failed: {e}")
@@ -153,6 +141,22 @@ async def get_suggested_lessons(
         logger.error(f"Suggested lessons endpointida xatolik: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _charge_tts_chars(db: Session, user_id: int, text_length: int) -> None:
+    """Endpoint-level TTS character quota enforcement (403 when exceeded)."""
+    usage = crud_user_ai_usage.user_ai_usage.get_or_create(db, user_id=user_id)
+    remaining = getattr(usage, "tts_chars_left", 0)
+    if remaining < text_length:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="TTS character quota exceeded. Please upgrade your plan."
+        )
+    # Decrement remaining chars and increment consumed counter atomically
+    setattr(usage, "tts_chars_left", remaining - text_length)
+    usage.tts_characters = (usage.tts_characters or 0) + text_length
+    db.add(usage)
+    db.commit()
+    db.refresh(usage)
+
 @router.post("/tts")
 @limiter.limit("60/minute")
 async def text_to_speech(
@@ -165,21 +169,7 @@ async def text_to_speech(
     Converts text to speech, saves MP3 to uploads and returns a public audio URL.
     """
     try:
-        text_length = len(payload.text or "")
-        # Endpoint-level TTS character quota enforcement
-        usage = crud_user_ai_usage.user_ai_usage.get_or_create(db, user_id=current_user.id)
-        remaining = getattr(usage, "tts_chars_left", 0)
-        if remaining < text_length:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="TTS character quota exceeded. Please upgrade your plan."
-            )
-        # Decrement remaining chars and increment consumed counter atomically
-        setattr(usage, "tts_chars_left", remaining - text_length)
-        usage.tts_characters = (usage.tts_characters or 0) + text_length
-        db.add(usage)
-        db.commit()
-        db.refresh(usage)
+        _charge_tts_chars(db, current_user.id, len(payload.text or ""))
 
         # Generate MP3 via gTTS and store under uploads/tts, then return a link
         uploads_root = Path(settings.UPLOAD_DIR)
@@ -190,15 +180,9 @@ async def text_to_speech(
         filepath = tts_dir / filename
 
         # Resolve language with fallback based on supported gTTS langs
-        requested = (payload.language or "en").split('-')[0]
-        supported_langs = tts_langs()
-        fallback_order = [requested, "uz", "tr", "ru", "en"]
-        chosen = next((lc for lc in fallback_order if lc in supported_langs), None)
-        if not chosen:
-            chosen = next(iter(supported_langs.keys()))
+        chosen = gtts_language(payload.language or "en")
 
-        tts = gTTS(text=payload.text, lang=chosen, slow=False)
-        tts.save(str(filepath))
+        await tts_executor.save(payload.text, gtts_provider(chosen), filepath)
 
         audio_url = f"/uploads/tts/{filename}"
         return {"audio_url": audio_url}
@@ -212,6 +196,24 @@ async def text_to_speech(
             detail=str(e)
         )
 
+@router.post("/tts/stream")
+@limiter.limit("60/minute")
+async def text_to_speech_stream(
+    request: Request,
+    payload: schemas.TTSRequest,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user_with_free_window),
+):
+    """
+    Converts text to speech and streams the MP3 while it is synthesized: long
+    texts are split into sentences synthesized concurrently, and each one is
+    sent as soon as it is ready, so playback can start after the first.
+    """
+    _charge_tts_chars(db, current_user.id, len(payload.text or ""))
+    return StreamingResponse(
+        ai_service.text_to_speech_stream(payload.text, payload.language or "en"), media_type="audio/mpeg",
+    )
+
 @router.post("/analyze-answer", response_model=schemas.AIFeedbackResponse)
 async def analyze_answer(
     payload: schemas.AIFeedbackRequest,
@@ -420,14 +422,8 @@ async def voice_loop(
 
             # Resolve TTS language with fallbacks
             try:
-                requested = language.split('-')[0]
-                supported_langs = tts_langs()
-                fallback_order = [requested, "uz", "tr", "ru", "en"]
-                chosen = next((lc for lc in fallback_order if lc in supported_langs), None)
-                if not chosen:
-                    chosen = next(iter(supported_langs.keys()))
-                tts = gTTS(text=ai_text, lang=chosen, slow=False)
-                tts.save(str(filepath))
+                chosen = gtts_language(language)
+                await tts_executor.save(ai_text, gtts_provider(chosen), filepath)
                 audio_url = f"/uploads/tts/{filename}"
             except Exception as e:
                 logger.error(f"Voice loop TTS generation failed: {e}")
@@ -493,3 +489,18 @@ async def reset_ai_usage_for_user(
     """Admin-only: reset AI usage/quotas for a given user."""
     usage = crud_user_ai_usage.user_ai_usage.reset(db, user_id=user_id)
     return usage
+
+
+@router.post("/usage/reset-all", status_code=status.HTTP_202_ACCEPTED)
+async def reset_ai_usage_for_all(
+    period: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}$"),
+    current_admin: models.User = Depends(deps.get_current_active_admin),
+):
+    """
+    Admin-only: queue the billing-period quota reset that beat runs daily
+    (``quotas.reset_ai_quotas``); progress is on ``/jobs/{id}``.
+    """
+    period = period or crud_user_ai_usage.billing_period()
+    return enqueue(
+        reset_ai_quotas, period, idempotency_key=f"quotas:reset:{period}", owner_id=current_admin.id,
+    )
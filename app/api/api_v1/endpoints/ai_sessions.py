@@ -10,22 +10,16 @@ import logging
 from app import models, schemas
 from app.api import deps
 from app.core.config import settings
-from app.core.cache import redis_client
 from app.services import ai_service
+from app.services.ai_session_store import ai_session_store
+from app.services.tts_executor import gtts_language, gtts_provider, tts_executor
 from app.crud import crud_user_ai_usage
-from gtts import gTTS
-from gtts.lang import tts_langs
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Helpers
-SESSION_PREFIX = "ai_session"
-MEMORY_SESSIONS: Dict[str, Dict[str, Any]] = {}
-
-
-def _session_key(session_id: str) -> str:
-    return f"{SESSION_PREFIX}:{session_id}"
+HISTORY_MESSAGES = 6  # messages sent to the LLM as context, including the new one
 
 
 def _now_iso() -> str:
@@ -37,59 +31,10 @@ def _ensure_owner(session: Dict[str, Any], user_id: int):
         raise HTTPException(status_code=404, detail="Session not found")
 
 
-def _load_session(session_id: str) -> Optional[Dict[str, Any]]:
-    try:
-        data = redis_client.get(_session_key(session_id))
-        if not data:
-            # try memory fallback
-            return MEMORY_SESSIONS.get(session_id)
-        try:
-            return json.loads(data)
-        except Exception:
-            return None
-    except Exception:
-        # Redis unavailable -> memory fallback
-        return MEMORY_SESSIONS.get(session_id)
-
-
-def _save_session(session_id: str, session: Dict[str, Any], ttl_seconds: int = 60 * 60 * 24 * 7):
-    # default TTL 7 days
-    try:
-        redis_client.setex(_session_key(session_id), ttl_seconds, json.dumps(session, default=str))
-    except Exception:
-        # Redis unavailable -> save to memory
-        MEMORY_SESSIONS[session_id] = session
-
-
-def _list_user_sessions(user_id: int) -> List[Dict[str, Any]]:
-    """Return all sessions for a given user from Redis."""
-    sessions: List[Dict[str, Any]] = []
-    try:
-        keys = redis_client.keys(f"{SESSION_PREFIX}:*")
-        for k in keys:
-            try:
-                raw = redis_client.get(k)
-                if not raw:
-                    continue
-                sess = json.loads(raw)
-                if sess.get("user_id") == user_id:
-                    sessions.append(sess)
-            except Exception:
-                # skip malformed entries
-                continue
-    except Exception:
-        # Redis unavailable -> use in-memory sessions
-        for sess in MEMORY_SESSIONS.values():
-            try:
-                if sess.get("user_id") == user_id:
-                    sessions.append(sess)
-            except Exception:
-                continue
-    # Order by created_at desc if present
-    def _created_at(s: Dict[str, Any]):
-        return s.get("created_at") or ""
-    sessions.sort(key=_created_at, reverse=True)
-    return sessions
+def _load_session(session_id: str, user_id: int) -> Dict[str, Any]:
+    session = ai_session_store.get(session_id)
+    _ensure_owner(session, user_id)
+    return session
 
 
 @router.post("/sessions", summary="Create AI multi-turn session")
@@ -98,26 +43,20 @@ async def create_session(
     current_user: models.User = Depends(deps.get_current_active_user),
     title: Optional[str] = Query(default=None, description="Optional session title")
 ):
-    session_id = uuid4().hex
-    session = {
-        "id": session_id,
-        "user_id": current_user.id,
-        "title": title or "AI Session",
-        "status": "idle",
-        "created_at": _now_iso(),
-        "messages": []  # list of {role, text, audio_url, analysis, created_at}
-    }
-    _save_session(session_id, session)
-    return session
+    session = ai_session_store.create(current_user.id, title or "AI Session")
+    return {**session, "messages": []}  # messages: list of {role, text, audio_url, analysis, created_at}
 
 
 @router.get("/sessions", summary="List user's AI sessions")
 async def list_sessions(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
 ):
-    sessions = _list_user_sessions(current_user.id)
-    return {"sessions": sessions, "count": len(sessions)}
+    """Newest first; each session carries ``message_count`` (fetch history with GET .../messages)."""
+    sessions, total = ai_session_store.list_for_user(current_user.id, limit=limit, offset=offset)
+    return {"sessions": sessions, "count": total}
 
 
 @router.get("/sessions/{session_id}", summary="Get session with history")
@@ -126,9 +65,9 @@ async def get_session(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    session = _load_session(session_id)
-    _ensure_owner(session, current_user.id)
-    return session
+    session = _load_session(session_id, current_user.id)
+    messages, _ = ai_session_store.messages(session_id)
+    return {**session, "messages": messages}
 
 
 @router.patch("/sessions/{session_id}", summary="Update session metadata (e.g., title)")
@@ -139,15 +78,13 @@ async def update_session(
     title: Optional[str] = Form(default=None),
     status: Optional[str] = Form(default=None),
 ):
-    session = _load_session(session_id)
-    _ensure_owner(session, current_user.id)
+    session = _load_session(session_id, current_user.id)
+    fields = {}
     if title is not None:
-        session["title"] = title
+        fields["title"] = title
     if status is not None:
-        session["status"] = status
-    session["updated_at"] = _now_iso()
-    _save_session(session_id, session)
-    return session
+        fields["status"] = status
+    return ai_session_store.update(session, **fields)
 
 
 @router.delete("/sessions/{session_id}", summary="Delete a session")
@@ -156,13 +93,8 @@ async def delete_session(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    session = _load_session(session_id)
-    _ensure_owner(session, current_user.id)
-    try:
-        redis_client.delete(_session_key(session_id))
-    except Exception:
-        # Redis unavailable -> remove from memory
-        MEMORY_SESSIONS.pop(session_id, None)
+    session = _load_session(session_id, current_user.id)
+    ai_session_store.delete(session)
     return {"status": "deleted", "id": session_id}
 
 
@@ -172,13 +104,10 @@ async def reset_session(
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
 ):
-    session = _load_session(session_id)
-    _ensure_owner(session, current_user.id)
-    session["messages"] = []
-    session["status"] = "idle"
-    session["updated_at"] = _now_iso()
-    _save_session(session_id, session)
-    return session
+    session = _load_session(session_id, current_user.id)
+    ai_session_store.clear_messages(session)
+    session = ai_session_store.update(session, status="idle")
+    return {**session, "messages": []}
 
 
 @router.post("/sessions/{session_id}/messages", summary="Post user message (text or audio) and get assistant reply")
@@ -192,8 +121,7 @@ async def post_message(
     language: str = Form(default="uz"),
     reference_text: Optional[str] = Form(default=None),
 ):
-    session = _load_session(session_id)
-    _ensure_owner(session, current_user.id)
+    session = _load_session(session_id, current_user.id)
 
     # 1) Ingest user input (text or audio -> STT)
     if not text and not audio_file:
@@ -234,7 +162,6 @@ async def post_message(
         "analysis": None,
         "created_at": _now_iso(),
     }
-    session["messages"].append(user_msg)
 
     # 2) Analyze user's message (heuristic, structured)
     analysis = await ai_service.analyze_answer(
@@ -245,8 +172,9 @@ async def post_message(
     user_msg["analysis"] = analysis
 
     # 3) Build chat history for completion (last 6 messages)
+    recent = ai_session_store.history(session_id, HISTORY_MESSAGES - 1) + [user_msg]
     history: List[Dict[str, Any]] = []
-    for m in session["messages"][-6:]:
+    for m in recent:
         history.append({
             "role": "user" if m["role"] == "user" else "model",
             "parts": [{"text": m.get("text", "") or ""}]
@@ -308,10 +236,7 @@ async def post_message(
             tts_dir.mkdir(parents=True, exist_ok=True)
             filename = f"sess_{session_id}_{int(datetime.utcnow().timestamp())}.mp3"
             filepath = tts_dir / filename
-            requested = language.split('-')[0]
-            supported = tts_langs()
-            fallback_order = [requested, "uz", "tr", "ru", "en"]
-            chosen = next((lc for lc in fallback_order if lc in supported), None) or next(iter(supported.keys()))
+            chosen = gtts_language(language)
             # TTS quota: based on character length of assistant_text
             tts_chars = len(assistant_text)
             if not crud_user_ai_usage.user_ai_usage.has_enough_quota(
@@ -324,8 +249,7 @@ async def post_message(
             crud_user_ai_usage.user_ai_usage.increment(
                 db, user_id=current_user.id, field="tts_characters", amount=tts_chars
             )
-            tts = gTTS(text=assistant_text, lang=chosen, slow=False)
-            tts.save(str(filepath))
+            await tts_executor.save(assistant_text, gtts_provider(chosen), filepath)
             assistant_audio_url = f"/uploads/tts/{filename}"
         except Exception as e:
             logger.error(f"TTS failed for session {session_id}: {e}")
@@ -338,14 +262,15 @@ async def post_message(
         "analysis": None,
         "created_at": _now_iso(),
     }
-    session["messages"].append(assistant_msg)
-    session["status"] = "idle"
 
-    # Persist session
-    _save_session(session_id, session)
+    # Persist both turns with one append to the message log
+    session = ai_session_store.append_messages(session, [user_msg, assistant_msg])
+    if session.get("status") != "idle":
+        session = ai_session_store.update(session, status="idle")
 
     return {
-        "session": session,
+        # Latest messages only; the full log is at GET /sessions/{session_id}/messages
+        "session": {**session, "messages": recent + [assistant_msg]},
         "assistant": {
             "text": assistant_text,
             "audio_url": assistant_audio_url,
@@ -362,10 +287,9 @@ async def get_messages(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
 ):
-    session = _load_session(session_id)
-    _ensure_owner(session, current_user.id)
-    messages = session.get("messages", [])
+    _load_session(session_id, current_user.id)
+    items, total = ai_session_store.messages(session_id, offset=offset, limit=limit)
     return {
-        "total": len(messages),
-        "items": messages[offset: offset + limit],
+        "total": total,
+        "items": items,
     }
@@ -1,15 +1,15 @@
-import os
 import uuid
 from typing import Any, List
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from starlette.responses import FileResponse
+from starlette.responses import FileResponse, JSONResponse
 
 from app import crud, models, schemas
 from app.api import deps
-from app.utils.pdf_generator import create_certificate_pdf
+from app.core.config import settings
+from app.tasks.certificates import schedule_render
 
 router = APIRouter()
 
@@ -31,23 +31,8 @@ def create_certificate(
     # Generate a unique verification code
     certificate_in.verification_code = str(uuid.uuid4())
 
-    # Create the certificate record first to get an ID
-    db_cert = crud.certificate.create(db, obj_in=certificate_in)
-
-    # Generate PDF
-    pdf_path = create_certificate_pdf(
-        user_name=user.full_name or user.username,
-        level_completed=db_cert.level_completed,
-        course_name=certificate_in.course_name,
-        certificate_id=db_cert.id
-    )
-
-    # Update the certificate record with the PDF path
-    update_data = schemas.CertificateUpdate(file_path=pdf_path)
-    crud.certificate.update(db=db, db_obj=db_cert, obj_in=update_data)
-    db.refresh(db_cert)
-
-    return db_cert
+    # The PDF is rendered by a background job after the record is created
+    return crud.certificate.create_with_pdf(db, obj_in=certificate_in, user=user)
 
 
 @router.get("/user/{user_id}", response_model=List[schemas.Certificate])
@@ -80,6 +65,28 @@ def read_my_certificates(
     return certificates
 
 
+def serve_certificate(certificate: models.Certificate) -> Any:
+    """Stream a stored certificate PDF, or queue its rendering (202) if it is not stored yet."""
+    if certificate.file_path:
+        # Stored paths are relative to the project root
+        PROJECT_ROOT = Path(__file__).resolve().parents[4]
+        absolute_file_path = PROJECT_ROOT / certificate.file_path
+        if absolute_file_path.exists():
+            return FileResponse(
+                path=str(absolute_file_path),
+                media_type="application/pdf",
+                filename=f"certificate-{certificate.id}.pdf",
+                # An issued certificate never changes: let browsers/CDNs keep it
+                headers={"Cache-Control": f"private, max-age={settings.CERTIFICATES_CACHE_MAX_AGE}, immutable"},
+            )
+
+    job = schedule_render(certificate)
+    return JSONResponse(
+        status_code=202,
+        content={"detail": "Certificate is being generated", "job_id": job["id"], "state": job["state"]},
+    )
+
+
 @router.get("/{certificate_id}/download", response_class=FileResponse)
 async def download_certificate(
     *, 
@@ -99,27 +106,7 @@ async def download_certificate(
     if not crud.user.is_admin(current_user) and certificate.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to download this certificate")
 
-    if not certificate.file_path:
-        raise HTTPException(status_code=404, detail="Certificate file path not recorded in the database.")
-
-    # Construct a robust absolute path from the project root
-    try:
-        # Assuming this file is at /app/api/api_v1/endpoints/certificates.py, we go up 4 levels
-        PROJECT_ROOT = Path(__file__).resolve().parents[4]
-        absolute_file_path = PROJECT_ROOT / certificate.file_path
-    except IndexError:
-        # Fallback in case the file structure changes
-        raise HTTPException(status_code=500, detail="Could not determine project root directory.")
-
-    if not absolute_file_path.exists():
-        raise HTTPException(status_code=404, detail=f"Certificate file not found at path: {absolute_file_path}")
-
-    try:
-        return FileResponse(path=str(absolute_file_path), media_type='application/pdf', filename=os.path.basename(certificate.file_path))
-    except Exception as e:
-        # Log the error for debugging
-        print(f"Error creating FileResponse: {e}")
-        raise HTTPException(status_code=500, detail=f"Could not process the certificate file. Error: {str(e)}")
+    return serve_certificate(certificate)
 
 
 @router.get("/{certificate_id}/verify/{verification_code}", response_model=schemas.Certificate)
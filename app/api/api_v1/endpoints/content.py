@@ -1,95 +1,150 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends
-from typing import Any, List, Dict, Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import Any, Iterator, List, Dict, Optional
 from pathlib import Path
-import json
-from app import models
+import orjson
+from sqlalchemy.orm import Session
+from app import crud, models
 from app.api import deps
+from app.core.responses import dumps
+from app.crud.crud_content_lesson import ContentVersionConflict
 
 router = APIRouter()
 
 # Simple content management endpoints
 CONTENT_DIR = Path("uploads/content")
 CONTENT_DIR.mkdir(parents=True, exist_ok=True)
-LESSONS_JSON = CONTENT_DIR / "lessons.json"
 
-def ensure_lessons_json() -> None:
-    if not LESSONS_JSON.exists():
-        default_payload = {"lessons": [], "version": 1}
-        LESSONS_JSON.write_text(json.dumps(default_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+# Lessons are rows of the content_lessons table (app/crud/crud_content_lesson.py).
+# The root "version" of exported documents is the format version.
+EXPORT_FORMAT_VERSION = 1
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+STREAM_BUFFER_BYTES = 64 * 1024
 
-def _load_lessons() -> Dict[str, Any]:
-    ensure_lessons_json()
+def _expected_version(if_match: Optional[str], document: Optional[Dict[str, Any]] = None) -> Optional[int]:
+    """The version a write is conditional on: the If-Match header (an ETag from GET) or the document's "version"."""
+    value: Any = if_match
+    if value is None and document is not None:
+        value = document.get("version")
+    if value is None or value == "*":
+        return None
     try:
-        return json.loads(LESSONS_JSON.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid lessons.json: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        return int(str(value).strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="If-Match must be a lesson version")
+
+def _conflict(e: ContentVersionConflict) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={"message": "Lesson was changed by another request", "current": e.lesson.to_dict()},
+    )
+
+def _tagged(response: Response, lesson: models.ContentLesson) -> Dict[str, Any]:
+    response.headers["ETag"] = f'"{lesson.version}"'
+    return lesson.to_dict()
 
-def _save_lessons(data: Dict[str, Any]) -> None:
+def _export_chunks(db: Session, ndjson: bool) -> Iterator[bytes]:
+    """The export document (or one lesson per line), buffered into chunks of about 64 KiB."""
+    buffer = bytearray(b"" if ndjson else b'{"version":%d,"lessons":[' % EXPORT_FORMAT_VERSION)
     try:
-        # atomic write
-        tmp = LESSONS_JSON.with_suffix(".json.tmp")
-        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-        tmp.replace(LESSONS_JSON)
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        for i, document in enumerate(crud.content_lesson.iter_documents(db)):
+            if ndjson:
+                buffer += dumps(document) + b"\n"
+            else:
+                buffer += (b"," if i else b"") + dumps(document)
+            if len(buffer) >= STREAM_BUFFER_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
+        if not ndjson:
+            buffer += b"]}"
+        yield bytes(buffer)
+    finally:
+        db.close()  # the request's session outlives get_db while the body streams
 
-def _next_id(items: List[Dict[str, Any]]) -> int:
-    ids = [int(it.get("id", 0)) for it in items if isinstance(it.get("id"), (int, str)) and str(it.get("id")).isdigit()]
-    return (max(ids) + 1) if ids else 1
+def _export_response(db: Session, format: str) -> StreamingResponse:
+    ndjson = format == "ndjson"
+    return StreamingResponse(
+        _export_chunks(db, ndjson), media_type="application/x-ndjson" if ndjson else "application/json",
+    )
 
-def _find_index_by_id(items: List[Dict[str, Any]], lesson_id: int) -> int:
-    for idx, it in enumerate(items):
-        if str(it.get("id")) == str(lesson_id):
-            return idx
-    return -1
+async def _ndjson_documents(request: Request):
+    """Lesson documents from an NDJSON body, parsed as the body arrives."""
+    pending = b""
+    line_number = 0
+    async for chunk in request.stream():
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_line(line, line_number)
+    if pending.strip():
+        yield _parse_line(pending, line_number + 1)
+
+def _parse_line(line: bytes, line_number: int) -> Any:
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+
+def _add_all(importer, documents: List[Any]) -> None:
+    for document in documents:
+        importer.add(document)
+
+async def _replace_lessons(request: Request, db: Session) -> Dict[str, Any]:
+    """Read the body on the event loop; the import itself runs in the threadpool, a chunk at a time."""
+    importer = await run_in_threadpool(crud.content_lesson.start_import, db)
+    try:
+        if request.headers.get("content-type", "").split(";")[0].strip() in NDJSON_TYPES:
+            batch: List[Any] = []
+            async for document in _ndjson_documents(request):
+                batch.append(document)
+                if len(batch) >= importer.chunk_size:
+                    await run_in_threadpool(_add_all, importer, batch)
+                    batch = []
+            await run_in_threadpool(_add_all, importer, batch)
+        else:
+            try:
+                payload = orjson.loads(await request.body())
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON: {e}")
+            lessons = payload.get("lessons") if isinstance(payload, dict) else None
+            if not isinstance(lessons, list):
+                raise ValueError("Payload must contain 'lessons' array")
+            await run_in_threadpool(_add_all, importer, lessons)
+        count = await run_in_threadpool(importer.finish)
+    except ValueError as e:
+        await run_in_threadpool(importer.abort)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except BaseException:
+        importer.abort()  # may be a cancellation: do not await again
+        raise
+    return {"status": "ok", "count": count}
 
 @router.get("/lessons/export")
-async def export_lessons(
+def export_lessons(
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    return _load_lessons()
+    """Stream all lessons as {"version": 1, "lessons": [...]}, or one lesson per line with format=ndjson."""
+    return _export_response(db, format)
 
 @router.get("/lessons/validate")
-async def validate_lessons_json(
+def validate_lessons_json(
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ):
     """
-    Validate lessons.json structure and referenced media files under uploads/content.
+    Validate stored lessons and referenced media files under uploads/content.
     Returns a summary with a list of validation errors (empty if valid).
     """
-    data = _load_lessons()
     errors: List[str] = []
-
-    # Basic structure
-    if not isinstance(data, dict):
-        errors.append("Root must be an object")
-        return {"valid": False, "errors": errors}
-
-    lessons = data.get("lessons")
-    if lessons is None:
-        errors.append("Missing 'lessons' array")
-        return {"valid": False, "errors": errors}
-    if not isinstance(lessons, list):
-        errors.append("'lessons' must be an array")
-        return {"valid": False, "errors": errors}
-
-    # Per-lesson checks
-    seen_ids = set()
-    for i, lesson in enumerate(lessons):
-        if not isinstance(lesson, dict):
-            errors.append(f"lessons[{i}] must be an object")
-            continue
-        lid = lesson.get("id")
-        title = lesson.get("title")
-        if lid is None:
-            errors.append(f"lessons[{i}] is missing 'id'")
-        else:
-            if str(lid) in seen_ids:
-                errors.append(f"Duplicate lesson id: {lid}")
-            seen_ids.add(str(lid))
-        if not title:
+    count = 0
+    for i, lesson in enumerate(crud.content_lesson.iter_documents(db)):
+        count += 1
+        if not lesson.get("title"):
             errors.append(f"lessons[{i}] is missing 'title'")
 
         # Media fields to check if given
@@ -106,141 +161,135 @@ async def validate_lessons_json(
                     if not candidate2.exists():
                         errors.append(f"lessons[{i}].{field}: file not found '{val}'")
 
-    return {"valid": len(errors) == 0, "errors": errors, "count": len(lessons)}
+    return {"valid": len(errors) == 0, "errors": errors, "count": count}
 
 @router.get("/lessons-json")
-async def get_lessons_json(
+def get_lessons_json(
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """Return lessons JSON content for admin content management."""
-    return _load_lessons()
+    return _export_response(db, "json")
 
 @router.put("/lessons-json")
 async def update_lessons_json(
-    *,
-    payload: Any,
+    request: Request,
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
-    """Overwrite lessons.json with provided JSON payload."""
-    try:
-        # Validate that payload is JSON-serializable
-        data = json.loads(json.dumps(payload))
-        _save_lessons(data)
-        return {"status": "ok", "size": len(json.dumps(data))}
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON: {str(e)}")
+    """Replace all lessons with a {"lessons": [...]} document (same as bulk-import)."""
+    return await _replace_lessons(request, db)
 
 # ---- Lessons CRUD (admin) ----
 
 @router.get("/lessons", response_model=List[Dict[str, Any]])
-async def list_lessons(
+def list_lessons(
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> List[Dict[str, Any]]:
-    data = _load_lessons()
-    return data.get("lessons", [])
+    return crud.content_lesson.get_multi(db, skip=skip, limit=limit)
 
 @router.get("/lessons/{lesson_id}", response_model=Dict[str, Any])
-async def get_lesson(
+def get_lesson(
     lesson_id: int,
+    response: Response,
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Dict[str, Any]:
-    data = _load_lessons()
-    lessons = data.get("lessons", [])
-    idx = _find_index_by_id(lessons, lesson_id)
-    if idx == -1:
+    lesson = crud.content_lesson.get(db, lesson_id)
+    if lesson is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
-    return lessons[idx]
+    return _tagged(response, lesson)
 
 @router.post("/lessons", status_code=status.HTTP_201_CREATED, response_model=Dict[str, Any])
-async def create_lesson(
+def create_lesson(
     payload: Dict[str, Any],
+    response: Response,
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Dict[str, Any]:
-    data = _load_lessons()
-    lessons = data.setdefault("lessons", [])
     # minimal validation
     if not payload.get("title"):
         raise HTTPException(status_code=400, detail="'title' is required")
-    new_item = dict(payload)
-    new_item["id"] = _next_id(lessons)
-    lessons.append(new_item)
-    _save_lessons(data)
-    return new_item
+    try:
+        lesson = crud.content_lesson.create(db, document=payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _tagged(response, lesson)
+
+def _write_lesson(
+    db: Session, response: Response, lesson_id: int, payload: Dict[str, Any], if_match: Optional[str], partial: bool,
+) -> Dict[str, Any]:
+    try:
+        lesson = crud.content_lesson.update(
+            db, lesson_id=lesson_id, document=payload, expected_version=_expected_version(if_match, payload),
+            partial=partial,
+        )
+    except ContentVersionConflict as e:
+        raise _conflict(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if lesson is None:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    return _tagged(response, lesson)
 
 @router.put("/lessons/{lesson_id}", response_model=Dict[str, Any])
-async def update_lesson(
+def update_lesson(
     lesson_id: int,
     payload: Dict[str, Any],
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Dict[str, Any]:
-    data = _load_lessons()
-    lessons = data.setdefault("lessons", [])
-    idx = _find_index_by_id(lessons, lesson_id)
-    if idx == -1:
-        raise HTTPException(status_code=404, detail="Lesson not found")
+    """Replace a lesson. With If-Match (or "version") the write only applies to that version, else 409."""
     # require title on full update
     if not payload.get("title"):
         raise HTTPException(status_code=400, detail="'title' is required")
-    updated = dict(payload)
-    updated["id"] = lesson_id
-    lessons[idx] = updated
-    _save_lessons(data)
-    return updated
+    return _write_lesson(db, response, lesson_id, payload, if_match, partial=False)
 
 @router.patch("/lessons/{lesson_id}", response_model=Dict[str, Any])
-async def patch_lesson(
+def patch_lesson(
     lesson_id: int,
     payload: Dict[str, Any],
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Dict[str, Any]:
-    data = _load_lessons()
-    lessons = data.setdefault("lessons", [])
-    idx = _find_index_by_id(lessons, lesson_id)
-    if idx == -1:
-        raise HTTPException(status_code=404, detail="Lesson not found")
-    merged = {**lessons[idx], **payload, "id": lesson_id}
-    lessons[idx] = merged
-    _save_lessons(data)
-    return merged
+    """Merge fields into a lesson; conditional like PUT."""
+    return _write_lesson(db, response, lesson_id, payload, if_match, partial=True)
 
 @router.delete("/lessons/{lesson_id}")
-async def delete_lesson(
+def delete_lesson(
     lesson_id: int,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Dict[str, Any]:
-    data = _load_lessons()
-    lessons = data.setdefault("lessons", [])
-    idx = _find_index_by_id(lessons, lesson_id)
-    if idx == -1:
+    try:
+        removed = crud.content_lesson.delete(db, lesson_id=lesson_id, expected_version=_expected_version(if_match))
+    except ContentVersionConflict as e:
+        raise _conflict(e)
+    if removed is None:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    removed = lessons.pop(idx)
-    _save_lessons(data)
     return {"status": "deleted", "id": lesson_id, "title": removed.get("title")}
 
 @router.post("/lessons/bulk-import")
 async def bulk_import_lessons(
-    payload: Dict[str, Any],
+    request: Request,
+    db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Dict[str, Any]:
     """
-    Accepts payload in shape {"lessons": [...], "version": <int>?}
-    If items have no id, they will be assigned.
+    Replace all lessons with {"lessons": [...], "version": <int>?} or, with
+    Content-Type: application/x-ndjson, one lesson per line (read and inserted
+    in chunks as the body arrives). Items without an id are assigned one.
+    On any invalid item nothing is changed.
     """
-    if not isinstance(payload, dict) or "lessons" not in payload or not isinstance(payload["lessons"], list):
-        raise HTTPException(status_code=400, detail="Payload must contain 'lessons' array")
-    data = _load_lessons()
-    incoming = payload["lessons"]
-    # assign ids if missing
-    next_id = _next_id(data.get("lessons", []))
-    for it in incoming:
-        if "id" not in it:
-            it["id"] = next_id
-            next_id += 1
-    data["lessons"] = incoming
-    if "version" in payload:
-        data["version"] = payload["version"]
-    _save_lessons(data)
-    return {"status": "ok", "count": len(incoming)}
+    return await _replace_lessons(request, db)
 
 @router.get("/media", response_model=List[str])
 async def list_media(
@@ -1,6 +1,6 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session, joinedload
 
 from app import crud, models, schemas
@@ -80,12 +80,18 @@ def delete_forum_category(
 
 @router.get("/topics/", response_model=List[schemas.ForumTopic])
 def read_all_forum_topics(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """Retrieve all forum topics across all categories."""
-    return crud.forum_topic.get_multi(db, skip=skip, limit=limit)
+    if skip:
+        return crud.forum_topic.get_multi(db, skip=skip, limit=limit)
+    topics, next_cursor = crud.forum_topic.get_page(db, cursor=cursor, limit=limit)
+    deps.set_next_cursor(response, next_cursor)
+    return topics
 
 @router.post("/topics/", response_model=schemas.ForumTopic, status_code=status.HTTP_201_CREATED)
 def create_forum_topic(
@@ -104,15 +110,23 @@ def create_forum_topic(
 @router.get("/categories/{category_id}/topics", response_model=List[schemas.ForumTopic])
 def read_topics_in_category(
     category_id: int,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """Retrieve all topics within a specific category."""
     category = crud.forum_category.get(db, id=category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    return crud.forum_topic.get_multi_by_category(db, category_id=category_id, skip=skip, limit=limit)
+    if skip:
+        return crud.forum_topic.get_multi_by_category(db, category_id=category_id, skip=skip, limit=limit)
+    topics, next_cursor = crud.forum_topic.get_page_by_category(
+        db, category_id=category_id, cursor=cursor, limit=limit
+    )
+    deps.set_next_cursor(response, next_cursor)
+    return topics
 
 @router.get("/topics/{topic_id}", response_model=schemas.ForumTopic)
 def read_forum_topic(
@@ -125,6 +139,25 @@ def read_forum_topic(
         raise HTTPException(status_code=404, detail="Topic not found")
     return topic
 
+@router.get("/topics/{topic_id}/posts", response_model=List[schemas.ForumPost])
+def read_topic_posts(
+    topic_id: int,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Any:
+    """Retrieve the posts of a topic in creation order."""
+    topic = crud.forum_topic.get(db, id=topic_id)
+    if not topic:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    if skip:
+        return crud.forum_post.get_multi_by_topic(db, topic_id=topic_id, skip=skip, limit=limit)
+    posts, next_cursor = crud.forum_post.get_page_by_topic(db, topic_id=topic_id, cursor=cursor, limit=limit)
+    deps.set_next_cursor(response, next_cursor)
+    return posts
+
 @router.put("/topics/{topic_id}", response_model=schemas.ForumTopic)
 def update_forum_topic(
     *,
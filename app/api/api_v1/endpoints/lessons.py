@@ -5,7 +5,9 @@ from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.responses import json_list
 from app.models.user import Role as UserRole
+from app.services.content_catalog import content_catalog
 
 router = APIRouter()
 
@@ -19,8 +21,7 @@ def read_lessons(
     """
     Retrieve lessons.
     """
-    lessons = crud.lesson.get_multi(db, skip=skip, limit=limit)
-    return lessons
+    return json_list(schemas.Lesson, crud.lesson.get_multi(db, skip=skip, limit=limit))
 
 @router.get("/categories")
 def get_lesson_categories() -> Any:
@@ -104,9 +105,9 @@ def update_lesson(
     lesson = crud.lesson.get(db=db, id=id)
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    course = crud.course.get(db=db, id=lesson.course_id)
+    course = content_catalog.course(db, lesson.course_id)
     
-    is_creator = course.instructor_id == current_user.id
+    is_creator = course is not None and course.instructor_id == current_user.id
     is_superuser = crud.user.is_superuser(current_user)
 
     if not is_creator and not is_superuser:
@@ -157,9 +158,9 @@ def delete_lesson(
     lesson = crud.lesson.get(db=db, id=id)
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
-    course = crud.course.get(db=db, id=lesson.course_id)
+    course = content_catalog.course(db, lesson.course_id)
 
-    is_creator = course.instructor_id == current_user.id
+    is_creator = course is not None and course.instructor_id == current_user.id
     is_superuser = crud.user.is_superuser(current_user)
 
     if not is_creator and not is_superuser:
@@ -1,26 +1,36 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.cache import get_async_redis
+from app.db.session import SessionLocal
+from app.services.notification_service import notification_channel
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.Notification])
 def read_notifications(
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
     skip: int = 0,
     limit: int = 100,
     is_read: Optional[bool] = None,
+    cursor: Optional[str] = None,
 ) -> Any:
     """Retrieve notifications for the current user."""
-    notifications = crud.notification.get_multi_by_user(
-        db, user_id=current_user.id, skip=skip, limit=limit, is_read=is_read
+    if skip:
+        return crud.notification.get_multi_by_user(
+            db, user_id=current_user.id, skip=skip, limit=limit, is_read=is_read
+        )
+    notifications, next_cursor = crud.notification.get_page_by_user(
+        db, user_id=current_user.id, cursor=cursor, limit=limit, is_read=is_read
     )
+    deps.set_next_cursor(response, next_cursor)
     return notifications
 
 
@@ -34,6 +44,46 @@ def get_unread_notification_count(
     return {"unread_count": count}
 
 
+@router.websocket("/ws")
+async def notifications_websocket(websocket: WebSocket, token: str):
+    """Real-time notifications for the current user (fan-outs are pushed here)."""
+    db = SessionLocal()
+    try:
+        user = await deps.get_user_from_token(token, db)
+    finally:
+        db.close()
+    if not user:
+        await websocket.close(code=4001)
+        return
+
+    client = get_async_redis()
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(notification_channel(user.id))
+    except Exception:
+        await client.aclose()
+        await websocket.close(code=1011)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=15.0)
+            if message:
+                await websocket.send_text(message["data"])
+            else:
+                await websocket.send_json({"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        try:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+            await client.aclose()
+        except Exception:
+            pass
+
+
 @router.post("/{notification_id}/read", response_model=schemas.Notification)
 def mark_notification_as_read(
     notification_id: int,
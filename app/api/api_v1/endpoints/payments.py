@@ -1,5 +1,4 @@
 import os
-import stripe
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Request
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
@@ -17,11 +16,11 @@ from app.schemas.payment_verification import (
     PaymentVerificationStatus, 
     StripeCheckoutSession
 )
+from app.services.stripe_service import stripe
 
 router = APIRouter()
 
 # --- Stripe Automated Payments ---
-stripe.api_key = settings.STRIPE_API_KEY
 
 @router.post("/create-checkout-session", response_model=StripeCheckoutSession)
 def create_checkout_session(
@@ -0,0 +1,64 @@
+from dataclasses import asdict
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api import deps
+from app.core.config import settings
+from app.services.content_catalog import content_catalog
+
+router = APIRouter()
+
+
+@router.get("/due", response_model=List[schemas.DueReview])
+def read_due_reviews(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Vocabulary due for review, most overdue first.
+    """
+    return crud.word_review.due(db, user_id=current_user.id, limit=limit)
+
+
+@router.post("/", response_model=List[schemas.WordReviewState])
+def submit_reviews(
+    *,
+    db: Session = Depends(deps.get_db),
+    submission: schemas.ReviewSubmission,
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Record a batch of graded reviews and return the rescheduled words.
+
+    Words that were not under review yet are added. If a word is graded twice, the last grade counts.
+    """
+    if len(submission.reviews) > settings.REVIEW_BATCH_MAX:
+        raise HTTPException(status_code=422, detail=f"At most {settings.REVIEW_BATCH_MAX} reviews per request")
+    grades = {review.word_id: review.grade for review in submission.reviews}
+    unknown = sorted(
+        word_id for word_id in grades
+        if (meta := content_catalog.word(db, word_id)) is None or not meta.is_active
+    )
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Words not found: {unknown}")
+    states = crud.word_review.submit(db, user_id=current_user.id, grades=grades)
+    return [schemas.WordReviewState(word_id=word_id, **asdict(state)) for word_id, state in states.items()]
+
+
+@router.post("/lessons/{lesson_id}", response_model=schemas.ReviewWordsAdded)
+def add_lesson_words(
+    lesson_id: int,
+    db: Session = Depends(deps.get_db),
+    lesson: models.InteractiveLesson = Depends(deps.check_lesson_access),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Start reviewing a lesson's vocabulary. Words already under review keep their schedule.
+    """
+    word_ids = [meta.id for meta in content_catalog.words_for_lesson(db, lesson_id) if meta.is_active]
+    added = crud.word_review.add_words(db, user_id=current_user.id, word_ids=word_ids)
+    return schemas.ReviewWordsAdded(added=len(added), word_ids=added)
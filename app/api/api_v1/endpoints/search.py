@@ -0,0 +1,60 @@
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.api import deps
+from app.schemas.search import SearchDocType
+from app.services.access_policy import access_policy
+from app.services.content_catalog import content_catalog
+from app.services.search import search_index, snippet
+
+router = APIRouter()
+
+
+@router.get("/", response_model=schemas.SearchResults)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[List[SearchDocType]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Ranked full-text search over words, lessons and forum topics/posts.
+
+    Every term must match; the last one also matches as a prefix. Filter with
+    repeated ``type`` parameters and page with ``offset`` (``next_offset`` is
+    null on the last page). Premium lessons the user cannot open are listed
+    as ``locked`` without a snippet.
+    """
+    terms, rows = search_index.search(db, q, types=type, limit=limit + 1, offset=offset)
+    entitlements = access_policy.entitlements(db, user=current_user)
+    items = []
+    for row in rows[:limit]:
+        locked = False
+        if row.doc_type == "lesson":
+            meta = content_catalog.lesson(db, row.doc_id)
+            locked = meta is None or not entitlements.can_access(meta)
+        items.append(schemas.SearchHit(
+            type=row.doc_type, id=row.doc_id, title=row.title, score=row.score, parent_id=row.parent_id,
+            locked=locked, snippet=None if locked else snippet(row.body, terms),
+        ))
+    return schemas.SearchResults(query=q, items=items, next_offset=offset + limit if len(rows) > limit else None)
+
+
+@router.get("/autocomplete", response_model=List[schemas.SearchSuggestion])
+def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    type: Optional[List[SearchDocType]] = Query(None),
+    limit: int = Query(10, ge=1, le=25),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Title suggestions for a partially typed query (words, lessons and forum topics)."""
+    _, rows = search_index.search(
+        db, q, types=type or ("word", "lesson", "forum_topic"), titles_only=True, limit=limit
+    )
+    return [schemas.SearchSuggestion(type=row.doc_type, id=row.doc_id, title=row.title) for row in rows]
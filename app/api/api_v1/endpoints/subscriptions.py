@@ -5,8 +5,8 @@ from typing import List, Any
 from app import crud, models, schemas
 from app.api import deps
 from app.services import stripe_service
+from app.services.stripe_service import stripe
 from app.core.config import settings
-import stripe
 
 router = APIRouter()
 
@@ -48,69 +48,15 @@ def read_available_subscription_plans(
 @router.post(
     "/stripe-webhook",
     summary="Stripe webhook",
-    description="Receives Stripe events and updates subscriptions/roles accordingly."
+    description="Stores verified Stripe events and acknowledges them; subscriptions/roles are updated by a background job."
 )
 async def stripe_webhook(
     request: Request,
     stripe_signature: str = Header(None, alias="Stripe-Signature"),
     db: Session = Depends(deps.get_db)
 ):
-    """
-    Stripe webhook endpoint to handle payment events.
-    """
-    try:
-        event = stripe.Webhook.construct_event(
-            payload=await request.body(),
-            sig_header=stripe_signature,
-            secret=settings.STRIPE_WEBHOOK_SECRET
-        )
-    except ValueError as e:  # Invalid payload
-        raise HTTPException(status_code=400, detail=str(e))
-    except stripe.error.SignatureVerificationError as e:  # Invalid signature
-        raise HTTPException(status_code=400, detail=str(e))
-
-    # Handle the checkout.session.completed event
-    if event['type'] == 'checkout.session.completed':
-        session = event['data']['object']
-        user_id = session.get("metadata", {}).get("user_id")
-        plan_id = session.get("metadata", {}).get("plan_id")
-
-        if user_id and plan_id:
-            user = crud.user.get(db, id=int(user_id))
-            plan = crud.get_subscription_plan(db, plan_id=int(plan_id))
-            if user and plan:
-                # Create subscription record and update AI quotas
-                crud.create_with_plan_details(db, user_id=user.id, plan_id=plan.id)
-
-                # Assign premium role automatically after successful payment
-                try:
-                    premium_role = crud.role.get_by_name(db, name="premium")
-                    if premium_role and premium_role not in user.roles:
-                        user.roles.append(premium_role)
-                        db.add(user)
-                        db.commit()
-                except Exception:
-                    pass
-
-                # Mark a payment verification entry as paid_pending_approval (optional)
-                try:
-                    crud.payment_verification.create_or_update(
-                        db,
-                        user_id=user.id,
-                        provider="stripe",
-                        provider_reference=session.get("id"),
-                        status="paid_pending_approval",
-                        amount=plan.price,
-                        currency="usd",
-                        raw_event=event
-                    )
-                except Exception:
-                    pass
-        else:
-            # Log an error if metadata is missing
-            print(f"Error: Missing user_id or plan_id in Stripe checkout session metadata. Session ID: {session.id}")
-
-    return {"status": "success"}
+    """Stripe webhook endpoint (see ``stripe_service.receive_webhook``)."""
+    return stripe_service.receive_webhook(db, await request.body(), stripe_signature)
 
 @router.get(
     "/status",
@@ -63,10 +63,14 @@ def mark_lesson_as_complete(
                 if course:
                     new_cert = crud.certificate.create_with_pdf(
                         db,
+                        obj_in=schemas.CertificateCreate(
+                            title=f"Certificate for {course.title}",
+                            user_id=current_user.id,
+                            course_id=course.id,
+                            course_name=course.title,
+                            level_completed=course.difficulty_level,
+                        ),
                         user=current_user,
-                        course_name=course.title,
-                        level_completed=course.level, # Pass the course level
-                        course_id=course.id # Pass the course_id
                     )
                     # Create a notification for the user
                     if new_cert:
@@ -1,13 +1,12 @@
 from datetime import timedelta
 from typing import Any, List, Optional
-from fastapi.responses import FileResponse
-import os
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.api.api_v1.endpoints.certificates import serve_certificate
 from app.core.config import settings
 from app.core.security import create_access_token
  
@@ -24,15 +23,20 @@ async def send_new_account_email(email_to: str, username: str) -> None:
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users (Superuser only).
     """
-    users = crud.user.get_multi(db, skip=skip, limit=limit)
+    if skip:
+        return crud.user.get_multi(db, skip=skip, limit=limit)
+    users, next_cursor = crud.user.get_page(db, cursor=cursor, limit=limit)
+    deps.set_next_cursor(response, next_cursor)
     return users
 
 
@@ -311,7 +315,4 @@ def download_certificate(
     if not certificate or certificate.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Certificate not found")
     
-    if not certificate.file_path or not os.path.exists(certificate.file_path):
-        raise HTTPException(status_code=404, detail="Certificate file not available.")
-
-    return FileResponse(certificate.file_path, media_type='application/pdf', filename=f"certificate-{certificate.id}.pdf")
+    return serve_certificate(certificate)
@@ -1,26 +1,54 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.responses import json_list
 from app.models.user import Role as UserRole
+from app.services.search import vocabulary_index
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.Word])
 def read_words(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
 ) -> Any:
     """
     Retrieve words.
     """
-    words = crud.word.get_multi(db, skip=skip, limit=limit)
-    return words
+    if skip:
+        return json_list(schemas.Word, crud.word.get_multi(db, skip=skip, limit=limit))
+    words, next_cursor = crud.word.get_page(db, cursor=cursor, limit=limit)
+    deps.set_next_cursor(response, next_cursor)
+    return json_list(schemas.Word, words, response=response)
+
+
+@router.get("/suggest", response_model=List[schemas.WordSuggestion])
+def suggest_words(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    max_distance: Optional[int] = Query(None, ge=0, le=3),
+    db: Session = Depends(deps.get_db),
+) -> Any:
+    """
+    Vocabulary words spelled like ``q`` (matched against the word and its translation).
+
+    Closest first; ``max_distance`` defaults to 0-2 edits depending on the length of ``q``.
+    """
+    return [
+        schemas.WordSuggestion(
+            id=match.word_id, word=match.word, translation=match.translation or None,
+            matched=match.field, distance=match.distance,
+        )
+        for match in vocabulary_index.suggest(db, q, limit=limit, max_distance=max_distance)
+    ]
 
 
 @router.post("/", response_model=schemas.Word)
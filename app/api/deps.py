@@ -1,18 +1,36 @@
 from typing import Generator, Optional
 from datetime import datetime, timedelta
 
-from fastapi import Depends, HTTPException, status, Query, Request, Body
+from fastapi import Depends, HTTPException, status, Query, Request, Response, Body
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, ValidationError
 from jose import jwt, JWTError
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.crud import loaders
 from app.core import security
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.user import User, Role as UserRole
 from app.schemas import Lesson
+from app.services.access_policy import access_policy
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """
+    Expose the keyset pagination cursor of a list response (absent on the last page).
+
+    Every cursor-paginated list endpoint follows the same contract: the body
+    stays a plain list, the next page is requested by passing this header's
+    value back as the ``cursor`` query parameter, and a non-zero ``skip``
+    selects the old OFFSET listing for existing clients.
+    """
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -128,7 +146,7 @@ async def get_current_user(
 
         # Get user from database
         print(f"\nLooking up user with ID {user_id} in database...")
-        user = crud.user.get(db, id=user_id)
+        user = crud.user.get(db, id=user_id, profile=loaders.AUTH)
         if not user:
             print(f"❌ User with ID {user_id} not found in database")
             raise credentials_exception
@@ -194,7 +212,7 @@ async def get_current_user_from_token(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get(db, id=int(token_data.sub))
+    user = crud.user.get(db, id=int(token_data.sub), profile=loaders.AUTH)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -347,47 +365,26 @@ def check_lesson_access(
     Raises:
         HTTPException: If access is denied or lesson not found
     """
-    # Get the lesson
+    meta = access_policy.catalog.lesson(db, lesson_id)
+    if meta is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lesson not found"
+        )
+
+    entitlements = access_policy.entitlements(db, user=current_user)
+    if not entitlements.can_access(meta):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Premium subscription required to access this lesson"
+        )
+
     lesson = crud.lesson.get(db, id=lesson_id)
     if not lesson:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Lesson not found"
         )
-    
-    # Admins and superadmins have full access
-    if current_user.is_superuser:
-        return lesson
-        
-    # Debug output
-    print(f"\n[DEBUG] check_lesson_access")
-    print(f"Current user ID: {current_user.id}, Role: {[role.name for role in current_user.roles]}")
-    print(f"Lesson ID: {lesson.id}, Premium only: {lesson.is_premium}")
-    print(f"Course instructor ID: {lesson.course.instructor_id}")
-
-    # Course creators can access their own lessons regardless of premium status
-    if lesson.course and lesson.course.instructor_id == current_user.id:
-        return lesson
-    
-    # Check if it's a premium lesson
-    if lesson.is_premium:
-        print("[DEBUG] This is a premium lesson")
-        
-        # Check if user is premium
-        if not current_user.is_premium:
-            print("[DEBUG] Access denied: User is not premium")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Premium subscription required to access this lesson"
-            )
-        print("[DEBUG] Access granted: User is premium")
-        return lesson
-        
-    # If not a premium lesson, check if user is the course creator
-    if lesson.course and lesson.course.instructor_id == current_user.id:
-        return lesson
-    
-    # If we get here, the lesson is not premium or the user has access
     return lesson
 
 
@@ -12,17 +12,15 @@ import sqlalchemy
 from pathlib import Path
 from datetime import datetime, timedelta
 import logging
-import difflib
-import re
 
 from app import models, schemas, crud
 from app.models.homework import HomeworkStatus as HWStatus, HomeworkSubmission as HomeworkSubmissionModel
-from app.schemas.ai_feedback import AIFeedbackRequest
-from app.services.ai_feedback_service import ai_feedback_service
 from app.api import deps
-from app.api.endpoints.ai import transcribe_audio
 from app.core.config import settings
+from app.core.responses import json_list
 from app.services import homework_service as hw_service
+from app.core.jobs import enqueue
+from app.tasks.homework import transcribe_submission
 from app.utils.file_handling import save_upload_file
 
 # Configure logger
@@ -69,119 +67,6 @@ def _has_role(user: models.User, role_name: str) -> bool:
     return any(getattr(r, "name", None) == role_name for r in roles)
 
 
-async def generate_ai_feedback(
-    *,
-    submission: Dict[str, Any] | None,
-    assignment: Any | None,
-    student: Any | None,
-) -> Dict[str, Any]:
-    """Generate AI feedback and adapt it to the structure expected by auto-grading.
-
-    Priority for user_response source:
-    1) submission["audio"]["transcript"] (STT result)
-    2) submission["text"] or submission["content"]
-
-    Heuristic auto-grading:
-    - If reference text is available from assignment (instructions/description),
-      compute a similarity ratio (0-100) between normalized user_response and reference.
-    - Attach feedback describing alignment and gaps.
-
-    If AIFeedbackService works, we include its output into metadata; otherwise we still
-    return a heuristic result.
-    """
-    try:
-        # Extract a textual response with preference to STT transcript
-        user_response = ""
-        transcript = None
-        if isinstance(submission, dict):
-            audio_part = submission.get("audio") if isinstance(submission.get("audio"), dict) else None
-            if audio_part:
-                transcript = audio_part.get("transcript")
-            user_response = transcript or submission.get("text") or submission.get("content") or ""
-
-        reference_text = None
-        if assignment is not None:
-            # Try common fields for expected/guide text
-            reference_text = getattr(assignment, "instructions", None) or getattr(assignment, "description", None)
-
-        req = AIFeedbackRequest(
-            user_response=user_response or "",
-            reference_text=reference_text or None,
-            context={
-                "student_id": getattr(student, "id", None),
-                "homework_id": getattr(assignment, "id", None),
-            },
-        )
-        ai_resp = None
-        try:
-            ai_resp = await ai_feedback_service.generate_feedback(req)
-        except Exception as e_ai:
-            # Non-fatal; we'll fall back to heuristics below
-            logger.info(f"AI feedback service unavailable, using heuristics: {e_ai}")
-
-        # Heuristic grading if we have a reference
-        def _normalize(text: str) -> str:
-            t = text.lower()
-            t = re.sub(r"[^a-z0-9\s']+", " ", t)
-            t = re.sub(r"\s+", " ", t).strip()
-            return t
-
-        score = None
-        fb_parts = []
-        meta: Dict[str, Any] = {}
-        if reference_text and user_response:
-            norm_user = _normalize(user_response)
-            norm_ref = _normalize(reference_text)
-            ratio = difflib.SequenceMatcher(None, norm_user, norm_ref).ratio()
-            score = round(ratio * 100, 2)
-            fb_parts.append(f"Similarity to expected answer: {score}%.")
-            # Highlight simple diff hints (missing words)
-            user_words = set(norm_user.split())
-            ref_words = set(norm_ref.split())
-            missing = [w for w in ref_words - user_words if w.isalpha()]
-            extra = [w for w in user_words - ref_words if w.isalpha()]
-            if missing:
-                fb_parts.append(f"Key words to include: {', '.join(missing[:10])}.")
-            if extra:
-                fb_parts.append(f"Extra words detected: {', '.join(extra[:10])}.")
-            meta.update({
-                "heuristic": {
-                    "ratio": ratio,
-                    "missing_words": missing[:50],
-                    "extra_words": extra[:50],
-                }
-            })
-
-        # If AI overall exists, blend it into feedback
-        blended_feedback = None
-        if ai_resp is not None:
-            overall = ai_resp.overall
-            ai_score = getattr(overall, "score", None)
-            ai_text = getattr(overall, "feedback", None)
-            meta["ai_feedback"] = ai_resp.model_dump()
-            if ai_text:
-                fb_parts.append(str(ai_text))
-            # Prefer heuristic score if available; else take AI score
-            if score is None:
-                score = ai_score
-
-        blended_feedback = " ".join(p for p in fb_parts if p)
-
-        return {
-            "score": score,
-            "feedback": blended_feedback or ("Transcription received." if transcript else "Response received."),
-            "auto_graded": score is not None,
-            "metadata": meta,
-        }
-    except Exception as e:
-        logger.warning(f"Fallback AI feedback due to error: {e}")
-        return {
-            "score": None,
-            "feedback": "AI feedback is currently unavailable.",
-            "auto_graded": False,
-            "metadata": {"error": str(e)},
-        }
-
 # Homework endpoints
 @router.get("/", response_model=List[schemas.Homework])
 def read_homework_assignments(
@@ -217,7 +102,7 @@ def read_homework_assignments(
             # Avoid recursive serialization; let default handle empty submissions/lesson
             "submissions": [],
         })
-    return sanitized
+    return json_list(schemas.Homework, sanitized)
 
 
 @router.post(
@@ -652,112 +537,6 @@ def _user_has_access_to_homework(db: Session, user_id: int, homework_id: int) ->
     return sub is not None
 
 
-async def _process_audio_submission(
-    db: Session,
-    submission_id: int,
-    audio_path: Path,
-    audio_data: Dict[str, Any]
-):
-    """Process audio submission in the background"""
-    try:
-        # Get the submission record
-        submission = db.query(HomeworkSubmissionModel).get(submission_id)
-        if not submission:
-            logger.error(f"Submission {submission_id} not found for audio processing")
-            return
-        
-        # Transcribe audio
-        try:
-            transcript = await transcribe_audio(audio_path)
-            audio_data["transcript"] = transcript
-
-            # Update submission metadata and optionally content
-            meta = submission.metadata_ or {}
-            audio_meta = meta.get("audio", {})
-            audio_meta.update({
-                "file": audio_data.get("file"),
-                "url": audio_data.get("url"),
-                "uploaded_at": audio_data.get("uploaded_at"),
-                "transcript": transcript,
-            })
-            meta["audio"] = audio_meta
-
-            update_payload: Dict[str, Any] = {
-                "metadata": meta,
-            }
-            # If content is empty, store transcript as content for easier display
-            if not submission.content and transcript:
-                update_payload["content"] = transcript
-
-            db.query(HomeworkSubmissionModel).filter(
-                HomeworkSubmissionModel.id == submission_id
-            ).update(update_payload)
-            db.commit()
-            
-            logger.info(f"Successfully transcribed audio for submission {submission_id}")
-                
-        except Exception as e:
-            logger.error(f"Error transcribing audio for submission {submission_id}: {e}")
-            
-    except Exception as e:
-        logger.error(f"Error in audio processing task: {e}", exc_info=True)
-    finally:
-        db.close()
-
-
-async def _auto_grade_submission(
-    db: Session,
-    submission_id: int
-):
-    """Automatically grade a submission using AI"""
-    try:
-        # Get the submission record with related data
-        submission = db.query(HomeworkSubmissionModel).options(
-            sqlalchemy.orm.joinedload(HomeworkSubmissionModel.homework),
-            sqlalchemy.orm.joinedload(HomeworkSubmissionModel.student)
-        ).filter(HomeworkSubmissionModel.id == submission_id).first()
-        
-        if not submission:
-            return
-            
-        # Generate AI feedback
-        meta = submission.metadata_ or {}
-        sub_payload: Dict[str, Any] = {
-            "audio": meta.get("audio"),
-            "text": submission.content,
-            "content": submission.content,
-        }
-        feedback = await generate_ai_feedback(
-            submission=sub_payload,
-            assignment=submission.homework,
-            student=submission.student
-        )
-        
-        # Update the submission with AI feedback
-        if feedback:
-            auto_graded = feedback.get("auto_graded", False)
-            score_val = feedback.get("score")
-            db.query(HomeworkSubmissionModel).filter(
-                HomeworkSubmissionModel.id == submission_id
-            ).update({
-                "status": HWStatus.GRADED if auto_graded or score_val is not None else HWStatus.SUBMITTED,
-                "score": score_val,
-                "feedback": feedback.get("feedback"),
-                "graded_at": datetime.utcnow() if (auto_graded or score_val is not None) else None,
-                "metadata": {
-                    **(submission.metadata_ or {}),
-                    "auto_graded": auto_graded,
-                    "grading_metadata": feedback.get("metadata", {})
-                }
-            })
-            db.commit()
-            
-    except Exception as e:
-        logger.error(f"Error in auto-grading task: {e}", exc_info=True)
-    finally:
-        db.close()
-
-
 # User homework endpoints
 @router.post(
     "/{homework_id}/assign",
@@ -1081,7 +860,6 @@ def my_submissions(
 async def submit_oral_homework(
     *,
     db: Session = Depends(deps.get_db),
-    background_tasks: BackgroundTasks,
     current_user: models.User = Depends(deps.get_current_active_user),
     homework_id: int,
     audio_file: UploadFile = File(..., description="Audio file to upload")
@@ -1117,17 +895,23 @@ async def submit_oral_homework(
 
     db.refresh(submission)
 
-    # Background: transcribe audio and (optionally) auto-grade
-    try:
-        audio_data = {
-            "file": str(dest_path),
-            "url": audio_url,
-            "uploaded_at": datetime.utcnow().isoformat(),
-        }
-        background_tasks.add_task(_process_audio_submission, db, submission.id, dest_path, audio_data)
-        background_tasks.add_task(_auto_grade_submission, db, submission.id)
-    except Exception as e:
-        logger.warning(f"Background tasks scheduling failed: {e}")
+    # Background job: transcribe audio, then auto-grade (chained by the worker)
+    audio_data = {
+        "file": str(dest_path),
+        "url": audio_url,
+        "uploaded_at": datetime.utcnow().isoformat(),
+    }
+    job = enqueue(
+        transcribe_submission,
+        submission.id,
+        str(dest_path),
+        audio_data,
+        idempotency_key=f"homework:transcribe:{submission.id}",
+        owner_id=current_user.id,
+        resource=f"homework_submission:{submission.id}",
+    )
+    logger.info(f"Queued transcription job {job['id']} for submission {submission.id}")
+    db.refresh(submission)
 
     return submission
 
@@ -9,8 +9,7 @@ from app import models, schemas, crud
 from app.api import deps
 from app.services import ai_service, ai_services
 from app.core.config import settings
-from gtts import gTTS
-from gtts.lang import tts_langs
+from app.services.tts_executor import gtts_language, gtts_provider, tts_executor
 
 logger = logging.getLogger(__name__)
 
@@ -110,12 +109,7 @@ async def start_lesson(
             tts_dir.mkdir(parents=True, exist_ok=True)
             filename = f"greeting_{current_user.id}_{int(datetime.utcnow().timestamp())}.mp3"
             filepath = tts_dir / filename
-            requested = "uz"
-            supported_langs = tts_langs()
-            fallback_order = [requested, "uz", "tr", "ru", "en"]
-            chosen = next((lc for lc in fallback_order if lc in supported_langs), None)
-            if not chosen:
-                chosen = next(iter(supported_langs.keys()))
+            chosen = gtts_language("uz")
             # Check quota
             try:
                 usage = crud.user_ai_usage.get_or_create(db, user_id=current_user.id)
@@ -126,7 +120,7 @@ async def start_lesson(
                     audio_url = None
                 else:
                     # Attempt TTS first; only deduct on success
-                    gTTS(text=greeting_text, lang=chosen, slow=False).save(str(filepath))
+                    await tts_executor.save(greeting_text, gtts_provider(chosen), filepath)
                     audio_url = f"/uploads/tts/{filename}"
                     # Deduct quota after successful synthesis
                     setattr(usage, "tts_chars_left", remaining - text_len)
@@ -237,11 +231,7 @@ async def send_message(
             tts_dir.mkdir(parents=True, exist_ok=True)
             filename = f"reply_{current_user.id}_{int(datetime.utcnow().timestamp())}.mp3"
             filepath = tts_dir / filename
-            supported_langs = tts_langs()
-            fallback_order = ["uz", "tr", "ru", "en"]
-            chosen = next((lc for lc in fallback_order if lc in supported_langs), None)
-            if not chosen:
-                chosen = next(iter(supported_langs.keys()))
+            chosen = gtts_language()
             # Check quota and deduct on success only
             try:
                 usage = crud.user_ai_usage.get_or_create(db, user_id=current_user.id)
@@ -250,7 +240,7 @@ async def send_message(
                 if remaining < text_len:
                     audio_url = None
                 else:
-                    gTTS(text=ai_text_response, lang=chosen, slow=False).save(str(filepath))
+                    await tts_executor.save(ai_text_response, gtts_provider(chosen), filepath)
                     audio_url = f"/uploads/tts/{filename}"
                     setattr(usage, "tts_chars_left", remaining - text_len)
                     setattr(usage, "tts_characters", getattr(usage, "tts_characters", 0) + text_len)
@@ -344,12 +334,8 @@ async def send_audio_message(
             tts_dir.mkdir(parents=True, exist_ok=True)
             filename = f"reply_{current_user.id}_{int(datetime.utcnow().timestamp())}.mp3"
             filepath = tts_dir / filename
-            supported_langs = tts_langs()
-            fallback_order = ["uz", "tr", "ru", "en"]
-            chosen = next((lc for lc in fallback_order if lc in supported_langs), None)
-            if not chosen:
-                chosen = next(iter(supported_langs.keys()))
-            gTTS(text=ai_text_response, lang=chosen, slow=False).save(str(filepath))
+            chosen = gtts_language()
+            await tts_executor.save(ai_text_response, gtts_provider(chosen), filepath)
             audio_url = f"/uploads/tts/{filename}"
         except Exception:
             audio_url = None
@@ -0,0 +1,104 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app import models
+from app.api import deps
+from app.core.jobs import job_store
+from app.core.progress import progress_bus
+from app.db.session import SessionLocal
+from app.schemas.job import Job
+
+router = APIRouter()
+
+
+def _can_see(event: Optional[Dict[str, Any]], user: models.User) -> bool:
+    return bool(event) and (event.get("owner_id") == user.id or user.is_superuser)
+
+
+@router.get("/", response_model=List[Job], summary="List current user's background jobs")
+async def list_my_jobs(
+    limit: int = Query(50, ge=1, le=200),
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """Most recent jobs first (transcription, auto-grading, video analysis)."""
+    return job_store.list_for_owner(current_user.id, limit=limit)
+
+
+@router.get("/progress/{resource}", summary="Get the latest progress event for a resource")
+async def get_progress(
+    resource: str,
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """Cached last state, e.g. for ``homework_submission:42``. No database reads."""
+    event = progress_bus.last(resource)
+    if not _can_see(event, current_user):
+        raise HTTPException(status_code=404, detail="No progress for this resource")
+    return event
+
+
+@router.get("/progress/{resource}/events", summary="Stream progress events (Server-Sent Events)")
+async def stream_progress(
+    resource: str,
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    """Sends the current state, then every change until the job is done or failed."""
+    event = progress_bus.last(resource)
+    if event is not None and not _can_see(event, current_user):
+        raise HTTPException(status_code=404, detail="No progress for this resource")
+
+    async def event_stream():
+        async for item in progress_bus.subscribe(resource):
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            if not _can_see(item, current_user):
+                return
+            yield f"data: {json.dumps(item, default=str)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/progress/{resource}/ws")
+async def progress_websocket(websocket: WebSocket, resource: str, token: str):
+    db = SessionLocal()
+    try:
+        user = await deps.get_user_from_token(token, db)
+    finally:
+        db.close()
+    if not user:
+        await websocket.close(code=4001)
+        return
+
+    await websocket.accept()
+    try:
+        async for item in progress_bus.subscribe(resource):
+            if item is None:
+                await websocket.send_json({"type": "ping"})
+                continue
+            if not _can_see(item, user):
+                await websocket.close(code=4004)
+                return
+            await websocket.send_json(item)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get("/{job_id}", response_model=Job, summary="Get background job status")
+async def get_job(
+    job_id: str,
+    current_user: models.User = Depends(deps.get_current_active_user),
+):
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.get("owner_id") != current_user.id and not current_user.is_superuser:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
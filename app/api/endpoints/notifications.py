@@ -41,12 +41,7 @@ async def get_unread_notifications_count(
     """
     Get count of unread notifications for the current user.
     """
-    notifications = crud_notification.notification.get_multi_by_user(
-        db=db,
-        user_id=current_user.id,
-        is_read=False,
-    )
-    return len(notifications)
+    return crud_notification.notification.get_unread_count(db, user_id=current_user.id)
 
 @router.post("/mark-read/{notification_id}", response_model=schemas.Notification)
 async def mark_notification_as_read(
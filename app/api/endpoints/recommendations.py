@@ -67,7 +67,7 @@ async def get_next_lessons(
 async def get_personalized_recommendations(
     content_types: Optional[List[str]] = Query(
         None, 
-        description="Qaytariladigan kontent turlari (masalan, exercises, lessons)"
+        description="Qaytariladigan kontent turlari (masalan, exercises, lessons, reviews)"
     ),
     limit: int = Query(5, description="Har bir turdagi tavsiyalar soni", ge=1, le=20),
     db: Session = Depends(get_db),
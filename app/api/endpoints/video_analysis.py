@@ -1,5 +1,5 @@
 import os
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
 from pathlib import Path
 import shutil
@@ -9,7 +9,8 @@ from datetime import datetime
 from app import crud, models, schemas
 from app.api import deps
 from app.core.config import settings
-from app.services.ai.gemini_service import GeminiService
+from app.core.jobs import enqueue
+from app.tasks.video import analyze_video
 from app.utils import save_upload_file
 
 router = APIRouter()
@@ -24,7 +25,6 @@ async def upload_video(
     file: UploadFile = File(...),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_active_user),
-    background_tasks: BackgroundTasks = None
 ):
     # File validation
     allowed_extensions = {".mp4", ".mov", ".avi", ".mkv"}
@@ -56,63 +56,24 @@ async def upload_video(
             obj_in={"video_url": video_url, "is_processed": False}
         )
         
-        # Start analysis in background
-        if background_tasks:
-            background_tasks.add_task(analyze_video_task, db_video.id, str(file_path), language, db)
+        # Start analysis as a durable background job (owns its own DB session)
+        job = enqueue(
+            analyze_video,
+            db_video.id,
+            str(file_path),
+            language,
+            idempotency_key=f"video:analyze:{db_video.id}",
+            owner_id=current_user.id,
+            resource=f"video_analysis:{db_video.id}",
+        )
         
-        return {"id": db_video.id, "status": "processing", "message": "Video yuklandi"}
+        return {"id": db_video.id, "status": "processing", "message": "Video yuklandi", "job_id": job["id"]}
         
     except Exception as e:
         db.delete(db_video)
         db.commit()
         raise HTTPException(500, detail=f"Xatolik: {str(e)}")
 
-async def analyze_video_task(video_id: int, video_path: str, language: str, db: Session):
-    try:
-        db_video = crud.video_analysis.get(db, video_id)
-        if not db_video:
-            return
-            
-        # Update status
-        db_video = crud.video_analysis.update(
-            db, db_obj=db_video,
-            obj_in={"processing_status": "processing"}
-        )
-        
-        # Analyze with Gemini
-        gemini = GeminiService()
-        analysis = await gemini.analyze_video(video_path)
-        
-        if analysis["status"] != "completed":
-            raise Exception(analysis.get("error", "Analysis failed"))
-        
-        # Save results
-        crud.video_analysis.update(
-            db, db_obj=db_video,
-            obj_in={
-                "is_processed": True,
-                "processing_status": "completed",
-                "metadata": {
-                    **db_video.metadata,
-                    "analysis": analysis,
-                    "processed_at": str(datetime.utcnow())
-                }
-            }
-        )
-        
-    except Exception as e:
-        if db_video:
-            crud.video_analysis.update(
-                db, db_obj=db_video,
-                obj_in={
-                    "processing_status": "failed",
-                    "metadata": {
-                        **db_video.metadata,
-                        "error": str(e)
-                    }
-                }
-            )
-
 @router.get("/{video_id}", response_model=schemas.VideoAnalysis)
 def get_video_analysis(
     video_id: int,
@@ -6,6 +6,8 @@ import json
 from enum import Enum
 from datetime import datetime
 
+from sqlalchemy.orm import object_session
+
 from app.core.ai.gemini_service import gemini_service
 from app.models.exercise import Exercise, ExerciseAttempt, ExerciseType
 from app.models.user import User
@@ -85,11 +87,25 @@ class ExerciseAnalyzer:
                         "score": a.score,
                         "created_at": a.created_at.isoformat()
                     }
-                    for a in (attempt.exercise.attempts if attempt and attempt.exercise else [])[:5]
-                ] if attempt and attempt.exercise else []
+                    for a in self._previous_attempts(attempt, user)
+                ]
             }
         }
     
+    def _previous_attempts(self, attempt: Optional[ExerciseAttempt], user: User) -> List[ExerciseAttempt]:
+        """Foydalanuvchining shu mashqdagi oxirgi 5 ta urinishi (bitta so'rov bilan)."""
+        db = object_session(attempt) if attempt is not None else None
+        if db is None or attempt.exercise_id is None:
+            return []
+        # `attempt.exercise.attempts` would load every attempt of every user
+        return (
+            db.query(ExerciseAttempt)
+            .filter(ExerciseAttempt.exercise_id == attempt.exercise_id, ExerciseAttempt.user_id == user.id)
+            .order_by(ExerciseAttempt.created_at.desc())
+            .limit(5)
+            .all()
+        )
+
     async def _get_ai_analysis(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """AI yordamida tahlil qilish."""
         prompt = self._create_analysis_prompt(context)
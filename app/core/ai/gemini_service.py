@@ -3,9 +3,11 @@ Google Gemini AI servisi uchun asosiy modul.
 """
 import os
 from typing import Optional, Dict, Any, List
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+from app.core.registry import services
+from app.services.ai_clients import genai
+
 # .env faylidan o'qib olish
 load_dotenv()
 
@@ -78,4 +80,4 @@ class GeminiService:
             raise Exception(f"Chat xizmatida xatolik: {str(e)}")
 
 # Singleton pattern orqali bitta instansiyani yaratish
-gemini_service = GeminiService()
+gemini_service = services.lazy("gemini_chat", GeminiService)
@@ -7,7 +7,7 @@ import random
 
 from sqlalchemy.orm import Session
 
-from app import models
+from app import crud, models
 from app.models import User, Exercise, UserProgress, UserLessonProgress
 from app.models.user_level import UserLevel
 from app.models.lesson import LessonDifficulty
@@ -37,7 +37,7 @@ class RecommendationService:
             Dict: Tavsiyalar ro'yxati
         """
         if content_types is None:
-            content_types = ['exercises', 'lessons']
+            content_types = ['exercises', 'lessons', 'reviews']
         
         recommendations = {}
         
@@ -57,6 +57,10 @@ class RecommendationService:
         if 'lessons' in content_types:
             lessons = await self._recommend_lessons(user, limit, user_level)
             recommendations['lessons'] = lessons
+
+        if 'reviews' in content_types:
+            # Takrorlash vaqti kelgan so'zlar (spaced repetition navbati)
+            recommendations['reviews'] = crud.word_review.due(self.db, user_id=user.id, limit=limit)
         
         return recommendations
     
@@ -4,10 +4,10 @@ Text-to-Speech (TTS) xizmati.
 import os
 import tempfile
 from pathlib import Path
-from gtts import gTTS
 from pydub import AudioSegment
 from pydub.playback import play
-import io
+
+from app.services.tts_executor import gtts_provider, tts_executor
 
 class TTSService:
     """Matnni ovozga aylantirish uchun servis."""
@@ -31,15 +31,8 @@ class TTSService:
             bytes: Audio fayl ma'lumotlari (MP3 formatida)
         """
         try:
-            # gTTS orqali audio generatsiya qilish
-            tts = gTTS(text=text, lang=self.lang, slow=slow)
-            
-            # Audio ma'lumotlarini bytelarga yozish
-            audio_buffer = io.BytesIO()
-            tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
-            
-            return audio_buffer.read()
+            # gTTS orqali audio generatsiya qilish (TTS thread pool'ida, gap-gap bo'yicha)
+            return await tts_executor.synthesize(text, gtts_provider(self.lang, slow))
             
         except Exception as e:
             raise Exception(f"TTS xatolik: {str(e)}")
@@ -59,8 +52,7 @@ class TTSService:
             audio_data = await self.text_to_speech(text, slow)
             
             # Faylga yozish
-            with open(output_path, 'wb') as f:
-                f.write(audio_data)
+            await tts_executor.run(Path(output_path).write_bytes, audio_data)
                 
             return output_path
             
@@ -15,6 +15,18 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+def get_async_redis():
+    """New ``redis.asyncio`` client (for pub/sub subscribers); close it when done."""
+    import redis.asyncio as aioredis
+
+    return aioredis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        decode_responses=True
+    )
+
 def get_cache_key(prefix: str, *args, **kwargs) -> str:
     """Generate a cache key from function arguments"""
     key_parts = [prefix]
@@ -0,0 +1,107 @@
+"""
+Celery application for background jobs (AI grading, transcription, video analysis).
+
+Tasks are routed to dedicated queues so CPU-heavy transcription does not starve
+the I/O-bound LLM calls. Run one worker pool per queue, e.g.::
+
+    celery -A app.core.celery_app worker -Q transcription -c 2 --pool prefork
+    celery -A app.core.celery_app worker -Q llm,video,payments -c 16 --pool threads
+    celery -A app.core.celery_app worker -Q documents -c 4 --pool prefork
+    celery -A app.core.celery_app beat   # stats reconciliation / rollups, quota resets, Stripe event sweeps
+
+When ``settings.JOBS_EAGER`` (or ``settings.TESTING``) is set, tasks run
+in-process inside ``apply_async`` and no broker is needed.
+"""
+from celery import Celery
+from celery.schedules import crontab
+from kombu import Queue
+
+from app.core.config import settings
+
+QUEUE_TRANSCRIPTION = "transcription"
+QUEUE_LLM = "llm"
+QUEUE_VIDEO = "video"
+QUEUE_DOCUMENTS = "documents"
+QUEUE_PAYMENTS = "payments"
+
+# Suggested worker concurrency per queue (see module docstring / docker-compose)
+QUEUE_CONCURRENCY = {
+    QUEUE_TRANSCRIPTION: settings.JOBS_TRANSCRIPTION_CONCURRENCY,
+    QUEUE_LLM: settings.JOBS_LLM_CONCURRENCY,
+    QUEUE_VIDEO: settings.JOBS_LLM_CONCURRENCY,
+    QUEUE_DOCUMENTS: settings.JOBS_DOCUMENTS_CONCURRENCY,
+    QUEUE_PAYMENTS: settings.JOBS_LLM_CONCURRENCY,
+}
+
+
+def _redis_url() -> str:
+    if settings.REDIS_URL:
+        return str(settings.REDIS_URL)
+    auth = f":{settings.REDIS_PASSWORD}@" if settings.REDIS_PASSWORD else ""
+    return f"redis://{auth}{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
+
+
+def is_eager() -> bool:
+    """Jobs run synchronously in the calling process (no broker, no worker)."""
+    return bool(settings.JOBS_EAGER or settings.TESTING)
+
+
+celery_app = Celery(
+    "oquv_worker",
+    broker=settings.CELERY_BROKER_URL or _redis_url(),
+    backend=settings.CELERY_RESULT_BACKEND or _redis_url(),
+    include=["app.tasks.homework", "app.tasks.video", "app.tasks.certificates", "app.tasks.stats",
+             "app.tasks.search", "app.tasks.quotas", "app.tasks.payments"],
+)
+
+celery_app.conf.update(
+    task_queues=(
+        Queue(QUEUE_TRANSCRIPTION),
+        Queue(QUEUE_LLM),
+        Queue(QUEUE_VIDEO),
+        Queue(QUEUE_DOCUMENTS),
+        Queue(QUEUE_PAYMENTS),
+    ),
+    task_default_queue=QUEUE_LLM,
+    task_routes={
+        "homework.transcribe_submission": {"queue": QUEUE_TRANSCRIPTION},
+        "homework.auto_grade_submission": {"queue": QUEUE_LLM},
+        "video.analyze_video": {"queue": QUEUE_VIDEO},
+        "certificates.*": {"queue": QUEUE_DOCUMENTS},
+        "stats.*": {"queue": QUEUE_DOCUMENTS},
+        "search.*": {"queue": QUEUE_DOCUMENTS},
+        "quotas.*": {"queue": QUEUE_DOCUMENTS},
+        "payments.*": {"queue": QUEUE_PAYMENTS},
+    },
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    # A job is only removed from the broker once it finished, so a worker
+    # restart re-delivers it instead of losing it.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    result_expires=settings.JOBS_STATUS_TTL,
+    task_always_eager=is_eager(),
+    task_eager_propagates=False,
+    timezone="UTC",
+    enable_utc=True,
+    beat_schedule={
+        "reconcile-platform-stats": {
+            "task": "stats.reconcile_platform_stats",
+            "schedule": float(settings.STATS_RECONCILE_INTERVAL),
+        },
+        "rollup-daily-stats": {
+            "task": "stats.rollup_daily_stats",
+            "schedule": crontab(hour=settings.STATS_ROLLUP_HOUR, minute=5),
+        },
+        "reset-ai-quotas": {
+            "task": "quotas.reset_ai_quotas",
+            "schedule": crontab(hour=settings.AI_QUOTA_RESET_HOUR, minute=15),
+        },
+        "sweep-stripe-events": {
+            "task": "payments.sweep_stripe_events",
+            "schedule": float(settings.STRIPE_EVENT_SWEEP_INTERVAL),
+        },
+    },
+)
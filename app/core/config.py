@@ -23,10 +23,82 @@ class Settings(BaseSettings):
     # Caching
     USE_CACHE: bool = True
     CACHE_TTL: int = 300  # 5 minutes default
+
+    # Background jobs (Celery). Broker/backend fall back to REDIS_URL.
+    CELERY_BROKER_URL: Optional[str] = None
+    CELERY_RESULT_BACKEND: Optional[str] = None
+    JOBS_EAGER: bool = False  # run jobs in-process (tests / local development)
+    JOBS_MAX_RETRIES: int = 3
+    JOBS_RETRY_BACKOFF_MAX: int = 600  # seconds
+    JOBS_STATUS_TTL: int = 60 * 60 * 24 * 3  # keep job records for 3 days
+    JOBS_IDEMPOTENCY_TTL: int = 60 * 60 * 24
+    JOBS_TRANSCRIPTION_CONCURRENCY: int = 2  # CPU bound (Whisper)
+    JOBS_LLM_CONCURRENCY: int = 16  # I/O bound (Gemini / feedback calls)
+    JOBS_DOCUMENTS_CONCURRENCY: int = 4  # CPU bound (certificate PDFs)
+
+    # Certificates (PDFs under MEDIA_ROOT/certificates)
+    CERTIFICATES_CACHE_MAX_AGE: int = 60 * 60 * 24 * 365  # issued PDFs never change
+    CERTIFICATES_BATCH_SIZE: int = 200  # certificates per bulk render job
+
+    # Dashboard statistics (precomputed counters + daily rollups)
+    STATS_RECONCILE_INTERVAL: int = 60 * 15  # seconds between recomputes from source
+    STATS_ROLLUP_HOUR: int = 0  # UTC hour at which yesterday is rolled up
+    STATS_COUNTER_SHARDS: int = 16  # rows per counter that concurrent writers spread their deltas over
+
+    # AI quota resets (app/tasks/quotas.py), once per calendar month
+    AI_QUOTA_RESET_HOUR: int = 0  # UTC hour of the daily run; only the first run in a new month changes anything
+    AI_QUOTA_RESET_CHUNK: int = 5000  # user ids per transaction
     
+    # N+1 guard: count SQL statements per request (always on under TESTING)
+    QUERY_BUDGET_ENABLED: bool = False
+    QUERY_BUDGET_PER_REQUEST: int = 30
+
+    # Per-request profiling (app/middleware/profiling.py): Server-Timing header and per-route histograms
+    REQUEST_PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # fraction of requests also run under the sampling profiler
+    PROFILING_TOKEN: str = ""  # requests with a matching X-Profile header are sampled; empty disables the header
+    PROFILING_INTERVAL: float = 0.005  # seconds between stack samples
+    PROFILING_DIR: str = "profiles"  # collapsed-stack files, one per sampled request
+
+    # Lesson access policy (per-user entitlements cached in Redis)
+    ACCESS_ENTITLEMENTS_TTL: int = 60 * 60  # invalidated on change; TTL only bounds missed writes
+
+    # In-process course/lesson/word catalog (app/services/content_catalog.py)
+    CONTENT_CATALOG_RECHECK: int = 5  # seconds between checks of the shared catalog version
+    CONTENT_CATALOG_TTL: int = 60  # full reload interval when Redis is unavailable
+    CONTENT_CATALOG_CHANGE_LOG: int = 500  # published change sets kept for incremental refresh
+    CONTENT_CATALOG_CONTENT_CACHE: int = 256  # lesson bodies kept for LLM context
+
+    # Full-text search (app/services/search)
+    SEARCH_MAX_BODY_CHARS: int = 20_000  # indexed text per document
+    SEARCH_MAX_TERMS: int = 8
+    VOCABULARY_FUZZY_MAX_DISTANCE: int = 2  # default edits for /words/suggest queries of 8+ characters
+
+    # Vocabulary reviews (app/services/spaced_repetition.py, app/crud/crud_word_review.py)
+    REVIEW_RELEARN_MINUTES: int = 10  # a forgotten word comes back after this long
+    REVIEW_MAX_INTERVAL_DAYS: int = 365
+    REVIEW_BATCH_MAX: int = 200  # reviews per POST /reviews/
+    REVIEW_QUEUE_TTL: int = 24 * 60 * 60  # cached due queues are rebuilt from the database at least this often
+
+    # AI multi-turn sessions (app/services/ai_session_store.py)
+    AI_SESSION_TTL: int = 60 * 60 * 24 * 7  # idle sessions expire after 7 days
+    AI_SESSION_MAX_MESSAGES: int = 500  # older messages are trimmed from the log
+
+    # Lazily built services (app/core/registry.py)
+    WARM_SERVICES_ON_STARTUP: bool = True  # build SDK clients and models in the background after startup
+
+    # Text-to-speech (app/services/tts_executor.py)
+    TTS_MAX_WORKERS: int = 8  # threads for blocking provider calls (gTTS HTTP, Google client)
+    TTS_SEGMENT_CHARS: int = 300  # replies are synthesized a sentence at a time; longer sentences are split at spaces
+    TTS_SEGMENTS_AHEAD: int = 3  # segments of one reply synthesized concurrently
+
     # Monitoring
     ENABLE_MONITORING: bool = True
     METRICS_ENDPOINT: str = "/metrics"
+    DB_STATS_INTERVAL: int = 300  # seconds between database statistics collections (app/db/stats.py)
+    DB_STATS_TOP_QUERIES: int = 10  # pg_stat_statements rows exported
+    DB_STATS_TOP_RELATIONS: int = 20  # largest tables and indexes exported
+    DB_STATS_LONG_QUERY_SECONDS: int = 60  # active queries older than this are reported
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -63,6 +135,8 @@ class Settings(BaseSettings):
     STRIPE_API_KEY: Optional[str] = None
     STRIPE_PUBLISHABLE_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
+    STRIPE_EVENT_SWEEP_INTERVAL: int = 60 * 5  # seconds between sweeps for stored events no job picked up
+    STRIPE_EVENT_LEASE: int = 60 * 10  # seconds before an event left "processing" by a dead worker is retried
 
     # Email
     SMTP_TLS: bool = True
@@ -84,6 +158,8 @@ class Settings(BaseSettings):
 
     # File Uploads
     UPLOAD_DIR: str = "uploads"
+    STATIC_FILES_DIR: str = "static"  # fonts, generated TTS audio
+    MEDIA_ROOT: str = "static"  # generated documents (certificates)
 
     @field_validator("ALLOWED_ORIGINS", "CORS_ORIGINS", mode='before')
     def assemble_origins(cls, v: Union[str, List[str]]) -> List[str]:
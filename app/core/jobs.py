@@ -0,0 +1,296 @@
+"""
+Durable background job helpers built on top of Celery.
+
+* ``JobStore`` keeps a small status record per job in Redis (with an
+  in-memory fallback, same as the AI session storage) so clients can poll
+  ``/jobs/{job_id}`` without touching the database.
+* ``JobTask`` is the Celery base class for all application tasks: it keeps the
+  status record in sync and retries failures with exponential backoff.
+* ``enqueue`` submits a task, de-duplicating on an idempotency key.
+
+Jobs created with a ``resource`` also publish progress events for it through
+``app.core.progress.progress_bus``.
+"""
+import asyncio
+import enum
+import json
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Coroutine, Dict, Generator, List, Optional, TypeVar
+
+from celery import Task
+from sqlalchemy.orm import Session
+
+from app.core.cache import redis_client
+from app.core.config import settings
+from app.core.progress import (
+    STAGE_DONE,
+    STAGE_FAILED,
+    STAGE_QUEUED,
+    STAGE_RETRYING,
+    progress_bus,
+)
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+JOB_PREFIX = "job"
+JOB_KEY_PREFIX = "job_key"
+JOB_OWNER_PREFIX = "job_owner"
+OWNER_INDEX_LIMIT = 200
+
+
+class JobState(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+class JobStore:
+    """Job status records keyed by job id, with an in-memory fallback."""
+
+    def __init__(self) -> None:
+        self._memory: Dict[str, Dict[str, Any]] = {}
+        self._memory_keys: Dict[str, str] = {}
+        self._memory_owners: Dict[int, List[str]] = {}
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{JOB_PREFIX}:{job_id}"
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = redis_client.get(self._job_key(job_id))
+            if raw:
+                return json.loads(raw)
+        except Exception:
+            pass
+        return self._memory.get(job_id)
+
+    def save(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        record["updated_at"] = _now_iso()
+        try:
+            redis_client.setex(
+                self._job_key(record["id"]),
+                settings.JOBS_STATUS_TTL,
+                json.dumps(record, default=str),
+            )
+        except Exception:
+            self._memory[record["id"]] = record
+        return record
+
+    def update(self, job_id: str, **fields: Any) -> Optional[Dict[str, Any]]:
+        record = self.get(job_id)
+        if record is None:
+            return None
+        record.update(fields)
+        return self.save(record)
+
+    def claim_key(self, key: str, job_id: str) -> Optional[str]:
+        """Bind ``key`` to ``job_id``. Returns the already-bound job id if the key was taken."""
+        redis_key = f"{JOB_KEY_PREFIX}:{key}"
+        try:
+            if redis_client.set(redis_key, job_id, nx=True, ex=settings.JOBS_IDEMPOTENCY_TTL):
+                return None
+            return redis_client.get(redis_key)
+        except Exception:
+            existing = self._memory_keys.get(key)
+            if existing:
+                return existing
+            self._memory_keys[key] = job_id
+            return None
+
+    def release_key(self, key: str) -> None:
+        try:
+            redis_client.delete(f"{JOB_KEY_PREFIX}:{key}")
+        except Exception:
+            pass
+        self._memory_keys.pop(key, None)
+
+    def add_to_owner(self, owner_id: int, job_id: str) -> None:
+        redis_key = f"{JOB_OWNER_PREFIX}:{owner_id}"
+        try:
+            pipe = redis_client.pipeline()
+            pipe.lpush(redis_key, job_id)
+            pipe.ltrim(redis_key, 0, OWNER_INDEX_LIMIT - 1)
+            pipe.expire(redis_key, settings.JOBS_STATUS_TTL)
+            pipe.execute()
+        except Exception:
+            jobs = self._memory_owners.setdefault(owner_id, [])
+            jobs.insert(0, job_id)
+            del jobs[OWNER_INDEX_LIMIT:]
+
+    def list_for_owner(self, owner_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        try:
+            job_ids = redis_client.lrange(f"{JOB_OWNER_PREFIX}:{owner_id}", 0, limit - 1)
+        except Exception:
+            job_ids = self._memory_owners.get(owner_id, [])[:limit]
+        records = []
+        for job_id in job_ids:
+            record = self.get(job_id)
+            if record:
+                records.append(record)
+        return records
+
+
+job_store = JobStore()
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine from a (sync) Celery task.
+
+    In eager mode the task may be executed from inside a running event loop
+    (an async endpoint), so the coroutine is handed to a helper thread.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+@contextmanager
+def job_session() -> Generator[Session, None, None]:
+    """A fresh DB session owned by the job (never reuse the request session)."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _publish(record: Optional[Dict[str, Any]], stage: str, **data: Any) -> None:
+    if not record or not record.get("resource"):
+        return
+    try:
+        progress_bus.publish(
+            record["resource"],
+            stage,
+            owner_id=record.get("owner_id"),
+            job_id=record["id"],
+            job=record.get("name"),
+            **data,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to publish progress for job {record.get('id')}: {e}")
+
+
+class JobTask(Task):
+    """Base task: retries with exponential backoff and mirrors state into ``job_store``.
+
+    ``progress_stage`` is published when the task starts; ``final_step`` says
+    whether success finishes the resource's pipeline (publishes ``done``).
+    """
+
+    abstract = True
+    autoretry_for = (Exception,)
+    max_retries = settings.JOBS_MAX_RETRIES
+    retry_backoff = True
+    retry_backoff_max = settings.JOBS_RETRY_BACKOFF_MAX
+    retry_jitter = True
+    progress_stage: Optional[str] = None
+    final_step: bool = True
+
+    def before_start(self, task_id, args, kwargs):
+        record = job_store.update(
+            task_id,
+            state=JobState.RUNNING.value,
+            attempts=self.request.retries + 1,
+            started_at=_now_iso(),
+        )
+        if self.progress_stage:
+            _publish(record, self.progress_stage)
+
+    def on_retry(self, exc, task_id, args, kwargs, einfo):
+        logger.warning(f"Job {self.name} [{task_id}] failed, retrying: {exc}")
+        record = job_store.update(task_id, state=JobState.RETRYING.value, error=str(exc))
+        _publish(record, STAGE_RETRYING, error=str(exc))
+
+    def on_success(self, retval, task_id, args, kwargs):
+        record = job_store.update(
+            task_id,
+            state=JobState.SUCCEEDED.value,
+            result=retval,
+            error=None,
+            finished_at=_now_iso(),
+        )
+        if self.final_step:
+            _publish(record, STAGE_DONE, result=retval)
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        logger.error(f"Job {self.name} [{task_id}] failed permanently: {exc}")
+        record = job_store.update(
+            task_id,
+            state=JobState.FAILED.value,
+            error=str(exc),
+            finished_at=_now_iso(),
+        )
+        # Let a retry by the client start a new job instead of getting this one back
+        if record and record.get("idempotency_key"):
+            job_store.release_key(record["idempotency_key"])
+        _publish(record, STAGE_FAILED, error=str(exc))
+
+
+def enqueue(
+    task: Task,
+    *args: Any,
+    idempotency_key: Optional[str] = None,
+    owner_id: Optional[int] = None,
+    resource: Optional[str] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """Submit ``task`` and return its job record.
+
+    If ``idempotency_key`` was already used (and has not expired), no new job
+    is created and the existing job record is returned instead.
+    """
+    job_id = uuid.uuid4().hex
+    if idempotency_key:
+        existing_id = job_store.claim_key(idempotency_key, job_id)
+        if existing_id:
+            existing = job_store.get(existing_id)
+            if existing:
+                return existing
+            # Stale key without a record: take it over
+            job_store.release_key(idempotency_key)
+            job_store.claim_key(idempotency_key, job_id)
+
+    record = job_store.save({
+        "id": job_id,
+        "name": task.name,
+        "state": JobState.QUEUED.value,
+        "owner_id": owner_id,
+        "resource": resource,
+        "idempotency_key": idempotency_key,
+        "attempts": 0,
+        "result": None,
+        "error": None,
+        "created_at": _now_iso(),
+    })
+    if owner_id is not None:
+        job_store.add_to_owner(owner_id, job_id)
+    _publish(record, STAGE_QUEUED)
+
+    try:
+        task.apply_async(args=args, kwargs=kwargs, task_id=job_id)
+    except Exception as e:
+        logger.error(f"Failed to enqueue {task.name}: {e}")
+        if idempotency_key:
+            job_store.release_key(idempotency_key)
+        failed = job_store.update(job_id, state=JobState.FAILED.value, error=str(e)) or record
+        _publish(failed, STAGE_FAILED, error=str(e))
+        return failed
+
+    return job_store.get(job_id) or record
@@ -1,3 +1,4 @@
+import asyncio
 import time
 import logging
 from typing import Dict, Any, Optional, Callable
@@ -31,6 +32,63 @@ ACTIVE_USERS = Gauge(
     'Number of active users in the last 5 minutes'
 )
 
+# Per-request breakdown (ProfilingMiddleware, settings.REQUEST_PROFILING_ENABLED), labelled by route template
+PROFILED_REQUEST_LATENCY = Histogram(
+    'http_request_profiled_duration_seconds',
+    'Latency of profiled requests',
+    ['method', 'endpoint']
+)
+
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_seconds',
+    'Time spent in SQL statements per request',
+    ['method', 'endpoint']
+)
+
+REQUEST_DB_STATEMENTS = Histogram(
+    'http_request_db_statements',
+    'SQL statements per request',
+    ['method', 'endpoint'],
+    buckets=(0, 1, 2, 5, 10, 20, 30, 50, 100, 200, 500)
+)
+
+REQUEST_REDIS_TIME = Histogram(
+    'http_request_redis_seconds',
+    'Time spent in Redis commands per request',
+    ['method', 'endpoint']
+)
+
+REQUEST_AI_TIME = Histogram(
+    'http_request_ai_seconds',
+    'Time spent waiting for AI providers per request',
+    ['method', 'endpoint'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+
+# Database statistics (log_database_metrics)
+DB_SIZE = Gauge('db_size_bytes', 'Size of the database')
+DB_SQLITE_PAGES = Gauge('db_sqlite_pages', 'SQLite pages in the database file', ['kind'])
+DB_SQLITE_WAL_SIZE = Gauge('db_sqlite_wal_bytes', 'Size of the SQLite write-ahead log')
+DB_CACHE_HIT_RATIO = Gauge('db_cache_hit_ratio', 'Share of block reads served from shared buffers')
+DB_CONNECTIONS = Gauge('db_connections', 'Connections to the database by state', ['state'])
+DB_LONG_RUNNING_QUERIES = Gauge('db_long_running_queries', 'Active queries older than DB_STATS_LONG_QUERY_SECONDS')
+DB_TABLE_SIZE = Gauge('db_table_bytes', 'Size of the largest tables, indexes and TOAST included', ['table'])
+DB_INDEX_SIZE = Gauge('db_index_bytes', 'Size of the largest indexes', ['index'])
+DB_STATEMENT_TIME = Gauge('db_statement_total_seconds', 'Total time of the top pg_stat_statements entries', ['queryid'])
+DB_STATEMENT_MEAN_TIME = Gauge('db_statement_mean_seconds', 'Mean time of the top pg_stat_statements entries', ['queryid'])
+DB_MISSING_FK_INDEX = Gauge('db_missing_fk_index', '1 if a hot foreign key column has no index', ['table', 'column'])
+
+# Stripe webhook events (app.services.stripe_events)
+STRIPE_EVENTS_FAILED = Counter(
+    'stripe_events_failed_total', 'Stripe events marked failed after using up their retries', ['type']
+)
+
+def route_template(request: Request) -> str:
+    """The matched route's path template (``/items/{id}``), or the raw path if no route matched."""
+    route = request.scope.get("route")
+    return getattr(route, "path", request.url.path)
+
+
 # In-memory storage for active users (in a production environment, use Redis)
 active_users: Dict[str, float] = {}
 
@@ -54,7 +112,7 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         process_time = time.time() - start_time
         
         # Update metrics
-        endpoint = request.url.path
+        endpoint = route_template(request)
         REQUEST_COUNT.labels(
             method=request.method,
             endpoint=endpoint,
@@ -132,33 +190,60 @@ def get_metrics() -> bytes:
     ACTIVE_USERS.set(len(active_users))
     return generate_latest(REGISTRY)
 
-def log_database_metrics():
-    """Log database performance metrics"""
-    # This would be implemented to query database-specific metrics
-    # For example, for PostgreSQL:
-    # - Number of connections
-    # - Cache hit ratio
-    # - Long-running queries
-    # - Table sizes
-    pass
-
-# Schedule periodic tasks
-if settings.ENABLE_MONITORING:
-    import threading
-    from datetime import datetime, timedelta
-    
-    def periodic_metrics():
-        """Periodically collect and log metrics"""
-        while True:
-            try:
-                log_database_metrics()
-                # Update other metrics here
-            except Exception as e:
-                logger.error(f"Error collecting metrics: {str(e)}")
-            
-            # Run every 5 minutes
-            time.sleep(300)
-    
-    # Start the metrics collection in a background thread
-    metrics_thread = threading.Thread(target=periodic_metrics, daemon=True)
-    metrics_thread.start()
+def log_database_metrics(engine=None) -> Dict[str, Any]:
+    """Collect database statistics (app/db/stats.py) into the db_* gauges and log what needs attention"""
+    from app.db import stats as db_stats
+
+    if engine is None:
+        from app.db.session import engine
+    stats = db_stats.collect(engine)
+
+    if stats.get("size_bytes") is not None:
+        DB_SIZE.set(stats["size_bytes"])
+    if stats["dialect"] == "sqlite":
+        DB_SQLITE_PAGES.labels(kind="total").set(stats["page_count"])
+        DB_SQLITE_PAGES.labels(kind="free").set(stats["freelist_count"])
+        DB_SQLITE_WAL_SIZE.set(stats["wal_bytes"])
+    elif stats["dialect"] == "postgresql":
+        if stats["cache_hit_ratio"] is not None:
+            DB_CACHE_HIT_RATIO.set(stats["cache_hit_ratio"])
+        DB_CONNECTIONS.clear()
+        for state, count in stats["connections"].items():
+            DB_CONNECTIONS.labels(state=state).set(count)
+        DB_LONG_RUNNING_QUERIES.set(len(stats["long_running_queries"]))
+        for query in stats["long_running_queries"]:
+            logger.warning(f"Query running for {query['seconds']:.0f}s (pid {query['pid']}, {query['state']}): {query['query']}")
+        DB_TABLE_SIZE.clear()
+        for table, size in stats["tables"].items():
+            DB_TABLE_SIZE.labels(table=table).set(size)
+        DB_INDEX_SIZE.clear()
+        for index, size in stats["indexes"].items():
+            DB_INDEX_SIZE.labels(index=index).set(size)
+        DB_STATEMENT_TIME.clear()
+        DB_STATEMENT_MEAN_TIME.clear()
+        for statement in stats["top_statements"] or []:
+            queryid = str(statement["queryid"])
+            DB_STATEMENT_TIME.labels(queryid=queryid).set(statement["total_ms"] / 1000)
+            DB_STATEMENT_MEAN_TIME.labels(queryid=queryid).set(statement["mean_ms"] / 1000)
+        if stats["top_statements"]:
+            top = stats["top_statements"][0]
+            logger.info(f"Slowest statement in total ({top['total_ms'] / 1000:.1f}s over {top['calls']} calls, "
+                        f"queryid {top['queryid']}): {top['query'][:200]}")
+
+    missing = set(stats["missing_fk_indexes"])
+    for table, column in db_stats.HOT_FOREIGN_KEYS:
+        DB_MISSING_FK_INDEX.labels(table=table, column=column).set(1 if (table, column) in missing else 0)
+    for table, column in sorted(missing):
+        logger.warning(f"No index on {table}.{column}: per-user queries on {table} scan the whole table")
+    return stats
+
+
+async def periodic_metrics(interval: Optional[float] = None) -> None:
+    """Collect database metrics every ``DB_STATS_INTERVAL`` seconds until cancelled (started in the app lifespan)"""
+    interval = settings.DB_STATS_INTERVAL if interval is None else interval
+    while True:
+        try:
+            await asyncio.to_thread(log_database_metrics)
+        except Exception as e:
+            logger.error(f"Error collecting metrics: {str(e)}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,228 @@
+"""
+Per-request profiling: where a request spent its time.
+
+While a ``RequestProfile`` is active (``activate``, used by
+``ProfilingMiddleware`` when ``settings.REQUEST_PROFILING_ENABLED``) it
+collects, per kind:
+
+- ``db``: SQL statements and their time (SQLAlchemy cursor events);
+- ``redis``: Redis commands and pipelines (``instrument_redis`` wraps the
+  redis-py client);
+- ``ai``: outbound AI provider calls (``httpx_event_hooks`` for httpx
+  clients, ``track`` / ``timed_stream`` around SDK calls).
+
+Outside a profiled request every hook is a single ContextVar lookup.
+
+``StackSampler`` is the sampling profiler behind the middleware's sampled
+requests: it writes collapsed stacks (``frame;frame;frame count``), which
+flamegraph.pl, speedscope and inferno read directly.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+T = TypeVar("T")
+
+KINDS = ("db", "redis", "ai")
+
+
+@dataclass
+class Timing:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class RequestProfile:
+    timings: Dict[str, Timing] = field(default_factory=lambda: {kind: Timing() for kind in KINDS})
+
+    def add(self, kind: str, seconds: float, calls: int = 1) -> None:
+        timing = self.timings.setdefault(kind, Timing())
+        timing.calls += calls
+        timing.seconds += seconds
+
+    def server_timing(self, total: float) -> str:
+        """``Server-Timing`` header value (durations in milliseconds)."""
+        metrics = [
+            f'{kind};dur={timing.seconds * 1000:.1f};desc="{timing.calls} calls"'
+            for kind, timing in self.timings.items() if timing.calls
+        ]
+        metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+@contextmanager
+def activate(profile: RequestProfile) -> Iterator[RequestProfile]:
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def record(kind: str, seconds: float, calls: int = 1) -> None:
+    profile = _current.get()
+    if profile is not None:
+        profile.add(kind, seconds, calls)
+
+
+@contextmanager
+def track(kind: str, calls: int = 1) -> Iterator[None]:
+    """Time the block as ``calls`` calls of ``kind`` (failures included)."""
+    if _current.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, time.perf_counter() - started, calls)
+
+
+async def timed_stream(stream: AsyncIterator[T], kind: str = "ai") -> AsyncIterator[T]:
+    """Re-yield ``stream``, counting only the time spent waiting for its items as one call."""
+    iterator = stream.__aiter__()
+    calls = 1
+    while True:
+        with track(kind, calls):
+            try:
+                item = await iterator.__anext__()
+            except StopAsyncIteration:
+                return
+        calls = 0
+        yield item
+
+
+# SQL: time every statement from cursor execute to its return (see QueryCounter for plain counts)
+@event.listens_for(Engine, "before_cursor_execute")
+def _statement_started(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _statement_finished(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("profile_started")
+    if started:
+        record("db", time.perf_counter() - started.pop())
+
+
+@event.listens_for(Engine, "handle_error")
+def _statement_failed(exception_context):
+    # A failing statement never reaches after_cursor_execute: count it here so its start is not left behind
+    conn = exception_context.connection
+    if conn is None or exception_context.execution_context is None:
+        return  # failed before a statement was sent
+    started = conn.info.get("profile_started")
+    if started:
+        record("db", time.perf_counter() - started.pop())
+
+
+def httpx_event_hooks(kind: str = "ai") -> Dict[str, list]:
+    """``event_hooks`` for an ``httpx.AsyncClient`` whose requests count as ``kind`` calls."""
+    async def on_request(request) -> None:
+        request.extensions["profile_started"] = time.perf_counter()
+
+    async def on_response(response) -> None:
+        started = response.request.extensions.get("profile_started")
+        if started is not None:
+            record(kind, time.perf_counter() - started)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+_redis_instrumented = False
+
+
+def instrument_redis() -> None:
+    """Count the commands of every redis-py client (and pipelines as one call each); idempotent."""
+    global _redis_instrumented
+    if _redis_instrumented:
+        return
+    import redis
+    from redis.client import Pipeline
+
+    def timed(method):
+        def wrapper(*args, **kwargs):
+            with track("redis"):
+                return method(*args, **kwargs)
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    redis.Redis.execute_command = timed(redis.Redis.execute_command)
+    Pipeline.execute = timed(Pipeline.execute)
+    _redis_instrumented = True
+
+
+# Sampling profiler
+_IDLE_FRAMES = {
+    ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock"), ("queue.py", "get"),
+    ("selectors.py", "select"),
+}
+_ROOT = os.getcwd() + os.sep
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(_ROOT):
+        filename = filename[len(_ROOT):]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+
+class StackSampler:
+    """
+    Samples the Python stack of every busy thread each ``interval`` seconds
+    while entered. Threads parked in a wait (idle pool workers, the event
+    loop in ``select``) are skipped, but other requests running at the same
+    time are sampled too: profile on a quiet instance, or read with that in
+    mind.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, daemon=True, name="stack-sampler")
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == me or _idle(frame):
+                    continue
+                names = []
+                while frame is not None:
+                    names.append(_frame_name(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
@@ -0,0 +1,156 @@
+"""
+Progress events for background processing (homework grading, video analysis).
+
+Processing code calls ``progress_bus.publish(resource, stage)``. The last event
+per resource is cached (Redis, with an in-memory fallback) so status reads
+never touch the database, and every event is fanned out to subscribers over
+Redis pub/sub (cross-process: Celery workers -> API workers) or, when Redis is
+unavailable, to in-process asyncio queues.
+
+Resources are strings such as ``homework_submission:42`` or
+``video_analysis:7``.
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.cache import get_async_redis, redis_client
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_PREFIX = "progress"
+PROGRESS_TTL = 60 * 60 * 24
+
+# Stages published by the job pipeline
+STAGE_QUEUED = "queued"
+STAGE_TRANSCRIBING = "transcribing"
+STAGE_GRADING = "grading"
+STAGE_ANALYZING = "analyzing"
+STAGE_RETRYING = "retrying"
+STAGE_DONE = "done"
+STAGE_FAILED = "failed"
+TERMINAL_STAGES = {STAGE_DONE, STAGE_FAILED}
+
+
+def _channel(resource: str) -> str:
+    return f"{PROGRESS_PREFIX}:{resource}"
+
+
+class ProgressBus:
+    """Publish/subscribe for progress events with a last-state cache."""
+
+    def __init__(self) -> None:
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def publish(
+        self,
+        resource: str,
+        stage: str,
+        *,
+        owner_id: Optional[int] = None,
+        job_id: Optional[str] = None,
+        **data: Any,
+    ) -> Dict[str, Any]:
+        previous = self.last(resource) or {}
+        event = {
+            "resource": resource,
+            "stage": stage,
+            "owner_id": owner_id if owner_id is not None else previous.get("owner_id"),
+            "job_id": job_id,
+            "data": data or {},
+            "at": datetime.utcnow().isoformat() + "Z",
+        }
+        payload = json.dumps(event, default=str)
+        try:
+            pipe = redis_client.pipeline()
+            pipe.setex(_channel(resource), PROGRESS_TTL, payload)
+            pipe.publish(_channel(resource), payload)
+            pipe.execute()
+        except Exception:
+            # Redis unavailable -> keep state and deliver in this process only
+            self._last[resource] = event
+            self._notify_local(resource, event)
+        return event
+
+    def last(self, resource: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = redis_client.get(_channel(resource))
+            if raw:
+                return json.loads(raw)
+        except Exception:
+            pass
+        return self._last.get(resource)
+
+    def _notify_local(self, resource: str, event: Dict[str, Any]) -> None:
+        for loop, queue in list(self._subscribers.get(resource, [])):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Subscriber's loop is closed
+                self._unsubscribe_local(resource, loop, queue)
+
+    def _unsubscribe_local(self, resource: str, loop, queue) -> None:
+        subs = self._subscribers.get(resource, [])
+        if (loop, queue) in subs:
+            subs.remove((loop, queue))
+        if not subs:
+            self._subscribers.pop(resource, None)
+
+    async def _redis_subscribe(self, resource: str):
+        try:
+            client = get_async_redis()
+            pubsub = client.pubsub()
+            await pubsub.subscribe(_channel(resource))
+            return client, pubsub
+        except Exception:
+            return None, None
+
+    async def subscribe(self, resource: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Yield the cached state, then live events until a terminal stage.
+
+        ``None`` is yielded every ``heartbeat`` seconds without events so
+        transports can send keep-alives.
+        """
+        # Subscribe before reading the cached state so no event is missed in between
+        client, pubsub = await self._redis_subscribe(resource)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        if pubsub is None:
+            self._subscribers.setdefault(resource, []).append((loop, queue))
+
+        async def _next_event() -> Optional[Dict[str, Any]]:
+            if pubsub is not None:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat)
+                return json.loads(message["data"]) if message else None
+            try:
+                return await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                return None
+
+        try:
+            last = self.last(resource)
+            if last:
+                yield last
+                if last["stage"] in TERMINAL_STAGES:
+                    return
+            while True:
+                event = await _next_event()
+                yield event
+                if event and event["stage"] in TERMINAL_STAGES:
+                    return
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.unsubscribe(_channel(resource))
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+            else:
+                self._unsubscribe_local(resource, loop, queue)
+
+
+progress_bus = ProgressBus()
@@ -0,0 +1,142 @@
+"""
+Lazily constructed services.
+
+Cloud SDK clients, ML models and heavy third-party modules (torch via
+whisper, the Gemini and Stripe SDKs) are registered here with a provider and
+built on first use, so importing the application - tests, CLI scripts,
+Celery workers - does not pay for them. A serving process resolves the ones
+it needs in ``lifespan`` (``services.warm``) so the first request does not
+either.
+
+``services.lazy(name, provider)`` returns a proxy that stands in for the
+instance in module globals (``from app.services.tts_service import
+tts_service`` keeps working); ``lazy_module(name)`` does the same for a
+module import.
+"""
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    def __init__(self) -> None:
+        self._providers: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._timings: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, provider: Callable[[], Any]) -> None:
+        with self._lock:
+            self._providers[name] = provider
+            self._instances.pop(name, None)
+
+    def lazy(self, name: str, provider: Callable[[], Any]) -> "LazyService":
+        self.register(name, provider)
+        return LazyService(self, name)
+
+    def get(self, name: str) -> Any:
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        with self._lock:  # one provider call even when threads race for it
+            if name not in self._instances:
+                if name not in self._providers:
+                    raise KeyError(f"Unknown service: {name}")
+                started = time.perf_counter()
+                self._instances[name] = self._providers[name]()
+                self._timings[name] = time.perf_counter() - started
+                logger.info("Service %s ready in %.2fs", name, self._timings[name])
+            return self._instances[name]
+
+    def set(self, name: str, instance: Any) -> None:
+        """Use ``instance`` for ``name`` (tests, or a client built elsewhere)."""
+        with self._lock:
+            self._instances[name] = instance
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Forget built instances so they are constructed again on next use."""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+    def registered(self, name: str) -> bool:
+        return name in self._providers
+
+    def resolved(self, name: str) -> bool:
+        return name in self._instances
+
+    def warm(self, *names: str) -> Dict[str, float]:
+        """Build ``names`` (all registered services by default); failures are logged, not raised."""
+        for name in names or list(self._providers):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.warning(f"Service {name} failed to start: {e}")
+        return dict(self._timings)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            name: {"resolved": name in self._instances, "seconds": round(self._timings.get(name, 0.0), 3)}
+            for name in sorted(self._providers)
+        }
+
+
+class LazyService:
+    """Stand-in for a registered service; attribute access, calls and truth tests build it first."""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str) -> None:
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def _resolve(self) -> Any:
+        return self._registry.get(self._name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._resolve(), attr, value)
+
+    def __delattr__(self, attr: str) -> None:
+        delattr(self._resolve(), attr)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __bool__(self) -> bool:
+        return bool(self._resolve())
+
+    def __repr__(self) -> str:
+        state = "resolved" if self._registry.resolved(self._name) else "not built"
+        return f"<LazyService {self._name} ({state})>"
+
+
+services = ServiceRegistry()
+
+
+def lazy_module(name: str, setup: Optional[Callable[[Any], None]] = None) -> LazyService:
+    """
+    ``import name`` on first attribute access, then ``setup(module)`` (e.g.
+    to set an API key). Modules are registered once; later calls for the same
+    module share the first proxy and its ``setup``.
+    """
+    key = f"module:{name}"
+    if services.registered(key):
+        return LazyService(services, key)
+
+    def _import() -> Any:
+        module = importlib.import_module(name)
+        if setup is not None:
+            setup(module)
+        return module
+
+    return services.lazy(key, _import)
@@ -8,7 +8,7 @@ def normalize_text(text: str) -> str:
     text = text.lower().strip()
     # Simple replacements for Uzbek specific characters for consistency
     replacements = {
-        'ʻ': "'", '`': "'", 'ʼ': "'",
+        'ʻ': "'", '`': "'", 'ʼ': "'", '‘': "'", '’': "'",
         'ғ': 'gʻ',
         'ў': 'oʻ',
         'ҳ': 'h',
@@ -42,6 +42,30 @@ def levenshtein_distance(s1: str, s2: str) -> int:
 
     return previous_row[-1]
 
+def bounded_levenshtein(s1: str, s2: str, limit: int) -> int:
+    """Levenshtein distance, or ``limit + 1`` as soon as it is known to exceed ``limit``."""
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s1) - len(s2) > limit:
+        return limit + 1
+    if len(s2) == 0:
+        return len(s1)
+
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        row_min = i + 1
+        for j, c2 in enumerate(s2):
+            cost = min(previous_row[j + 1] + 1, current_row[j] + 1, previous_row[j] + (c1 != c2))
+            current_row.append(cost)
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return limit + 1
+        previous_row = current_row
+
+    return min(previous_row[-1], limit + 1)
+
 def semantic_similarity(text1: str, text2: str) -> float:
     """Calculate a simple similarity score based on Levenshtein distance."""
     if not text1 or not text2:
@@ -14,7 +14,12 @@ from . import crud_subscription as subscription
 
 from .crud_word import word
 from .crud_notification import notification
+from .crud_word_review import word_review
+from .crud_content_lesson import content_lesson
+from .crud_stripe_event import stripe_event
 from . import crud_statistics as statistics
+from .crud_platform_stats import platform_stats
+from app.services.search import search_index  # keeps the search index in step with writes
 from .crud_user_ai_usage import user_ai_usage
 from .crud_payment_verification import payment_verification
 from .crud_role import CRUDRole
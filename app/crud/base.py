@@ -1,8 +1,12 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query, Session
 
 from app.db.base_class import Base
 
@@ -11,6 +15,45 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+class InvalidCursorError(ValueError):
+    """The pagination cursor is malformed or belongs to a different listing."""
+
+
+def encode_cursor(sort_name: str, values: Sequence[Any]) -> str:
+    payload = json.dumps({"s": sort_name, "k": list(values)}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_name: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["k"]
+    except Exception:
+        raise InvalidCursorError("Invalid cursor")
+    if payload.get("s") != sort_name or not isinstance(values, list):
+        raise InvalidCursorError("Cursor does not match this listing")
+    return values
+
+
+def _cursor_value(column, raw: Any) -> Any:
+    """Convert a JSON cursor value back to the column's Python type."""
+    if raw is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return raw
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(raw)
+        if python_type is date:
+            return date.fromisoformat(raw)
+        return python_type(raw)
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
@@ -21,13 +64,64 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    def get(self, db: Session, id: Any, *, profile: Sequence[Any] = ()) -> Optional[ModelType]:
+        """``profile``: eager-loading options from ``app.crud.loaders``."""
+        return db.query(self.model).options(*profile).filter(self.model.id == id).first()
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self, db: Session, *, skip: int = 0, limit: int = 100, profile: Sequence[Any] = ()
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return db.query(self.model).options(*profile).offset(skip).limit(limit).all()
+
+    def paginate(
+        self,
+        query: Query,
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort_column: Any = None,
+        descending: bool = False,
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Keyset ("seek") pagination of ``query`` ordered by (``sort_column``, id).
+
+        Unlike OFFSET, the cost of a page does not grow with its depth as long
+        as an index covers the filter columns followed by the sort key.
+        Returns the page and an opaque cursor for the next one (``None`` on
+        the last page).
+        """
+        id_column = self.model.id
+        columns = [id_column] if sort_column is None or sort_column is id_column else [sort_column, id_column]
+        sort_name = ",".join(f"{c.key}:{'desc' if descending else 'asc'}" for c in columns)
+
+        if cursor:
+            raw_values = decode_cursor(cursor, sort_name)
+            if len(raw_values) != len(columns):
+                raise InvalidCursorError("Invalid cursor")
+            values = [_cursor_value(c, v) for c, v in zip(columns, raw_values)]
+            # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y), spelled out for portability
+            after = (lambda c, v: c < v) if descending else (lambda c, v: c > v)
+            conditions = []
+            for i, (column, value) in enumerate(zip(columns, values)):
+                equal_prefix = [columns[j] == values[j] for j in range(i)]
+                conditions.append(and_(*equal_prefix, after(column, value)))
+            query = query.filter(or_(*conditions))
+
+        order = [c.desc() if descending else c.asc() for c in columns]
+        rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(sort_name, [getattr(last, c.key) for c in columns])
+        return rows, next_cursor
+
+    def get_page(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset-paginated counterpart of ``get_multi`` (ordered by id)."""
+        return self.paginate(db.query(self.model), limit=limit, cursor=cursor)
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
@@ -5,7 +5,6 @@ import uuid
 from app.crud.base import CRUDBase
 from app.models import Certificate, User
 from app.schemas import CertificateCreate, CertificateUpdate
-from app.utils.pdf_generator import create_certificate_pdf
 
 class CRUDCertificate(CRUDBase[Certificate, CertificateCreate, CertificateUpdate]):
     def get_multi_by_user(
@@ -24,29 +23,24 @@ class CRUDCertificate(CRUDBase[Certificate, CertificateCreate, CertificateUpdate
 
     def create_with_pdf(self, db: Session, *, obj_in: CertificateCreate, user: User) -> Certificate:
         """
-        Create a certificate record and generate the PDF file.
+        Create a certificate record and queue rendering of its PDF.
+
+        The PDF is rendered by the ``certificates.render_certificate`` job;
+        ``file_path`` is set once it is stored.
         """
-        # 1. Create the certificate record to get an ID
-        verification_code = str(uuid.uuid4())
-        db_cert = self.model(**obj_in.model_dump(), verification_code=verification_code)
+        from app.tasks.certificates import schedule_render
+
+        verification_code = obj_in.verification_code or str(uuid.uuid4())
+        db_cert = self.model(
+            **obj_in.model_dump(exclude={"verification_code"}),
+            verification_code=verification_code,
+        )
         db.add(db_cert)
         db.commit()
         db.refresh(db_cert)
 
-        # 2. Generate PDF
-        pdf_path = create_certificate_pdf(
-            user_name=user.full_name or user.username,
-            course_name=obj_in.course_name,
-            level_completed=obj_in.level_completed,
-            certificate_id=db_cert.id,
-            issue_date=db_cert.issue_date.strftime("%Y-%m-%d"),
-            verification_code=verification_code
-        )
-
-        # 3. Update the certificate record with the PDF path
-        update_data = CertificateUpdate(file_path=pdf_path)
-        db_cert = self.update(db=db, db_obj=db_cert, obj_in=update_data)
-
+        schedule_render(db_cert)
+        db.refresh(db_cert)
         return db_cert
 
 certificate = CRUDCertificate(Certificate)
@@ -0,0 +1,254 @@
+"""
+Lessons managed through ``/content/lessons``.
+
+One row per lesson: ``title`` and ``position`` are columns and every other
+field of the lesson document lives in the ``data`` JSON column, so reading or
+editing a lesson touches only its row. ``version`` is the mapper's version
+column: each write bumps it and is conditional on the version that was read,
+and writes given the client's ``expected_version`` (its ``If-Match``) raise
+``ContentVersionConflict`` instead of overwriting someone else's edit.
+
+Exports iterate the rows in ``position`` order a batch at a time, and
+``LessonImport`` replaces every lesson inside one savepoint, inserting a chunk
+of rows at a time as documents arrive. Documents without an id are stored
+under a negative placeholder id and numbered after the highest explicit id
+once the whole import has been read, so an id given later in the stream can
+never collide with one assigned earlier.
+"""
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import delete, func, insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.models.content_lesson import ContentLesson
+
+logger = logging.getLogger(__name__)
+
+LEGACY_LESSONS_JSON = Path("uploads/content/lessons.json")
+IMPORT_CHUNK_SIZE = 500
+EXPORT_BATCH_SIZE = 500
+_RESERVED = ("id", "title", "version")
+_TITLE_LENGTH = ContentLesson.__table__.c.title.type.length
+
+
+class ContentVersionConflict(Exception):
+    """The lesson is no longer at the version the client edited."""
+
+    def __init__(self, lesson: ContentLesson):
+        super().__init__(f"Lesson {lesson.id} is at version {lesson.version}")
+        self.lesson = lesson
+
+
+def _title(value: Any, where: str) -> str:
+    title = "" if value is None else str(value)
+    if len(title) > _TITLE_LENGTH:
+        raise ValueError(f"{where}.title is longer than {_TITLE_LENGTH} characters")
+    return title
+
+
+def _data(document: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in document.items() if key not in _RESERVED}
+
+
+def _sync_id_sequence(db: Session) -> None:
+    """After inserting explicit ids, move the PostgreSQL sequence past them (SQLite uses max(id) + 1)."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(
+            "SELECT setval(pg_get_serial_sequence('content_lessons', 'id'), "
+            "COALESCE((SELECT MAX(id) FROM content_lessons), 0) + 1, false)"
+        ))
+
+
+class LessonImport:
+    """Replace all lessons with a stream of documents: ``add`` each one, then ``finish`` (or ``abort``)."""
+
+    def __init__(self, db: Session, chunk_size: Optional[int] = None):
+        self.db, self.chunk_size = db, chunk_size or IMPORT_CHUNK_SIZE
+        self.count = 0
+        self._unnumbered = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._savepoint = db.begin_nested()
+        db.execute(delete(ContentLesson))
+
+    def add(self, document: Any) -> None:
+        where = f"lessons[{self.count}]"
+        if not isinstance(document, dict):
+            raise ValueError(f"{where} must be an object")
+        now = datetime.utcnow()
+        row = {
+            "position": self.count, "title": _title(document.get("title"), where), "data": _data(document),
+            "version": 1, "created_at": now, "updated_at": now,
+        }
+        if document.get("id") is not None:
+            try:
+                row["id"] = int(document["id"])
+            except (TypeError, ValueError):
+                raise ValueError(f"{where}.id must be an integer")
+            if row["id"] < 1:
+                raise ValueError(f"{where}.id must be positive")
+        else:
+            self._unnumbered += 1
+            row["id"] = -self._unnumbered  # numbered in finish()
+        self._pending.append(row)
+        self.count += 1
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        try:
+            self.db.execute(insert(ContentLesson), rows)
+        except IntegrityError:
+            raise ValueError("Duplicate lesson id in import")
+
+    def _number_placeholders(self) -> None:
+        """Give rows without an id the ids after the highest explicit one, in import order."""
+        if self._unnumbered:
+            highest = self.db.scalar(select(func.coalesce(func.max(ContentLesson.id), 0)).where(ContentLesson.id > 0))
+            self.db.execute(
+                update(ContentLesson)
+                .where(ContentLesson.id < 0)
+                .values(id=highest - ContentLesson.id)
+                .execution_options(synchronize_session=False)
+            )
+        _sync_id_sequence(self.db)
+
+    def finish(self) -> int:
+        """Insert what is left and commit; returns the number of lessons imported."""
+        self.flush()
+        self._number_placeholders()
+        self._savepoint.commit()
+        self.db.commit()
+        return self.count
+
+    def abort(self) -> None:
+        """Roll back to the lessons stored before the import."""
+        if self._savepoint.is_active:
+            self._savepoint.rollback()
+
+
+class CRUDContentLesson:
+    def get(self, db: Session, lesson_id: int) -> Optional[ContentLesson]:
+        return db.get(ContentLesson, lesson_id)
+
+    def get_multi(self, db: Session, *, skip: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return list(self.iter_documents(db, skip=skip, limit=limit))
+
+    def count(self, db: Session) -> int:
+        return db.scalar(select(func.count()).select_from(ContentLesson))
+
+    def iter_documents(
+        self, db: Session, *, skip: int = 0, limit: Optional[int] = None, batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Lesson documents in ``position`` order, fetched ``batch_size`` rows at a time."""
+        stmt = (
+            select(ContentLesson.id, ContentLesson.title, ContentLesson.version, ContentLesson.data)
+            .order_by(ContentLesson.position, ContentLesson.id)
+            .offset(skip)
+            .limit(limit)
+            .execution_options(yield_per=batch_size)
+        )
+        for lesson_id, title, version, data in db.execute(stmt):
+            yield {**data, "id": lesson_id, "title": title, "version": version}
+
+    def create(self, db: Session, *, document: Dict[str, Any]) -> ContentLesson:
+        position = db.scalar(select(func.coalesce(func.max(ContentLesson.position), -1) + 1))
+        lesson = ContentLesson(position=position, title=_title(document.get("title"), "lesson"), data=_data(document))
+        db.add(lesson)
+        db.commit()
+        db.refresh(lesson)
+        return lesson
+
+    def _check(self, lesson: ContentLesson, expected_version: Optional[int]) -> None:
+        if expected_version is not None and lesson.version != expected_version:
+            raise ContentVersionConflict(lesson)
+
+    def _commit(self, db: Session, lesson_id: int) -> None:
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            current = self.get(db, lesson_id)
+            if current is None:
+                raise LookupError(lesson_id)
+            raise ContentVersionConflict(current)
+
+    def update(
+        self, db: Session, *, lesson_id: int, document: Dict[str, Any], expected_version: Optional[int] = None,
+        partial: bool = False,
+    ) -> Optional[ContentLesson]:
+        """Replace (or with ``partial``, merge into) a lesson; None if it does not exist."""
+        lesson = self.get(db, lesson_id)
+        if lesson is None:
+            return None
+        self._check(lesson, expected_version)
+        if partial:
+            if "title" in document:
+                lesson.title = _title(document["title"], "lesson")
+            lesson.data = {**lesson.data, **_data(document)}
+        else:
+            lesson.title = _title(document.get("title"), "lesson")
+            lesson.data = _data(document)
+        try:
+            self._commit(db, lesson_id)
+        except LookupError:
+            return None
+        return lesson
+
+    def delete(
+        self, db: Session, *, lesson_id: int, expected_version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Delete a lesson; returns its last document, or None if it does not exist."""
+        lesson = self.get(db, lesson_id)
+        if lesson is None:
+            return None
+        self._check(lesson, expected_version)
+        document = lesson.to_dict()
+        db.delete(lesson)
+        try:
+            self._commit(db, lesson_id)
+        except LookupError:
+            return None
+        return document
+
+    def start_import(self, db: Session, *, chunk_size: Optional[int] = None) -> LessonImport:
+        return LessonImport(db, chunk_size)
+
+    def import_legacy_file(self, db: Session, path: Path = LEGACY_LESSONS_JSON) -> int:
+        """
+        One-off move of a ``lessons.json`` written before the table existed.
+        Only runs while the table is empty; the file is renamed to
+        ``lessons.json.imported`` afterwards.
+        """
+        if not path.exists() or self.count(db):
+            return 0
+        try:
+            lessons = json.loads(path.read_text(encoding="utf-8")).get("lessons") or []
+        except (ValueError, AttributeError) as e:
+            logger.warning("Skipping %s: %s", path, e)
+            return 0
+        if not lessons:
+            return 0
+        importer = self.start_import(db)
+        try:
+            for document in lessons:
+                importer.add(document)
+            count = importer.finish()
+        except ValueError as e:
+            importer.abort()
+            logger.warning("Skipping %s: %s", path, e)
+            return 0
+        path.replace(path.with_name(path.name + ".imported"))
+        logger.info("Imported %d lessons from %s", count, path)
+        return count
+
+
+content_lesson = CRUDContentLesson()
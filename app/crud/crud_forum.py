@@ -1,7 +1,8 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.crud import loaders
 from app.crud.base import CRUDBase
 from app.models.forum import ForumCategory, ForumTopic, ForumPost
 from app.models.user import User
@@ -46,6 +47,18 @@ class CRUDForumTopic(CRUDBase[ForumTopic, ForumTopicCreate, ForumTopicUpdate]):
     def get_multi_by_category(self, db: Session, *, category_id: int, skip: int = 0, limit: int = 100) -> List[ForumTopic]:
         return db.query(self.model).filter(self.model.category_id == category_id).offset(skip).limit(limit).all()
 
+    def get_page(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ForumTopic], Optional[str]]:
+        query = db.query(self.model).options(*loaders.FORUM_TOPICS)
+        return self.paginate(query, limit=limit, cursor=cursor)
+
+    def get_page_by_category(
+        self, db: Session, *, category_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ForumTopic], Optional[str]]:
+        query = db.query(self.model).options(*loaders.FORUM_TOPICS).filter(self.model.category_id == category_id)
+        return self.paginate(query, limit=limit, cursor=cursor)
+
 
 class CRUDForumPost(CRUDBase[ForumPost, ForumPostCreate, ForumPostUpdate]):
     def create_with_owner(self, db: Session, *, obj_in: ForumPostCreate, author_id: int) -> ForumPost:
@@ -59,6 +72,13 @@ class CRUDForumPost(CRUDBase[ForumPost, ForumPostCreate, ForumPostUpdate]):
     def get_multi_by_topic(self, db: Session, *, topic_id: int, skip: int = 0, limit: int = 100) -> List[ForumPost]:
         return db.query(self.model).filter(self.model.topic_id == topic_id).order_by(self.model.created_at.asc()).offset(skip).limit(limit).all()
 
+    def get_page_by_topic(
+        self, db: Session, *, topic_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ForumPost], Optional[str]]:
+        """Posts in creation order. Ids follow ``created_at``, so the keyset is the id alone."""
+        query = db.query(self.model).filter(self.model.topic_id == topic_id)
+        return self.paginate(query, limit=limit, cursor=cursor)
+
 
 forum_category = CRUDForumCategory(ForumCategory)
 forum_topic = CRUDForumTopic(ForumTopic)
@@ -1,12 +1,15 @@
+from sqlalchemy import or_
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from app.crud import loaders
 from app.crud.base import CRUDBase
 from app.models.lesson import InteractiveLesson as LessonModel
-from app.models.user import User, Role as UserRole
-from app.models.course import Course
+from app.models.user import User
 from app.schemas.lesson import LessonCreate, LessonUpdate, Lesson as LessonSchema
+from app.services.access_policy import access_policy
+from app.services.content_catalog import content_catalog
 
 
 class CRUDLesson(CRUDBase[LessonModel, LessonCreate, LessonUpdate]):
@@ -25,48 +28,27 @@ class CRUDLesson(CRUDBase[LessonModel, LessonCreate, LessonUpdate]):
         Returns:
             Optional[LessonModel]: The next lesson or None if no more lessons
         """
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User).options(*loaders.AUTH).filter(User.id == user_id).first()
         if not user:
             return None
+        entitlements = access_policy.entitlements(db, user=user)
+        now = datetime.utcnow()
 
         # Some deployments may not have this column; fall back gracefully
         last_lesson_id = getattr(user, 'last_viewed_lesson_id', None)
-
-        # Determine privilege once using roles relationship (robust to deployments)
-        try:
-            user_roles = {role.name for role in getattr(user, 'roles', [])}
-        except Exception:
-            user_roles = set()
-        is_privileged_user = any(role in user_roles for role in ["premium", "admin", "superadmin"])
-
         if last_lesson_id:
-            last_lesson = self.get(db, id=last_lesson_id)
-            if last_lesson:
-                # Find the next lesson in the same course
-                query = (
-                    db.query(self.model)
-                    .filter(
-                        self.model.course_id == last_lesson.course_id,
-                        self.model.order > last_lesson.order,
-                    )
-                )
-                # For non-privileged users, filter out premium lessons
-                if not is_privileged_user:
-                    query = query.filter(self.model.is_premium == False)
-
-                next_lesson = query.order_by(self.model.order.asc()).first()
-                if next_lesson:
-                    return next_lesson
-
-        # If no last lesson or no next lesson in the current course, find the first available lesson
-        query = db.query(self.model).join(Course, self.model.course_id == Course.id)
-        
-        # For free users, only show non-premium lessons
-        if not is_privileged_user:
-            query = query.filter(self.model.is_premium == False)
-            
-        first_lesson = query.order_by(Course.id.asc(), self.model.order.asc()).first()
-        return first_lesson
+            # Next accessible lesson in the same course
+            meta = content_catalog.next_lesson(db, last_lesson_id)
+            while meta is not None and not entitlements.can_access(meta, now):
+                meta = content_catalog.next_lesson(db, meta.id)
+            if meta is not None:
+                return self.get(db, id=meta.id)
+
+        # Otherwise the first accessible lesson overall (course order, then lesson order)
+        for meta in content_catalog.ordered(db):
+            if meta.course_id is not None and entitlements.can_access(meta, now):
+                return self.get(db, id=meta.id)
+        return None
         
     def get_accessible_lessons(
         self, 
@@ -91,9 +73,7 @@ class CRUDLesson(CRUDBase[LessonModel, LessonCreate, LessonUpdate]):
         Returns:
             List[LessonModel]: List of accessible lessons
         """
-        # Resolve user if only user_id provided
-        if user is None and user_id is not None:
-            user = db.query(User).filter(User.id == user_id).first()
+        entitlements = access_policy.entitlements(db, user=user, user_id=user_id)
 
         query = db.query(self.model)
         
@@ -101,30 +81,13 @@ class CRUDLesson(CRUDBase[LessonModel, LessonCreate, LessonUpdate]):
         if course_id is not None:
             query = query.filter(self.model.course_id == course_id)
             
-        # For free users, only show non-premium lessons
-        role_names = set()
-        if user is not None:
-            # Many-to-many roles
-            try:
-                role_names |= {r.name for r in getattr(user, "roles", []) if getattr(r, "name", None)}
-            except Exception:
-                pass
-            # Single role relationship
-            role_obj = getattr(user, "role", None)
-            if role_obj and getattr(role_obj, "name", None):
-                role_names.add(role_obj.name)
-            # Fallback via role_id
-            if not role_names:
-                rid = getattr(user, "role_id", None)
-                if rid:
-                    role = db.query(UserRole).filter(UserRole.id == rid).first()
-                    if role and role.name:
-                        role_names.add(role.name)
-
-        is_privileged_user = any(r in role_names for r in ["premium", "admin", "superadmin"])
-
-        if not is_privileged_user:
+        # Without premium only free lessons, plus lessons of courses the user teaches
+        if entitlements is None:
             query = query.filter(self.model.is_premium == False)
+        elif not entitlements.has_premium():
+            query = query.filter(
+                or_(self.model.is_premium == False, self.model.course_id.in_(entitlements.course_ids))
+            )
             
         return query.offset(skip).limit(limit).all()
         
@@ -141,47 +104,7 @@ class CRUDLesson(CRUDBase[LessonModel, LessonCreate, LessonUpdate]):
         Returns:
             bool: True if the user can access the lesson, False otherwise
         """
-        # Resolve user if only user_id provided
-        if user is None and user_id is not None:
-            user = db.query(User).filter(User.id == user_id).first()
-        if user is None:
-            return False
-
-        # Admins and superadmins have full access
-        role_names = set()
-        try:
-            role_names |= {r.name for r in getattr(user, "roles", []) if getattr(r, "name", None)}
-        except Exception:
-            pass
-        role_obj = getattr(user, "role", None)
-        if role_obj and getattr(role_obj, "name", None):
-            role_names.add(role_obj.name)
-        if not role_names:
-            rid = getattr(user, "role_id", None)
-            if rid:
-                role = db.query(UserRole).filter(UserRole.id == rid).first()
-                if role and role.name:
-                    role_names.add(role.name)
-
-        is_privileged_user = any(r in role_names for r in ["premium", "admin", "superadmin"])
-
-        if is_privileged_user:
-            return True
-            
-        # Get the lesson with course relationship
-        lesson = self.get_with_course(db, id=lesson_id)
-        if not lesson:
-            return False
-            
-        # Course creators have access to their own lessons
-        if lesson.course and lesson.course.instructor_id == user.id:
-            return True
-            
-        # Check premium access
-        if lesson.is_premium and not is_privileged_user:
-            return False
-            
-        return True
+        return access_policy.can_access(db, user=user, user_id=user_id, lesson_id=lesson_id)
 
     def get_count(self, db: Session) -> int:
         return db.query(self.model).count()
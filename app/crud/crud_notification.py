@@ -1,8 +1,9 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import Iterable, List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc
+from sqlalchemy import JSON, Select, and_, or_, desc, insert, literal, select
 
+from app.core.cache import redis_client
 from app.crud.base import CRUDBase
 from app.models.notification import Notification, NotificationType, PaymentStatus
 from app.schemas.notification import (
@@ -12,7 +13,87 @@ from app.schemas.notification import (
 )
 
 
+UNREAD_COUNT_PREFIX = "notif_unread"
+# Counts are recomputed from the database at least this often, which bounds
+# any drift from a write racing a recompute.
+UNREAD_COUNT_TTL = 60 * 60
+BULK_INSERT_CHUNK = 1000
+
+# INCRBY only the counters that are cached; missing ones get recomputed on read
+_INCR_IF_CACHED = """
+for _, key in ipairs(KEYS) do
+    if redis.call('exists', key) == 1 then redis.call('incrby', key, ARGV[1]) end
+end
+return 0
+"""
+
+
+class UnreadCounter:
+    """Per-user unread notification counts cached in Redis.
+
+    Without Redis every read falls back to a COUNT query (no in-memory copy:
+    it would go stale across API workers).
+    """
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{UNREAD_COUNT_PREFIX}:{user_id}"
+
+    def get(self, db: Session, user_id: int) -> int:
+        try:
+            cached = redis_client.get(self._key(user_id))
+            if cached is not None:
+                return max(int(cached), 0)
+        except Exception:
+            pass
+        count = (
+            db.query(Notification)
+            .filter(Notification.user_id == user_id, Notification.is_read == False)
+            .count()
+        )
+        try:
+            redis_client.set(self._key(user_id), count, ex=UNREAD_COUNT_TTL, nx=True)
+        except Exception:
+            pass
+        return count
+
+    def incr(self, user_ids: Iterable[int], amount: int = 1) -> None:
+        keys = [self._key(user_id) for user_id in user_ids]
+        try:
+            for i in range(0, len(keys), BULK_INSERT_CHUNK):
+                chunk = keys[i:i + BULK_INSERT_CHUNK]
+                redis_client.eval(_INCR_IF_CACHED, len(chunk), *chunk, amount)
+        except Exception:
+            pass
+
+    def reset(self, user_id: int) -> None:
+        try:
+            redis_client.set(self._key(user_id), 0, ex=UNREAD_COUNT_TTL)
+        except Exception:
+            pass
+
+    def invalidate(self, user_id: int) -> None:
+        try:
+            redis_client.delete(self._key(user_id))
+        except Exception:
+            pass
+
+
+unread_counter = UnreadCounter()
+
+
 class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUpdate]):
+    def create(self, db: Session, *, obj_in: NotificationCreate) -> Notification:
+        db_obj = super().create(db, obj_in=obj_in)
+        unread_counter.incr([db_obj.user_id])
+        return db_obj
+
+    def remove(self, db: Session, *, id: int) -> Notification:
+        db_obj = super().remove(db, id=id)
+        if db_obj is not None and not db_obj.is_read:
+            unread_counter.incr([db_obj.user_id], -1)
+        return db_obj
+
     def create_for_user(
         self, 
         db: Session, 
@@ -34,7 +115,57 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
+        if not db_obj.is_read:
+            unread_counter.incr([user_id])
         return db_obj
+
+    @staticmethod
+    def _bulk_values(values: Dict[str, Any]) -> Dict[str, Any]:
+        values = dict(values)
+        if hasattr(values.get("notification_type"), "value"):
+            values["notification_type"] = values["notification_type"].value
+        values.setdefault("data", {})
+        values.setdefault("is_read", False)
+        return values
+
+    def create_bulk(self, db: Session, *, user_ids: List[int], values: Dict[str, Any]) -> int:
+        """Insert the same notification for many users (chunked executemany, one commit)."""
+        row = self._bulk_values(values)
+        for i in range(0, len(user_ids), BULK_INSERT_CHUNK):
+            chunk = user_ids[i:i + BULK_INSERT_CHUNK]
+            db.execute(insert(self.model), [{**row, "user_id": user_id} for user_id in chunk])
+        db.commit()
+        unread_counter.incr(user_ids)
+        return len(user_ids)
+
+    def create_for_audience(self, db: Session, *, audience: Select, values: Dict[str, Any]) -> List[int]:
+        """Insert the same notification for every user id selected by ``audience``.
+
+        Runs as a single ``INSERT ... SELECT ... RETURNING``, so the returned
+        recipients are exactly the rows inserted. Without ``RETURNING`` the
+        audience is selected once and inserted with ``create_bulk``.
+        """
+        row = self._bulk_values(values)
+        if not db.get_bind().dialect.insert_returning:
+            user_ids = list(db.execute(audience).scalars())
+            self.create_bulk(db, user_ids=user_ids, values=row)
+            return user_ids
+
+        user_id_column = list(audience.subquery().c)[0]
+        columns = ["user_id", *row]
+        source = select(
+            user_id_column,
+            *(
+                literal(value, type_=JSON) if name == "data" else literal(value)
+                for name, value in row.items()
+            ),
+        )
+        user_ids = list(db.execute(
+            insert(self.model).from_select(columns, source).returning(self.model.user_id)
+        ).scalars())
+        db.commit()
+        unread_counter.incr(user_ids)
+        return user_ids
     
     def create_payment_notification(
         self,
@@ -111,6 +242,42 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
         }
         return self.create_for_user(db, obj_in=notification_data, user_id=user_id)
 
+    def _user_query(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        is_read: Optional[bool] = None,
+        notification_type: Optional[NotificationType] = None,
+        payment_status: Optional[str] = None,
+    ):
+        query = db.query(self.model).filter(Notification.user_id == user_id)
+
+        if is_read is not None:
+            query = query.filter(Notification.is_read == is_read)
+
+        if notification_type:
+            query = query.filter(Notification.notification_type == notification_type.value)
+
+        if payment_status:
+            query = query.filter(Notification.payment_status == payment_status)
+
+        return query
+
+    def get_page_by_user(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        is_read: Optional[bool] = None,
+        notification_type: Optional[NotificationType] = None,
+    ) -> Tuple[List[Notification], Optional[str]]:
+        """Newest first, keyset-paginated. Ids follow ``created_at``, so the keyset is the id alone."""
+        query = self._user_query(db, user_id=user_id, is_read=is_read, notification_type=notification_type)
+        return self.paginate(query, limit=limit, cursor=cursor, descending=True)
+
     def get_multi_by_user(
         self, 
         db: Session, 
@@ -123,17 +290,10 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
         payment_status: Optional[str] = None,
     ) -> List[Notification]:
         """Get notifications for a user with optional filters."""
-        query = db.query(self.model).filter(Notification.user_id == user_id)
-        
-        if is_read is not None:
-            query = query.filter(Notification.is_read == is_read)
-            
-        if notification_type:
-            query = query.filter(Notification.notification_type == notification_type.value)
-            
-        if payment_status:
-            query = query.filter(Notification.payment_status == payment_status)
-        
+        query = self._user_query(
+            db, user_id=user_id, is_read=is_read,
+            notification_type=notification_type, payment_status=payment_status,
+        )
         return (
             query
             .order_by(desc(Notification.created_at))
@@ -177,8 +337,8 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
         )
     
     def get_unread_count(self, db: Session, *, user_id: int) -> int:
-        """Get the count of unread notifications for a user."""
-        return db.query(self.model).filter(self.model.user_id == user_id, self.model.is_read == False).count()
+        """Get the count of unread notifications for a user (cached counter)."""
+        return unread_counter.get(db, user_id)
 
     def mark_all_as_read(self, db: Session, *, user_id: int) -> int:
         """Mark all unread notifications for a user as read."""
@@ -187,6 +347,7 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
             self.model.is_read == False
         ).update({self.model.is_read: True}, synchronize_session=False)
         db.commit()
+        unread_counter.reset(user_id)
         return updated_count
     
     def mark_as_read(
@@ -212,9 +373,12 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
         if notification_id:
             db_notification = db.query(self.model).filter(Notification.id == notification_id).first()
             if db_notification:
+                was_unread = not db_notification.is_read
                 db_notification.is_read = True
                 db.commit()
                 db.refresh(db_notification)
+                if was_unread:
+                    unread_counter.incr([db_notification.user_id], -1)
             return db_notification
             
         elif user_id and mark_all:
@@ -225,6 +389,7 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
                 )
             ).update({"is_read": True}, synchronize_session=False)
             db.commit()
+            unread_counter.reset(user_id)
             return result
             
         return None
@@ -263,6 +428,7 @@ class CRUDNotification(CRUDBase[Notification, NotificationCreate, NotificationUp
                 
             db.commit()
             db.refresh(db_notification)
+            unread_counter.invalidate(db_notification.user_id)
             
         return db_notification
 
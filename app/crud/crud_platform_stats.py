@@ -0,0 +1,344 @@
+"""
+Precomputed platform statistics for the admin dashboards.
+
+Every figure the dashboards show is a row in ``platform_counters``. Counters
+are adjusted in the same transaction as the write that changes them (ORM
+mapper events below), so reading the dashboard is two small SELECTs instead
+of ~15 aggregates over the big tables. The events do not touch the counter
+row itself: each delta goes to one of ``STATS_COUNTER_SHARDS`` rows in
+``platform_counter_shards`` picked at random, so concurrent writers rarely
+wait on the same row lock. ``read`` adds the shard sums to the base value.
+
+Writes that bypass the ORM unit of work (``query.update()``, bulk inserts,
+raw SQL) and time-based figures (subscriptions expiring, "active today")
+are not seen by the events; ``reconcile`` recomputes everything from source
+and runs periodically (``stats.reconcile_platform_stats``) to correct drift;
+it also takes the shard deltas its recount already includes out of the
+shards.
+``rollup_day`` stores one ``daily_platform_stats`` row per day for charts.
+"""
+import logging
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import desc, event, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app import models
+from app.core.config import settings
+from app.db.bulk import insert_ignore
+from app.models.platform_stats import DailyPlatformStats, PlatformCounter, PlatformCounterShard
+from app.schemas.payment_verification import PaymentVerificationStatus
+
+logger = logging.getLogger(__name__)
+
+TOP_LEARNERS = "top_learners"
+TOP_COURSES = "top_courses"
+TOP_LIMIT = 5
+
+COUNTERS = (
+    "users_total",
+    "users_new_week",
+    "users_active_today",
+    "premium_users",  # reconciled only: depends on other rows of the same user
+    "courses_total",
+    "lessons_total",
+    "exercises_total",
+    "words_total",
+    "forum_topics_total",
+    "subscriptions_active",
+    "revenue_total",
+    "payments_pending",
+    "lessons_completed",
+    "ai_gemini_requests",
+    "ai_stt_requests",
+    "ai_tts_characters",
+    TOP_LEARNERS,
+    TOP_COURSES,
+)
+
+Contribution = Callable[[Dict[str, Any], datetime], Dict[str, float]]
+
+
+def _within(value: Optional[datetime], now: datetime, days: int) -> int:
+    return int(value is not None and value >= now - timedelta(days=days))
+
+
+def _user(v: Dict[str, Any], now: datetime) -> Dict[str, float]:
+    return {
+        "users_total": 1,
+        "users_new_week": _within(v["created_at"] or now, now, 7),
+        "users_active_today": _within(v["last_login"], now, 1),
+    }
+
+
+def _subscription(v: Dict[str, Any], now: datetime) -> Dict[str, float]:
+    active = bool(v["is_active"])
+    return {
+        "subscriptions_active": int(active and v["end_date"] is not None and v["end_date"] >= now),
+        "revenue_total": (v["amount_paid"] or 0.0) if active else 0.0,
+    }
+
+
+def _payment_verification(v: Dict[str, Any], now: datetime) -> Dict[str, float]:
+    return {"payments_pending": int(v["status"] == PaymentVerificationStatus.PENDING.value)}
+
+
+def _ai_usage(v: Dict[str, Any], now: datetime) -> Dict[str, float]:
+    return {
+        "ai_gemini_requests": v["gemini_requests"] or 0,
+        "ai_stt_requests": v["stt_requests"] or 0,
+        "ai_tts_characters": v["tts_characters"] or 0,
+    }
+
+
+def _row_count(name: str) -> Contribution:
+    return lambda v, now: {name: 1}
+
+
+def _values(connection, target: Any, keys: Iterable[str], *, before: bool) -> Dict[str, Any]:
+    """Attribute values before/after the flush.
+
+    Old values of modified columns are kept by ``active_history``; columns that
+    are neither loaded nor modified are read from the row itself.
+    """
+    state = inspect(target)
+    values, missing = {}, []
+    for key in keys:
+        history = state.attrs[key].history
+        seq = (history.deleted or history.unchanged) if before else (history.added or history.unchanged)
+        if seq:
+            values[key] = seq[0]
+        else:
+            missing.append(key)
+    if missing:
+        mapper = state.mapper
+        columns = [mapper.columns[key] for key in missing]
+        criteria = [column == value for column, value in zip(mapper.primary_key, state.identity or ())]
+        row = connection.execute(select(*columns).where(*criteria)).first() if criteria else None
+        values.update(zip(missing, row or (None,) * len(missing)))
+    return values
+
+
+def _apply(connection, deltas: Dict[str, float]) -> None:
+    table = PlatformCounterShard.__table__
+    for name, delta in deltas.items():
+        if delta:
+            # No-op until the first reconcile has created the shards
+            connection.execute(
+                table.update()
+                .where(table.c.name == name, table.c.shard == random.randrange(settings.STATS_COUNTER_SHARDS))
+                .values(value=table.c.value + delta)
+            )
+
+
+def _track(model, keys: tuple, contribution: Contribution) -> None:
+    def after_insert(mapper, connection, target):
+        _apply(connection, contribution(_values(connection, target, keys, before=False), datetime.utcnow()))
+
+    def after_update(mapper, connection, target):
+        now = datetime.utcnow()
+        new = contribution(_values(connection, target, keys, before=False), now)
+        old = contribution(_values(connection, target, keys, before=True), now)
+        _apply(connection, {name: new[name] - old[name] for name in new})
+
+    def before_delete(mapper, connection, target):
+        old = contribution(_values(connection, target, keys, before=True), datetime.utcnow())
+        _apply(connection, {name: -value for name, value in old.items()})
+
+    event.listen(model, "after_insert", after_insert)
+    event.listen(model, "before_delete", before_delete)
+    if keys:
+        event.listen(model, "after_update", after_update)
+        for key in keys:
+            # Load the previous value before it is overwritten, even if expired
+            event.listen(getattr(model, key), "set", lambda *args: None, active_history=True)
+
+
+_track(models.User, ("created_at", "last_login"), _user)
+_track(models.Subscription, ("is_active", "end_date", "amount_paid"), _subscription)
+_track(models.PaymentVerification, ("status",), _payment_verification)
+_track(models.UserAIUsage, ("gemini_requests", "stt_requests", "tts_characters"), _ai_usage)
+_track(models.UserLessonCompletion, (), _row_count("lessons_completed"))
+_track(models.Course, (), _row_count("courses_total"))
+_track(models.InteractiveLesson, (), _row_count("lessons_total"))
+_track(models.Exercise, (), _row_count("exercises_total"))
+_track(models.Word, (), _row_count("words_total"))
+_track(models.ForumTopic, (), _row_count("forum_topics_total"))
+
+
+class CRUDPlatformStats:
+    def _rows(self, db: Session) -> Dict[str, PlatformCounter]:
+        rows = {row.name: row for row in db.query(PlatformCounter).populate_existing().all()}
+        pending = db.query(PlatformCounterShard.name, func.sum(PlatformCounterShard.value)).group_by(
+            PlatformCounterShard.name
+        )
+        for name, delta in pending:
+            if name in rows and delta:
+                # Loaded as if stored, so the sum is never flushed back to the base row
+                set_committed_value(rows[name], "value", rows[name].value + delta)
+        return rows
+
+    def read(self, db: Session) -> Dict[str, PlatformCounter]:
+        """All counters with their pending shard deltas; reconciles first if they were never computed."""
+        rows = self._rows(db)
+        if any(name not in rows for name in COUNTERS):
+            self.reconcile(db)
+            rows = self._rows(db)
+        return rows
+
+    def compute(self, db: Session, *, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Recompute every counter from the source tables."""
+        now = now or datetime.utcnow()
+        count = lambda column, *criteria: db.query(func.count(column)).filter(*criteria).scalar() or 0
+        active_sub = (models.Subscription.is_active == True, models.Subscription.end_date >= now)
+
+        values: Dict[str, Any] = {
+            "users_total": count(models.User.id),
+            "users_new_week": count(models.User.id, models.User.created_at >= now - timedelta(days=7)),
+            "users_active_today": count(models.User.id, models.User.last_login >= now - timedelta(days=1)),
+            "premium_users": count(models.User.id, models.User.premium_until >= now),
+            "courses_total": count(models.Course.id),
+            "lessons_total": count(models.InteractiveLesson.id),
+            "exercises_total": count(models.Exercise.id),
+            "words_total": count(models.Word.id),
+            "forum_topics_total": count(models.ForumTopic.id),
+            "subscriptions_active": count(models.Subscription.id, *active_sub),
+            "revenue_total": db.query(func.sum(models.Subscription.amount_paid))
+            .filter(models.Subscription.is_active == True)
+            .scalar() or 0.0,
+            "payments_pending": count(
+                models.PaymentVerification.id,
+                models.PaymentVerification.status == PaymentVerificationStatus.PENDING.value,
+            ),
+            "lessons_completed": count(models.UserLessonCompletion.id),
+        }
+        ai = db.query(
+            func.sum(models.UserAIUsage.gemini_requests),
+            func.sum(models.UserAIUsage.stt_requests),
+            func.sum(models.UserAIUsage.tts_characters),
+        ).one()
+        values["ai_gemini_requests"], values["ai_stt_requests"], values["ai_tts_characters"] = (v or 0 for v in ai)
+
+        top_learners = (
+            db.query(models.User.full_name, func.count(models.UserLessonCompletion.id).label("completed_lessons"))
+            .join(models.UserLessonCompletion, models.User.id == models.UserLessonCompletion.user_id)
+            .group_by(models.User.id)
+            .order_by(desc("completed_lessons"))
+            .limit(TOP_LIMIT)
+            .all()
+        )
+        values[TOP_LEARNERS] = [
+            {"full_name": name, "completed_lessons": completed} for name, completed in top_learners
+        ]
+        # Popularity proxy: lesson completions per course
+        top_courses = (
+            db.query(models.Course.title, func.count(models.UserLessonCompletion.user_id).label("enrolled_users"))
+            .join(models.InteractiveLesson, models.Course.id == models.InteractiveLesson.course_id)
+            .join(models.UserLessonCompletion, models.InteractiveLesson.id == models.UserLessonCompletion.lesson_id)
+            .group_by(models.Course.id)
+            .order_by(desc("enrolled_users"))
+            .limit(TOP_LIMIT)
+            .all()
+        )
+        values[TOP_COURSES] = [{"title": title, "enrolled_users": users} for title, users in top_courses]
+        return values
+
+    def _snapshot(self, db: Session) -> Tuple[Dict[str, Any], List[Tuple[str, int, float]]]:
+        """Counters recomputed from source plus the shard deltas they already include, read in one snapshot."""
+        if db.get_bind().dialect.name == "postgresql":
+            db.commit()  # the isolation level can only be chosen before the transaction starts
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        values = self.compute(db)
+        seen = db.execute(
+            select(PlatformCounterShard.name, PlatformCounterShard.shard, PlatformCounterShard.value)
+            .where(PlatformCounterShard.value != 0)
+        ).tuples().all()
+        db.commit()
+        return values, seen
+
+    def reconcile(self, db: Session) -> Dict[str, Any]:
+        """
+        Overwrite all counters with freshly computed values (corrects any drift).
+        The shards keep the deltas of writes committed after the snapshot the
+        values were computed from; only the deltas it already saw are taken out.
+        """
+        values, seen = self._snapshot(db)
+        now = datetime.utcnow()
+        shards = PlatformCounterShard.__table__
+        for name, shard, value in seen:
+            db.execute(
+                shards.update()
+                .where(shards.c.name == name, shards.c.shard == shard)
+                .values(value=shards.c.value - value)
+            )
+        insert_ignore(db, shards, [
+            {"name": name, "shard": shard, "value": 0}
+            for name, value in values.items() if not isinstance(value, list)
+            for shard in range(settings.STATS_COUNTER_SHARDS)
+        ], index_elements=["name", "shard"])
+        rows = {row.name: row for row in db.query(PlatformCounter).populate_existing().all()}
+        for name, value in values.items():
+            row = rows.get(name) or PlatformCounter(name=name)
+            if isinstance(value, list):
+                row.value, row.data = len(value), value
+            else:
+                row.value = value
+            row.updated_at = now
+            db.add(row)
+        db.commit()
+        logger.info("Reconciled platform counters")
+        return values
+
+    def rollup_day(self, db: Session, *, day: date) -> DailyPlatformStats:
+        """Create or refresh the ``daily_platform_stats`` row for ``day`` (UTC)."""
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+        count = lambda column, created: db.query(func.count(column)).filter(
+            created >= start, created < end
+        ).scalar() or 0
+
+        totals = {
+            name: row.value for name, row in self.read(db).items() if name not in (TOP_LEARNERS, TOP_COURSES)
+        }
+        # AI usage is only stored as running totals per user, so the day's usage
+        # is the difference between consecutive snapshots.
+        previous = db.query(DailyPlatformStats).filter(DailyPlatformStats.date == day - timedelta(days=1)).first()
+        previous_totals = (previous.totals or {}) if previous else {}
+
+        def _delta(name: str) -> int:
+            if name not in previous_totals:
+                return 0
+            return max(int(totals.get(name, 0) - previous_totals[name]), 0)
+
+        row = db.query(DailyPlatformStats).filter(DailyPlatformStats.date == day).first() or DailyPlatformStats(date=day)
+        row.new_users = count(models.User.id, models.User.created_at)
+        # Only the latest login is stored, so this is exact when rolled up shortly after midnight
+        row.active_users = count(models.User.id, models.User.last_login)
+        row.lessons_completed = count(models.UserLessonCompletion.id, models.UserLessonCompletion.completed_at)
+        row.subscriptions_started = count(models.Subscription.id, models.Subscription.start_date)
+        row.revenue = db.query(func.sum(models.Subscription.amount_paid)).filter(
+            models.Subscription.start_date >= start, models.Subscription.start_date < end
+        ).scalar() or 0.0
+        row.gemini_requests = _delta("ai_gemini_requests")
+        row.stt_requests = _delta("ai_stt_requests")
+        row.tts_characters = _delta("ai_tts_characters")
+        row.totals = totals
+        db.add(row)
+        db.commit()
+        db.refresh(row)
+        return row
+
+    def get_daily(self, db: Session, *, days: int = 30) -> List[DailyPlatformStats]:
+        since = datetime.utcnow().date() - timedelta(days=days)
+        return (
+            db.query(DailyPlatformStats)
+            .filter(DailyPlatformStats.date > since)
+            .order_by(DailyPlatformStats.date)
+            .all()
+        )
+
+
+platform_stats = CRUDPlatformStats()
@@ -0,0 +1,170 @@
+"""
+Stripe webhook events, stored as delivered and processed in the background.
+
+The webhook stores each verified event under its Stripe id, so a redelivery
+of an event we already have is recognised and only acknowledged. Events are
+processed one at a time per customer, oldest first: a job claims the oldest
+unfinished event of its customer with a conditional UPDATE and stops if that
+event is already claimed by someone else, so concurrent jobs for the same
+customer never interleave. An event whose handler raised goes back to
+pending, so the job's automatic retry or the sweep runs it again ahead of
+the customer's later events; after ``JOBS_MAX_RETRIES`` attempts it is
+marked failed and holds them back until it is replayed (``replay``).
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.stripe_event import StripeEvent
+
+PENDING = "pending"
+PROCESSING = "processing"
+PROCESSED = "processed"
+IGNORED = "ignored"  # no handler for the event type
+FAILED = "failed"
+UNFINISHED = (PENDING, PROCESSING, FAILED)
+
+
+def customer_key(event: Dict[str, Any]) -> str:
+    """The key events are ordered by: the Stripe customer, else our user id from metadata, else the event itself."""
+    obj = (event.get("data") or {}).get("object") or {}
+    customer = obj.get("customer")
+    if isinstance(customer, dict):
+        customer = customer.get("id")
+    if customer:
+        return str(customer)
+    user_id = (obj.get("metadata") or {}).get("user_id")
+    if user_id:
+        return f"user:{user_id}"
+    return f"event:{event['id']}"
+
+
+class CRUDStripeEvent:
+    def get(self, db: Session, event_id: str) -> Optional[StripeEvent]:
+        return db.get(StripeEvent, event_id)
+
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        status: Optional[str] = None,
+        customer: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[StripeEvent]:
+        query = select(StripeEvent)
+        if status:
+            query = query.where(StripeEvent.status == status)
+        if customer:
+            query = query.where(StripeEvent.customer == customer)
+        query = query.order_by(StripeEvent.received_at.desc()).offset(skip).limit(limit)
+        return list(db.execute(query).scalars())
+
+    def record(self, db: Session, event: Dict[str, Any]) -> Tuple[StripeEvent, bool]:
+        """Store a verified event; returns the row and whether it is new (``False`` for a redelivery)."""
+        row = StripeEvent(
+            id=event["id"],
+            type=event["type"],
+            customer=customer_key(event),
+            created=int(event.get("created") or 0),
+            payload=event,
+            status=PENDING,
+        )
+        savepoint = db.begin_nested()
+        try:
+            db.add(row)
+            db.flush()
+        except IntegrityError:
+            savepoint.rollback()
+            return self.get(db, event["id"]), False
+        db.commit()
+        return row, True
+
+    def claim_next(self, db: Session, customer: str) -> Optional[StripeEvent]:
+        """
+        Claim the customer's oldest unfinished event, or return ``None`` if
+        there is none, another job holds it, or it failed for good. A failed
+        event has used up its retries and is only claimed again after
+        ``replay`` has put it back to pending.
+        """
+        head = db.execute(
+            select(StripeEvent)
+            .where(StripeEvent.customer == customer, StripeEvent.status.in_(UNFINISHED))
+            .order_by(StripeEvent.created, StripeEvent.received_at, StripeEvent.id)
+            .limit(1)
+        ).scalar_one_or_none()
+        now = datetime.utcnow()
+        if head is None or head.status == FAILED or (
+            head.status == PROCESSING and head.claimed_at > now - timedelta(seconds=settings.STRIPE_EVENT_LEASE)
+        ):
+            return None
+        claimed = db.execute(
+            update(StripeEvent)
+            .where(StripeEvent.id == head.id, StripeEvent.status == head.status, StripeEvent.attempts == head.attempts)
+            .values(status=PROCESSING, claimed_at=now, attempts=head.attempts + 1)
+        ).rowcount
+        db.commit()
+        if not claimed:
+            return None
+        db.refresh(head)
+        return head
+
+    def finish(self, db: Session, event: StripeEvent, status: str, error: Optional[str] = None) -> StripeEvent:
+        event.status = status
+        event.error = error
+        if status in (PROCESSED, IGNORED):
+            event.processed_at = datetime.utcnow()
+        db.add(event)
+        db.commit()
+        return event
+
+    def customers_to_process(self, db: Session, *, limit: int = 1000) -> List[str]:
+        """Customers with pending events, or events whose claim has outlived the lease."""
+        stale = datetime.utcnow() - timedelta(seconds=settings.STRIPE_EVENT_LEASE)
+        return list(db.execute(
+            select(StripeEvent.customer)
+            .where(or_(
+                StripeEvent.status == PENDING,
+                (StripeEvent.status == PROCESSING) & (StripeEvent.claimed_at < stale),
+            ))
+            .distinct()
+            .limit(limit)
+        ).scalars())
+
+    def replay(
+        self,
+        db: Session,
+        *,
+        event_ids: Optional[List[str]] = None,
+        customer: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Put the matching events back to ``pending`` so they are processed
+        again; returns the customers affected. At least one filter is required.
+        """
+        conditions = []
+        if event_ids:
+            conditions.append(StripeEvent.id.in_(event_ids))
+        if customer:
+            conditions.append(StripeEvent.customer == customer)
+        if status:
+            conditions.append(StripeEvent.status == status)
+        if since:
+            conditions.append(StripeEvent.received_at >= since)
+        if not conditions:
+            raise ValueError("replay needs event ids, a customer, a status or a start time")
+        customers = sorted(set(db.execute(select(StripeEvent.customer).where(*conditions)).scalars()))
+        db.execute(
+            update(StripeEvent).where(*conditions).values(status=PENDING, error=None, claimed_at=None)
+        )
+        db.commit()
+        return customers
+
+
+stripe_event = CRUDStripeEvent()
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict
-from sqlalchemy import func
+from sqlalchemy import event, func, select, update
 from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 
@@ -12,6 +12,34 @@ from app.models.user import User  # Import the User model
 
 # SubscriptionPlan CRUD
 
+def _premium_until_query(user_id):
+    return (
+        select(func.max(Subscription.end_date))
+        .where(Subscription.user_id == user_id, Subscription.is_active == True)
+        .scalar_subquery()
+    )
+
+
+def refresh_premium_until(db: Session, user_id: int) -> None:
+    """Recompute ``User.premium_until`` from the user's active subscriptions."""
+    db.execute(update(User).where(User.id == user_id).values(premium_until=_premium_until_query(user_id)))
+
+
+def _sync_premium_until(mapper, connection, target: Subscription) -> None:
+    # Runs inside the flush, so every way of creating, extending, deactivating or
+    # deleting a subscription (plans, trials, payment verification, Stripe)
+    # keeps the column current in the same transaction.
+    connection.execute(
+        update(User.__table__)
+        .where(User.__table__.c.id == target.user_id)
+        .values(premium_until=_premium_until_query(target.user_id))
+    )
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(Subscription, _event, _sync_premium_until)
+
+
 def get_subscription_plan(db: Session, plan_id: int) -> Optional[SubscriptionPlan]:
     return db.query(SubscriptionPlan).filter(SubscriptionPlan.id == plan_id).first()
 
@@ -95,7 +123,15 @@ def update_subscription(db: Session, db_sub: Subscription, sub_in: Dict) -> Subs
     db.refresh(db_sub)
     return db_sub
 
-def create_with_plan_details(db: Session, user_id: int, plan_id: int) -> Optional[Subscription]:
+def create_with_plan_details(
+    db: Session,
+    user_id: int,
+    plan_id: int,
+    *,
+    payment_id: Optional[str] = None,
+    payment_method: Optional[str] = None,
+    amount_paid: Optional[float] = None,
+) -> Optional[Subscription]:
     """
     Create a new subscription for a user based on a plan, 
     deactivate old ones, and update AI quota.
@@ -119,7 +155,10 @@ def create_with_plan_details(db: Session, user_id: int, plan_id: int) -> Optiona
         plan_id=plan_id,
         start_date=start_date,
         end_date=end_date,
-        is_active=True
+        is_active=True,
+        payment_id=payment_id,
+        payment_method=payment_method,
+        amount_paid=amount_paid,
     )
     db.add(db_subscription)
 
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
 from sqlalchemy.orm import Session, joinedload
@@ -8,7 +8,7 @@ from app.schemas import UserRole as UserRoleSchema
 from app.schemas.user import UserCreate, UserUpdate
 from app.crud.base import CRUDBase
 from app import models, schemas
-from app.crud import crud_subscription
+from app.crud import crud_subscription, loaders
 from app.crud.crud_role import role as crud_role
 from app.crud.crud_user_ai_usage import user_ai_usage
 import logging
@@ -60,7 +60,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_multi_by_role(
         self, db: Session, *, skip: int = 0, limit: int = 100, role_name: Optional[str] = None
     ) -> list[User]:
-        query = db.query(self.model)
+        query = db.query(self.model).options(*loaders.DASHBOARD)
         if role_name:
             query = query.join(models.User.roles).filter(models.Role.name == role_name)
         return query.offset(skip).limit(limit).all()
@@ -68,15 +68,23 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100, role: Optional[UserRoleSchema] = None
     ) -> list[User]:
-        query = db.query(self.model)
+        query = db.query(self.model).options(*loaders.DASHBOARD)
         if role:
             query = query.join(User.roles).filter(Role.name == role.value)
         return query.offset(skip).limit(limit).all()
 
+    def get_page(
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100, role: Optional[UserRoleSchema] = None
+    ) -> Tuple[list[User], Optional[str]]:
+        query = db.query(self.model).options(*loaders.DASHBOARD)
+        if role:
+            query = query.join(User.roles).filter(Role.name == role.value)
+        return self.paginate(query, limit=limit, cursor=cursor)
+
     def get_multi_filtered(
         self, db: Session, *, skip: int = 0, limit: int = 100, is_premium: bool | None = None
     ) -> list[User]:
-        query = db.query(self.model)
+        query = db.query(self.model).options(*loaders.DASHBOARD)
         if is_premium is not None:
             query = query.filter(self.model.is_premium == is_premium)
         return query.offset(skip).limit(limit).all()
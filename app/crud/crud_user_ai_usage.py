@@ -1,15 +1,41 @@
 import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import and_, exists, func, insert, literal, or_, select, update
 from sqlalchemy.orm import Session
 
 from app import models
+from app.core.config import settings
 from app.crud import crud_subscription
-from app.models import UserAIUsage
+from app.models import Role, Subscription, SubscriptionPlan, User, UserAIUsage
+from app.models.user import user_role
 from app.schemas import UserRole
 from app.schemas.user_ai_usage import UserAIUsageUpdate
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Remaining-quota columns per tier; premium users with an active subscription get their plan's quotas
+FREE_QUOTAS = {
+    "gpt4o_requests_left": 50, "tts_chars_left": 5000, "stt_requests_left": 100, "pronunciation_analysis_left": 20,
+}
+PREMIUM_FALLBACK_QUOTAS = {
+    "gpt4o_requests_left": 500, "tts_chars_left": 100000, "stt_requests_left": 2000, "pronunciation_analysis_left": 400,
+}
+PLAN_QUOTAS = {
+    "gpt4o_requests_left": SubscriptionPlan.gpt4o_requests_quota,
+    "tts_chars_left": SubscriptionPlan.tts_chars_quota,
+    "stt_requests_left": SubscriptionPlan.stt_requests_quota,
+    "pronunciation_analysis_left": SubscriptionPlan.pronunciation_analysis_quota,
+}
+_COUNTERS = ("gemini_requests", "stt_requests", "tts_characters", "pronunciation_analysis")
+
+
+def billing_period(when: Optional[datetime] = None) -> str:
+    """The quota period ``when`` (default: now, UTC) falls in: its calendar month, e.g. "2025-09"."""
+    return (when or datetime.utcnow()).strftime("%Y-%m")
+
 
 class CRUDUserAIUsage:
     def get_or_create(self, db: Session, *, user_id: int) -> UserAIUsage:
@@ -87,22 +113,18 @@ class CRUDUserAIUsage:
                 
                 if active_subscription and hasattr(active_subscription, 'plan') and active_subscription.plan:
                     logger.info(f"Active subscription with plan found for user {user_id}. Applying plan quotas.")
-                    db_obj.gpt4o_requests_left = active_subscription.plan.gpt4o_requests_quota
-                    db_obj.tts_chars_left = active_subscription.plan.tts_chars_quota
-                    db_obj.stt_requests_left = active_subscription.plan.stt_requests_quota
-                    db_obj.pronunciation_analysis_left = active_subscription.plan.pronunciation_analysis_quota
+                    quotas = {
+                        field: getattr(active_subscription.plan, column.key) for field, column in PLAN_QUOTAS.items()
+                    }
                 else:
                     logger.info(f"No active subscription plan found for premium user {user_id}. Applying fallback quotas.")
-                    db_obj.gpt4o_requests_left = 500
-                    db_obj.tts_chars_left = 100000
-                    db_obj.stt_requests_left = 2000
-                    db_obj.pronunciation_analysis_left = 400
+                    quotas = PREMIUM_FALLBACK_QUOTAS
             else:
                 logger.info(f"User {user_id} is a free user. Applying free quotas.")
-                db_obj.gpt4o_requests_left = 50
-                db_obj.tts_chars_left = 5000
-                db_obj.stt_requests_left = 100
-                db_obj.pronunciation_analysis_left = 20
+                quotas = FREE_QUOTAS
+            for field, value in quotas.items():
+                setattr(db_obj, field, value)
+            db_obj.quota_period = billing_period()
             
             db.add(db_obj)
             db.commit()
@@ -114,6 +136,81 @@ class CRUDUserAIUsage:
             db.rollback()
             raise
         
+    def reset_all(
+        self,
+        db: Session,
+        *,
+        period: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Apply the tier quotas of ``reset`` to every user for ``period`` (default:
+        the current one) with set-based statements, one transaction per range
+        of ``chunk_size`` user ids. Rows already reset for ``period`` are left
+        alone, so running it again (or after a failure part way) only touches
+        the rest. ``on_progress`` gets the running totals after each range.
+        """
+        period = period or billing_period()
+        chunk_size = chunk_size or settings.AI_QUOTA_RESET_CHUNK
+        stats = {"period": period, "chunks": 0, "chunks_done": 0, "created": 0, "plan": 0, "premium": 0, "free": 0}
+        low, high = db.execute(select(func.min(User.id), func.max(User.id))).one()
+        if low is None:
+            return stats
+        stats["chunks"] = (high - low) // chunk_size + 1
+        for start in range(low, high + 1, chunk_size):
+            try:
+                counts = self._reset_range(db, period, start, start + chunk_size)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            for key, count in counts.items():
+                stats[key] += count
+            stats["chunks_done"] += 1
+            if on_progress:
+                on_progress(dict(stats))
+        return stats
+
+    def _reset_range(self, db: Session, period: str, start: int, end: int) -> Dict[str, int]:
+        """Reset users ``start <= id < end``; returns rows created and rows reset per tier."""
+        # Users who never used AI get their row now rather than on their first request
+        created = db.execute(insert(UserAIUsage).from_select(
+            ["user_id", "usage_date", *_COUNTERS],
+            select(User.id, literal(datetime.now()), *(literal(0) for _ in _COUNTERS)).where(
+                User.id >= start, User.id < end, ~exists().where(UserAIUsage.user_id == User.id),
+            ),
+        )).rowcount
+
+        pending = and_(
+            UserAIUsage.user_id >= start, UserAIUsage.user_id < end,
+            or_(UserAIUsage.quota_period.is_(None), UserAIUsage.quota_period != period),
+        )
+        is_premium = exists().where(
+            user_role.c.user_id == UserAIUsage.user_id, user_role.c.role_id == Role.id,
+            Role.name == UserRole.premium.value,
+        )
+        # Each user's newest active subscription (reset() takes an arbitrary one)
+        latest = (
+            select(Subscription.user_id, func.max(Subscription.id).label("subscription_id"))
+            .where(Subscription.is_active == True, Subscription.user_id >= start, Subscription.user_id < end)  # noqa: E712
+            .group_by(Subscription.user_id)
+            .subquery()
+        )
+
+        def apply(*criteria, **values) -> int:
+            stmt = update(UserAIUsage).where(pending, *criteria).values(**values, quota_period=period)
+            return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+        # Tiers in order: each statement stamps the period, so later ones skip those rows
+        plan = apply(
+            is_premium, latest.c.user_id == UserAIUsage.user_id, Subscription.id == latest.c.subscription_id,
+            SubscriptionPlan.id == Subscription.plan_id, **PLAN_QUOTAS,
+        )
+        premium = apply(is_premium, **PREMIUM_FALLBACK_QUOTAS)
+        free = apply(**FREE_QUOTAS)
+        return {"created": created, "plan": plan, "premium": premium, "free": free}
+
     def has_enough_quota(self, db: Session, user_id: int, field: str, amount: int = 1) -> bool:
         """
         Check if user has enough quota for a specific action.
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Tuple, Optional
 
+from app.crud import loaders
 from app.crud.base import CRUDBase
 from app.models import User
 from app.models.user_lesson_progress import UserLessonCompletion
@@ -30,6 +31,7 @@ class CRUDUserLessonCompletion(CRUDBase[UserLessonCompletion, UserLessonCompleti
         """
         return (
             db.query(User, func.count(UserLessonCompletion.id).label('lesson_count'))
+            .options(*loaders.DASHBOARD)
             .join(UserLessonCompletion, User.id == UserLessonCompletion.user_id)
             .group_by(User.id)
             .order_by(func.count(UserLessonCompletion.id).desc())
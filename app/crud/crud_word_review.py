@@ -0,0 +1,202 @@
+"""
+Vocabulary review states and per-learner due queues.
+
+A learner's due queue is the ``(user_id, next_due_at)`` index on
+``word_review_states``. It is mirrored in a Redis sorted set
+``review_queue:{user_id}`` (word id scored by due time), so "the next 20
+due words" is one ZRANGEBYSCORE. The set is built from the database on first
+use (a sentinel member keeps an empty queue cached) and updated after each
+commit; updates to sets that are not cached are skipped, and entries found
+stale when read are corrected. Without Redis the indexed query is used.
+
+Review submissions are scheduled in Python (``services.spaced_repetition``)
+and written back with a single multi-row INSERT ... ON CONFLICT DO UPDATE.
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cache import redis_client
+from app.core.config import settings
+from app.models.word import Word
+from app.models.word_review import WordReviewState
+from app.services.spaced_repetition import DEFAULT_EASE, ReviewState, schedule
+
+REVIEW_QUEUE_PREFIX = "review_queue"
+_SENTINEL = "0"  # word ids start at 1; scored +inf, so never due
+_EPOCH = datetime(1970, 1, 1)
+_STATE_FIELDS = ("repetitions", "lapses", "ease", "interval", "next_due_at", "last_reviewed_at")
+
+# ZADD only to queues that are cached; missing ones get rebuilt on read
+_ZADD_IF_CACHED = """
+if redis.call('exists', KEYS[1]) == 1 then
+    for i = 1, #ARGV, 2 do redis.call('zadd', KEYS[1], ARGV[i], ARGV[i + 1]) end
+end
+return 0
+"""
+
+
+def _score(when: datetime) -> float:
+    return (when - _EPOCH).total_seconds()
+
+
+class ReviewQueue:
+    """Per-learner due queues cached in Redis sorted sets."""
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{REVIEW_QUEUE_PREFIX}:{user_id}"
+
+    def _load(self, db: Session, user_id: int) -> None:
+        rows = db.execute(
+            select(WordReviewState.word_id, WordReviewState.next_due_at).where(WordReviewState.user_id == user_id)
+        )
+        mapping = {str(word_id): _score(due) for word_id, due in rows}
+        mapping[_SENTINEL] = float("inf")
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.delete(self._key(user_id))
+        pipe.zadd(self._key(user_id), mapping)
+        pipe.expire(self._key(user_id), settings.REVIEW_QUEUE_TTL)
+        pipe.execute()
+
+    def due(self, db: Session, user_id: int, now: datetime, limit: int) -> List[int]:
+        """IDs of the ``limit`` words due longest ago."""
+        try:
+            if not redis_client.exists(self._key(user_id)):
+                self._load(db, user_id)
+            members = redis_client.zrangebyscore(self._key(user_id), "-inf", _score(now), start=0, num=limit)
+            return [int(member) for member in members]
+        except Exception:
+            pass
+        return list(db.execute(
+            select(WordReviewState.word_id)
+            .where(WordReviewState.user_id == user_id, WordReviewState.next_due_at <= now)
+            .order_by(WordReviewState.next_due_at, WordReviewState.word_id)
+            .limit(limit)
+        ).scalars())
+
+    def update(self, user_id: int, due: Dict[int, datetime]) -> None:
+        args = []
+        for word_id, when in due.items():
+            args += [_score(when), word_id]
+        try:
+            if args:
+                redis_client.eval(_ZADD_IF_CACHED, 1, self._key(user_id), *args)
+        except Exception:
+            pass
+
+    def remove(self, user_id: int, word_ids: Iterable[int]) -> None:
+        word_ids = list(word_ids)
+        try:
+            if word_ids:
+                redis_client.zrem(self._key(user_id), *word_ids)
+        except Exception:
+            pass
+
+    def invalidate(self, user_id: int) -> None:
+        try:
+            redis_client.delete(self._key(user_id))
+        except Exception:
+            pass
+
+
+review_queue = ReviewQueue()
+
+
+def _insert(db: Session):
+    dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+    return dialect.insert(WordReviewState)
+
+
+class CRUDWordReview:
+    def get_states(self, db: Session, *, user_id: int, word_ids: Iterable[int]) -> Dict[int, ReviewState]:
+        # Plain columns: the bulk upsert below would leave loaded ORM objects stale
+        rows = db.execute(
+            select(WordReviewState.word_id, *(getattr(WordReviewState, name) for name in _STATE_FIELDS))
+            .where(WordReviewState.user_id == user_id, WordReviewState.word_id.in_(list(word_ids)))
+        )
+        return {row.word_id: ReviewState(*row[1:]) for row in rows}
+
+    def due(
+        self, db: Session, *, user_id: int, limit: int = 20, now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """The learner's ``limit`` most overdue words with their review state (``schemas.DueReview`` fields)."""
+        now = now or datetime.utcnow()
+        word_ids = review_queue.due(db, user_id, now, limit)
+        if not word_ids:
+            return []
+        rows = {
+            state.word_id: (state, word)
+            for state, word in db.execute(
+                select(WordReviewState, Word)
+                .join(Word, Word.id == WordReviewState.word_id)
+                .where(WordReviewState.user_id == user_id, WordReviewState.word_id.in_(word_ids))
+            ).all()
+        }
+        items, gone, moved = [], [], {}
+        for word_id in word_ids:
+            state, word = rows.get(word_id, (None, None))
+            if state is None or word.is_active is False:
+                gone.append(word_id)
+            elif state.next_due_at > now:
+                moved[word_id] = state.next_due_at  # a write the cached queue missed
+            else:
+                items.append({
+                    "word_id": word_id, **{name: getattr(state, name) for name in _STATE_FIELDS},
+                    "word": word.word, "translation": word.translation,
+                    "ipa_pronunciation": word.ipa_pronunciation, "audio_url": word.audio_url,
+                })
+        review_queue.remove(user_id, gone)
+        review_queue.update(user_id, moved)
+        return items
+
+    def add_words(
+        self, db: Session, *, user_id: int, word_ids: Iterable[int], now: Optional[datetime] = None
+    ) -> List[int]:
+        """Start reviewing ``word_ids`` (due immediately); words already under review are left alone."""
+        now = now or datetime.utcnow()
+        word_ids = set(word_ids)
+        new_ids = sorted(word_ids - set(self.get_states(db, user_id=user_id, word_ids=word_ids)))
+        if new_ids:
+            db.execute(
+                _insert(db)
+                .values([
+                    {"user_id": user_id, "word_id": word_id, "repetitions": 0, "lapses": 0, "ease": DEFAULT_EASE,
+                     "interval": 0, "next_due_at": now}
+                    for word_id in new_ids
+                ])
+                .on_conflict_do_nothing(index_elements=["user_id", "word_id"])
+            )
+            db.commit()
+            review_queue.update(user_id, {word_id: now for word_id in new_ids})
+        return new_ids
+
+    def submit(
+        self, db: Session, *, user_id: int, grades: Dict[int, int], now: Optional[datetime] = None
+    ) -> Dict[int, ReviewState]:
+        """Record graded reviews (word id -> grade 0-5) in one statement; returns the new states."""
+        now = now or datetime.utcnow()
+        if not grades:
+            return {}
+        current = self.get_states(db, user_id=user_id, word_ids=grades)
+        states = {
+            word_id: schedule(current.get(word_id, ReviewState()), grade, now)
+            for word_id, grade in grades.items()
+        }
+        stmt = _insert(db).values([
+            {"user_id": user_id, "word_id": word_id, **{name: getattr(state, name) for name in _STATE_FIELDS}}
+            for word_id, state in states.items()
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id", "word_id"],
+            set_={name: getattr(stmt.excluded, name) for name in _STATE_FIELDS},
+        ))
+        db.commit()
+        review_queue.update(user_id, {word_id: state.next_due_at for word_id, state in states.items()})
+        return states
+
+
+word_review = CRUDWordReview()
@@ -0,0 +1,30 @@
+"""
+Named eager-loading profiles for the CRUD layer.
+
+Relationships are lazy by default, so code that walks them (role checks,
+user listings) issues one SELECT per object. A profile is
+the tuple of loader options a hot path needs; pass it to ``CRUDBase.get`` /
+``get_multi`` (``profile=loaders.AUTH``) or ``query.options(*profile)``.
+"""
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.exercise import ExerciseAttempt
+from app.models.forum import ForumPost, ForumTopic
+from app.models.user import User
+
+# Authenticated user for deps: role checks read `roles` on almost every request
+AUTH = (joinedload(User.roles),)
+
+# User listings rendered with roles (admin tables, leaderboards)
+DASHBOARD = (selectinload(User.roles),)
+
+# AI feedback on an attempt reads its exercise
+EXERCISE_ANALYSIS = (joinedload(ExerciseAttempt.exercise),)
+
+# Topic listings render each topic's author, category and posts (with their authors and replies)
+FORUM_TOPICS = (
+    joinedload(ForumTopic.author).selectinload(User.roles),
+    joinedload(ForumTopic.category),
+    selectinload(ForumTopic.posts).joinedload(ForumPost.author).selectinload(User.roles),
+    selectinload(ForumTopic.posts).selectinload(ForumPost.replies, recursion_depth=-1),
+)
@@ -11,10 +11,14 @@ from app.models.course import Course, Enrollment  # noqa
 from app.models.lesson import InteractiveLesson, LessonSession  # noqa
 from app.models.user_lesson_progress import UserLessonProgress  # noqa
 from app.models.word import Word, WordDefinition  # noqa
+from app.models.word_review import WordReviewState  # noqa
+from app.models.content_lesson import ContentLesson  # noqa
 from app.models.exercise import Exercise, ExerciseAttempt, ExerciseSet, ExerciseSetItem  # noqa
 from app.models.test import Test, TestSection, TestQuestion, TestAttempt, TestAnswer  # noqa
 from app.models.subscription import Subscription, SubscriptionPlan  # noqa
 from app.models.payment_verification import PaymentVerification  # noqa
+from app.models.stripe_event import StripeEvent  # noqa
+from app.models.seed_state import SeedState  # noqa
 from app.models.certificate import Certificate  # noqa
 from app.models.feedback import Feedback  # noqa
 from app.models.forum import ForumTopic, ForumPost  # noqa
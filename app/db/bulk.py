@@ -0,0 +1,66 @@
+"""
+Bulk INSERT helpers for seeding and fixture loads.
+
+Rows are sent ``chunk_size`` at a time through one cached INSERT statement
+(the driver's executemany, batched into multi-row VALUES by SQLAlchemy where
+the dialect supports it). ``insert_ignore`` skips rows that collide with a
+unique key (``ON CONFLICT DO NOTHING`` on PostgreSQL/SQLite, ``INSERT
+IGNORE`` on MySQL), so loading the same rows twice is harmless.
+
+These are Core statements: ORM events (search index, content catalog and
+dashboard counters) do not see them, so callers refresh those afterwards.
+"""
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import Session
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _table(target) -> Table:
+    return target if isinstance(target, Table) else target.__table__
+
+
+def chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def insert_ignore(
+    db: Session,
+    target,
+    rows: Iterable[Dict[str, Any]],
+    *,
+    index_elements: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Insert ``rows`` into a model or table, skipping conflicts on ``index_elements``; returns rows inserted."""
+    table = _table(target)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+    if dialect_insert is not None:
+        statement = dialect_insert(table).on_conflict_do_nothing(index_elements=list(index_elements))
+    else:
+        statement = insert(table).prefix_with("IGNORE", dialect="mysql")
+    inserted = 0
+    for chunk in chunks(rows, chunk_size):
+        inserted += max(db.execute(statement, chunk).rowcount, 0)
+    return inserted
+
+
+def insert_many(db: Session, target, rows: Iterable[Dict[str, Any]], *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Plain INSERTs for rows the caller already de-duplicated; returns rows inserted."""
+    statement = insert(_table(target))
+    inserted = 0
+    for chunk in chunks(rows, chunk_size):
+        db.execute(statement, chunk)
+        inserted += len(chunk)
+    return inserted
@@ -1,10 +1,26 @@
+"""
+Database seeding: roles, subscription plans, the first users and sample
+content (``init_db``, run at startup), and bulk fixture loads for load
+testing (``load_words``).
+"""
 import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import exists, select, text, update
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
 from app.core.config import settings
+from app.core.security import get_password_hash
 from app.db import base  # noqa: F401
+from app.db.bulk import chunks, insert_ignore, insert_many
+from app.models import AIAvatar, Course, InteractiveLesson, Role, SeedState, SubscriptionPlan, User, Word
+from app.models.lesson import LessonDifficulty
+from app.models.user import user_role
 from app.schemas import UserRole
+from app.services.content_catalog import content_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -125,210 +141,194 @@ SUBSCRIPTION_PLANS = [
     },
 ]
 
-def init_db(db: Session) -> None:
-    # Tables should be created with Alembic migrations
-    # But if you don't want to use migrations, create
-    # the tables un-commenting the next line
-    # Base.metadata.create_all(bind=db.get_bind())
-
-    roles = ["superadmin", "admin", "teacher", "premium", "free"]
-    for role_name in roles:
-        role = crud.role.get_by_name(db, name=role_name)
-        if not role:
-            role_in = schemas.RoleCreate(name=role_name, description=f"{role_name.capitalize()} role")
-            crud.role.create(db, obj_in=role_in)
-            logger.info(f"Created role: {role_name}")
-
-    # Create subscription plans
-    plans = [
-        {
-            "name": "Free Trial",
-            "description": "1-day free trial for all new users.",
-            "price": 0.00,
-            "duration_days": 1,
-            "is_active": True,
-            "features": '["Limited access to video lessons", "Basic AI chat"]',
-            "stripe_price_id": "price_free_trial",
-            "gpt4o_requests_quota": 50,
-            "stt_requests_quota": 100,
-            "tts_chars_quota": 5000,
-            "pronunciation_analysis_quota": 20
-        },
-        {
-            "name": "Weekly",
-            "description": "Full access for one week.",
-            "price": 4.99,
-            "duration_days": 7,
-            "is_active": True,
-            "features": '["Full access to all content", "Premium AI features"]',
-            "stripe_price_id": "price_weekly",
-            "gpt4o_requests_quota": 200,
-            "stt_requests_quota": 500,
-            "tts_chars_quota": 25000,
-            "pronunciation_analysis_quota": 100
-        },
-        {
-            "name": "Monthly",
-            "description": "Full access for one month.",
-            "price": 14.99,
-            "duration_days": 30,
-            "is_active": True,
-            "features": '["Full access to all content", "Premium AI features"]',
-            "stripe_price_id": "price_monthly",
-            "gpt4o_requests_quota": 1000,
-            "stt_requests_quota": 2500,
-            "tts_chars_quota": 125000,
-            "pronunciation_analysis_quota": 500
-        },
-        {
-            "name": "Quarterly",
-            "description": "Full access for three months.",
-            "price": 39.99,
-            "duration_days": 90,
-            "is_active": True,
-            "features": '["Full access to all content", "Premium AI features"]',
-            "stripe_price_id": "price_quarterly",
-            "gpt4o_requests_quota": 3500,
-            "stt_requests_quota": 8000,
-            "tts_chars_quota": 400000,
-            "pronunciation_analysis_quota": 1750
-        },
-        {
-            "name": "Semi-Annual",
-            "description": "Full access for six months.",
-            "price": 69.99,
-            "duration_days": 180,
-            "is_active": True,
-            "features": '["Full access to all content", "Premium AI features"]',
-            "stripe_price_id": "price_semi_annual",
-            "gpt4o_requests_quota": 8000,
-            "stt_requests_quota": 20000,
-            "tts_chars_quota": 1000000,
-            "pronunciation_analysis_quota": 4000
-        },
-        {
-            "name": "Annual",
-            "description": "Full access for one year.",
-            "price": 99.99,
-            "duration_days": 365,
-            "is_active": True,
-            "features": '["Full access to all content", "Premium AI features"]',
-            "stripe_price_id": "price_annual",
-            "gpt4o_requests_quota": 20000,
-            "stt_requests_quota": 50000,
-            "tts_chars_quota": 2500000,
-            "pronunciation_analysis_quota": 10000
-        },
+SEED_KEY = "initial_data"
+# Bump when the seed data below changes; databases at an older version are seeded again on the next start
+SEED_VERSION = 1
+SEED_LOCK_ID = 0x5EED  # pg_advisory_xact_lock key shared by every process that seeds
+
+ROLE_NAMES = ["superadmin", "admin", "teacher", "premium", "free"]
+
+DEFAULT_AVATAR = {
+    "name": "Orzu",
+    "description": "A friendly and helpful AI assistant for learning languages.",
+    "avatar_url": "https://example.com/orzu.png",
+    "voice_id": "default_voice",
+    "language": "uz-UZ",
+}
+
+DEFAULT_COURSE = {
+    "title": "English for Beginners",
+    "description": "A comprehensive course for starting your English learning journey.",
+    "difficulty_level": "Beginner",
+}
+
+DEFAULT_LESSONS = [
+    {
+        "title": "Lesson 1: Greetings",
+        "description": "Learn common English greetings.",
+        "content": {"text": "Hello! How are you? - Bu eng keng tarqalgan salomlashish usuli..."},
+        "order": 1,
+        "is_premium": False,
+        "difficulty": "easy",
+    },
+    {
+        "title": "Lesson 2: The Alphabet",
+        "description": "Learn the English alphabet.",
+        "content": {"text": "The English alphabet consists of 26 letters..."},
+        "order": 2,
+        "is_premium": False,
+        "difficulty": "easy",
+    },
+    {
+        "title": "Lesson 3: Basic Verbs (Premium)",
+        "description": "Learn essential verbs like to be, to have, to do.",
+        "content": {"text": "Verbs are action words. Let's start with the most important ones..."},
+        "order": 3,
+        "is_premium": True,
+        "difficulty": "medium",
+    },
+]
+
+WORD_COLUMNS = ("word", "translation", "language", "level", "part_of_speech", "ipa_pronunciation", "audio_url", "image_url")
+
+
+def _seed_version(db: Session) -> int:
+    return db.execute(select(SeedState.version).where(SeedState.key == SEED_KEY)).scalar() or 0
+
+
+def _lock(db: Session) -> None:
+    """Serialize seeding across processes until the transaction ends."""
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": SEED_LOCK_ID})
+    else:
+        # A write takes SQLite's database lock (and a row lock elsewhere) before the version is re-read
+        db.execute(update(SeedState).where(SeedState.key == SEED_KEY).values(version=SeedState.version))
+
+
+def _seed_users(db: Session) -> int:
+    users = [
+        (settings.FIRST_SUPERUSER, settings.FIRST_SUPERUSER_PASSWORD, True, "Initial Super User"),
+        (settings.EMAIL_TEST_USER, settings.EMAIL_TEST_USER_PASSWORD, False, "Test User"),
     ]
+    existing = set(db.execute(select(User.email).where(User.email.in_([u[0] for u in users]))).scalars())
+    # Only hash passwords for users that are actually missing
+    created = insert_ignore(db, User, [
+        {
+            "email": email,
+            "username": email[:50],
+            "hashed_password": get_password_hash(password),
+            "full_name": full_name,
+            "is_superuser": is_superuser,
+            "is_teacher": False,
+        }
+        for email, password, is_superuser, full_name in users if email not in existing
+    ], index_elements=["email"])
+
+    superuser_id = select(User.id).where(User.email == settings.FIRST_SUPERUSER).scalar_subquery()
+    superadmin_id = select(Role.id).where(Role.name == UserRole.superadmin.value).scalar_subquery()
+    # user_role has no unique key: insert the pair only if it is missing (we hold the seed lock)
+    db.execute(user_role.insert().from_select(
+        ["user_id", "role_id"],
+        select(superuser_id, superadmin_id).where(
+            superuser_id.is_not(None),
+            superadmin_id.is_not(None),
+            ~exists().where(user_role.c.user_id == superuser_id, user_role.c.role_id == superadmin_id),
+        ),
+    ))
+    return created
 
-    for plan_data in plans:
-        plan = crud.subscription.get_subscription_plan_by_name(db, name=plan_data["name"])
-        if not plan:
-            plan_in = schemas.SubscriptionPlanCreate(**plan_data)
-            crud.subscription.create_subscription_plan(db, obj_in=plan_in)
-            logger.info(f"Created subscription plan: {plan_data['name']}")
-
-    # Create first superuser
-    user = crud.user.get_by_email(db, email=settings.FIRST_SUPERUSER)
-    if not user:
-        user_in = schemas.UserCreate(
-            username=settings.FIRST_SUPERUSER,
-            email=settings.FIRST_SUPERUSER,
-            password=settings.FIRST_SUPERUSER_PASSWORD,
-            is_superuser=True,
-            full_name="Initial Super User"
-        )
-        user = crud.user.create(db, obj_in=user_in)
-
-        # Assign superuser role
-        superuser_role = crud.role.get_by_name(db, name="superadmin")
-        if superuser_role:
-            user.roles.append(superuser_role)
-            db.add(user)
-            db.commit()
-
-    # Create test user
-    test_user = crud.user.get_by_email(db, email=settings.EMAIL_TEST_USER)
-    if not test_user:
-        user_in = schemas.UserCreate(
-            username=settings.EMAIL_TEST_USER,
-            email=settings.EMAIL_TEST_USER,
-            password=settings.EMAIL_TEST_USER_PASSWORD,
-            is_superuser=False,
-            full_name="Test User"
-        )
-        test_user = crud.user.create(db, obj_in=user_in)
 
-    # Create a default AI Avatar
-    avatar = crud.ai_avatar.get_by_name(db, name="Orzu")
+def _seed_content(db: Session) -> None:
+    """The default avatar, course and its lessons (through the ORM, so the search index and catalog see them)."""
+    avatar = db.execute(select(AIAvatar).where(AIAvatar.name == DEFAULT_AVATAR["name"])).scalars().first()
     if not avatar:
-        avatar_in = schemas.AIAvatarCreate(
-            name="Orzu",
-            description="A friendly and helpful AI assistant for learning languages.",
-            avatar_url="https://example.com/orzu.png",
-            voice_id="default_voice",
-            language="uz-UZ",
-            is_public=True,
-        )
-        avatar = crud.ai_avatar.create(db, obj_in=avatar_in)
+        avatar = AIAvatar(**DEFAULT_AVATAR)
+        db.add(avatar)
         logger.info("Created default AI Avatar: Orzu")
 
-    # Create a default Course
-    course = crud.course.get_by_title(db, title="English for Beginners")
+    course = db.execute(select(Course).where(Course.title == DEFAULT_COURSE["title"])).scalars().first()
     if not course:
-        # Assuming the first superuser is the default instructor
-        superuser = crud.user.get_by_email(db, email=settings.FIRST_SUPERUSER)
-        if superuser:
-            course_in = schemas.CourseCreate(
-                title="English for Beginners",
-                description="A comprehensive course for starting your English learning journey.",
-                difficulty_level="Beginner",
-                instructor_id=superuser.id  # Assign superuser's ID
-            )
-            course = crud.course.create_with_instructor(
-                db, obj_in=course_in
+        superuser_id = db.execute(select(User.id).where(User.email == settings.FIRST_SUPERUSER)).scalar()
+        if not superuser_id:
+            return
+        course = Course(**jsonable_encoder(schemas.CourseCreate(**DEFAULT_COURSE, instructor_id=superuser_id)))
+        db.add(course)
+        logger.info("Created default course: English for Beginners")
+    db.flush()
+
+    if not db.execute(select(InteractiveLesson.id).where(InteractiveLesson.course_id == course.id).limit(1)).first():
+        db.add_all(
+            InteractiveLesson(**{**lesson, "difficulty": LessonDifficulty(lesson["difficulty"]),
+                                 "course_id": course.id, "avatar_id": avatar.id})
+            for lesson in DEFAULT_LESSONS
+        )
+        logger.info(f"Created {len(DEFAULT_LESSONS)} lessons for the default course")
+
+
+def init_db(db: Session, *, force: bool = False) -> bool:
+    """
+    Seed roles, subscription plans, the first superuser, the test user and
+    the sample course, once per ``SEED_VERSION``; returns whether it seeded.
+
+    A database already at ``SEED_VERSION`` is skipped after one primary key
+    lookup. Otherwise the seed runs in one transaction under a lock, so when
+    several workers start together one seeds and the others find the new
+    version once it is released. Rows go in with bulk ``INSERT ... ON
+    CONFLICT DO NOTHING``, so seeding over existing data is harmless.
+    """
+    # Tables should be created with Alembic migrations
+    seeded = False
+    if force or _seed_version(db) < SEED_VERSION:
+        _lock(db)
+        if force or _seed_version(db) < SEED_VERSION:
+            roles = insert_ignore(db, Role, [
+                {"name": name, "description": f"{name.capitalize()} role"} for name in ROLE_NAMES
+            ], index_elements=["name"])
+            plans = insert_ignore(db, SubscriptionPlan, SUBSCRIPTION_PLANS, index_elements=["name"])
+            users = _seed_users(db)
+            _seed_content(db)
+            insert_ignore(db, SeedState, [{"key": SEED_KEY, "version": 0}], index_elements=["key"])
+            db.execute(
+                update(SeedState).where(SeedState.key == SEED_KEY)
+                .values(version=SEED_VERSION, applied_at=datetime.utcnow())
             )
-            logger.info("Created default course: English for Beginners")
-
-    # Create some lessons if none exist for the course
-    if course and avatar and not course.lessons:
-        lessons_to_create = [
-            {
-                "title": "Lesson 1: Greetings",
-                "description": "Learn common English greetings.",
-                "content": {"text": "Hello! How are you? - Bu eng keng tarqalgan salomlashish usuli..."},
-                "order": 1,
-                "is_premium": False,
-                "course_id": course.id,
-                "avatar_id": avatar.id,
-                "difficulty": "easy",
-            },
-            {
-                "title": "Lesson 2: The Alphabet",
-                "description": "Learn the English alphabet.",
-                "content": {"text": "The English alphabet consists of 26 letters..."},
-                "order": 2,
-                "is_premium": False,
-                "course_id": course.id,
-                "avatar_id": avatar.id,
-                "difficulty": "easy",
-            },
-            {
-                "title": "Lesson 3: Basic Verbs (Premium)",
-                "description": "Learn essential verbs like to be, to have, to do.",
-                "content": {"text": "Verbs are action words. Let's start with the most important ones..."},
-                "order": 3,
-                "is_premium": True,
-                "course_id": course.id,
-                "avatar_id": avatar.id,
-                "difficulty": "medium",
-            },
-        ]
-
-        for lesson_data in lessons_to_create:
-            # Ensure avatar_id is correctly passed from the dictionary
-            lesson_in = schemas.InteractiveLessonCreate(**lesson_data)
-            crud.interactive_lesson.create(db, obj_in=lesson_in)
-            logger.info(f"Created lesson: {lesson_data['title']}")
-    elif not avatar:
-        logger.error("Default AI Avatar not found, cannot create lessons.")
+            logger.info(f"Seeded database to version {SEED_VERSION}: {roles} roles, {plans} plans, {users} users")
+            seeded = True
+        db.commit()
+
+    # /content lessons used to be kept in uploads/content/lessons.json
+    crud.content_lesson.import_legacy_file(db)
+    return seeded
+
+
+def _word_row(word: Dict[str, Any]) -> Dict[str, Any]:
+    row = {column: word.get(column) for column in WORD_COLUMNS}
+    row["language"] = row["language"] or "en"
+    return row
+
+
+def load_words(db: Session, words: Iterable[Dict[str, Any]], *, chunk_size: int = 5000) -> int:
+    """
+    Bulk-load vocabulary fixtures (dicts with ``word`` plus any of
+    ``WORD_COLUMNS``), e.g. a 100k word dataset for load tests. Words already
+    present for their language are skipped, so a load can be re-run or
+    resumed. Commits per chunk; returns the number of words inserted.
+
+    Rows bypass the ORM, so the content catalog is told to reload in every
+    worker; rebuild the search index afterwards (``search_index.rebuild``)
+    if the words should be searchable.
+    """
+    existing = set(db.execute(select(Word.word, Word.language)).tuples())
+    now = datetime.utcnow()
+    inserted = 0
+    for chunk in chunks(map(_word_row, words), chunk_size):
+        fresh = []
+        for row in chunk:
+            if (row["word"], row["language"]) not in existing:
+                existing.add((row["word"], row["language"]))
+                fresh.append({**row, "is_active": True, "created_at": now, "updated_at": now})
+        inserted += insert_many(db, Word, fresh)
+        db.commit()
+    if inserted:
+        content_catalog.reload_everywhere()
+    return inserted
@@ -0,0 +1,89 @@
+"""
+Per-request SQL statement counting (N+1 detection).
+
+``count_queries()`` activates a counter for the current context; every
+statement executed by any engine while it is active is counted. Used by
+``QueryBudgetMiddleware`` in development and tests.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MAX_RECORDED_STATEMENTS = 50
+
+
+@dataclass
+class QueryCounter:
+    count: int = 0
+    statements: List[str] = field(default_factory=list)
+
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None:
+        counter.count += 1
+        if len(counter.statements) < MAX_RECORDED_STATEMENTS:
+            counter.statements.append(statement)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+@dataclass
+class EndpointQueries:
+    calls: int = 0
+    total: int = 0
+    worst: int = 0
+
+
+class QueryReport:
+    """Statement counts per endpoint plus the requests that went over budget."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.endpoints: Dict[str, EndpointQueries] = {}
+        self.violations: List[Tuple[str, int, List[str]]] = []
+
+    def record(self, endpoint: str, counter: QueryCounter, budget: int) -> None:
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointQueries())
+            stats.calls += 1
+            stats.total += counter.count
+            stats.worst = max(stats.worst, counter.count)
+            if counter.count > budget:
+                self.violations.append((endpoint, counter.count, list(counter.statements)))
+
+    def worst(self, limit: int = 10) -> List[Tuple[str, EndpointQueries]]:
+        with self._lock:
+            ranked = sorted(self.endpoints.items(), key=lambda item: item[1].worst, reverse=True)
+        return ranked[:limit]
+
+    def format(self, limit: int = 10) -> str:
+        lines = [f"{'worst':>6} {'avg':>6} {'calls':>6}  endpoint"]
+        for endpoint, stats in self.worst(limit):
+            lines.append(f"{stats.worst:>6} {stats.total / stats.calls:>6.1f} {stats.calls:>6}  {endpoint}")
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints.clear()
+            self.violations.clear()
+
+
+query_report = QueryReport()
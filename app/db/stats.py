@@ -0,0 +1,122 @@
+"""
+Database statistics for monitoring (``app.core.monitoring.log_database_metrics``).
+
+``collect(engine)`` returns a snapshot for the engine's dialect:
+
+- PostgreSQL: database size, cache hit ratio, connections by state,
+  queries running longer than ``DB_STATS_LONG_QUERY_SECONDS``, the largest
+  tables and indexes, and the top statements by total time from
+  ``pg_stat_statements`` (skipped when the extension is not installed);
+- SQLite: page count and size, freelist pages and the WAL file size.
+
+For every dialect it also reports which of ``HOT_FOREIGN_KEYS`` have no
+index leading with the column, since each of those turns a per-user lookup
+into a full table scan.
+"""
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+
+# (table, column) pairs filtered on by per-user pages and jobs
+HOT_FOREIGN_KEYS: Tuple[Tuple[str, str], ...] = (
+    ("exercise_attempts", "user_id"),
+    ("user_lesson_completions", "user_id"),
+    ("notifications", "user_id"),
+)
+
+
+def missing_foreign_key_indexes(engine: Engine, columns=HOT_FOREIGN_KEYS) -> List[Tuple[str, str]]:
+    """The ``(table, column)`` pairs of existing tables that no index, primary or unique key leads with."""
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    missing = []
+    for table, column in columns:
+        if table not in tables:
+            continue
+        leading = {index["column_names"][0] for index in inspector.get_indexes(table) if index["column_names"]}
+        leading |= {unique["column_names"][0] for unique in inspector.get_unique_constraints(table) if unique["column_names"]}
+        primary_key = inspector.get_pk_constraint(table).get("constrained_columns") or []
+        if primary_key:
+            leading.add(primary_key[0])
+        if column not in leading:
+            missing.append((table, column))
+    return missing
+
+
+def _sqlite(conn: Connection, engine: Engine) -> Dict[str, Any]:
+    page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+    page_count = conn.exec_driver_sql("PRAGMA page_count").scalar()
+    freelist = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+    database = engine.url.database
+    wal_path = f"{database}-wal" if database and database != ":memory:" else None
+    return {
+        "size_bytes": page_size * page_count,
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_count": freelist,
+        "wal_bytes": os.path.getsize(wal_path) if wal_path and os.path.exists(wal_path) else 0,
+    }
+
+
+def _top_statements(conn: Connection, limit: int) -> Optional[List[Dict[str, Any]]]:
+    # Column names changed in PostgreSQL 13 (total_time -> total_exec_time)
+    for total, mean in (("total_exec_time", "mean_exec_time"), ("total_time", "mean_time")):
+        savepoint = conn.begin_nested()
+        try:
+            rows = conn.execute(text(
+                f"SELECT queryid, calls, {total} AS total_ms, {mean} AS mean_ms, rows, query "
+                f"FROM pg_stat_statements ORDER BY {total} DESC LIMIT :limit"
+            ), {"limit": limit}).mappings().all()
+        except SQLAlchemyError:
+            savepoint.rollback()
+            continue
+        savepoint.commit()
+        return [dict(row) for row in rows]
+    return None  # extension not installed (or not readable)
+
+
+def _postgres(conn: Connection) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {}
+    stats["size_bytes"] = conn.execute(text("SELECT pg_database_size(current_database())")).scalar()
+    stats["cache_hit_ratio"] = conn.execute(text(
+        "SELECT sum(blks_hit)::float / NULLIF(sum(blks_hit) + sum(blks_read), 0) "
+        "FROM pg_stat_database WHERE datname = current_database()"
+    )).scalar()
+    stats["connections"] = dict(conn.execute(text(
+        "SELECT coalesce(state, 'unknown'), count(*) FROM pg_stat_activity "
+        "WHERE datname = current_database() GROUP BY 1"
+    )).all())
+    stats["long_running_queries"] = [dict(row) for row in conn.execute(text(
+        "SELECT pid, state, extract(epoch FROM now() - query_start) AS seconds, left(query, 200) AS query "
+        "FROM pg_stat_activity WHERE datname = current_database() AND state <> 'idle' AND pid <> pg_backend_pid() "
+        "AND query_start < now() - make_interval(secs => :seconds) ORDER BY query_start"
+    ), {"seconds": settings.DB_STATS_LONG_QUERY_SECONDS}).mappings()]
+    stats["tables"] = dict(conn.execute(text(
+        "SELECT relname, pg_total_relation_size(relid) FROM pg_statio_user_tables "
+        "ORDER BY 2 DESC LIMIT :limit"
+    ), {"limit": settings.DB_STATS_TOP_RELATIONS}).all())
+    stats["indexes"] = dict(conn.execute(text(
+        "SELECT indexrelname, pg_relation_size(indexrelid) FROM pg_stat_user_indexes "
+        "ORDER BY 2 DESC LIMIT :limit"
+    ), {"limit": settings.DB_STATS_TOP_RELATIONS}).all())
+    stats["top_statements"] = _top_statements(conn, settings.DB_STATS_TOP_QUERIES)
+    return stats
+
+
+def collect(engine: Engine) -> Dict[str, Any]:
+    dialect = engine.dialect.name
+    with engine.connect() as conn:
+        if dialect == "postgresql":
+            stats = _postgres(conn)
+        elif dialect == "sqlite":
+            stats = _sqlite(conn, engine)
+        else:
+            stats = {}
+    stats["dialect"] = dialect
+    stats["missing_fk_indexes"] = missing_foreign_key_indexes(engine)
+    return stats
@@ -0,0 +1,101 @@
+import hmac
+import logging
+import random
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp
+
+from app.core import monitoring, profiling
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Breaks each request's time down into SQL, Redis and AI provider calls.
+
+    Adds a ``Server-Timing`` header (shown per request in browser dev tools)
+    and observes the ``http_request_*`` histograms in ``app.core.monitoring``
+    under the route template. The header has to go out before the body, so
+    for a streamed body (AI replies) it only covers the time to the first
+    byte; the histograms are observed once the body has been sent and
+    include the time spent streaming it. A ``PROFILING_SAMPLE_RATE`` fraction of
+    requests, and requests whose ``X-Profile`` header matches
+    ``PROFILING_TOKEN``, also run under the stack sampler; its collapsed
+    stacks go to ``PROFILING_DIR`` and the file name to ``X-Profile-File``.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: Optional[float] = None, token: Optional[str] = None) -> None:
+        super().__init__(app)
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.token = settings.PROFILING_TOKEN if token is None else token
+        profiling.instrument_redis()
+
+    def _sampled(self, request: Request) -> bool:
+        header = request.headers.get(PROFILE_HEADER)
+        if header and self.token and hmac.compare_digest(header, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        if request.url.path == "/metrics":
+            return await call_next(request)
+
+        sampler = profiling.StackSampler(settings.PROFILING_INTERVAL) if self._sampled(request) else None
+        started = time.perf_counter()
+        with profiling.activate(profiling.RequestProfile()) as profile:
+            if sampler is None:
+                response = await call_next(request)
+            else:
+                with sampler:
+                    response = await call_next(request)
+
+        labels = {"method": request.method, "endpoint": monitoring.route_template(request)}
+        response.headers["Server-Timing"] = profile.server_timing(time.perf_counter() - started)
+
+        if sampler is not None:
+            try:
+                response.headers["X-Profile-File"] = self._dump(sampler, request.method, labels["endpoint"])
+            except OSError as e:
+                logger.warning(f"Could not write the profile of {request.method} {labels['endpoint']}: {e}")
+        response.body_iterator = self._observed(response.body_iterator, profile, labels, started)
+        return response
+
+    @staticmethod
+    async def _observed(
+        body: AsyncIterator[bytes], profile: profiling.RequestProfile, labels: Dict[str, str], started: float,
+    ) -> AsyncIterator[bytes]:
+        """Re-yield the body, then observe the histograms (also if the client went away mid-stream)."""
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            elapsed = time.perf_counter() - started
+            db, redis, ai = (profile.timings[kind] for kind in ("db", "redis", "ai"))
+            monitoring.PROFILED_REQUEST_LATENCY.labels(**labels).observe(elapsed)
+            monitoring.REQUEST_DB_TIME.labels(**labels).observe(db.seconds)
+            monitoring.REQUEST_DB_STATEMENTS.labels(**labels).observe(db.calls)
+            monitoring.REQUEST_REDIS_TIME.labels(**labels).observe(redis.seconds)
+            if ai.calls:
+                monitoring.REQUEST_AI_TIME.labels(**labels).observe(ai.seconds)
+
+    @staticmethod
+    def _dump(sampler: profiling.StackSampler, method: str, endpoint: str) -> str:
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", endpoint).strip("_") or "root"
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{method.lower()}-{slug}.folded"
+        (directory / name).write_text(sampler.collapsed())
+        logger.info(f"Profiled {method} {endpoint}: {sampler.samples} samples in {directory / name}")
+        return name
@@ -0,0 +1,39 @@
+import logging
+
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp
+
+from app.core.config import settings
+from app.db.query_counter import QueryReport, count_queries, query_report
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    """
+    Counts SQL statements per request and flags requests over the budget.
+
+    Adds an ``X-Query-Count`` header and records every request in
+    ``query_report`` (keyed by route template), which the test suite uses to
+    fail tests that exceed the budget and to print the worst endpoints.
+    """
+
+    def __init__(self, app: ASGIApp, budget: int = None, report: QueryReport = query_report) -> None:
+        super().__init__(app)
+        self.budget = budget or settings.QUERY_BUDGET_PER_REQUEST
+        self.report = report
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        with count_queries() as counter:
+            response = await call_next(request)
+
+        route = request.scope.get("route")
+        endpoint = f"{request.method} {getattr(route, 'path', request.url.path)}"
+        self.report.record(endpoint, counter, self.budget)
+        response.headers["X-Query-Count"] = str(counter.count)
+        if counter.count > self.budget:
+            logger.warning(f"{endpoint} ran {counter.count} SQL statements (budget {self.budget})")
+        return response
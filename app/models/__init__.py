@@ -7,6 +7,7 @@ from app.db.base_class import Base
 from .admin_log import AdminLog
 from .ai_avatar import AIAvatar
 from .certificate import Certificate
+from .content_lesson import ContentLesson
 from .course import Course, Enrollment
 from .exercise import Exercise, ExerciseAttempt, ExerciseType
 from .feedback import Feedback
@@ -15,8 +16,11 @@ from .homework import Homework, HomeworkSubmission
 from .lesson import InteractiveLesson, LessonInteraction, LessonSession
 from .notification import Notification
 from .payment_verification import PaymentVerification
+from .platform_stats import DailyPlatformStats, PlatformCounter, PlatformCounterShard
 from .pronunciation import PronunciationAttempt, PronunciationAnalysisResult, PronunciationPhrase, PronunciationSession, \
     UserPronunciationProfile
+from .seed_state import SeedState
+from .stripe_event import StripeEvent
 from .subscription import Subscription, SubscriptionPlan
 from .test import Test, TestQuestion
 from .user import User, Role
@@ -25,6 +29,7 @@ from .user_lesson_progress import UserLessonProgress, UserLessonCompletion
 from .user_level import UserLevel, UserProgress
 from .video_analysis import VideoAnalysis, VideoSegment, VideoQuestion
 from .word import Word, WordDefinition, WordExample
+from .word_review import WordReviewState
 
 # --- __all__ list (Alphabetical Order) ---
 __all__ = [
@@ -36,7 +41,9 @@ __all__ = [
     'AILesson',
     'Base',
     'Certificate',
+    'ContentLesson',
     'Course',
+    'DailyPlatformStats',
     'Enrollment',
     'Exercise',
     'ExerciseAttempt',
@@ -53,11 +60,15 @@ __all__ = [
     'Notification',
     'Payment',
     'PaymentVerification',
+    'PlatformCounter',
+    'PlatformCounterShard',
     'PronunciationAnalysisResult',
     'PronunciationAttempt',
     'PronunciationPhrase',
     'PronunciationSession',
     'Role',
+    'SeedState',
+    'StripeEvent',
     'Subscription',
     'SubscriptionPlan',
     'Test',
@@ -75,5 +86,6 @@ __all__ = [
     'VideoSegment',
     'Word',
     'WordDefinition',
-    'WordExample'
+    'WordExample',
+    'WordReviewState'
 ]
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+
+from app.db.base_class import Base
+
+
+class ContentLesson(Base):
+    """A lesson managed through ``/content/lessons`` (formerly ``uploads/content/lessons.json``)."""
+    __tablename__ = "content_lessons"
+
+    id = Column(Integer, primary_key=True)
+    position = Column(Integer, nullable=False, index=True)  # order in listings and exports
+    title = Column(String(255), nullable=False, default="")
+    data = Column(JSON, nullable=False, default=dict)  # every other field of the lesson document
+    version = Column(Integer, nullable=False, default=1)  # bumped on every write, for If-Match
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # UPDATE/DELETE ... WHERE version = <loaded version>; StaleDataError if another writer got there first
+    __mapper_args__ = {"version_id_col": version}
+
+    def to_dict(self) -> dict:
+        return {**self.data, "id": self.id, "title": self.title, "version": self.version}
+
+    def __repr__(self):
+        return f"<ContentLesson id={self.id} version={self.version}>"
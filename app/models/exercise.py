@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, JSON, DateTime, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum, JSON, DateTime, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
@@ -28,6 +28,10 @@ class DifficultyLevel(str, enum.Enum):
 class Exercise(Base):
     """Model for storing exercise questions."""
     __tablename__ = "exercises"
+    __table_args__ = (
+        # Recommendations: WHERE difficulty = ? AND is_active
+        Index("ix_exercises_difficulty_is_active", "difficulty", "is_active"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     question = Column(Text, nullable=False)
@@ -51,6 +55,10 @@ class Exercise(Base):
 class ExerciseAttempt(Base):
     """Model for tracking user attempts at exercises."""
     __tablename__ = "exercise_attempts"
+    __table_args__ = (
+        # A user's attempts at one exercise, newest first (get_by_user_and_exercise, get_last_attempt)
+        Index("ix_exercise_attempts_user_id_exercise_id_created_at", "user_id", "exercise_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
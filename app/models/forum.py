@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base_class import Base
@@ -17,6 +17,10 @@ class ForumCategory(Base):
 
 class ForumTopic(Base):
     __tablename__ = "forum_topics"
+    __table_args__ = (
+        # Keyset pagination of a category's topics
+        Index("ix_forum_topics_category_id_id", "category_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -35,6 +39,10 @@ class ForumTopic(Base):
 
 class ForumPost(Base):
     __tablename__ = "forum_posts"
+    __table_args__ = (
+        # Keyset pagination of a topic's posts
+        Index("ix_forum_posts_topic_id_id", "topic_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
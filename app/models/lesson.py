@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, func, Enum as SQLAlchemyEnum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Index, func, Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -15,6 +15,10 @@ class LessonDifficulty(str, enum.Enum):
 class InteractiveLesson(Base):
     """Model for storing interactive lessons"""
     __tablename__ = "interactive_lessons"
+    __table_args__ = (
+        # A course's lessons in order
+        Index("ix_interactive_lessons_course_id_order", "course_id", "order"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -1,7 +1,7 @@
 import datetime
 import enum
 import json
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Enum, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -29,6 +29,12 @@ class PaymentStatus(str, enum.Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset pagination of a user's feed (newest first)
+        Index("ix_notifications_user_id_id", "user_id", "id"),
+        # A user's notifications by date (get_multi_by_user orders by created_at)
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON
+
+from app.db.base_class import Base
+
+
+class PlatformCounter(Base):
+    """One precomputed dashboard figure, kept current by ``crud_platform_stats``."""
+    __tablename__ = "platform_counters"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(Float, nullable=False, default=0)
+    data = Column(JSON, nullable=True)  # list-valued stats (top learners / courses)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<PlatformCounter {self.name}={self.value}>"
+
+
+class PlatformCounterShard(Base):
+    """Pending delta for one counter; writers pick a random shard so they do not contend on one row."""
+    __tablename__ = "platform_counter_shards"
+
+    name = Column(String(64), primary_key=True)
+    shard = Column(Integer, primary_key=True, autoincrement=False)
+    value = Column(Float, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PlatformCounterShard {self.name}[{self.shard}]={self.value}>"
+
+
+class DailyPlatformStats(Base):
+    """Per-day rollup for the admin dashboard time series."""
+    __tablename__ = "daily_platform_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    date = Column(Date, nullable=False, unique=True, index=True)
+
+    # Activity during the day
+    new_users = Column(Integer, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+    lessons_completed = Column(Integer, nullable=False, default=0)
+    subscriptions_started = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+    gemini_requests = Column(Integer, nullable=False, default=0)
+    stt_requests = Column(Integer, nullable=False, default=0)
+    tts_characters = Column(Integer, nullable=False, default=0)
+
+    # Counter snapshot at rollup time (AI usage deltas are derived from it)
+    totals = Column(JSON, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DailyPlatformStats {self.date}>"
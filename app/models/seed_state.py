@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base_class import Base
+
+
+class SeedState(Base):
+    """Version of a seed step (``app.db.initial_data``) already applied to this database."""
+    __tablename__ = "seed_state"
+
+    key = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SeedState {self.key}={self.version}>"
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+
+from app.db.base_class import Base
+
+
+class StripeEvent(Base):
+    """A Stripe webhook event as delivered, processed in order per customer by ``payments.*`` jobs."""
+    __tablename__ = "stripe_events"
+
+    id = Column(String(255), primary_key=True)  # Stripe event id ("evt_..."): redeliveries hit the same row
+    type = Column(String(100), nullable=False)
+    customer = Column(String(255), nullable=False)  # ordering key, see crud_stripe_event.customer_key
+    created = Column(Integer, nullable=False)  # Stripe's event timestamp (epoch seconds)
+    payload = Column(JSON, nullable=False)
+    status = Column(String(20), nullable=False, default="pending", index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    received_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = Column(DateTime, nullable=True)
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_stripe_events_customer_created", "customer", "created"),)
+
+    def __repr__(self):
+        return f"<StripeEvent {self.id} {self.type} {self.status}>"
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -36,6 +36,10 @@ class SubscriptionPlan(Base):
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        # A user's active subscriptions; covers MAX(end_date) for User.premium_until
+        Index("ix_subscriptions_user_id_is_active_end_date", "user_id", "is_active", "end_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
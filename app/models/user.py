@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, JSON, Text, Table, Float
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, JSON, Text, Table, Float, and_, or_
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.db.base_class import Base
@@ -31,6 +32,9 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login = Column(DateTime, nullable=True)
     trial_ends_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Latest end_date of the user's active subscriptions (denormalized, kept in
+    # sync by crud_subscription) so premium checks never load `subscriptions`.
+    premium_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, index=True)
 
     # AI Usage Counters
     gpt4o_requests_used: Mapped[int] = mapped_column(Integer, default=0, nullable=False, server_default='0')
@@ -98,7 +102,7 @@ class User(Base):
     def is_admin(self):
         return any(role.name == "admin" for role in self.roles)
 
-    @property
+    @hybrid_property
     def is_premium(self) -> bool:
         """Checks if the user has premium access (superuser, active subscription, or in trial)."""
         if self.is_superuser:
@@ -111,11 +115,16 @@ class User(Base):
             return True
 
         # Check for an active subscription
-        for sub in self.subscriptions:
-            if sub.is_active and sub.end_date > now:
-                return True
+        return bool(self.premium_until and self.premium_until > now)
 
-        return False
+    @is_premium.expression
+    def is_premium(cls):
+        now = datetime.utcnow()
+        return or_(
+            cls.is_superuser == True,
+            and_(cls.trial_ends_at.isnot(None), cls.trial_ends_at > now),
+            and_(cls.premium_until.isnot(None), cls.premium_until > now),
+        )
 
 
 class Role(Base):
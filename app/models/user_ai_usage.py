@@ -23,6 +23,8 @@ class UserAIUsage(Base):
     tts_chars_left = Column(Integer, default=0)
     stt_requests_left = Column(Integer, default=0)
     pronunciation_analysis_left = Column(Integer, default=0)
+    # Billing period ("YYYY-MM") the remaining quotas were last reset for
+    quota_period = Column(String(7), nullable=True)
 
     # Relationship
     user = relationship("User", back_populates="ai_usage")
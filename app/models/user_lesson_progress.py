@@ -2,7 +2,7 @@
 UserLessonProgress model for tracking user progress on lessons.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 
@@ -28,6 +28,10 @@ class UserLessonProgress(Base):
 
 class UserLessonCompletion(Base):
     __tablename__ = "user_lesson_completions"
+    __table_args__ = (
+        # A user's completed lessons (covers is_course_completed's lesson_id IN (...) lookup)
+        Index("ix_user_lesson_completions_user_id_lesson_id", "user_id", "lesson_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, SmallInteger
+
+from app.db.base_class import Base
+
+
+class WordReviewState(Base):
+    """Spaced-repetition state of one word for one learner (see ``app/services/spaced_repetition.py``)."""
+    __tablename__ = "word_review_states"
+    __table_args__ = (
+        # A learner's due queue: WHERE user_id = ? AND next_due_at <= now ORDER BY next_due_at
+        Index("ix_word_review_states_user_id_next_due_at", "user_id", "next_due_at"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    word_id = Column(Integer, ForeignKey("words.id", ondelete="CASCADE"), primary_key=True)
+    repetitions = Column(SmallInteger, nullable=False, default=0)  # successful reviews in a row
+    lapses = Column(SmallInteger, nullable=False, default=0)
+    ease = Column(Float, nullable=False, default=2.5)
+    interval = Column(Integer, nullable=False, default=0)  # days
+    next_due_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_reviewed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<WordReviewState user={self.user_id} word={self.word_id} due={self.next_due_at}>"
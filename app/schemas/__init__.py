@@ -49,6 +49,7 @@ from .notification import Notification, NotificationCreate, NotificationUpdate,
 from .payment_verification import PaymentVerificationBase, PaymentVerificationCreate, PaymentVerificationUpdate, PaymentVerificationInDB, PaymentVerificationApprove, PaymentVerificationReject
 from .pronunciation import PronunciationWordAssessment, PronunciationAssessmentRequest, PronunciationAssessmentResponse, PronunciationExercise
 from .recommendation import PersonalizedRecommendations, AdaptiveLessonPlan, ForYouRecommendations
+from .search import SearchHit, SearchResults, SearchSuggestion
 from .statistics import UserStats, PaymentStats, DashboardStats, GeneralStats
 from .stripe import SubscriptionPlanId, StripeCheckoutSession
 from .subscription import Subscription, SubscriptionCreate, SubscriptionUpdate, SubscriptionPlan, SubscriptionPlanCreate, SubscriptionPlanUpdate
@@ -63,9 +64,10 @@ from .test import (
 )
 from .user_ai_usage import UserAIUsage, UserAIUsageCreate, UserAIUsageUpdate
 from .user_lesson_completion import UserLessonCompletion, UserLessonCompletionCreate, UserLessonCompletionUpdate
-from .word import Word, WordCreate, WordUpdate
+from .word import Word, WordCreate, WordUpdate, WordSuggestion
+from .word_review import DueReview, ReviewGrade, ReviewSubmission, ReviewWordsAdded, WordReviewState
 from .role import Role, RoleCreate, RoleUpdate
-from .admin_stats import UserStats, ContentStats, AIUsageStats, PlatformStats
+from .admin_stats import UserStats, ContentStats, AIUsageStats, PlatformStats, DailyPlatformStats
 from .admin import UserUpdateAdmin
 
 from .user import User, UserCreate, UserUpdate, UserInDB
@@ -103,6 +105,7 @@ __all__ = [
     'ContentStats',
     'AIUsageStats',
     'PlatformStats',
+    'DailyPlatformStats',
     'GeneralStats',
 
     # AI
@@ -124,7 +127,8 @@ __all__ = [
     # Content
     'Course', 'CourseCreate', 'CourseUpdate',
     'Lesson', 'LessonCreate', 'LessonUpdate', 'LessonBase',
-    'Word', 'WordCreate', 'WordUpdate',
+    'Word', 'WordCreate', 'WordUpdate', 'WordSuggestion',
+    'DueReview', 'ReviewGrade', 'ReviewSubmission', 'ReviewWordsAdded', 'WordReviewState',
     'Certificate', 'CertificateCreate', 'CertificateUpdate',
     'Homework', 'HomeworkCreate', 'HomeworkUpdate', 'HomeworkInDB',
     'UserHomework', 'UserHomeworkCreate', 'UserHomeworkUpdate', 'UserHomeworkInDB',
@@ -168,4 +172,5 @@ __all__ = [
     'PersonalizedRecommendations', 'AdaptiveLessonPlan', 'ForYouRecommendations',
     'Role', 'RoleCreate', 'RoleUpdate',
     'UnreadCount',
+    'SearchHit', 'SearchResults', 'SearchSuggestion',
 ]
@@ -1,3 +1,5 @@
+from datetime import date
+
 from pydantic import BaseModel, ConfigDict
 from typing import Dict
 
@@ -39,3 +41,19 @@ class PlatformStats(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
     )
+
+
+class DailyPlatformStats(BaseModel):
+    date: date
+    new_users: int
+    active_users: int
+    lessons_completed: int
+    subscriptions_started: int
+    revenue: float
+    gemini_requests: int
+    stt_requests: int
+    tts_characters: int
+
+    model_config = ConfigDict(
+        from_attributes=True,
+    )
@@ -0,0 +1,24 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from app.core.jobs import JobState
+
+
+class Job(BaseModel):
+    """Status record of a background job."""
+    id: str
+    name: str
+    state: JobState
+    owner_id: Optional[int] = None
+    resource: Optional[str] = None
+    attempts: int = 0
+    progress: Optional[Any] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -3,10 +3,12 @@ from pydantic import BaseModel, Field, ConfigDict
 
 from .lesson import Lesson
 from .exercise import Exercise
+from .word_review import DueReview
 
 class PersonalizedRecommendations(BaseModel):
     lessons: Optional[List[Lesson]] = []
     exercises: Optional[List[Exercise]] = []
+    reviews: Optional[List[DueReview]] = []
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -0,0 +1,27 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+SearchDocType = Literal["word", "lesson", "forum_topic", "forum_post"]
+
+
+class SearchHit(BaseModel):
+    type: SearchDocType
+    id: int
+    title: str
+    snippet: Optional[str] = None  # None for lessons the user cannot open yet
+    score: float
+    parent_id: Optional[int] = None  # word -> lesson, lesson -> course, forum_post -> topic
+    locked: bool = False
+
+
+class SearchResults(BaseModel):
+    query: str
+    items: List[SearchHit]
+    next_offset: Optional[int] = None
+
+
+class SearchSuggestion(BaseModel):
+    type: SearchDocType
+    id: int
+    title: str
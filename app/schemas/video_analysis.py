@@ -99,6 +99,7 @@ class VideoUploadResponse(BaseModel):
     upload_url: Optional[HttpUrl] = None
     status: str
     message: Optional[str] = None
+    job_id: Optional[str] = None
 
     class Config:
         model_config = ConfigDict(
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 
@@ -50,3 +50,11 @@ class WordInDB(WordInDBBase):
     model_config = ConfigDict(
         from_attributes=True,
     )
+
+
+class WordSuggestion(BaseModel):
+    id: int
+    word: str
+    translation: Optional[str] = None
+    matched: Literal["word", "translation"]
+    distance: int = Field(..., description="Edits between the query and the matched field (0: exact)")
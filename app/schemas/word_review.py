@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ReviewGrade(BaseModel):
+    word_id: int
+    grade: int = Field(..., ge=0, le=5, description="0-2: forgotten, 3: hard, 4: good, 5: easy")
+
+
+class ReviewSubmission(BaseModel):
+    reviews: List[ReviewGrade] = Field(..., min_length=1)
+
+
+class WordReviewState(BaseModel):
+    word_id: int
+    repetitions: int
+    lapses: int
+    ease: float
+    interval: int = Field(..., description="Days until the next review")
+    next_due_at: datetime
+    last_reviewed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+    )
+
+
+class DueReview(WordReviewState):
+    word: str
+    translation: Optional[str] = None
+    ipa_pronunciation: Optional[str] = None
+    audio_url: Optional[str] = None
+
+
+class ReviewWordsAdded(BaseModel):
+    added: int
+    word_ids: List[int]
@@ -0,0 +1,197 @@
+"""
+Lesson access policy.
+
+Access depends on two small pieces of state:
+
+- ``Entitlements`` per user: full access (admin/superadmin/superuser), premium
+  (``premium`` role, subscription or trial window) and the courses the user
+  teaches. Computed once and cached in Redis under ``entitlements:{user_id}``.
+- Lesson metadata (course, premium flag, order) and course instructors from
+  the in-process ``ContentCatalog``.
+
+Entitlements are invalidated after commit when roles, subscriptions or the
+courses a user teaches change (session events below); the catalog tracks
+its own changes. ``can_access`` is therefore a pure in-memory check.
+"""
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import FrozenSet, List, Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.cache import redis_client
+from app.core.config import settings
+from app.services.content_catalog import ContentCatalog, LessonMeta, content_catalog
+
+logger = logging.getLogger(__name__)
+
+ENTITLEMENTS_PREFIX = "entitlements"
+FULL_ACCESS_ROLES = frozenset({"admin", "superadmin"})
+PREMIUM_ROLE = "premium"
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    user_id: int
+    full_access: bool = False
+    premium_role: bool = False
+    premium_until: Optional[datetime] = None  # latest of subscription end and trial end
+    course_ids: FrozenSet[int] = field(default_factory=frozenset)  # courses the user teaches
+
+    def has_premium(self, now: Optional[datetime] = None) -> bool:
+        if self.full_access or self.premium_role:
+            return True
+        return self.premium_until is not None and self.premium_until > (now or datetime.utcnow())
+
+    def can_access(self, lesson: LessonMeta, now: Optional[datetime] = None) -> bool:
+        if not lesson.is_premium or lesson.course_id in self.course_ids:
+            return True
+        return self.has_premium(now)
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "user_id": self.user_id,
+            "full_access": self.full_access,
+            "premium_role": self.premium_role,
+            "premium_until": self.premium_until.isoformat() if self.premium_until else None,
+            "course_ids": sorted(self.course_ids),
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "Entitlements":
+        data = json.loads(raw)
+        until = data.get("premium_until")
+        return cls(
+            user_id=data["user_id"],
+            full_access=data["full_access"],
+            premium_role=data["premium_role"],
+            premium_until=datetime.fromisoformat(until) if until else None,
+            course_ids=frozenset(data["course_ids"]),
+        )
+
+
+class AccessPolicy:
+    def __init__(self, catalog: ContentCatalog) -> None:
+        self.catalog = catalog
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"{ENTITLEMENTS_PREFIX}:{user_id}"
+
+    def compute(self, db: Session, user: models.User) -> Entitlements:
+        role_names = {role.name for role in user.roles}
+        windows = [
+            value.replace(tzinfo=None)
+            for value in (user.premium_until, user.trial_ends_at)
+            if value is not None
+        ]
+        return Entitlements(
+            user_id=user.id,
+            full_access=bool(user.is_superuser) or bool(role_names & FULL_ACCESS_ROLES),
+            premium_role=PREMIUM_ROLE in role_names,
+            premium_until=max(windows) if windows else None,
+            course_ids=self.catalog.courses_taught_by(db, user.id),
+        )
+
+    def entitlements(
+        self, db: Session, *, user: Optional[models.User] = None, user_id: Optional[int] = None
+    ) -> Optional[Entitlements]:
+        """Cached entitlements for ``user`` (or ``user_id``); None if the user does not exist."""
+        user_id = user.id if user is not None else user_id
+        if user_id is None:
+            return None
+        try:
+            cached = redis_client.get(self._key(user_id))
+            if cached:
+                return Entitlements.from_json(cached)
+        except Exception:
+            pass
+        if user is None:
+            from app.crud import loaders
+
+            user = db.query(models.User).options(*loaders.AUTH).filter(models.User.id == user_id).first()
+            if user is None:
+                return None
+        entitlements = self.compute(db, user)
+        try:
+            redis_client.set(self._key(user_id), entitlements.to_json(), ex=settings.ACCESS_ENTITLEMENTS_TTL)
+        except Exception:
+            pass
+        return entitlements
+
+    def can_access(self, db: Session, *, user: Optional[models.User] = None, user_id: Optional[int] = None,
+                   lesson_id: int) -> bool:
+        lesson = self.catalog.lesson(db, lesson_id)
+        entitlements = self.entitlements(db, user=user, user_id=user_id)
+        return lesson is not None and entitlements is not None and entitlements.can_access(lesson)
+
+    def accessible_lessons(self, db: Session, entitlements: Entitlements,
+                           course_id: Optional[int] = None) -> List[LessonMeta]:
+        """Accessible lessons in course/lesson order."""
+        now = datetime.utcnow()
+        return [meta for meta in self.catalog.ordered(db, course_id) if entitlements.can_access(meta, now)]
+
+    def invalidate_user(self, user_id: int) -> None:
+        try:
+            redis_client.delete(self._key(user_id))
+        except Exception:
+            pass
+
+
+access_policy = AccessPolicy(content_catalog)
+
+
+# --- Invalidation ------------------------------------------------------------
+# Mapper events only record what changed; the cache is cleared after commit so
+# a concurrent request cannot re-cache the pre-commit state.
+
+_PENDING_USERS = "access_policy_users"
+
+
+def _pending(target) -> Optional[dict]:
+    session = inspect(target).session
+    return session.info if session is not None else None
+
+
+def _user_changed(mapper, connection, target) -> None:
+    info = _pending(target)
+    if info is not None:
+        info.setdefault(_PENDING_USERS, set()).add(target.id)
+
+
+def _subscription_changed(mapper, connection, target) -> None:
+    info = _pending(target)
+    if info is not None and target.user_id is not None:
+        info.setdefault(_PENDING_USERS, set()).add(target.user_id)
+
+
+def _course_changed(mapper, connection, target) -> None:
+    info = _pending(target)
+    if info is None:
+        return
+    history = inspect(target).attrs.instructor_id.history
+    instructors = {target.instructor_id, *history.deleted} - {None}
+    info.setdefault(_PENDING_USERS, set()).update(instructors)
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(models.User, _event, _user_changed)
+    event.listen(models.Subscription, _event, _subscription_changed)
+    event.listen(models.Course, _event, _course_changed)
+# Keep the previous instructor even if the attribute was expired, so both lose/gain access
+event.listen(models.Course.instructor_id, "set", lambda *args: None, active_history=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_USERS, ()):
+        access_policy.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(_PENDING_USERS, None)
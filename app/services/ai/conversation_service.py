@@ -8,6 +8,7 @@ import numpy as np
 from pydantic import BaseModel
 
 from app.core.config import settings
+from app.core.registry import services
 from app.services.ai.stt import STTService
 from app.services.ai.tts import TTSService
 from app.services.ai.pronunciation import PronunciationAnalyzer
@@ -195,4 +196,4 @@ class AIConversationService:
         self.conversation_contexts[context.conversation_id] = context
 
 # Singleton instance
-conversation_service = AIConversationService()
+conversation_service = services.lazy("ai.conversation_service", AIConversationService)
@@ -1,8 +1,8 @@
 import os
 import logging
 from typing import List, Dict, Any, Optional
-import google.generativeai as genai
 from app.core.config import settings
+from app.services.ai_clients import genai
 
 logger = logging.getLogger(__name__)
 
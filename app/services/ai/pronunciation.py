@@ -6,6 +6,7 @@ import wave
 import io
 import speech_recognition as sr
 from pydub import AudioSegment
+from app.core.registry import services
 
 logger = logging.getLogger(__name__)
 
@@ -247,4 +248,4 @@ class PronunciationAnalyzer:
             return f"The word '{word}' was difficult to understand. Please practice this word."
 
 # Singleton instance
-pronunciation_analyzer = PronunciationAnalyzer()
+pronunciation_analyzer = services.lazy("ai.pronunciation_analyzer", PronunciationAnalyzer)
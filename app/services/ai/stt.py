@@ -8,6 +8,7 @@ from pydub import AudioSegment
 import numpy as np
 
 from app.core.config import settings
+from app.core.registry import services
 
 logger = logging.getLogger(__name__)
 
@@ -206,4 +207,4 @@ class STTService:
         return self.supported_languages
 
 # Singleton instance
-stt_service = STTService()
+stt_service = services.lazy("ai.stt_service", STTService)
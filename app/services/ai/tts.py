@@ -13,6 +13,8 @@ from pydub.playback import play
 import numpy as np
 
 from app.core.config import settings
+from app.core.registry import services
+from app.services.tts_executor import tts_executor
 
 logger = logging.getLogger(__name__)
 
@@ -123,12 +125,12 @@ class TTSService:
             **{k: v for k, v in kwargs.items() if k in TTSOptions.__annotations__}
         )
         
-        # Try different TTS providers until one succeeds
+        # Try different TTS providers until one succeeds; they block, so run them in the TTS pool
         last_error = None
         
         for provider in self.providers:
             try:
-                audio_data = await provider(text, options)
+                audio_data = await tts_executor.run(provider, text, options)
                 if audio_data:
                     logger.info(f"TTS generated {len(audio_data)} bytes of audio")
                     return audio_data
@@ -177,7 +179,7 @@ class TTSService:
         # Default fallback
         return self.default_voice
     
-    async def _azure_tts(self, text: str, options: TTSOptions) -> bytes:
+    def _azure_tts(self, text: str, options: TTSOptions) -> bytes:
         """Use Azure Cognitive Services for TTS"""
         if not settings.AZURE_SPEECH_KEY or not settings.AZURE_SPEECH_REGION:
             raise ValueError("Azure Speech Service credentials not configured")
@@ -247,7 +249,7 @@ class TTSService:
             logger.error(f"Azure TTS error: {str(e)}")
             raise
     
-    async def _google_tts(self, text: str, options: TTSOptions) -> bytes:
+    def _google_tts(self, text: str, options: TTSOptions) -> bytes:
         """Use Google Cloud Text-to-Speech API"""
         if not settings.GOOGLE_CLOUD_CREDENTIALS_JSON:
             raise ValueError("Google Cloud credentials not configured")
@@ -305,7 +307,7 @@ class TTSService:
             logger.error(f"Google TTS error: {str(e)}")
             raise
     
-    async def _espeak_tts(self, text: str, options: TTSOptions) -> bytes:
+    def _espeak_tts(self, text: str, options: TTSOptions) -> bytes:
         """Use eSpeak as a fallback TTS (offline, lower quality)"""
         try:
             from gtts import gTTS
@@ -345,4 +347,4 @@ class TTSService:
             raise
 
 # Singleton instance
-tts_service = TTSService()
+tts_service = services.lazy("ai.tts_service", TTSService)
@@ -5,11 +5,11 @@ import random
 import logging
 import json
 from typing import Dict, List, Optional, Any, Union
-import google.generativeai as genai
 from fastapi import HTTPException
 import tempfile
 
 from app.core.config import settings
+from app.core.registry import services
 from app.services.ai.tts import tts_service
 from app.services.ai.gemini_service import GeminiService
 
@@ -243,7 +243,7 @@ class AIAvatarService:
         return self.avatars.get(avatar_type, self.avatars["default"])
 
 # Initialize the service
-ai_avatar_service = AIAvatarService()
+ai_avatar_service = services.lazy("ai_avatar_service", AIAvatarService)
 
 # Export the service instance
 __all__ = ["ai_avatar_service"]
@@ -1,11 +1,15 @@
 import logging
 import os
-import google.generativeai as genai
-from google.cloud import speech, texttospeech
 from app.core.config import settings
+from app.core.registry import lazy_module, services
 
 logger = logging.getLogger(__name__)
 
+# SDK modules are imported on first use (see app.core.registry)
+genai = lazy_module("google.generativeai", setup=lambda module: module.configure(api_key=settings.GOOGLE_API_KEY))
+speech = lazy_module("google.cloud.speech")
+texttospeech = lazy_module("google.cloud.texttospeech")
+
 # --- Google Gemini Client --- #
 def get_gemini_model():
     """Initializes and returns the Gemini Pro model."""
@@ -13,14 +17,13 @@ def get_gemini_model():
         if not settings.GOOGLE_API_KEY:
             logger.warning("GOOGLE_API_KEY is not set. Gemini AI functionality will be disabled.")
             return None
-        genai.configure(api_key=settings.GOOGLE_API_KEY)
         model = genai.GenerativeModel('gemini-pro')
         return model
     except Exception as e:
         logger.error(f"Error initializing Gemini Pro model: {e}")
         return None
 
-gemini_model = get_gemini_model()
+gemini_model = services.lazy("gemini_model", get_gemini_model)
 
 async def get_gemini_response(prompt: str) -> str:
     """Generates a response from the Gemini model."""
@@ -45,7 +48,7 @@ def get_google_speech_client():
         logger.error(f"Google Cloud Speech client initialization failed: {e}")
         return None
 
-speech_client = get_google_speech_client()
+speech_client = services.lazy("speech_client", get_google_speech_client)
 
 # --- Google Cloud Text-to-Speech Client --- #
 def get_google_tts_client():
@@ -59,4 +62,4 @@ def get_google_tts_client():
         logger.error(f"Google Cloud TTS client initialization failed: {e}")
         return None
 
-tts_client = get_google_tts_client()
+tts_client = services.lazy("tts_client", get_google_tts_client)
@@ -1,21 +1,16 @@
 import os
 import json
 import httpx
-import google.generativeai as genai
 from google.api_core.client_options import ClientOptions
 from typing import AsyncGenerator, Dict, Any, Optional, List, Union, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status, BackgroundTasks
 from pydantic import BaseModel, Field
 import asyncio
-import aiohttp
 import json
 import logging
 import base64
 from datetime import datetime, timedelta
-import io
-from gtts import gTTS
-import whisper
 import tempfile
 
 from ..models.lesson import LessonSession
@@ -24,32 +19,45 @@ from ..models.lesson import LessonSession
 logger = logging.getLogger(__name__)
 
 from app import crud, models, schemas
+from app.core import profiling
 from app.core.config import settings
+from app.core.registry import lazy_module, services
+from app.services.ai_clients import genai
+from app.services.content_catalog import content_catalog
+from app.services.tts_executor import gtts_language, gtts_provider, tts_executor
 from datetime import datetime
 
 from ..schemas import Lesson
 
-# Configure Gemini
-genai.configure(api_key=settings.GOOGLE_API_KEY)
+# aiohttp is imported on first use, like the Gemini SDK (gTTS: services.tts_executor)
+aiohttp = lazy_module("aiohttp")
 
 # Env flags to make tests fast and non-blocking
 DISABLE_WHISPER = os.getenv("DISABLE_WHISPER") == "1"
 DISABLE_GEMINI = os.getenv("DISABLE_GEMINI") == "1"
 DISABLE_TTS = os.getenv("DISABLE_TTS") == "1"
 
-# Load the Whisper model on startup unless disabled via env
-whisper_model = None
-if DISABLE_WHISPER:
-    print("Whisper model loading skipped (DISABLE_WHISPER=1).")
-else:
+
+def _load_whisper_model():
+    """The Whisper model (and torch) is loaded on first use or by ``lifespan``, not on import."""
+    if DISABLE_WHISPER:
+        print("Whisper model loading skipped (DISABLE_WHISPER=1).")
+        return None
     try:
+        import whisper
+
         # Using the 'tiny' model for faster performance and lower resource usage.
         # Other options: 'base', 'small', 'medium', 'large'
-        whisper_model = whisper.load_model("tiny")
+        model = whisper.load_model("tiny")
         print("Whisper model (tiny) loaded successfully.")
+        return model
     except Exception as e:
         print(f"Warning: Failed to load Whisper model: {e}")
         print("Speech-to-text functionality will be limited or disabled.")
+        return None
+
+
+services.register("whisper_model", _load_whisper_model)
 
 # Constants
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
@@ -126,7 +134,7 @@ async def call_gemini_api(
     params = {"key": api_key}
     
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(event_hooks=profiling.httpx_event_hooks("ai")) as client:
             response = await client.post(
                 url,
                 params=params,
@@ -250,9 +258,8 @@ async def ask_llm(
     final_prompt = prompt
 
     if lesson_id:
-        lesson = crud.lesson.get(db, id=lesson_id)
-        if lesson and lesson.content:
-            context = lesson.content
+        context = content_catalog.lesson_content(db, lesson_id)
+        if context:
             final_prompt = f"""Foydalanuvchi quyidagi savolni berdi: '{prompt}'
 
 Bu savolga FAQAT quyidagi dars matni asosida javob bering. Agar javob matnda mavjud bo'lmasa, 'Bu savolning javobi darsda mavjud emas.' deb ayting. Darsdan tashqari ma'lumot ishlatmang.
@@ -282,6 +289,7 @@ async def transcribe_audio_file(file_content: bytes) -> str:
         # Fast path for tests
         return "test transcription"
 
+    whisper_model = services.get("whisper_model")
     if not whisper_model:
         raise Exception("Transkripsiya xatoligi: Whisper modeli yuklanmagan.")
 
@@ -315,33 +323,25 @@ async def text_to_speech_stream(
     """
     Converts text to speech using gTTS and streams the audio data.
 
+    The text is split at sentence boundaries and the sentences are synthesized
+    concurrently in the TTS thread pool (``services.tts_executor``); each
+    sentence's MP3 is yielded as soon as it is ready.
+
     Args:
         text: The text to synthesize.
-        language_code: The language code (e.g., "en", "uz").
+        language_code: The language code (e.g., "en", "uz", "en-US").
 
     Yields:
-        bytes: Chunks of the MP3 audio data.
+        bytes: MP3 audio, one sentence segment at a time.
     """
     try:
-        # gTTS requires a 2-letter language code
-        lang = language_code.split('-')[0]
-        
-        # Create the gTTS object
-        tts = gTTS(text=text, lang=lang, slow=False)
-        
-        # Save the audio to an in-memory file
-        mp3_fp = io.BytesIO()
-        tts.write_to_fp(mp3_fp)
-        mp3_fp.seek(0)
-        
-        # Yield the audio in chunks
-        chunk_size = 1024
-        while chunk := mp3_fp.read(chunk_size):
-            yield chunk
+        provider = gtts_provider(gtts_language(language_code))
+        async for audio in tts_executor.stream(text, provider):
+            yield audio
 
     except Exception as e:
         print(f"gTTS xatoligi: {e}")
-        # Yield nothing in case of an error
+        # Stop the stream in case of an error
         return
 
 
@@ -582,9 +582,10 @@ async def get_chat_completion(
         *chat_history, current_message = history
 
         chat = model.start_chat(history=chat_history)
-        response = await chat.send_message_async(current_message['parts'], stream=True)
+        with profiling.track("ai", calls=0):
+            response = await chat.send_message_async(current_message['parts'], stream=True)
 
-        async for chunk in response:
+        async for chunk in profiling.timed_stream(response):
             if chunk.text:
                 yield chunk.text
 
@@ -663,7 +664,9 @@ async def call_gemini_api(
     for attempt in range(max_retries):
         try:
             async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=request_dict, params=params) as response:
+                with profiling.track("ai"):
+                    response = await session.post(url, json=request_dict, params=params)
+                async with response:
                     if response.status == 200:
                         return await response.json()
                     
@@ -1,5 +1,3 @@
-import google.generativeai as genai
-from google.cloud import texttospeech, speech
 from app.core.config import settings
 import logging
 import os
@@ -9,6 +7,8 @@ from typing import Optional, Dict, AsyncGenerator
 from sqlalchemy.orm import Session
 
 from app import crud
+from app.crud import loaders
+from app.services.ai_clients import genai, speech, texttospeech
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -145,7 +145,7 @@ async def analyze_user_answer(question: str, correct_answer: str, user_answer: s
 
 async def analyze_exercise_attempt(db: Session, exercise_attempt_id: int):
     """Analyzes a user's incorrect exercise attempt using AI and updates the feedback."""
-    attempt = crud.exercise_attempt.get(db, id=exercise_attempt_id)
+    attempt = crud.exercise_attempt.get(db, id=exercise_attempt_id, profile=loaders.EXERCISE_ANALYSIS)
     if not attempt or attempt.is_correct:
         return
 
@@ -0,0 +1,201 @@
+"""
+Storage for AI multi-turn sessions.
+
+Redis layout (every key expires ``AI_SESSION_TTL`` after the session's last
+write):
+
+- ``ai_session_meta:{id}``: hash of session metadata (id, user_id, title,
+  status, created_at, updated_at);
+- ``ai_session_messages:{id}``: append-only list of JSON messages, trimmed to
+  the newest ``AI_SESSION_MAX_MESSAGES``;
+- ``ai_sessions_by_user:{user_id}``: sorted set of the user's session ids
+  scored by creation time.
+
+Listing a user's sessions is one ZREVRANGE plus a pipelined HGETALL/LLEN for
+each session on the page, posting a message is one RPUSH + LTRIM, and chat
+history is an LRANGE of the last few entries. Index entries whose session
+has expired are dropped when a listing finds them. Without Redis the same
+operations run on in-process structures (one worker only, like
+``JobStore``).
+"""
+import json
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from app.core.cache import redis_client
+from app.core.config import settings
+
+META_PREFIX = "ai_session_meta"
+MESSAGES_PREFIX = "ai_session_messages"
+USER_INDEX_PREFIX = "ai_sessions_by_user"
+
+
+def _now() -> Tuple[datetime, str]:
+    now = datetime.utcnow()
+    return now, now.isoformat() + "Z"
+
+
+def _decode_meta(raw: Dict[str, str]) -> Dict[str, Any]:
+    meta: Dict[str, Any] = dict(raw)
+    meta["user_id"] = int(meta["user_id"])
+    return meta
+
+
+class AISessionStore:
+    """Session metadata, per-user index and message log, with an in-memory fallback."""
+
+    def __init__(self) -> None:
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._messages: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._by_user: Dict[int, Dict[str, float]] = {}
+
+    @staticmethod
+    def _meta_key(session_id: str) -> str:
+        return f"{META_PREFIX}:{session_id}"
+
+    @staticmethod
+    def _messages_key(session_id: str) -> str:
+        return f"{MESSAGES_PREFIX}:{session_id}"
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"{USER_INDEX_PREFIX}:{user_id}"
+
+    def _touch(self, pipe, session: Dict[str, Any]) -> None:
+        for key in (
+            self._meta_key(session["id"]), self._messages_key(session["id"]), self._user_key(session["user_id"]),
+        ):
+            pipe.expire(key, settings.AI_SESSION_TTL)
+
+    def create(self, user_id: int, title: str) -> Dict[str, Any]:
+        now, now_iso = _now()
+        session = {"id": uuid4().hex, "user_id": user_id, "title": title, "status": "idle", "created_at": now_iso}
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.hset(self._meta_key(session["id"]), mapping=session)
+            pipe.zadd(self._user_key(user_id), {session["id"]: now.timestamp()})
+            self._touch(pipe, session)
+            pipe.execute()
+        except Exception:
+            self._meta[session["id"]] = dict(session)
+            self._by_user.setdefault(user_id, {})[session["id"]] = now.timestamp()
+        return session
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = redis_client.hgetall(self._meta_key(session_id))
+            if raw:
+                return _decode_meta(raw)
+        except Exception:
+            pass
+        meta = self._meta.get(session_id)
+        return dict(meta) if meta else None
+
+    def update(self, session: Dict[str, Any], **fields: Any) -> Dict[str, Any]:
+        """Set metadata ``fields`` on a session loaded with ``get``; returns the updated metadata."""
+        fields["updated_at"] = _now()[1]
+        session = {**session, **fields}
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.hset(self._meta_key(session["id"]), mapping=fields)
+            self._touch(pipe, session)
+            pipe.execute()
+        except Exception:
+            self._meta[session["id"]] = dict(session)
+        return session
+
+    def delete(self, session: Dict[str, Any]) -> None:
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.delete(self._meta_key(session["id"]), self._messages_key(session["id"]))
+            pipe.zrem(self._user_key(session["user_id"]), session["id"])
+            pipe.execute()
+        except Exception:
+            pass
+        self._meta.pop(session["id"], None)
+        self._messages.pop(session["id"], None)
+        self._by_user.get(session["user_id"], {}).pop(session["id"], None)
+
+    def list_for_user(self, user_id: int, *, limit: int = 50, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """A page of the user's sessions, newest first, with ``message_count``; and the user's total."""
+        try:
+            user_key = self._user_key(user_id)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.zcard(user_key)
+            pipe.zrevrange(user_key, offset, offset + limit - 1)
+            total, session_ids = pipe.execute()
+            pipe = redis_client.pipeline(transaction=False)
+            for session_id in session_ids:
+                pipe.hgetall(self._meta_key(session_id))
+                pipe.llen(self._messages_key(session_id))
+            results = pipe.execute() if session_ids else []
+            sessions, expired = [], []
+            for session_id, raw, count in zip(session_ids, results[0::2], results[1::2]):
+                if raw:
+                    sessions.append({**_decode_meta(raw), "message_count": count})
+                else:
+                    expired.append(session_id)
+            if expired:
+                redis_client.zrem(user_key, *expired)
+            return sessions, total - len(expired)
+        except Exception:
+            pass
+        index = self._by_user.get(user_id, {})
+        session_ids = sorted(index, key=index.get, reverse=True)
+        sessions = [
+            {**self._meta[session_id], "message_count": len(self._messages.get(session_id, ()))}
+            for session_id in session_ids[offset:offset + limit]
+        ]
+        return sessions, len(session_ids)
+
+    def append_messages(self, session: Dict[str, Any], messages: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Append ``messages`` to the log (oldest trimmed past the cap); returns the updated metadata."""
+        messages = list(messages)
+        updated_at = _now()[1]
+        session = {**session, "updated_at": updated_at}
+        try:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.rpush(self._messages_key(session["id"]), *(json.dumps(m, default=str) for m in messages))
+            pipe.ltrim(self._messages_key(session["id"]), -settings.AI_SESSION_MAX_MESSAGES, -1)
+            pipe.hset(self._meta_key(session["id"]), "updated_at", updated_at)
+            self._touch(pipe, session)
+            pipe.execute()
+        except Exception:
+            log = self._messages.setdefault(session["id"], deque(maxlen=settings.AI_SESSION_MAX_MESSAGES))
+            log.extend(json.loads(json.dumps(m, default=str)) for m in messages)
+            self._meta[session["id"]] = dict(session)
+        return session
+
+    def history(self, session_id: str, count: int) -> List[Dict[str, Any]]:
+        """The last ``count`` messages, oldest first."""
+        if count <= 0:
+            return []
+        try:
+            return [json.loads(m) for m in redis_client.lrange(self._messages_key(session_id), -count, -1)]
+        except Exception:
+            return list(self._messages.get(session_id, ()))[-count:]
+
+    def messages(self, session_id: str, *, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Messages ``offset``..``offset + limit`` (oldest first) and the number stored."""
+        stop = -1 if limit is None else offset + limit - 1
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.llen(self._messages_key(session_id))
+            pipe.lrange(self._messages_key(session_id), offset, stop)
+            total, raw = pipe.execute()
+            return [json.loads(m) for m in raw], total
+        except Exception:
+            log = list(self._messages.get(session_id, ()))
+            return log[offset:None if limit is None else offset + limit], len(log)
+
+    def clear_messages(self, session: Dict[str, Any]) -> None:
+        try:
+            redis_client.delete(self._messages_key(session["id"]))
+        except Exception:
+            pass
+        self._messages.pop(session["id"], None)
+
+
+ai_session_store = AISessionStore()
@@ -0,0 +1,187 @@
+"""
+Certificate PDF rendering.
+
+Every certificate shares the same page: border, title and the fixed wording.
+That static layer is drawn once per process and its PDF drawing operators are
+cached; each certificate then only replays the cached operators and draws the
+per-user fields (name, course, level, date, verification code) on top. With
+the embedded DejaVu fonts the layer's characters are assigned their subset
+codes first, in the cached order, so the replayed operators stay valid.
+Both steps use ReportLab internals (pinned in requirements.txt); if those
+change, the template logs it once and draws the static layer normally.
+
+The renderer is used from the ``certificates.render_certificate`` job, so PDFs
+are produced when a certificate is issued and the download endpoints only
+stream the stored file.
+"""
+import io
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from reportlab.lib.colors import black, darkblue
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+
+def _register_fonts(font_dir: Optional[str] = None) -> Tuple[str, str]:
+    font_dir = font_dir or os.path.join(settings.STATIC_FILES_DIR, "fonts")
+    try:
+        pdfmetrics.registerFont(TTFont("DejaVu-Bold", os.path.join(font_dir, "DejaVuSans-Bold.ttf")))
+        pdfmetrics.registerFont(TTFont("DejaVu", os.path.join(font_dir, "DejaVuSans.ttf")))
+        return "DejaVu", "DejaVu-Bold"
+    except Exception:
+        return "Helvetica", "Helvetica-Bold"
+
+
+@dataclass(frozen=True)
+class CertificateFields:
+    user_name: str
+    course_name: str
+    issue_date: str
+    verification_code: str
+    level_completed: Optional[str] = None
+
+
+class CertificateTemplate:
+    """Fixed certificate layout with a cached static layer."""
+
+    def __init__(self, font: str, font_bold: str, pagesize: Tuple[float, float] = landscape(letter)) -> None:
+        self.font = font
+        self.font_bold = font_bold
+        self.pagesize = pagesize
+        self._lock = threading.Lock()
+        self._static: Optional[Tuple[str, Dict[str, str], Dict[str, str]]] = None
+        self._replayable = True
+
+    def draw_static(self, c: canvas.Canvas) -> None:
+        width, height = self.pagesize
+
+        c.setStrokeColor(darkblue)
+        c.setLineWidth(3)
+        c.rect(0.2 * inch, 0.2 * inch, width - 0.4 * inch, height - 0.4 * inch)
+
+        c.setFont(self.font_bold, 36)
+        c.drawCentredString(width / 2, height - 1.5 * inch, "Certificate of Completion")
+
+        c.setFont(self.font, 18)
+        c.drawCentredString(width / 2, height - 2.5 * inch, "This certifies that")
+        c.drawCentredString(width / 2, height - 4.5 * inch, "has successfully completed the course")
+
+    def draw_fields(self, c: canvas.Canvas, fields: CertificateFields) -> None:
+        width, height = self.pagesize
+
+        c.setFont(self.font_bold, 32)
+        c.setFillColor(darkblue)
+        c.drawCentredString(width / 2, height - 3.5 * inch, fields.user_name)
+
+        c.setFillColor(black)
+        c.setFont(self.font_bold, 24)
+        c.drawCentredString(width / 2, height - 5.2 * inch, fields.course_name)
+
+        if fields.level_completed:
+            c.setFont(self.font, 16)
+            c.drawCentredString(width / 2, height - 5.8 * inch, f"Level: {fields.level_completed}")
+
+        c.setFont(self.font, 12)
+        c.drawString(0.5 * inch, 0.5 * inch, f"Issue Date: {fields.issue_date}")
+        c.drawRightString(width - 0.5 * inch, 0.5 * inch, f"Verification Code: {fields.verification_code}")
+
+    def static_layer(self) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """PDF operators of the static layer, the font resource names they use
+        and, for embedded TrueType fonts, the characters the layer assigned
+        subset codes to (in assignment order)."""
+        if self._static is None:
+            with self._lock:
+                if self._static is None:
+                    scratch = canvas.Canvas(io.BytesIO(), pagesize=self.pagesize)
+                    self.draw_static(scratch)
+                    ops = "\n".join(["q", *scratch._code, "Q"])
+                    subsets = {}
+                    for font_name in scratch._doc.fontMapping:
+                        font = pdfmetrics.getFont(font_name)
+                        if font._dynamicFont:
+                            assignments = font.state[scratch._doc].assignments
+                            subsets[font_name] = "".join(chr(code) for code in sorted(assignments, key=assignments.get))
+                    self._static = (ops, dict(scratch._doc.fontMapping), subsets)
+        return self._static
+
+    def _replay_static(self, c: canvas.Canvas) -> bool:
+        if not self._replayable:
+            return False
+        try:
+            ops, font_names, subsets = self.static_layer()
+            # Register the fonts in the same order so the operators' /F<n> names resolve
+            for font_name, internal_name in font_names.items():
+                font = pdfmetrics.getFont(font_name)
+                if font._dynamicFont:
+                    # TrueType glyphs are subset per document: assigning the same
+                    # characters in the same order gives them the same codes
+                    font.splitString(subsets[font_name], c._doc)
+                    font.getSubsetInternalName(0, c._doc)
+                    if c._doc.fontMapping.get(font_name) != internal_name:
+                        return False
+                elif c._doc.getInternalFontName(font_name) != internal_name:
+                    return False
+        except (AttributeError, KeyError) as e:
+            logger.warning(f"Cannot replay the cached certificate layer with this ReportLab, drawing it instead: {e!r}")
+            self._replayable = False
+            return False
+        c.addLiteral(ops)
+        return True
+
+    def render(self, fields: CertificateFields) -> bytes:
+        buffer = io.BytesIO()
+        c = canvas.Canvas(buffer, pagesize=self.pagesize)
+        c.setTitle(f"Certificate - {fields.course_name}")
+        if not self._replay_static(c):
+            c.saveState()
+            self.draw_static(c)
+            c.restoreState()
+        self.draw_fields(c, fields)
+        c.showPage()
+        c.save()
+        return buffer.getvalue()
+
+
+class CertificateRenderer:
+    """Renders certificates and stores them under ``<settings.MEDIA_ROOT>/certificates``."""
+
+    def __init__(self, storage_dir: Optional[str] = None) -> None:
+        self.storage_dir = storage_dir or os.path.join(settings.MEDIA_ROOT, "certificates")
+        self._template: Optional[CertificateTemplate] = None
+
+    @property
+    def template(self) -> CertificateTemplate:
+        if self._template is None:
+            self._template = CertificateTemplate(*_register_fonts())
+        return self._template
+
+    def render(self, fields: CertificateFields) -> bytes:
+        return self.template.render(fields)
+
+    def path_for(self, certificate_id: int) -> str:
+        return os.path.join(self.storage_dir, f"certificate_{certificate_id}.pdf")
+
+    def render_to_file(self, certificate_id: int, fields: CertificateFields) -> str:
+        """Render and atomically write the PDF. Returns its (relative) path."""
+        os.makedirs(self.storage_dir, exist_ok=True)
+        path = self.path_for(certificate_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.render(fields))
+        os.replace(tmp_path, path)
+        return path
+
+
+certificate_renderer = CertificateRenderer()
@@ -0,0 +1,442 @@
+"""
+In-process catalog of courses, lessons and vocabulary metadata.
+
+Course/lesson/word metadata changes rarely but is read on almost every
+request (access checks, lesson ordering, recommendations, LLM lesson
+context). ``ContentCatalog`` keeps an immutable snapshot of it in memory:
+
+- ``CourseMeta`` / ``LessonMeta`` / ``WordMeta`` (no large text columns);
+- lessons ordered per course with precomputed previous/next links;
+- indexes by course, course difficulty level, instructor and lesson.
+
+Writes through the ORM record the changed IDs; after commit the catalog
+re-reads only those rows and rebuilds the indexes. Each change set is
+published to Redis (a version counter plus a short change log), so other
+workers apply the same incremental refresh, or a full reload if they fell
+too far behind. Without Redis, workers fall back to a periodic full reload.
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.cache import redis_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "content_catalog:version"
+CHANGES_KEY = "content_catalog:changes"
+KINDS = ("courses", "lessons", "words")
+
+
+@dataclass(frozen=True, slots=True)
+class CourseMeta:
+    id: int
+    title: str
+    difficulty_level: Optional[str]
+    instructor_id: Optional[int]
+    is_published: bool
+    lesson_ids: Tuple[int, ...] = ()  # in lesson order
+
+
+@dataclass(frozen=True, slots=True)
+class LessonMeta:
+    id: int
+    course_id: Optional[int]
+    is_premium: bool
+    order: int
+    title: str = ""
+    is_active: bool = True
+    difficulty: Optional[str] = None
+    previous_id: Optional[int] = None  # within the course
+    next_id: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class WordMeta:
+    id: int
+    word: str
+    level: Optional[str]
+    lesson_id: Optional[int]
+    is_active: bool
+    translation: str = ""
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    version: Optional[int]
+    courses: Mapping[int, CourseMeta]
+    lessons: Mapping[int, LessonMeta]
+    words: Mapping[int, WordMeta]
+    ordered: Tuple[LessonMeta, ...]  # by course, then lesson order
+    by_difficulty: Mapping[str, Tuple[int, ...]]  # course difficulty level -> lesson ids
+    by_instructor: Mapping[int, frozenset]  # instructor id -> course ids
+    words_by_lesson: Mapping[int, Tuple[int, ...]]
+
+
+def _build(courses: Dict[int, CourseMeta], lessons: Dict[int, LessonMeta],
+           words: Dict[int, WordMeta], version: Optional[int]) -> _Snapshot:
+    per_course: Dict[Optional[int], List[LessonMeta]] = defaultdict(list)
+    for meta in lessons.values():
+        per_course[meta.course_id].append(meta)
+
+    linked: Dict[int, LessonMeta] = {}
+    for course_lessons in per_course.values():
+        course_lessons.sort(key=lambda m: (m.order, m.id))
+        for i, meta in enumerate(course_lessons):
+            linked[meta.id] = replace(
+                meta,
+                previous_id=course_lessons[i - 1].id if i > 0 else None,
+                next_id=course_lessons[i + 1].id if i + 1 < len(course_lessons) else None,
+            )
+
+    courses = {
+        cid: replace(course, lesson_ids=tuple(m.id for m in per_course.get(cid, ())))
+        for cid, course in courses.items()
+    }
+    by_difficulty: Dict[str, List[int]] = defaultdict(list)
+    by_instructor: Dict[int, Set[int]] = defaultdict(set)
+    for cid in sorted(courses):
+        course = courses[cid]
+        if course.difficulty_level:
+            by_difficulty[course.difficulty_level].extend(course.lesson_ids)
+        if course.instructor_id is not None:
+            by_instructor[course.instructor_id].add(cid)
+    words_by_lesson: Dict[int, List[int]] = defaultdict(list)
+    for wid in sorted(words):
+        if words[wid].lesson_id is not None:
+            words_by_lesson[words[wid].lesson_id].append(wid)
+
+    return _Snapshot(
+        version=version,
+        courses=MappingProxyType(courses),
+        lessons=MappingProxyType(linked),
+        words=MappingProxyType(dict(words)),
+        ordered=tuple(sorted(linked.values(), key=lambda m: (m.course_id or 0, m.order, m.id))),
+        by_difficulty=MappingProxyType({k: tuple(v) for k, v in by_difficulty.items()}),
+        by_instructor=MappingProxyType({k: frozenset(v) for k, v in by_instructor.items()}),
+        words_by_lesson=MappingProxyType({k: tuple(v) for k, v in words_by_lesson.items()}),
+    )
+
+
+def _deep_size(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (dict, MappingProxyType)):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_deep_size(getattr(obj, name), seen) for name in obj.__slots__)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_size(vars(obj), seen)
+    return size
+
+
+def _query(db: Session, kind: str, ids: Optional[Iterable[int]] = None) -> Dict[int, Any]:
+    """Fresh metadata for ``kind`` (all rows, or just ``ids``)."""
+    if kind == "courses":
+        model = models.Course
+        stmt = select(model.id, model.title, model.difficulty_level, model.instructor_id, model.is_published)
+        make = lambda r: CourseMeta(r.id, r.title, r.difficulty_level, r.instructor_id, bool(r.is_published))
+    elif kind == "lessons":
+        model = models.InteractiveLesson
+        stmt = select(model.id, model.course_id, model.is_premium, model.order, model.title,
+                      model.is_active, model.difficulty)
+        make = lambda r: LessonMeta(
+            r.id, r.course_id, bool(r.is_premium), r.order or 0, r.title or "",
+            r.is_active is not False, getattr(r.difficulty, "value", r.difficulty),
+        )
+    else:
+        model = models.Word
+        stmt = select(model.id, model.word, model.level, model.lesson_id, model.is_active, model.translation)
+        make = lambda r: WordMeta(r.id, r.word, r.level, r.lesson_id, r.is_active is not False, r.translation or "")
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(list(ids)))
+    return {row.id: make(row) for row in db.execute(stmt)}
+
+
+@dataclass
+class CatalogStats:
+    loads: int = 0
+    refreshes: int = 0
+    lookups: int = 0  # each one replaces at least one SELECT
+    bytes: int = 0  # measured on full loads and in describe() (a deep walk costs ~0.5 s at 100k words)
+    loaded_at: float = 0.0
+
+
+class ContentCatalog:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._snapshot: Optional[_Snapshot] = None
+        self._pending: Dict[str, Set[int]] = {kind: set() for kind in KINDS}
+        self._dirty = False
+        self._checked_at = 0.0
+        self._content: "OrderedDict[int, Any]" = OrderedDict()
+        self._measured = False
+        self.stats = CatalogStats()
+
+    # --- Loading -------------------------------------------------------------
+
+    def _remote_version(self) -> Optional[int]:
+        try:
+            value = redis_client.get(VERSION_KEY)
+            return int(value) if value is not None else 0
+        except Exception:
+            return None
+
+    def _changes_since(self, version: Optional[int], remote: int) -> Optional[Dict[str, Set[int]]]:
+        """Union of published changes after ``version``; None if the log no longer covers them."""
+        if version is None:
+            return None
+        try:
+            entries = [json.loads(raw) for raw in redis_client.lrange(CHANGES_KEY, 0, -1)]
+        except Exception:
+            return None
+        entries = [entry for entry in entries if version < entry["v"] <= remote]
+        if sorted(entry["v"] for entry in entries) != list(range(version + 1, remote + 1)):
+            return None
+        changes: Dict[str, Set[int]] = {kind: set() for kind in KINDS}
+        for entry in entries:
+            for kind in KINDS:
+                changes[kind].update(entry.get(kind, ()))
+        return changes
+
+    def _load(self, db: Session, version: Optional[int]) -> None:
+        self._install(_build(*(_query(db, kind) for kind in KINDS), version))
+        self._content.clear()
+        self._measure()
+        self.stats.loads += 1
+        logger.info(
+            "Content catalog loaded: %d courses, %d lessons, %d words (%d KiB)",
+            len(self._snapshot.courses), len(self._snapshot.lessons), len(self._snapshot.words),
+            self.stats.bytes // 1024,
+        )
+
+    def _refresh(self, db: Session, changes: Dict[str, Set[int]], version: Optional[int]) -> None:
+        snapshot = self._snapshot
+        current = {"courses": snapshot.courses, "lessons": snapshot.lessons, "words": snapshot.words}
+        updated = []
+        for kind in KINDS:
+            items = dict(current[kind])
+            if changes[kind]:
+                fresh = _query(db, kind, changes[kind])
+                for item_id in changes[kind]:
+                    items.pop(item_id, None)
+                items.update(fresh)
+            updated.append(items)
+        self._install(_build(*updated, version))
+        for lesson_id in changes["lessons"]:
+            self._content.pop(lesson_id, None)
+        self.stats.refreshes += 1
+
+    def _install(self, snapshot: _Snapshot) -> None:
+        self._snapshot = snapshot
+        self._measured = False
+        self.stats.loaded_at = time.monotonic()
+
+    def _measure(self) -> None:
+        snapshot = self._snapshot
+        if snapshot is not None and not self._measured:
+            self.stats.bytes = _deep_size(snapshot)
+            self._measured = True
+
+    def _take_pending(self) -> Dict[str, Set[int]]:
+        pending, self._pending = self._pending, {kind: set() for kind in KINDS}
+        return pending
+
+    def _ensure(self, db: Session) -> _Snapshot:
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if snapshot is not None and not self._dirty and now - self._checked_at < settings.CONTENT_CATALOG_RECHECK:
+            self.stats.lookups += 1
+            return snapshot
+        with self._lock:
+            if self._snapshot is not None and not self._dirty and now - self._checked_at < settings.CONTENT_CATALOG_RECHECK:
+                return self._snapshot  # another thread just refreshed it
+            self._checked_at, self._dirty = now, False
+            remote = self._remote_version()
+            if self._snapshot is None:
+                self._take_pending()
+                self._load(db, remote)
+            elif remote is None and now - self.stats.loaded_at >= settings.CONTENT_CATALOG_TTL:
+                # No Redis: other workers' edits are only picked up by reloading
+                self._take_pending()
+                self._load(db, None)
+            else:
+                changes = self._take_pending()
+                if remote is not None and remote != self._snapshot.version:
+                    published = self._changes_since(self._snapshot.version, remote)
+                    if published is None:
+                        self._load(db, remote)
+                        changes = None
+                    else:
+                        changes = {kind: changes[kind] | published[kind] for kind in KINDS}
+                if changes and any(changes.values()):
+                    self._refresh(db, changes, remote if remote is not None else self._snapshot.version)
+            self.stats.lookups += 1
+            return self._snapshot
+
+    def warm(self, db: Session) -> None:
+        """Load the catalog up front (startup) instead of on the first request."""
+        self._ensure(db)
+
+    def invalidate(self) -> None:
+        """Drop everything; the next lookup reloads from the database."""
+        with self._lock:
+            self._snapshot = None
+            self._content.clear()
+
+    def reload_everywhere(self) -> None:
+        """
+        After writes the mapper events do not see (bulk inserts, raw SQL):
+        drop the local snapshot and bump the version without a change-log
+        entry, so every other worker finds a gap in the log and reloads fully.
+        """
+        self.invalidate()
+        try:
+            redis_client.incr(VERSION_KEY)
+        except Exception:
+            pass  # without Redis the other workers reload after CONTENT_CATALOG_TTL
+
+    def publish(self, changes: Dict[str, Set[int]]) -> None:
+        """Apply committed changes locally and announce them to the other workers."""
+        with self._lock:
+            for kind in KINDS:
+                self._pending[kind].update(changes.get(kind, ()))
+            self._dirty = True
+        try:
+            version = redis_client.incr(VERSION_KEY)
+            redis_client.rpush(
+                CHANGES_KEY, json.dumps({"v": version, **{kind: sorted(changes.get(kind, ())) for kind in KINDS}})
+            )
+            redis_client.ltrim(CHANGES_KEY, -settings.CONTENT_CATALOG_CHANGE_LOG, -1)
+        except Exception:
+            pass
+
+    # --- Lookups -------------------------------------------------------------
+
+    def course(self, db: Session, course_id: int) -> Optional[CourseMeta]:
+        return self._ensure(db).courses.get(course_id)
+
+    def lesson(self, db: Session, lesson_id: int) -> Optional[LessonMeta]:
+        return self._ensure(db).lessons.get(lesson_id)
+
+    def word(self, db: Session, word_id: int) -> Optional[WordMeta]:
+        return self._ensure(db).words.get(word_id)
+
+    def words(self, db: Session) -> Mapping[int, WordMeta]:
+        """All words (a new mapping after every catalog refresh; unchanged entries are the same objects)."""
+        return self._ensure(db).words
+
+    def next_lesson(self, db: Session, lesson_id: int) -> Optional[LessonMeta]:
+        snapshot = self._ensure(db)
+        meta = snapshot.lessons.get(lesson_id)
+        return snapshot.lessons.get(meta.next_id) if meta and meta.next_id else None
+
+    def previous_lesson(self, db: Session, lesson_id: int) -> Optional[LessonMeta]:
+        snapshot = self._ensure(db)
+        meta = snapshot.lessons.get(lesson_id)
+        return snapshot.lessons.get(meta.previous_id) if meta and meta.previous_id else None
+
+    def ordered(self, db: Session, course_id: Optional[int] = None) -> Tuple[LessonMeta, ...]:
+        """All lessons by course and lesson order, or one course's lessons."""
+        snapshot = self._ensure(db)
+        if course_id is None:
+            return snapshot.ordered
+        course = snapshot.courses.get(course_id)
+        return tuple(snapshot.lessons[lid] for lid in course.lesson_ids) if course else ()
+
+    def lessons_by_difficulty(self, db: Session, difficulty_level: str) -> Tuple[LessonMeta, ...]:
+        """Lessons of courses at ``difficulty_level`` (course difficulty, e.g. "A1" or "beginner")."""
+        snapshot = self._ensure(db)
+        return tuple(snapshot.lessons[lid] for lid in snapshot.by_difficulty.get(difficulty_level, ()))
+
+    def courses_taught_by(self, db: Session, user_id: int) -> frozenset:
+        return self._ensure(db).by_instructor.get(user_id, frozenset())
+
+    def words_for_lesson(self, db: Session, lesson_id: int) -> Tuple[WordMeta, ...]:
+        snapshot = self._ensure(db)
+        return tuple(snapshot.words[wid] for wid in snapshot.words_by_lesson.get(lesson_id, ()))
+
+    def lesson_content(self, db: Session, lesson_id: int) -> Any:
+        """Lesson body (LLM context); a small LRU, dropped when the lesson changes."""
+        if self.lesson(db, lesson_id) is None:
+            return None
+        with self._lock:
+            if lesson_id in self._content:
+                self._content.move_to_end(lesson_id)
+                return self._content[lesson_id]
+        content = db.execute(
+            select(models.InteractiveLesson.content).where(models.InteractiveLesson.id == lesson_id)
+        ).scalar()
+        with self._lock:
+            self._content[lesson_id] = content
+            while len(self._content) > settings.CONTENT_CATALOG_CONTENT_CACHE:
+                self._content.popitem(last=False)
+        return content
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            self._measure()
+        snapshot = self._snapshot
+        return {
+            "loaded": snapshot is not None,
+            "version": snapshot.version if snapshot else None,
+            "courses": len(snapshot.courses) if snapshot else 0,
+            "lessons": len(snapshot.lessons) if snapshot else 0,
+            "words": len(snapshot.words) if snapshot else 0,
+            "memory_bytes": self.stats.bytes,
+            "cached_lesson_contents": len(self._content),
+            "loads": self.stats.loads,
+            "refreshes": self.stats.refreshes,
+            "lookups": self.stats.lookups,
+        }
+
+
+content_catalog = ContentCatalog()
+
+
+# --- Change tracking -----------------------------------------------------------
+# Mapper events record changed IDs on the session; they are published after
+# commit (a rolled-back change must not reach the catalog).
+
+_PENDING = "content_catalog_changes"
+
+
+def _tracker(kind: str):
+    def _changed(mapper, connection, target) -> None:
+        session = inspect(target).session
+        if session is not None:
+            session.info.setdefault(_PENDING, {k: set() for k in KINDS})[kind].add(target.id)
+    return _changed
+
+
+for _model, _kind in ((models.Course, "courses"), (models.InteractiveLesson, "lessons"), (models.Word, "words")):
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _tracker(_kind))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING, None)
+    if changes:
+        content_catalog.publish(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_PENDING, None)
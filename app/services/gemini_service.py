@@ -1,8 +1,10 @@
 import os
-import google.generativeai as genai
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
+from app.core.registry import services
+from app.services.ai_clients import genai
+
 # Load environment variables
 load_dotenv()
 
@@ -42,4 +44,4 @@ class GeminiService:
             )
 
 # Create a singleton instance
-gemini_service = GeminiService()
+gemini_service = services.lazy("gemini_service", GeminiService)
@@ -1,7 +1,10 @@
+import difflib
 import logging
+import re
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app import models, schemas
 from app.crud import crud_homework, crud_user
@@ -13,6 +16,8 @@ from app.models.homework import (
     HomeworkStatus,
 )
 from app.schemas.homework import OralAssignmentBase
+from app.schemas.ai_feedback import AIFeedbackRequest
+from app.services.ai_feedback_service import ai_feedback_service
 
 logger = logging.getLogger(__name__)
 
@@ -306,3 +311,197 @@ class HomeworkService:
                 "title": a.homework.course.title
             } if a.homework.course else None
         } for a in assignments]
+
+
+async def generate_ai_feedback(
+    *,
+    submission: Dict[str, Any] | None,
+    assignment: Any | None,
+    student: Any | None,
+) -> Dict[str, Any]:
+    """Generate AI feedback and adapt it to the structure expected by auto-grading.
+
+    Priority for user_response source:
+    1) submission["audio"]["transcript"] (STT result)
+    2) submission["text"] or submission["content"]
+
+    Heuristic auto-grading:
+    - If reference text is available from assignment (instructions/description),
+      compute a similarity ratio (0-100) between normalized user_response and reference.
+    - Attach feedback describing alignment and gaps.
+
+    If AIFeedbackService works, we include its output into metadata; otherwise we still
+    return a heuristic result.
+    """
+    try:
+        # Extract a textual response with preference to STT transcript
+        user_response = ""
+        transcript = None
+        if isinstance(submission, dict):
+            audio_part = submission.get("audio") if isinstance(submission.get("audio"), dict) else None
+            if audio_part:
+                transcript = audio_part.get("transcript")
+            user_response = transcript or submission.get("text") or submission.get("content") or ""
+
+        reference_text = None
+        if assignment is not None:
+            # Try common fields for expected/guide text
+            reference_text = getattr(assignment, "instructions", None) or getattr(assignment, "description", None)
+
+        req = AIFeedbackRequest(
+            user_response=user_response or "",
+            reference_text=reference_text or None,
+            context={
+                "student_id": getattr(student, "id", None),
+                "homework_id": getattr(assignment, "id", None),
+            },
+        )
+        ai_resp = None
+        try:
+            ai_resp = await ai_feedback_service.generate_feedback(req)
+        except Exception as e_ai:
+            # Non-fatal; we'll fall back to heuristics below
+            logger.info(f"AI feedback service unavailable, using heuristics: {e_ai}")
+
+        # Heuristic grading if we have a reference
+        def _normalize(text: str) -> str:
+            t = text.lower()
+            t = re.sub(r"[^a-z0-9\s']+", " ", t)
+            t = re.sub(r"\s+", " ", t).strip()
+            return t
+
+        score = None
+        fb_parts = []
+        meta: Dict[str, Any] = {}
+        if reference_text and user_response:
+            norm_user = _normalize(user_response)
+            norm_ref = _normalize(reference_text)
+            ratio = difflib.SequenceMatcher(None, norm_user, norm_ref).ratio()
+            score = round(ratio * 100, 2)
+            fb_parts.append(f"Similarity to expected answer: {score}%.")
+            # Highlight simple diff hints (missing words)
+            user_words = set(norm_user.split())
+            ref_words = set(norm_ref.split())
+            missing = [w for w in ref_words - user_words if w.isalpha()]
+            extra = [w for w in user_words - ref_words if w.isalpha()]
+            if missing:
+                fb_parts.append(f"Key words to include: {', '.join(missing[:10])}.")
+            if extra:
+                fb_parts.append(f"Extra words detected: {', '.join(extra[:10])}.")
+            meta.update({
+                "heuristic": {
+                    "ratio": ratio,
+                    "missing_words": missing[:50],
+                    "extra_words": extra[:50],
+                }
+            })
+
+        # If AI overall exists, blend it into feedback
+        blended_feedback = None
+        if ai_resp is not None:
+            overall = ai_resp.overall
+            ai_score = getattr(overall, "score", None)
+            ai_text = getattr(overall, "feedback", None)
+            meta["ai_feedback"] = ai_resp.model_dump()
+            if ai_text:
+                fb_parts.append(str(ai_text))
+            # Prefer heuristic score if available; else take AI score
+            if score is None:
+                score = ai_score
+
+        blended_feedback = " ".join(p for p in fb_parts if p)
+
+        return {
+            "score": score,
+            "feedback": blended_feedback or ("Transcription received." if transcript else "Response received."),
+            "auto_graded": score is not None,
+            "metadata": meta,
+        }
+    except Exception as e:
+        logger.warning(f"Fallback AI feedback due to error: {e}")
+        return {
+            "score": None,
+            "feedback": "AI feedback is currently unavailable.",
+            "auto_graded": False,
+            "metadata": {"error": str(e)},
+        }
+
+
+async def process_audio_submission(
+    db: Session,
+    submission_id: int,
+    audio_path: str,
+    audio_data: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Transcribe an oral submission and store the transcript on it.
+
+    Errors are raised (not swallowed) so the calling job can retry.
+    """
+    submission = db.get(HomeworkSubmissionModel, submission_id)
+    if not submission:
+        logger.error(f"Submission {submission_id} not found for audio processing")
+        return None
+
+    from app.services import ai_service  # heavy (Whisper); only needed by workers
+
+    transcript = await ai_service.transcribe_audio_file(Path(audio_path).read_bytes())
+
+    meta = dict(submission.metadata_ or {})
+    audio_meta = dict(meta.get("audio") or {})
+    audio_meta.update({
+        "file": audio_data.get("file"),
+        "url": audio_data.get("url"),
+        "uploaded_at": audio_data.get("uploaded_at"),
+        "transcript": transcript,
+    })
+    meta["audio"] = audio_meta
+    submission.metadata_ = meta
+    # If content is empty, store transcript as content for easier display
+    if not submission.content and transcript:
+        submission.content = transcript
+    db.add(submission)
+    db.commit()
+
+    logger.info(f"Successfully transcribed audio for submission {submission_id}")
+    return {"submission_id": submission_id, "student_id": submission.student_id, "transcript": transcript}
+
+
+async def auto_grade_submission(db: Session, submission_id: int) -> Optional[Dict[str, Any]]:
+    """Automatically grade a submission using AI feedback + heuristics."""
+    submission = db.query(HomeworkSubmissionModel).options(
+        joinedload(HomeworkSubmissionModel.homework),
+        joinedload(HomeworkSubmissionModel.student)
+    ).filter(HomeworkSubmissionModel.id == submission_id).first()
+
+    if not submission:
+        return None
+
+    meta = submission.metadata_ or {}
+    sub_payload: Dict[str, Any] = {
+        "audio": meta.get("audio"),
+        "text": submission.content,
+        "content": submission.content,
+    }
+    feedback = await generate_ai_feedback(
+        submission=sub_payload,
+        assignment=submission.homework,
+        student=submission.student
+    )
+    if not feedback:
+        return None
+
+    auto_graded = feedback.get("auto_graded", False)
+    score_val = feedback.get("score")
+    graded = auto_graded or score_val is not None
+    submission.status = HomeworkStatus.GRADED if graded else HomeworkStatus.SUBMITTED
+    submission.score = score_val
+    submission.feedback = feedback.get("feedback")
+    submission.graded_at = datetime.utcnow() if graded else None
+    submission.metadata_ = {
+        **meta,
+        "auto_graded": auto_graded,
+        "grading_metadata": feedback.get("metadata", {}),
+    }
+    db.add(submission)
+    db.commit()
+    return {"submission_id": submission_id, "score": score_val, "auto_graded": auto_graded}
@@ -1,13 +1,24 @@
+import json
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Union
+from sqlalchemy import Select
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
+from app.core.cache import redis_client
 from app.models.notification import NotificationType
-from app.schemas.notification import NotificationCreate, PaymentStatus
+from app.schemas.notification import PaymentStatus
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_CHANNEL_PREFIX = "notifications"
+PUBLISH_CHUNK = 1000
+
+
+def notification_channel(user_id: int) -> str:
+    """Redis pub/sub channel a user's connected sockets listen on."""
+    return f"{NOTIFICATION_CHANNEL_PREFIX}:{user_id}"
+
 class NotificationService:
     """Service for handling application notifications."""
     
@@ -39,18 +50,82 @@ class NotificationService:
         Returns:
             The created notification
         """
-        notification_in = NotificationCreate(
-            user_id=user_id,
-            title=title,
-            message=message,
-            notification_type=notification_type,
-            status=status,
-            data=data or {},
-            related_id=related_id
-        )
-        
-        return crud.notification.create(db=self.db, obj_in=notification_in)
-    
+        notification_data = {
+            "title": title,
+            "message": message,
+            "notification_type": notification_type,
+            "data": {"status": status, "related_id": related_id, **(data or {})},
+        }
+        return crud.notification.create_for_user(self.db, obj_in=notification_data, user_id=user_id)
+
+    def fan_out(
+        self,
+        recipients: Union[Iterable[int], Select],
+        *,
+        title: str,
+        message: str,
+        notification_type: NotificationType = NotificationType.GENERAL,
+        data: Optional[Dict[str, Any]] = None,
+        context: Optional[Dict[str, Any]] = None,
+        deliver: bool = True,
+    ) -> int:
+        """
+        Send the same notification to many users in bulk.
+
+        Args:
+            recipients: User ids, or a ``select()`` of user ids (an audience
+                query such as all students of a course), which is inserted
+                with a single ``INSERT ... SELECT``
+            title: Title template, rendered once with ``context``
+            message: Message template, rendered once with ``context``
+            notification_type: Type of notification
+            data: Additional data stored with every notification
+            context: Values for the ``str.format`` placeholders in the templates
+            deliver: Also push the notification to the users' connected sockets
+
+        Returns:
+            Number of notifications created
+        """
+        if context:
+            title = title.format(**context)
+            message = message.format(**context)
+        values = {
+            "title": title,
+            "message": message,
+            "notification_type": notification_type,
+            "data": data or {},
+        }
+
+        if isinstance(recipients, Select):
+            user_ids = crud.notification.create_for_audience(self.db, audience=recipients, values=values)
+        else:
+            user_ids = list(dict.fromkeys(recipients))
+            if not user_ids:
+                return 0
+            crud.notification.create_bulk(self.db, user_ids=user_ids, values=values)
+
+        if deliver and user_ids:
+            self.publish(user_ids, {
+                "type": "notification",
+                "title": title,
+                "message": message,
+                "notification_type": getattr(notification_type, "value", notification_type),
+                "data": data or {},
+            })
+        return len(user_ids)
+
+    def publish(self, user_ids: List[int], payload: Dict[str, Any]) -> None:
+        """Push ``payload`` to the users' notification channels (best effort)."""
+        message = json.dumps(payload, default=str)
+        try:
+            for i in range(0, len(user_ids), PUBLISH_CHUNK):
+                pipe = redis_client.pipeline(transaction=False)
+                for user_id in user_ids[i:i + PUBLISH_CHUNK]:
+                    pipe.publish(notification_channel(user_id), message)
+                pipe.execute()
+        except Exception as e:
+            logger.debug(f"Real-time notification delivery skipped: {e}")
+
     def notify_payment_verification_submitted(
         self,
         user: models.User,
@@ -158,7 +233,7 @@ class NotificationService:
         self,
         payment_verification: models.PaymentVerification,
         admin_emails: List[str]
-    ) -> List[models.Notification]:
+    ) -> int:
         """
         Create notifications for admins about a new payment verification.
         
@@ -167,40 +242,35 @@ class NotificationService:
             admin_emails: List of admin email addresses to notify
             
         Returns:
-            List of created notifications
+            Number of notifications created
         """
         if not admin_emails:
-            return []
+            return 0
             
         # Get admin users by email
         admins = crud.user.get_multi_by_emails(
             db=self.db, emails=admin_emails, is_superuser=True
         )
         
-        notifications = []
         title = "New Payment Verification Submitted"
         message = (
             f"User {payment_verification.user.email} has submitted a payment verification "
             f"for ${payment_verification.amount:.2f} via {payment_verification.payment_method}."
         )
-        
-        for admin in admins:
-            notification = self.create_notification(
-                user_id=admin.id,
-                title=title,
-                message=message,
-                notification_type=NotificationType.ADMIN_PAYMENT_VERIFICATION_SUBMITTED,
-                related_id=payment_verification.id,
-                data={
-                    "user_id": payment_verification.user_id,
-                    "user_email": payment_verification.user.email,
-                    "amount": float(payment_verification.amount),
-                    "payment_method": payment_verification.payment_method
-                }
-            )
-            notifications.append(notification)
-        
-        return notifications
+
+        return self.fan_out(
+            [admin.id for admin in admins],
+            title=title,
+            message=message,
+            notification_type=NotificationType.ADMIN_PAYMENT_VERIFICATION_SUBMITTED,
+            data={
+                "related_id": payment_verification.id,
+                "user_id": payment_verification.user_id,
+                "user_email": payment_verification.user.email,
+                "amount": float(payment_verification.amount),
+                "payment_method": payment_verification.payment_method
+            }
+        )
 
 # Create a singleton instance
 notification_service = NotificationService(None)
@@ -74,14 +74,7 @@ class PremiumService:
                 self.db, obj_in=subscription_in
             )
         
-        # Update user's premium status
-        user = crud.user.get(self.db, id=user_id)
-        if user:
-            user.is_premium = True
-            user.premium_until = subscription.end_date
-            self.db.add(user)
-            self.db.commit()
-        
+        # User.premium_until follows the subscription (see crud_subscription)
         logger.info(f"Granted {days} days of premium access to user {user_id}")
         return subscription
     
@@ -117,24 +110,8 @@ class PremiumService:
                 self.db, db_obj=subscription, obj_in=subscription_in
             )
             
-            # Check if user has any other active subscriptions
-            has_other_active = crud.subscription.has_active_subscription(
-                self.db, user_id=user_id, exclude_id=subscription.id
-            )
-            
-            # Update user's premium status
-            user = crud.user.get(self.db, id=user_id)
-            if user:
-                if has_other_active:
-                    # User has another active subscription, keep premium status
-                    user.premium_until = subscription.end_date
-                else:
-                    # No other active subscriptions, revoke premium status
-                    user.is_premium = False
-                    user.premium_until = None
-                
-                self.db.add(user)
-                self.db.commit()
+            # User.premium_until is recomputed from the remaining active
+            # subscriptions when the subscription is saved (see crud_subscription)
             
             logger.info(f"Revoked premium access from user {user_id}. Reason: {reason}")
             return subscription
@@ -151,22 +128,12 @@ class PremiumService:
         Returns:
             bool: True if the user has active premium access, False otherwise
         """
-        # Check user's premium status first (quick check)
-        user = crud.user.get(self.db, id=user_id)
-        if not user:
-            return False
-            
-        if not user.is_premium or not user.premium_until:
-            return False
-            
-        if user.premium_until < datetime.utcnow():
-            # Premium has expired, update user status
-            user.is_premium = False
-            self.db.add(user)
-            self.db.commit()
-            return False
-            
-        return True
+        # Single indexed query: no user row or subscriptions are loaded
+        return bool(
+            self.db.query(models.User.id)
+            .filter(models.User.id == user_id, models.User.is_premium)
+            .first()
+        )
 
 # Create a singleton instance
 premium_service = PremiumService(None)
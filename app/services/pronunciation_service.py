@@ -9,6 +9,8 @@ import speech_recognition as sr
 from scipy.spatial.distance import cosine
 import Levenshtein
 
+from app.core.registry import services
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -215,4 +217,4 @@ class PronunciationAnalyzer:
             return "Iltimos, talaffuzga ko'proq e'tibor bering. Ko'proq mashq qiling."
 
 # Singleton instance
-pronunciation_analyzer = PronunciationAnalyzer()
+pronunciation_analyzer = services.lazy("pronunciation_analyzer", PronunciationAnalyzer)
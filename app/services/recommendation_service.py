@@ -5,6 +5,7 @@ from app import crud, models, schemas
 from app.models.user import User
 from app.models.user_level import UserLevel
 from app.schemas import Lesson
+from app.services.content_catalog import content_catalog
 
 
 def get_recommended_lessons(db: Session, user: User, limit: int = 10) -> List[Lesson]:
@@ -24,19 +25,19 @@ def get_recommended_lessons(db: Session, user: User, limit: int = 10) -> List[Le
     # Get IDs of lessons the user has already completed
     completed_lesson_ids = crud.user_lesson_completion.get_completed_lesson_ids(db, user_id=user.id)
 
-    # Find courses that match the user's level
+    # Lessons of courses that match the user's level, in course/lesson order
     # Note: We assume course.difficulty_level string matches UserLevel enum values
-    courses = db.query(models.Course).filter(models.Course.difficulty_level == current_user_level.value).all()
-
-    recommended_lessons = []
-    for course in courses:
-        for lesson in course.lessons:
-            if lesson.id not in completed_lesson_ids and lesson.is_active:
-                recommended_lessons.append(lesson)
-            if len(recommended_lessons) >= limit:
-                break
-        if len(recommended_lessons) >= limit:
-            break
+    recommended_ids = [
+        meta.id
+        for meta in content_catalog.lessons_by_difficulty(db, current_user_level.value)
+        if meta.id not in completed_lesson_ids and meta.is_active
+    ][:limit]
+
+    lessons = {
+        lesson.id: lesson
+        for lesson in db.query(models.InteractiveLesson).filter(models.InteractiveLesson.id.in_(recommended_ids))
+    }
+    recommended_lessons = [lessons[lesson_id] for lesson_id in recommended_ids if lesson_id in lessons]
 
     # If no lessons found at the current level, maybe suggest from a lower level or any level?
     # For now, we just return what we have.
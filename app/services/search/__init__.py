@@ -0,0 +1,10 @@
+"""Full-text search over words, lessons and forum topics/posts, and fuzzy vocabulary lookup."""
+from app.services.search.backends import DOC_TYPES, SearchDocument, SearchRow
+from app.services.search.fuzzy import FuzzyMatch, vocabulary_index
+from app.services.search.index import search_index
+from app.services.search.text import normalize, snippet, tokens
+
+__all__ = [
+    "DOC_TYPES", "FuzzyMatch", "SearchDocument", "SearchRow", "normalize", "search_index", "snippet", "tokens",
+    "vocabulary_index",
+]
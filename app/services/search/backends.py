@@ -0,0 +1,170 @@
+"""
+Storage for the search index: Postgres ``tsvector`` + GIN, or SQLite FTS5.
+
+Both keep one row per indexed document in ``search_index``, keyed by
+``doc_id * 8 + type code`` so a document can be replaced with a primary-key
+write. Indexed text is normalized in Python first (``text.normalize``); the
+original title/body are stored alongside for display.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+
+from app.services.search.text import normalize
+
+TABLE = "search_index"
+DOC_TYPES = {"word": 1, "lesson": 2, "forum_topic": 3, "forum_post": 4}
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    doc_type: str
+    doc_id: int
+    title: str
+    body: str
+    parent_id: Optional[int] = None  # word -> lesson, lesson -> course, post -> topic
+
+    @property
+    def key(self) -> int:
+        return doc_key(self.doc_type, self.doc_id)
+
+
+@dataclass(frozen=True)
+class SearchRow:
+    doc_type: str
+    doc_id: int
+    parent_id: Optional[int]
+    title: str
+    body: str
+    score: float
+
+
+def doc_key(doc_type: str, doc_id: int) -> int:
+    return doc_id * 8 + DOC_TYPES[doc_type]
+
+
+class SQLiteBackend:
+    """FTS5 virtual table (local development and tests)."""
+
+    create = [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+        "title, body, doc_type UNINDEXED, doc_id UNINDEXED, parent_id UNINDEXED, "
+        "display_title UNINDEXED, display_body UNINDEXED, tokenize='unicode61 remove_diacritics 2')"
+    ]
+    drop = [f"DROP TABLE IF EXISTS {TABLE}"]
+
+    def upsert(self, connection: Connection, doc: SearchDocument) -> None:
+        self.delete(connection, doc.key)
+        connection.execute(
+            text(
+                f"INSERT INTO {TABLE} (rowid, title, body, doc_type, doc_id, parent_id, display_title, display_body) "
+                "VALUES (:key, :title_norm, :body_norm, :doc_type, :doc_id, :parent_id, :title, :body)"
+            ),
+            _params(doc),
+        )
+
+    def delete(self, connection: Connection, key: int) -> None:
+        connection.execute(text(f"DELETE FROM {TABLE} WHERE rowid = :key"), {"key": key})
+
+    def delete_children(self, connection: Connection, doc_type: str, parent_id: int) -> None:
+        connection.execute(
+            text(f"DELETE FROM {TABLE} WHERE doc_type = :doc_type AND parent_id = :parent_id"),
+            {"doc_type": doc_type, "parent_id": parent_id},
+        )
+
+    def search(self, connection: Connection, *, terms: List[str], types: Sequence[str], prefix: bool,
+               titles_only: bool, limit: int, offset: int) -> List[SearchRow]:
+        phrases = [f'"{term}"' for term in terms]
+        if prefix:
+            phrases[-1] += "*"
+        match = " AND ".join(phrases)
+        if titles_only:
+            match = f"title : ({match})"
+        stmt = text(
+            "SELECT doc_type, doc_id, parent_id, display_title, display_body, "
+            f"-bm25({TABLE}, 10.0, 1.0) AS score FROM {TABLE} "
+            f"WHERE {TABLE} MATCH :match AND doc_type IN :types "
+            "ORDER BY score DESC, rowid LIMIT :limit OFFSET :offset"
+        ).bindparams(bindparam("types", expanding=True))
+        rows = connection.execute(stmt, {"match": match, "types": list(types), "limit": limit, "offset": offset})
+        return [SearchRow(r[0], int(r[1]), _int(r[2]), r[3], r[4], float(r[5])) for r in rows]
+
+
+class PostgresBackend:
+    """Plain table with a weighted ``tsvector`` column and a GIN index."""
+
+    create = [
+        f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+        "id BIGINT PRIMARY KEY, doc_type VARCHAR(20) NOT NULL, doc_id INTEGER NOT NULL, parent_id INTEGER, "
+        "title TEXT NOT NULL, body TEXT NOT NULL, document TSVECTOR NOT NULL)",
+        f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_document ON {TABLE} USING GIN (document)",
+        f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_parent ON {TABLE} (doc_type, parent_id)",
+    ]
+    drop = [f"DROP TABLE IF EXISTS {TABLE}"]
+
+    def upsert(self, connection: Connection, doc: SearchDocument) -> None:
+        # Titles rank above bodies; the english configuration adds stemmed forms of English words
+        connection.execute(
+            text(
+                f"INSERT INTO {TABLE} (id, doc_type, doc_id, parent_id, title, body, document) "
+                "VALUES (:key, :doc_type, :doc_id, :parent_id, :title, :body, "
+                "setweight(to_tsvector('simple', :title_norm), 'A') || "
+                "setweight(to_tsvector('simple', :body_norm), 'B') || "
+                "setweight(to_tsvector('english', :body_norm), 'D')) "
+                "ON CONFLICT (id) DO UPDATE SET parent_id = EXCLUDED.parent_id, title = EXCLUDED.title, "
+                "body = EXCLUDED.body, document = EXCLUDED.document"
+            ),
+            _params(doc),
+        )
+
+    def delete(self, connection: Connection, key: int) -> None:
+        connection.execute(text(f"DELETE FROM {TABLE} WHERE id = :key"), {"key": key})
+
+    def delete_children(self, connection: Connection, doc_type: str, parent_id: int) -> None:
+        connection.execute(
+            text(f"DELETE FROM {TABLE} WHERE doc_type = :doc_type AND parent_id = :parent_id"),
+            {"doc_type": doc_type, "parent_id": parent_id},
+        )
+
+    def search(self, connection: Connection, *, terms: List[str], types: Sequence[str], prefix: bool,
+               titles_only: bool, limit: int, offset: int) -> List[SearchRow]:
+        weight = "A" if titles_only else ""
+        lexemes = [f"{term}:{weight}" if weight else term for term in terms]
+        if prefix:
+            lexemes[-1] = f"{terms[-1]}:*{weight}"
+        query = "to_tsquery('simple', :simple)"
+        if not titles_only:
+            query = f"({query} || plainto_tsquery('english', :plain))"
+        stmt = text(
+            "SELECT doc_type, doc_id, parent_id, title, body, ts_rank_cd(document, q) AS score "
+            f"FROM {TABLE}, {query} AS q "
+            "WHERE document @@ q AND doc_type IN :types "
+            "ORDER BY score DESC, id LIMIT :limit OFFSET :offset"
+        ).bindparams(bindparam("types", expanding=True))
+        rows = connection.execute(stmt, {
+            "simple": " & ".join(lexemes), "plain": " ".join(terms),
+            "types": list(types), "limit": limit, "offset": offset,
+        })
+        return [SearchRow(r[0], int(r[1]), _int(r[2]), r[3], r[4], float(r[5])) for r in rows]
+
+
+def _int(value) -> Optional[int]:
+    return int(value) if value is not None else None
+
+
+def _params(doc: SearchDocument) -> dict:
+    return {
+        "key": doc.key, "doc_type": doc.doc_type, "doc_id": doc.doc_id, "parent_id": doc.parent_id,
+        "title": doc.title, "body": doc.body,
+        "title_norm": normalize(doc.title), "body_norm": normalize(doc.body),
+    }
+
+
+BACKENDS = {"sqlite": SQLiteBackend(), "postgresql": PostgresBackend()}
+
+
+def backend_for(connection: Connection):
+    """Backend for the connection's dialect (None: search unsupported on this database)."""
+    return BACKENDS.get(connection.dialect.name)
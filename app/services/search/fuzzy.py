@@ -0,0 +1,239 @@
+"""
+In-memory fuzzy lookup over vocabulary (``Word.word`` and ``translation``).
+
+Terms are normalized like the full-text index (``search.text.normalize``:
+lowercase, Cyrillic transliterated, apostrophes dropped) and indexed by padded character trigrams. A
+term within edit distance k of the query still shares at least
+``distinct query trigrams - 3k`` of them (one edit touches at most three),
+so only terms passing that count and the length bound are compared with a
+bounded Levenshtein. Queries too short for the trigram bound scan the terms
+of nearby lengths instead.
+
+The index is derived from the content catalog's word snapshot and follows
+it incrementally: changed words are re-indexed and removed ones tombstoned
+until the next compaction, so edits made on other workers arrive the same
+way as the catalog's.
+"""
+import heapq
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.text_utils import bounded_levenshtein
+from app.services.content_catalog import WordMeta, content_catalog
+from app.services.search.text import normalize
+
+FIELDS = ("word", "translation")
+_VARIANTS = re.compile(r"[,;/]")  # "kitob, daftar" -> two translation terms
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+@dataclass(frozen=True)
+class FuzzyMatch:
+    word_id: int
+    word: str
+    translation: str
+    field: str  # which field matched: "word" or "translation"
+    term: str  # the normalized term that matched
+    distance: int
+
+
+def normalize_term(text: Optional[str]) -> str:
+    """``search.text.normalize`` without punctuation and with whitespace collapsed."""
+    return " ".join(_PUNCTUATION.sub("", normalize(text)).split())
+
+
+def trigrams(term: str) -> frozenset:
+    padded = f"  {term} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def default_distance(term: str) -> int:
+    """Edit distance allowed for a query of this length (0 for one or two characters)."""
+    if len(term) <= 2:
+        return 0
+    return min(1 if len(term) <= 7 else 2, settings.VOCABULARY_FUZZY_MAX_DISTANCE)
+
+
+def _terms(meta: WordMeta) -> Iterator[Tuple[str, int]]:
+    seen = set()
+    for field, values in ((0, [meta.word]), (1, _VARIANTS.split(meta.translation or ""))):
+        for value in values:
+            term = normalize_term(value)
+            if term and (term, field) not in seen:
+                seen.add((term, field))
+                yield term, field
+
+
+class VocabularyIndex:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._source: Optional[Mapping[int, WordMeta]] = None  # catalog mapping the index reflects
+        self._terms: List[Optional[Tuple[str, int, int]]] = []  # term id -> (term, word id, field); None once removed
+        self._by_word: Dict[int, List[int]] = {}
+        self._trigrams: Dict[str, List[int]] = defaultdict(list)
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+        self._exact: Dict[str, List[int]] = defaultdict(list)
+        self._dead = 0
+
+    # --- Maintenance ---------------------------------------------------------
+
+    def _clear(self) -> None:
+        self._terms, self._by_word, self._dead = [], {}, 0
+        self._trigrams, self._by_length, self._exact = defaultdict(list), defaultdict(list), defaultdict(list)
+
+    def _add(self, meta: WordMeta) -> None:
+        if not meta.is_active:
+            return
+        ids = self._by_word.setdefault(meta.id, [])
+        for term, field in _terms(meta):
+            term_id = len(self._terms)
+            self._terms.append((term, meta.id, field))
+            ids.append(term_id)
+            for gram in trigrams(term):
+                self._trigrams[gram].append(term_id)
+            self._by_length[len(term)].append(term_id)
+            self._exact[term].append(term_id)
+
+    def _remove(self, word_id: int) -> None:
+        for term_id in self._by_word.pop(word_id, ()):
+            self._terms[term_id] = None
+            self._dead += 1
+
+    def load(self, words: Mapping[int, WordMeta]) -> None:
+        """Bring the index in line with ``words`` (a catalog word mapping)."""
+        if words is self._source:
+            return
+        with self._lock:
+            if words is self._source:
+                return
+            old = self._source
+            if old is None:
+                changed, removed = list(words), []
+            else:
+                changed = [wid for wid, meta in words.items() if old.get(wid) is not meta and old.get(wid) != meta]
+                removed = [wid for wid in old if wid not in words]
+            if old is None or self._dead + len(changed) + len(removed) > len(self._terms) // 2:
+                self._clear()
+                for meta in words.values():
+                    self._add(meta)
+            else:
+                for wid in chain(changed, removed):
+                    self._remove(wid)
+                for wid in changed:
+                    self._add(words[wid])
+            self._source = words
+
+    def warm(self, db: Session) -> None:
+        """Build the index up front (startup) instead of on the first lookup."""
+        self.load(content_catalog.words(db))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._source = None
+            self._clear()
+
+    # --- Queries -------------------------------------------------------------
+
+    def _candidates(self, query: str, k: int) -> Tuple[Iterable[Tuple[int, int]], int]:
+        """Candidate (term id, shared trigrams) pairs, most shared first, and the distinct query trigram count."""
+        if k == 0:
+            return ((term_id, 0) for term_id in self._exact.get(query, ())), 0
+        grams = trigrams(query)
+        if len(grams) - 3 * k <= 0:
+            n = len(query)
+            lengths = range(max(n - k, 1), n + k + 1)
+            return ((term_id, 0) for size in lengths for term_id in self._by_length.get(size, ())), 0
+        counts: Counter = Counter()
+        for gram in grams:
+            postings = self._trigrams.get(gram)
+            if postings:
+                counts.update(postings)
+        return counts.most_common(), len(grams)
+
+    def _search(self, query: str, k: int, fields: Tuple[int, ...], limit: int) -> Dict[int, Tuple[int, int, int, str]]:
+        """
+        Best (distance, field, length difference, term) per word within ``k``
+        edits. Once ``limit`` words are at distance d or closer, the remaining
+        candidates are only checked against d (and skipped once they share
+        too few trigrams to be within it).
+        """
+        best: Dict[int, Tuple[int, int, int, str]] = {}
+        per_distance = [0] * (k + 1)
+        bound = k
+        n = len(query)
+        candidates, grams = self._candidates(query, k)
+        for term_id, shared in candidates:
+            if grams and shared < grams - 3 * bound:
+                break
+            entry = self._terms[term_id]
+            if entry is None:
+                continue
+            term, word_id, field = entry
+            if field not in fields or abs(len(term) - n) > bound:
+                continue
+            distance = bounded_levenshtein(query, term, bound)
+            if distance > bound:
+                continue
+            rank = (distance, field, abs(len(term) - n), term)
+            previous = best.get(word_id)
+            if previous is not None and previous <= rank:
+                continue
+            if previous is not None:
+                per_distance[previous[0]] -= 1
+            best[word_id] = rank
+            per_distance[distance] += 1
+            total = 0
+            for d in range(bound + 1):
+                total += per_distance[d]
+                if total >= limit:
+                    bound = d
+                    break
+        return best
+
+    def suggest(
+        self, db: Session, text: str, *, limit: int = 10, max_distance: Optional[int] = None,
+        fields: Iterable[str] = FIELDS,
+    ) -> List[FuzzyMatch]:
+        """
+        Up to ``limit`` active words whose word or translation is within
+        ``max_distance`` edits of ``text`` (by default scaled with its length),
+        closest first; exact matches have distance 0.
+        """
+        query = normalize_term(text)
+        if not query:
+            return []
+        k = default_distance(query) if max_distance is None else max(max_distance, 0)
+        self.load(content_catalog.words(db))
+        field_codes = tuple(FIELDS.index(field) for field in fields)
+        with self._lock:
+            best, words = self._search(query, k, field_codes, limit), self._source
+        top = heapq.nsmallest(limit, best.items(), key=lambda item: (item[1], item[0]))
+        return [
+            FuzzyMatch(wid, words[wid].word, words[wid].translation, FIELDS[field], term, distance)
+            for wid, (distance, field, _, term) in top
+        ]
+
+    def closest(
+        self, db: Session, text: str, *, max_distance: Optional[int] = None, fields: Iterable[str] = FIELDS,
+    ) -> Optional[FuzzyMatch]:
+        """The known vocabulary item nearest to ``text`` (graders: "did they mean ...?"), or None."""
+        matches = self.suggest(db, text, limit=1, max_distance=max_distance, fields=fields)
+        return matches[0] if matches else None
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "words": len(self._by_word),
+            "terms": len(self._terms) - self._dead,
+            "removed_terms": self._dead,
+            "trigrams": len(self._trigrams),
+        }
+
+
+vocabulary_index = VocabularyIndex()
@@ -0,0 +1,214 @@
+"""
+Search index maintenance and queries.
+
+Documents are rebuilt from their source rows in the same transaction as the
+write that changed them: mapper events collect the affected documents and
+``after_flush_postexec`` re-reads them with plain SQL and upserts (or
+deletes) their index rows. A rollback therefore also rolls back the index.
+Changes to definitions/examples re-index their word; deleting a topic drops
+its posts (the database cascades those without ORM events).
+
+``rebuild`` re-indexes everything (``search.rebuild_index`` task, and at
+startup when the index is empty).
+"""
+import logging
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import DDL, event, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db.base_class import Base
+from app.services.search.backends import (
+    BACKENDS, DOC_TYPES, TABLE, SearchDocument, SearchRow, backend_for, doc_key,
+)
+from app.services.search.text import flatten, join, tokens
+
+logger = logging.getLogger(__name__)
+
+
+def _trim(body: str) -> str:
+    return body[: settings.SEARCH_MAX_BODY_CHARS]
+
+
+# --- Documents ------------------------------------------------------------------
+
+def _word(connection: Connection, word_id: int) -> Optional[SearchDocument]:
+    word = models.Word.__table__
+    row = connection.execute(
+        select(word.c.word, word.c.translation, word.c.lesson_id, word.c.is_active).where(word.c.id == word_id)
+    ).first()
+    if row is None or row.is_active is False:
+        return None
+    definitions = models.WordDefinition.__table__
+    examples = models.WordExample.__table__
+    parts = [row.translation]
+    for definition, example in connection.execute(
+        select(definitions.c.definition, definitions.c.example).where(definitions.c.word_id == word_id)
+    ):
+        parts += [definition, example]
+    for example, translation in connection.execute(
+        select(examples.c.example, examples.c.translation).where(examples.c.word_id == word_id)
+    ):
+        parts += [example, translation]
+    return SearchDocument("word", word_id, row.word, _trim(join(parts)), row.lesson_id)
+
+
+def _lesson(connection: Connection, lesson_id: int) -> Optional[SearchDocument]:
+    lesson = models.InteractiveLesson.__table__
+    row = connection.execute(
+        select(lesson.c.title, lesson.c.description, lesson.c.content, lesson.c.course_id, lesson.c.is_active)
+        .where(lesson.c.id == lesson_id)
+    ).first()
+    if row is None or row.is_active is False:
+        return None
+    return SearchDocument(
+        "lesson", lesson_id, row.title, _trim(join([row.description, flatten(row.content)])), row.course_id
+    )
+
+
+def _forum_topic(connection: Connection, topic_id: int) -> Optional[SearchDocument]:
+    topic = models.ForumTopic.__table__
+    row = connection.execute(select(topic.c.title, topic.c.description).where(topic.c.id == topic_id)).first()
+    if row is None:
+        return None
+    return SearchDocument("forum_topic", topic_id, row.title, _trim(row.description or ""))
+
+
+def _forum_post(connection: Connection, post_id: int) -> Optional[SearchDocument]:
+    post = models.ForumPost.__table__
+    row = connection.execute(select(post.c.content, post.c.topic_id).where(post.c.id == post_id)).first()
+    if row is None:
+        return None
+    # Untitled: clients show the topic (parent_id)
+    return SearchDocument("forum_post", post_id, "", _trim(row.content or ""), row.topic_id)
+
+
+BUILDERS = {"word": _word, "lesson": _lesson, "forum_topic": _forum_topic, "forum_post": _forum_post}
+SOURCES = {
+    "word": models.Word, "lesson": models.InteractiveLesson,
+    "forum_topic": models.ForumTopic, "forum_post": models.ForumPost,
+}
+
+
+def _reindex(connection: Connection, keys: Set[Tuple[str, int]]) -> None:
+    backend = backend_for(connection)
+    if backend is None:
+        return
+    for doc_type, doc_id in sorted(keys):
+        doc = BUILDERS[doc_type](connection, doc_id)
+        if doc is not None:
+            backend.upsert(connection, doc)
+        else:
+            backend.delete(connection, doc_key(doc_type, doc_id))
+            if doc_type == "forum_topic":
+                backend.delete_children(connection, "forum_post", doc_id)
+
+
+# --- Queries --------------------------------------------------------------------
+
+class SearchIndex:
+    def search(
+        self, db: Session, query: str, *, types: Optional[Sequence[str]] = None, prefix: bool = True,
+        titles_only: bool = False, limit: int = 20, offset: int = 0,
+    ) -> Tuple[List[str], List[SearchRow]]:
+        """Ranked matches for ``query`` (all terms must match; the last one as a prefix if ``prefix``)."""
+        terms = tokens(query)[: settings.SEARCH_MAX_TERMS]
+        backend = backend_for(db.connection())
+        if not terms or backend is None:
+            return terms, []
+        rows = backend.search(
+            db.connection(), terms=terms, types=list(types or DOC_TYPES), prefix=prefix,
+            titles_only=titles_only, limit=limit, offset=offset,
+        )
+        return terms, rows
+
+    def rebuild(self, db: Session, *, batch_size: int = 500) -> Dict[str, int]:
+        """Re-index every document (source rows are read in ID batches)."""
+        connection = db.connection()
+        backend = backend_for(connection)
+        if backend is None:
+            return {}
+        connection.execute(text(f"DELETE FROM {TABLE}"))
+        counts = {}
+        for doc_type, model in SOURCES.items():
+            counts[doc_type] = 0
+            for ids in _batches(connection, model, batch_size):
+                _reindex(connection, {(doc_type, doc_id) for doc_id in ids})
+                counts[doc_type] += len(ids)
+        db.commit()
+        logger.info("Search index rebuilt: %s", counts)
+        return counts
+
+    def ensure_populated(self, db: Session) -> None:
+        """Build the index if it is empty but there is content (first start after the migration)."""
+        connection = db.connection()
+        if backend_for(connection) is None:
+            return
+        if connection.execute(text(f"SELECT 1 FROM {TABLE} LIMIT 1")).first():
+            return
+        if any(connection.execute(select(model.id).limit(1)).first() for model in SOURCES.values()):
+            self.rebuild(db)
+
+
+def _batches(connection: Connection, model, size: int) -> Iterator[List[int]]:
+    last = 0
+    while True:
+        ids = list(connection.execute(
+            select(model.id).where(model.id > last).order_by(model.id).limit(size)
+        ).scalars())
+        if not ids:
+            return
+        yield ids
+        last = ids[-1]
+
+
+search_index = SearchIndex()
+
+
+# --- Schema ---------------------------------------------------------------------
+# The index is not an ORM model (FTS5 virtual table / tsvector column); it is
+# created and dropped together with the metadata (tests, create_all) and by the
+# Alembic migration in deployed databases.
+
+for _dialect, _backend in BACKENDS.items():
+    for _statement in _backend.create:
+        event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+    for _statement in _backend.drop:
+        event.listen(Base.metadata, "before_drop", DDL(_statement).execute_if(dialect=_dialect))
+
+
+# --- Change tracking ------------------------------------------------------------
+
+_PENDING = "search_index_pending"
+
+
+def _mark(doc_type: str, id_attr: str):
+    def _changed(mapper, connection, target) -> None:
+        session = inspect(target).session
+        doc_id = getattr(target, id_attr, None)
+        if session is not None and doc_id is not None:
+            session.info.setdefault(_PENDING, set()).add((doc_type, doc_id))
+    return _changed
+
+
+_TRACKED = (
+    (models.Word, "word", "id"),
+    (models.WordDefinition, "word", "word_id"),
+    (models.WordExample, "word", "word_id"),
+    (models.InteractiveLesson, "lesson", "id"),
+    (models.ForumTopic, "forum_topic", "id"),
+    (models.ForumPost, "forum_post", "id"),
+)
+for _model, _doc_type, _attr in _TRACKED:
+    for _event in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event, _mark(_doc_type, _attr))
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _apply_pending(session: Session, flush_context) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if pending:
+        _reindex(session.connection(), pending)
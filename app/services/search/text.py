@@ -0,0 +1,84 @@
+"""
+Text normalization shared by indexing and querying.
+
+Neither Postgres nor SQLite ships an Uzbek dictionary, so both backends
+index text that has already been normalized here:
+
+- Uzbek Cyrillic is transliterated to Latin ("салом" matches "salom");
+- the oʻ/gʻ and tutuq belgisi apostrophe variants (ʻ ʼ ‘ ’ ` ') are
+  dropped, so "o'zbek", "oʻzbek" and "ozbek" are the same token (tokenizers
+  would otherwise split on them);
+- accents are stripped and everything is lowercased.
+
+English words pass through unchanged apart from case (Postgres additionally
+stems them with the ``english`` configuration).
+"""
+import json
+import re
+import unicodedata
+from typing import Any, Iterable, List, Optional
+
+_CYRILLIC = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo", "ж": "j", "з": "z",
+    "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r",
+    "с": "s", "т": "t", "у": "u", "ф": "f", "х": "x", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "sh",
+    "ъ": "", "ы": "i", "ь": "", "э": "e", "ю": "yu", "я": "ya", "ў": "o", "қ": "q", "ғ": "g",
+    "ҳ": "h",
+}
+_APOSTROPHES = "'`ʻʼ‘’ʹ´"
+_TRANSLATE = str.maketrans({**_CYRILLIC, **{ch: "" for ch in _APOSTROPHES}})
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text.lower().translate(_TRANSLATE))
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokens(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall(normalize(text))
+
+
+def flatten(value: Any) -> str:
+    """Text of structured lesson content (JSON strings/objects/lists) for indexing."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value
+    parts: List[str] = []
+
+    def _walk(item: Any) -> None:
+        if isinstance(item, str):
+            parts.append(item)
+        elif isinstance(item, dict):
+            for child in item.values():
+                _walk(child)
+        elif isinstance(item, (list, tuple)):
+            for child in item:
+                _walk(child)
+
+    _walk(value)
+    return "\n".join(parts)
+
+
+def join(parts: Iterable[Optional[str]]) -> str:
+    return "\n".join(part for part in parts if part)
+
+
+def snippet(text: str, query_tokens: List[str], *, width: int = 12) -> str:
+    """About ``width`` words of ``text`` around the first word matching a query token (prefix)."""
+    words = text.split()
+    if not words:
+        return ""
+    position = 0
+    for i, word in enumerate(words):
+        normalized = normalize(word)
+        if any(normalized.lstrip("\"'([").startswith(token) for token in query_tokens):
+            position = i
+            break
+    start = max(position - width // 3, 0)
+    end = start + width
+    return ("… " if start else "") + " ".join(words[start:end]) + (" …" if end < len(words) else "")
@@ -0,0 +1,53 @@
+"""
+SM-2 review scheduling for vocabulary.
+
+A review is graded 0-5 (0-2: forgotten, 3: hard, 4: good, 5: easy). A
+forgotten word starts over and comes back after ``REVIEW_RELEARN_MINUTES``;
+a remembered one is due again after 1 day, 6 days, then the previous
+interval times its ease factor. Ease moves with every grade and never drops
+below 1.3. ``schedule`` is pure: persistence and due queues live in
+``crud_word_review``.
+"""
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.config import settings
+
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+PASSING_GRADE = 3
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    repetitions: int = 0
+    lapses: int = 0
+    ease: float = DEFAULT_EASE
+    interval: int = 0  # days
+    next_due_at: Optional[datetime] = None
+    last_reviewed_at: Optional[datetime] = None
+
+
+def schedule(state: ReviewState, grade: int, now: datetime) -> ReviewState:
+    """State after a review graded ``grade`` at ``now``."""
+    if not 0 <= grade <= 5:
+        raise ValueError(f"grade must be between 0 and 5, got {grade}")
+    ease = max(MIN_EASE, state.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    if grade < PASSING_GRADE:
+        return replace(
+            state, repetitions=0, lapses=state.lapses + 1, ease=round(ease, 3), interval=0,
+            next_due_at=now + timedelta(minutes=settings.REVIEW_RELEARN_MINUTES), last_reviewed_at=now,
+        )
+    repetitions = state.repetitions + 1
+    if repetitions == 1:
+        interval = 1
+    elif repetitions == 2:
+        interval = 6
+    else:
+        interval = max(state.interval + 1, round(state.interval * ease))
+    interval = min(interval, settings.REVIEW_MAX_INTERVAL_DAYS)
+    return replace(
+        state, repetitions=repetitions, ease=round(ease, 3), interval=interval,
+        next_due_at=now + timedelta(days=interval), last_reviewed_at=now,
+    )
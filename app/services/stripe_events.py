@@ -0,0 +1,186 @@
+"""
+Handlers for stored Stripe webhook events (see ``app.crud.crud_stripe_event``).
+
+``process_customer`` drains one customer's unfinished events oldest first.
+Handlers may see an event more than once (worker restarts, replays), so each
+one checks what it already applied before writing.
+"""
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core import monitoring
+from app.core.config import settings
+from app.crud.crud_stripe_event import FAILED, IGNORED, PENDING, PROCESSED
+from app.models.notification import NotificationType, PaymentStatus
+from app.schemas.notification import PaymentNotificationCreate
+
+logger = logging.getLogger(__name__)
+
+
+def _payment_notification(db: Session, payment_id: str) -> Optional[models.Notification]:
+    return (
+        db.query(models.Notification)
+        .filter(
+            models.Notification.payment_id == payment_id,
+            models.Notification.notification_type == NotificationType.PAYMENT.value,
+        )
+        .first()
+    )
+
+
+def _start_subscription(
+    db: Session, user: models.User, plan: models.SubscriptionPlan, payment_id: Optional[str], amount: Optional[float],
+) -> None:
+    """Start ``plan`` for ``user`` unless ``payment_id`` already paid for a subscription, and grant premium."""
+    applied = payment_id and (
+        db.query(models.Subscription.id).filter(models.Subscription.payment_id == payment_id).first()
+    )
+    if not applied:
+        crud.create_with_plan_details(
+            db,
+            user_id=user.id,
+            plan_id=plan.id,
+            payment_id=payment_id,
+            payment_method="stripe",
+            amount_paid=amount if amount is not None else plan.price,
+        )
+
+    premium_role = crud.role.get_by_name(db, name="premium")
+    if premium_role and premium_role not in user.roles:
+        user.roles.append(premium_role)
+        db.add(user)
+        db.commit()
+
+
+def handle_checkout_completed(db: Session, event: Dict[str, Any]) -> None:
+    """
+    Record the payment and, once it is paid, start the plan's subscription.
+    Sessions created before plan_id/user_id metadata name the user in
+    ``client_reference_id`` and the plan as ``subscription_plan_id``.
+    """
+    session = event["data"]["object"]
+    metadata = session.get("metadata") or {}
+    user_id = metadata.get("user_id") or session.get("client_reference_id")
+    plan_id = metadata.get("plan_id") or metadata.get("subscription_plan_id")
+    if not (user_id and plan_id):
+        logger.error(f"Missing user_id or plan_id in Stripe checkout session metadata. Session ID: {session.get('id')}")
+        return
+    user = crud.user.get(db, id=int(user_id))
+    plan = crud.get_subscription_plan(db, plan_id=int(plan_id))
+    if not (user and plan):
+        logger.warning(f"Stripe checkout session {session.get('id')} names unknown user {user_id} or plan {plan_id}")
+        return
+
+    amount_total = session.get("amount_total")
+    amount = amount_total / 100 if amount_total is not None else None
+    # Delayed payment methods complete the session unpaid; payment_intent.succeeded starts those
+    paid = session.get("payment_status", "paid") != "unpaid"
+    payment_id = session.get("payment_intent") or session["id"]
+    if not _payment_notification(db, payment_id):
+        crud.notification.create_payment_notification(
+            db,
+            obj_in=PaymentNotificationCreate(
+                user_id=user.id,
+                amount=amount if amount is not None else plan.price,
+                currency=(session.get("currency") or "usd").upper(),
+                payment_method=(session.get("payment_method_types") or ["card"])[0],
+                status=PaymentStatus.COMPLETED if paid else PaymentStatus.PENDING,
+                subscription_plan_id=plan.id,
+                subscription_duration_days=int(metadata.get("subscription_duration_days") or plan.duration_days),
+                user_full_name=user.full_name or "",
+                user_email=session.get("customer_email") or user.email,
+                payment_id=payment_id,
+                metadata={
+                    "session_id": session["id"],
+                    "amount_paid": amount,
+                    "customer_id": session.get("customer"),
+                    "payment_status": session.get("payment_status"),
+                    "subscription": session.get("subscription"),
+                },
+            ),
+            user_id=user.id,
+        )
+    if paid:
+        _start_subscription(db, user, plan, session["id"], amount)
+
+
+def handle_payment_intent_succeeded(db: Session, event: Dict[str, Any]) -> None:
+    """Mark the checkout's payment completed and start its subscription if the session completed unpaid."""
+    intent = event["data"]["object"]
+    charges = (intent.get("charges") or {}).get("data") or [{}]
+    notification = crud.notification.update_payment_status(
+        db, payment_id=intent["id"], status=PaymentStatus.COMPLETED.value, receipt_url=charges[0].get("receipt_url"),
+    )
+    if notification is None:
+        # The intent can arrive before its checkout session; that event then finds it paid
+        logger.info(f"No payment recorded yet for Stripe payment intent {intent['id']}")
+        return
+    data = notification.data or {}
+    user = crud.user.get(db, id=notification.user_id)
+    plan = crud.get_subscription_plan(db, plan_id=data.get("subscription_plan_id")) if data.get("subscription_plan_id") else None
+    if not (user and plan):
+        return
+    metadata = data.get("metadata") or {}
+    _start_subscription(db, user, plan, metadata.get("session_id") or intent["id"], metadata.get("amount_paid"))
+
+
+def handle_payment_intent_failed(db: Session, event: Dict[str, Any]) -> None:
+    """Mark the checkout's payment failed."""
+    intent = event["data"]["object"]
+    crud.notification.update_payment_status(db, payment_id=intent["id"], status=PaymentStatus.FAILED.value)
+
+
+def handle_charge_refunded(db: Session, event: Dict[str, Any]) -> None:
+    """Mark the payment the charge belongs to refunded."""
+    charge = event["data"]["object"]
+    if charge.get("payment_intent"):
+        crud.notification.update_payment_status(
+            db, payment_id=charge["payment_intent"], status=PaymentStatus.REFUNDED.value,
+        )
+
+
+HANDLERS: Dict[str, Callable[[Session, Dict[str, Any]], None]] = {
+    "checkout.session.completed": handle_checkout_completed,
+    "payment_intent.succeeded": handle_payment_intent_succeeded,
+    "payment_intent.payment_failed": handle_payment_intent_failed,
+    "charge.refunded": handle_charge_refunded,
+}
+
+
+def process_customer(db: Session, customer: str) -> Dict[str, int]:
+    """
+    Process the customer's unfinished events in order until none is left or
+    another job holds the next one. A failing handler puts its event back to
+    pending and re-raises, so the job's retry (or the sweep) runs it again
+    before the later events; after ``JOBS_MAX_RETRIES`` attempts the event is
+    marked failed and holds them back until it is replayed.
+    """
+    counts = {"processed": 0, "ignored": 0}
+    while True:
+        event = crud.stripe_event.claim_next(db, customer)
+        if event is None:
+            return counts
+        handler = HANDLERS.get(event.type)
+        if handler is None:
+            crud.stripe_event.finish(db, event, IGNORED)
+            counts["ignored"] += 1
+            continue
+        try:
+            handler(db, event.payload)
+        except Exception as e:
+            db.rollback()
+            if event.attempts < settings.JOBS_MAX_RETRIES:
+                crud.stripe_event.finish(db, event, PENDING, error=str(e))
+            else:
+                crud.stripe_event.finish(db, event, FAILED, error=str(e))
+                monitoring.STRIPE_EVENTS_FAILED.labels(type=event.type).inc()
+                logger.error(
+                    f"Stripe event {event.id} ({event.type}) failed {event.attempts} times; "
+                    f"events of {customer} are held back until it is replayed: {e}"
+                )
+            raise
+        crud.stripe_event.finish(db, event, PROCESSED)
+        counts["processed"] += 1
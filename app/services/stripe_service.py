@@ -1,11 +1,17 @@
-import stripe
-from typing import Dict, Any
+import json
+from typing import Dict, Any, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app import models, schemas
+from app.core.jobs import enqueue
+from app.core.registry import lazy_module
+from app import crud, models, schemas
+from app.tasks.payments import process_stripe_events
 
-# Stripe API kalitini sozlash
-stripe.api_key = settings.STRIPE_API_KEY
+# Stripe SDK birinchi ishlatilganda yuklanadi va API kaliti sozlanadi
+stripe = lazy_module("stripe", setup=lambda module: setattr(module, "api_key", settings.STRIPE_API_KEY))
 
 def create_stripe_checkout_session(plan: models.SubscriptionPlan, user: models.User) -> Dict[str, Any]:
     """
@@ -38,3 +44,24 @@ def create_stripe_checkout_session(plan: models.SubscriptionPlan, user: models.U
         # Xatolikni loglash yoki qayta ishlash
         print(f"Stripe checkout session yaratishda xatolik: {e}")
         return {"error": str(e)}
+
+
+def receive_webhook(db: Session, payload: bytes, signature: Optional[str]) -> Dict[str, Any]:
+    """
+    Stripe webhook tanasini tekshiradi, hodisani saqlaydi va uni qayta ishlash
+    jobini navbatga qo'yadi. The event is stored under its id (redeliveries
+    are acknowledged without being stored again) and processed by
+    ``payments.process_stripe_events`` in order per customer.
+    """
+    try:
+        stripe.Webhook.construct_event(payload=payload, sig_header=signature, secret=settings.STRIPE_WEBHOOK_SECRET)
+    except ValueError as e:  # Invalid payload
+        raise HTTPException(status_code=400, detail=str(e))
+    except stripe.error.SignatureVerificationError as e:  # Invalid signature
+        raise HTTPException(status_code=400, detail=str(e))
+
+    event, created = crud.stripe_event.record(db, json.loads(payload))
+    if created:
+        # If the broker is down the event stays pending for payments.sweep_stripe_events
+        enqueue(process_stripe_events, event.customer)
+    return {"status": "success", "duplicate": not created}
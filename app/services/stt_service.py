@@ -12,6 +12,8 @@ from pydub import AudioSegment
 from google.cloud import speech
 from google.api_core.exceptions import GoogleAPICallError, RetryError
 
+from app.core.registry import services
+
 # Constants for pronunciation assessment
 PRONUNCIATION_SCORE_WEIGHTS = {
     'accuracy': 0.4,      # How accurate the pronunciation is
@@ -161,4 +163,4 @@ class STTService:
         intersection = recognized_words.intersection(expected_words)
         return len(intersection) / len(expected_words)
 
-stt_service = STTService()
+stt_service = services.lazy("stt_service", STTService)
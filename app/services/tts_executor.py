@@ -0,0 +1,124 @@
+"""
+Text-to-speech off the event loop.
+
+Provider calls block: gTTS makes one HTTP request per ~100 characters and
+the Google Cloud client is synchronous. ``TTSExecutor`` runs them in a
+bounded thread pool (``TTS_MAX_WORKERS``) so a reply being synthesized no
+longer freezes the worker.
+
+Long texts are split into sentences (wrapped at ``TTS_SEGMENT_CHARS``), and
+``stream`` keeps up to ``TTS_SEGMENTS_AHEAD`` of them in flight, yielding
+each segment's MP3 as soon as it and the ones before it are done. MP3 frames are self-contained, so the segments played (or
+saved) back to back are one continuous file, and time to first audio is the
+time of the first segment rather than of the whole reply.
+"""
+import asyncio
+import functools
+import io
+import re
+import textwrap
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Deque, List, Optional, Union
+
+from app.core import profiling
+from app.core.config import settings
+from app.core.registry import lazy_module
+
+gtts = lazy_module("gtts")
+gtts_lang = lazy_module("gtts.lang")
+
+Provider = Callable[[str], bytes]  # text segment -> audio bytes, blocking
+
+FALLBACK_LANGUAGES = ("uz", "tr", "ru", "en")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+
+def split_sentences(text: str, max_chars: Optional[int] = None) -> List[str]:
+    """One segment per sentence; sentences longer than ``max_chars`` are wrapped at spaces."""
+    max_chars = max_chars or settings.TTS_SEGMENT_CHARS
+    return [
+        piece
+        for sentence in _SENTENCE_END.split(text)
+        for piece in textwrap.wrap(sentence, max_chars, break_on_hyphens=False)
+    ]
+
+
+def gtts_language(*preferred: Optional[str]) -> str:
+    """The first of ``preferred`` (e.g. "en-US"), then uz, tr, ru, en, that gTTS supports."""
+    supported = gtts_lang.tts_langs()
+    candidates = [code.split("-")[0] for code in preferred if code] + list(FALLBACK_LANGUAGES)
+    return next((code for code in candidates if code in supported), None) or next(iter(supported))
+
+
+def gtts_mp3(text: str, lang: str, slow: bool = False) -> bytes:
+    buffer = io.BytesIO()
+    gtts.gTTS(text=text, lang=lang, slow=slow).write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def gtts_provider(lang: str, slow: bool = False) -> Provider:
+    return functools.partial(gtts_mp3, lang=lang, slow=slow)
+
+
+class TTSExecutor:
+    """Bounded thread pool for blocking TTS provider calls, created on first use."""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self._max_workers or settings.TTS_MAX_WORKERS, thread_name_prefix="tts",
+                )
+            return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """``fn(*args, **kwargs)`` in the pool, awaited without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+
+    async def stream(self, text: str, provider: Provider, *, ahead: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Audio for ``text`` one segment at a time, in order, with up to ``ahead`` segments synthesizing."""
+        loop = asyncio.get_running_loop()
+        segments = iter(split_sentences(text))
+        pending: Deque[asyncio.Future] = deque()
+
+        def submit() -> None:
+            segment = next(segments, None)
+            if segment is not None:
+                pending.append(loop.run_in_executor(self.pool, provider, segment))
+
+        for _ in range(ahead or settings.TTS_SEGMENTS_AHEAD):
+            submit()
+        try:
+            while pending:
+                with profiling.track("ai"):
+                    audio = await pending.popleft()
+                submit()
+                yield audio
+        finally:
+            for future in pending:
+                future.cancel()  # client went away or a segment failed; don't start the rest
+
+    async def synthesize(self, text: str, provider: Provider) -> bytes:
+        return b"".join([audio async for audio in self.stream(text, provider)])
+
+    async def save(self, text: str, provider: Provider, path: Union[str, Path]) -> None:
+        audio = await self.synthesize(text, provider)
+        await self.run(Path(path).write_bytes, audio)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+tts_executor = TTSExecutor()
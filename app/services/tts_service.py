@@ -5,6 +5,8 @@ import logging
 from fastapi import HTTPException
 from pydantic import HttpUrl
 from app.core.config import settings
+from app.core.registry import services
+from app.services.tts_executor import tts_executor
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -53,6 +55,15 @@ class TTSService:
             logger.warning("TTS functionality will be disabled due to initialization error.")
             self.client = None
 
+    def _synthesize(self, text: str) -> bytes:
+        """One blocking Google Cloud TTS request, as MP3 bytes."""
+        response = self.client.synthesize_speech(
+            input=texttospeech.SynthesisInput(text=text),
+            voice=self.voice,
+            audio_config=self.audio_config
+        )
+        return response.audio_content
+
     async def text_to_speech(self, text: str) -> Union[str, None]:
         """
         Convert text to speech and return URL to the audio file.
@@ -63,24 +74,14 @@ class TTSService:
             return None
             
         try:
-            synthesis_input = texttospeech.SynthesisInput(text=text)
-            
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=self.voice,
-                audio_config=self.audio_config
-            )
-            
             # Ensure the tts directory exists
             tts_dir = os.path.join(settings.STATIC_FILES_DIR, "tts")
             os.makedirs(tts_dir, exist_ok=True)
             
-            # Save audio to file
+            # Synthesize sentence by sentence in the TTS thread pool and save to file
             filename = f"{uuid.uuid4()}.mp3"
             filepath = os.path.join(tts_dir, filename)
-            
-            with open(filepath, "wb") as out:
-                out.write(response.audio_content)
+            await tts_executor.save(text, self._synthesize, filepath)
                 
             return f"{settings.API_V1_STR}/static/tts/{filename}"
             
@@ -88,4 +89,4 @@ class TTSService:
             logger.error(f"TTS conversion failed: {str(e)}", exc_info=True)
             return None
 
-tts_service = TTSService()
+tts_service = services.lazy("tts_service", TTSService)
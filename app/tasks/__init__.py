@@ -0,0 +1,2 @@
+# Celery task modules. Import the task objects from their modules, e.g.
+# ``from app.tasks.homework import transcribe_submission``.
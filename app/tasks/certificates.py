@@ -0,0 +1,94 @@
+"""Certificate PDF rendering jobs."""
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session, joinedload
+
+from app import models
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.core.jobs import JobState, JobTask, enqueue, job_session, job_store
+from app.services.certificate_renderer import CertificateFields, certificate_renderer
+
+
+def _render(db: Session, certificate: models.Certificate) -> str:
+    if certificate.file_path and os.path.exists(certificate.file_path):
+        return certificate.file_path
+    user = certificate.user
+    fields = CertificateFields(
+        user_name=user.full_name or user.username,
+        course_name=certificate.course_name,
+        issue_date=certificate.issue_date.strftime("%Y-%m-%d"),
+        verification_code=certificate.verification_code,
+        level_completed=certificate.level_completed,
+    )
+    certificate.file_path = certificate_renderer.render_to_file(certificate.id, fields)
+    db.add(certificate)
+    return certificate.file_path
+
+
+@celery_app.task(base=JobTask, name="certificates.render_certificate")
+def render_certificate(certificate_id: int) -> Optional[Dict[str, Any]]:
+    """Render one certificate PDF into storage (no-op if it already exists)."""
+    with job_session() as db:
+        certificate = (
+            db.query(models.Certificate)
+            .options(joinedload(models.Certificate.user))
+            .filter(models.Certificate.id == certificate_id)
+            .first()
+        )
+        if not certificate:
+            return None
+        file_path = _render(db, certificate)
+        db.commit()
+        return {"certificate_id": certificate_id, "file_path": file_path}
+
+
+@celery_app.task(base=JobTask, name="certificates.render_certificates")
+def render_certificates(certificate_ids: List[int]) -> Dict[str, Any]:
+    """Render a batch of certificates with one session and one commit."""
+    with job_session() as db:
+        certificates = (
+            db.query(models.Certificate)
+            .options(joinedload(models.Certificate.user))
+            .filter(models.Certificate.id.in_(certificate_ids))
+            .all()
+        )
+        for certificate in certificates:
+            _render(db, certificate)
+        db.commit()
+        return {"rendered": len(certificates)}
+
+
+def schedule_render(certificate: models.Certificate) -> Dict[str, Any]:
+    """
+    Queue rendering for a certificate without a stored PDF. Requests while a
+    render is queued or running get that job back; once it has finished (the
+    file was removed since, or it failed) a new render is queued.
+    """
+    key = f"certificate:render:{certificate.id}"
+
+    def _enqueue() -> Dict[str, Any]:
+        return enqueue(
+            render_certificate,
+            certificate.id,
+            idempotency_key=key,
+            owner_id=certificate.user_id,
+            resource=f"certificate:{certificate.id}",
+        )
+
+    job = _enqueue()
+    stored = (job.get("result") or {}).get("file_path") or certificate.file_path
+    if job["state"] in (JobState.SUCCEEDED.value, JobState.FAILED.value) and not (stored and os.path.exists(stored)):
+        job_store.release_key(key)
+        job = _enqueue()
+    return job
+
+
+def schedule_bulk_render(certificate_ids: List[int], batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Queue rendering for many certificates (e.g. everyone who finished a course)."""
+    batch_size = batch_size or settings.CERTIFICATES_BATCH_SIZE
+    return [
+        enqueue(render_certificates, certificate_ids[i:i + batch_size])
+        for i in range(0, len(certificate_ids), batch_size)
+    ]
@@ -0,0 +1,40 @@
+"""Homework jobs: audio transcription and AI auto-grading."""
+from typing import Any, Dict, Optional
+
+from app.core.celery_app import celery_app
+from app.core.jobs import JobTask, enqueue, job_session, run_async
+from app.core.progress import STAGE_GRADING, STAGE_TRANSCRIBING
+from app.services import homework_service
+
+
+@celery_app.task(
+    base=JobTask,
+    name="homework.transcribe_submission",
+    progress_stage=STAGE_TRANSCRIBING,
+    final_step=False,  # auto-grading follows
+)
+def transcribe_submission(
+    submission_id: int, audio_path: str, audio_data: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Transcribe an oral submission, then queue its auto-grading."""
+    with job_session() as db:
+        result = run_async(
+            homework_service.process_audio_submission(db, submission_id, audio_path, audio_data)
+        )
+    if result is not None:
+        grade_job = enqueue(
+            auto_grade_submission,
+            submission_id,
+            idempotency_key=f"homework:grade:{submission_id}",
+            owner_id=result.get("student_id"),
+            resource=f"homework_submission:{submission_id}",
+        )
+        result["grade_job_id"] = grade_job["id"]
+    return result
+
+
+@celery_app.task(base=JobTask, name="homework.auto_grade_submission", progress_stage=STAGE_GRADING)
+def auto_grade_submission(submission_id: int) -> Optional[Dict[str, Any]]:
+    """Grade a submission with AI feedback + similarity heuristics."""
+    with job_session() as db:
+        return run_async(homework_service.auto_grade_submission(db, submission_id))
@@ -0,0 +1,24 @@
+"""Stripe webhook event processing jobs (events are stored by the webhook first)."""
+from typing import Any, Dict
+
+from app.core.celery_app import celery_app
+from app.core.jobs import JobTask, enqueue, job_session
+from app.crud.crud_stripe_event import stripe_event
+from app.services import stripe_events
+
+
+@celery_app.task(base=JobTask, name="payments.process_stripe_events")
+def process_stripe_events(customer: str) -> Dict[str, Any]:
+    """Process one customer's stored Stripe events, oldest first."""
+    with job_session() as db:
+        return {"customer": customer, **stripe_events.process_customer(db, customer)}
+
+
+@celery_app.task(base=JobTask, name="payments.sweep_stripe_events")
+def sweep_stripe_events() -> Dict[str, Any]:
+    """Queue processing for customers whose events no job picked up (broker down, worker lost)."""
+    with job_session() as db:
+        customers = stripe_event.customers_to_process(db)
+    for customer in customers:
+        enqueue(process_stripe_events, customer)
+    return {"customers": len(customers)}
@@ -0,0 +1,24 @@
+"""AI quota resets at the start of each billing period (scheduled by celery beat)."""
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.celery_app import celery_app
+from app.core.jobs import JobTask, job_session, job_store
+from app.crud.crud_user_ai_usage import user_ai_usage
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(base=JobTask, bind=True, name="quotas.reset_ai_quotas")
+def reset_ai_quotas(self, period: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reset every user's remaining AI quotas for ``period`` ("YYYY-MM", default
+    the current month). Beat runs it daily; after the first run of a month
+    the others find nothing left to reset.
+    """
+    def report(stats: Dict[str, Any]) -> None:
+        logger.info(f"AI quota reset {stats['period']}: chunk {stats['chunks_done']}/{stats['chunks']}")
+        job_store.update(self.request.id, progress=stats)
+
+    with job_session() as db:
+        return user_ai_usage.reset_all(db, period=period, on_progress=report)
@@ -0,0 +1,13 @@
+"""Search index maintenance jobs."""
+from typing import Dict
+
+from app.core.celery_app import celery_app
+from app.core.jobs import JobTask, job_session
+from app.services.search import search_index
+
+
+@celery_app.task(base=JobTask, name="search.rebuild_index")
+def rebuild_index() -> Dict[str, int]:
+    """Re-index every word, lesson and forum topic/post (after bulk imports or raw SQL edits)."""
+    with job_session() as db:
+        return search_index.rebuild(db)
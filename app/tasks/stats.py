@@ -0,0 +1,26 @@
+"""Periodic dashboard statistics jobs (scheduled by celery beat)."""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from app.core.celery_app import celery_app
+from app.core.jobs import JobTask, job_session
+from app.crud.crud_platform_stats import platform_stats
+
+
+@celery_app.task(base=JobTask, name="stats.reconcile_platform_stats")
+def reconcile_platform_stats() -> Dict[str, Any]:
+    """Recompute every dashboard counter from the source tables."""
+    with job_session() as db:
+        values = platform_stats.reconcile(db)
+        return {name: value for name, value in values.items() if not isinstance(value, list)}
+
+
+@celery_app.task(base=JobTask, name="stats.rollup_daily_stats")
+def rollup_daily_stats(day: Optional[str] = None) -> Dict[str, Any]:
+    """Store the ``daily_platform_stats`` row for ``day`` (ISO date, default yesterday UTC)."""
+    target = date.fromisoformat(day) if day else datetime.utcnow().date() - timedelta(days=1)
+    with job_session() as db:
+        # Fresh counters so the snapshot (and tomorrow's AI deltas) starts from source
+        platform_stats.reconcile(db)
+        row = platform_stats.rollup_day(db, day=target)
+        return {"date": row.date.isoformat(), "new_users": row.new_users, "revenue": row.revenue}
@@ -0,0 +1,56 @@
+"""Video analysis job (Gemini)."""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from app import models
+from app.core.celery_app import celery_app
+from app.core.jobs import JobTask, job_session, run_async
+from app.core.progress import STAGE_ANALYZING
+from app.crud.base import CRUDBase
+
+# Only get/update are needed here
+crud_video_analysis = CRUDBase(models.VideoAnalysis)
+
+
+@celery_app.task(base=JobTask, name="video.analyze_video", progress_stage=STAGE_ANALYZING)
+def analyze_video(video_id: int, video_path: str, language: str) -> Optional[Dict[str, Any]]:
+    """Analyze an uploaded video and store the result in ``analysis_metadata``."""
+    from app.services.ai.gemini_service import GeminiService
+
+    with job_session() as db:
+        db_video = crud_video_analysis.get(db, video_id)
+        if not db_video:
+            return None
+
+        db_video = crud_video_analysis.update(
+            db, db_obj=db_video, obj_in={"processing_status": "processing"}
+        )
+        try:
+            analysis = run_async(GeminiService().analyze_video(video_path))
+            if analysis.get("status") != "completed":
+                raise RuntimeError(analysis.get("error", "Analysis failed"))
+        except Exception as e:
+            crud_video_analysis.update(
+                db, db_obj=db_video,
+                obj_in={
+                    "processing_status": "failed",
+                    "analysis_metadata": {**(db_video.analysis_metadata or {}), "error": str(e)},
+                }
+            )
+            # Re-raise so the job is retried with backoff
+            raise
+
+        crud_video_analysis.update(
+            db, db_obj=db_video,
+            obj_in={
+                "is_processed": True,
+                "processing_status": "completed",
+                "analysis_metadata": {
+                    **(db_video.analysis_metadata or {}),
+                    "analysis": analysis,
+                    "language": language,
+                    "processed_at": str(datetime.utcnow()),
+                },
+            }
+        )
+        return {"video_id": video_id, "status": "completed"}
@@ -0,0 +1,16 @@
+"""
+Load-test dataset and in-process API benchmarks.
+
+- ``bench.generate``: deterministic synthetic dataset (users, courses,
+  lessons, words, exercises, attempts, forum, notifications), bulk loaded;
+- ``bench.scenarios``: user flows (login storm, lesson browsing, exercise
+  answering, chat, forum browsing) driven against the ASGI app with the AI
+  providers stubbed;
+- ``bench.run``: builds a database, runs the scenarios and writes a JSON
+  report (p50/p95/p99 latency and SQL statements per request);
+- ``bench.compare``: diffs two reports, e.g. from two commits.
+
+Usage:
+    python -m bench.run --scale small
+    python -m bench.compare bench/results/<base>.json bench/results/<head>.json
+"""
@@ -0,0 +1,91 @@
+"""
+Compare two ``bench.run`` reports, e.g. the base and head of a branch.
+
+Prints p50/p95/p99 latency and SQL statements per request side by side for
+every scenario and endpoint in both reports. A p95 more than ``--threshold``
+slower, more queries per request or new errors count as regressions; with
+``--fail-on-regression`` the exit status is 1 if there are any.
+
+Usage:
+    python -m bench.compare bench/results/1fe29ca.json bench/results/953a28d.json
+    python -m bench.compare base.json head.json --threshold 0.2 --endpoints
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+
+def _change(base: float, head: float) -> str:
+    if not base:
+        return "" if not head else "   new"
+    return f"{(head - base) / base:+6.0%}"
+
+
+def regressions(name: str, base: Dict[str, Any], head: Dict[str, Any], threshold: float) -> List[str]:
+    found = []
+    base_p95, head_p95 = base["latency_ms"]["p95"], head["latency_ms"]["p95"]
+    if base_p95 and head_p95 > base_p95 * (1 + threshold):
+        found.append(f"{name}: p95 {base_p95:.1f}ms -> {head_p95:.1f}ms")
+    base_queries, head_queries = base["queries_per_request"]["mean"], head["queries_per_request"]["mean"]
+    if head_queries > base_queries:
+        found.append(f"{name}: {base_queries:.1f} -> {head_queries:.1f} queries/request")
+    if head["errors"] > base["errors"]:
+        found.append(f"{name}: {base['errors']} -> {head['errors']} errors")
+    return found
+
+
+def _row(name: str, base: Dict[str, Any], head: Dict[str, Any]) -> str:
+    cells = []
+    for q in ("p50", "p95", "p99"):
+        b, h = base["latency_ms"][q], head["latency_ms"][q]
+        cells.append(f"{b:>8.1f} {h:>8.1f} {_change(b, h)}")
+    b, h = base["queries_per_request"]["mean"], head["queries_per_request"]["mean"]
+    cells.append(f"{b:>6.1f} {h:>6.1f}")
+    return f"{name:<52}" + "  ".join(cells)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed p95 slowdown (0.1 = 10%%)")
+    parser.add_argument("--endpoints", action="store_true", help="also compare each endpoint")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+    print(f"base {base.get('revision')} ({base['scale']['name']}, {base['database']})  "
+          f"head {head.get('revision')} ({head['scale']['name']}, {head['database']})")
+    if base["scale"] != head["scale"] or base["settings"] != head["settings"]:
+        print("warning: the reports were made with different scales or settings")
+
+    header = "  ".join(f"{q + ' base':>8} {'head':>8} {'':>6}" for q in ("p50", "p95", "p99"))
+    print(f"{'ms':<52}{header}  {'q base':>6} {'head':>6}")
+    found = []
+    for name, base_result in base["scenarios"].items():
+        head_result = head["scenarios"].get(name)
+        if head_result is None:
+            continue
+        print(_row(name, base_result, head_result))
+        found += regressions(name, base_result, head_result, args.threshold)
+        if args.endpoints:
+            for endpoint, base_endpoint in base_result["endpoints"].items():
+                head_endpoint = head_result["endpoints"].get(endpoint)
+                if head_endpoint is not None:
+                    print(_row(f"  {endpoint}", base_endpoint, head_endpoint))
+                    found += regressions(f"{name} {endpoint}", base_endpoint, head_endpoint, args.threshold)
+
+    if found:
+        print("\nregressions:")
+        for line in found:
+            print(f"  {line}")
+    if found and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
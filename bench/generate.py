@@ -0,0 +1,266 @@
+"""
+Deterministic synthetic dataset for load tests.
+
+``generate(db, scale, seed)`` loads ``scale`` worth of users, courses,
+lessons, words, exercises, exercise attempts, forum topics and posts and
+notifications with bulk Core INSERTs (``app.db.bulk``). The same scale and
+seed give the same rows, apart from timestamps, which are relative to now so
+that generated users are inside the free usage window. Meant for a freshly
+created database: generated emails and usernames are not unique across runs.
+
+Rows get explicit ids (after the table's current maximum), so foreign keys
+need no round trips; on PostgreSQL the id sequences are moved past them
+afterwards. The rows bypass the ORM, so the search index, dashboard counters
+and content catalog are refreshed at the end.
+
+Every generated user has the password ``PASSWORD`` and an ``@example.com``
+address starting with ``USER_PREFIX``; ``load_dataset`` finds them again.
+"""
+import logging
+import random
+import string
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.security import get_password_hash
+from app.crud.crud_platform_stats import platform_stats
+from app.db import base  # noqa: F401
+from app.db.bulk import insert_ignore, insert_many
+from app.db.initial_data import DEFAULT_AVATAR, init_db, load_words
+from app.models import (
+    AIAvatar, Course, Exercise, ExerciseAttempt, ForumPost, ForumTopic, InteractiveLesson, Notification, Role, User,
+    Word,
+)
+from app.models.exercise import DifficultyLevel, ExerciseType
+from app.models.forum import ForumCategory
+from app.models.lesson import LessonDifficulty
+from app.models.user import user_role
+from app.services.content_catalog import content_catalog
+from app.services.search import search_index
+
+logger = logging.getLogger(__name__)
+
+PASSWORD = "bench-password"
+USER_PREFIX = "bench"
+COURSE_PREFIX = "Bench course"
+FORUM_CATEGORIES = ("General", "Grammar", "Vocabulary", "Speaking", "Homework")
+LEVELS = ("A1", "A2", "B1", "B2", "C1", "C2")
+PARTS_OF_SPEECH = ("noun", "verb", "adjective", "adverb")
+PREMIUM_EVERY = 5  # every fifth user has an active subscription
+TEACHER_EVERY = 50
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    courses: int
+    lessons_per_course: int
+    exercises_per_lesson: int
+    words: int
+    attempts_per_user: int
+    topics: int
+    posts_per_topic: int
+    notifications_per_user: int
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(users=20, courses=2, lessons_per_course=4, exercises_per_lesson=3, words=200,
+                  attempts_per_user=3, topics=5, posts_per_topic=4, notifications_per_user=3),
+    "small": Scale(users=500, courses=10, lessons_per_course=20, exercises_per_lesson=10, words=5_000,
+                   attempts_per_user=20, topics=200, posts_per_topic=10, notifications_per_user=20),
+    "medium": Scale(users=5_000, courses=40, lessons_per_course=25, exercises_per_lesson=10, words=50_000,
+                    attempts_per_user=50, topics=2_000, posts_per_topic=20, notifications_per_user=50),
+    "large": Scale(users=50_000, courses=100, lessons_per_course=30, exercises_per_lesson=10, words=100_000,
+                   attempts_per_user=100, topics=20_000, posts_per_topic=25, notifications_per_user=100),
+}
+
+
+@dataclass
+class Dataset:
+    """Ids the scenarios pick from."""
+    user_ids: List[int] = field(default_factory=list)
+    emails: List[str] = field(default_factory=list)
+    course_ids: List[int] = field(default_factory=list)
+    lesson_ids: List[int] = field(default_factory=list)
+    # (id, correct answer, a wrong answer)
+    exercises: List[Tuple[int, Any, Any]] = field(default_factory=list)
+    words: List[str] = field(default_factory=list)
+    topic_ids: List[int] = field(default_factory=list)
+
+
+def _next_id(db: Session, model) -> int:
+    return (db.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _sync_sequences(db: Session, models) -> None:
+    """Move PostgreSQL id sequences past the explicit ids we inserted."""
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for model in models:
+        table = model.__tablename__
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+
+
+def _word(rng: random.Random, i: int) -> Dict[str, Any]:
+    stem = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+    return {"word": f"{stem}{i}", "translation": f"{stem[::-1]} {i}",
+            "level": rng.choice(LEVELS), "part_of_speech": rng.choice(PARTS_OF_SPEECH)}
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 8))) for _ in range(words)).capitalize()
+
+
+def _exercise(rng: random.Random, exercise_id: int, lesson_id: int, now: datetime) -> Dict[str, Any]:
+    # Multiple choice only: the only type whose answers the JSON API can express and check without errors
+    return {"id": exercise_id, "question": f"{_sentence(rng, 6)}?", "exercise_type": ExerciseType.MULTIPLE_CHOICE,
+            "difficulty": rng.choice(list(DifficultyLevel)), "correct_answer": rng.choice("ABCD"),
+            "options": {key: _sentence(rng, 2) for key in "ABCD"}, "lesson_id": lesson_id, "is_active": True,
+            "tags": [rng.choice(("grammar", "vocabulary", "reading"))], "created_at": now}
+
+
+def _wrong_answer(correct: str) -> str:
+    return "A" if correct != "A" else "B"
+
+
+def generate(db: Session, scale: Scale, *, seed: int = 42, chunk_size: int = 5000) -> Dict[str, int]:
+    """Seed ``init_db`` data plus the synthetic dataset; returns rows inserted per table."""
+    init_db(db)
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    counts: Dict[str, int] = {}
+    avatar_id = db.execute(select(AIAvatar.id).where(AIAvatar.name == DEFAULT_AVATAR["name"])).scalar()
+    free_role_id = db.execute(select(Role.id).where(Role.name == "free")).scalar()
+
+    # One hash for everyone: bcrypt at this volume would dominate the load
+    password_hash = get_password_hash(PASSWORD)
+    first_user = _next_id(db, User)
+    user_ids = list(range(first_user, first_user + scale.users))
+    counts["users"] = insert_many(db, User, (
+        {"id": user_id, "email": f"{USER_PREFIX}{n}@example.com", "username": f"{USER_PREFIX}{n}",
+         "hashed_password": password_hash, "full_name": f"Bench User {n}", "is_active": True,
+         "is_superuser": False, "is_teacher": n % TEACHER_EVERY == 0, "created_at": now, "updated_at": now,
+         "premium_until": now + timedelta(days=30) if n % PREMIUM_EVERY == 0 else None}
+        for n, user_id in enumerate(user_ids)
+    ), chunk_size=chunk_size)
+    if free_role_id:
+        insert_many(db, user_role, ({"user_id": user_id, "role_id": free_role_id} for user_id in user_ids),
+                    chunk_size=chunk_size)
+    teachers = user_ids[::TEACHER_EVERY]
+
+    first_course = _next_id(db, Course)
+    course_ids = list(range(first_course, first_course + scale.courses))
+    counts["courses"] = insert_many(db, Course, [
+        {"id": course_id, "title": f"{COURSE_PREFIX} {n}", "description": _sentence(rng, 20),
+         "short_description": _sentence(rng, 8), "is_published": True, "difficulty_level": rng.choice(LEVELS),
+         "language": "en", "price": 0.0, "instructor_id": rng.choice(teachers), "category": "english",
+         "tags": ["bench"], "created_at": now, "updated_at": now}
+        for n, course_id in enumerate(course_ids)
+    ], chunk_size=chunk_size)
+
+    lesson_id = _next_id(db, InteractiveLesson)
+    lessons = []
+    for course_id in course_ids:
+        for order in range(1, scale.lessons_per_course + 1):
+            lessons.append({
+                "id": lesson_id, "title": f"Lesson {order}: {_sentence(rng, 3)}", "description": _sentence(rng, 12),
+                "content": {"text": _sentence(rng, 60)}, "order": order, "is_premium": order % 5 == 0,
+                "is_active": True, "course_id": course_id, "avatar_id": avatar_id,
+                "difficulty": rng.choice(list(LessonDifficulty)), "estimated_duration": rng.randint(5, 30),
+                "tags": [rng.choice(("grammar", "vocabulary", "speaking"))],
+            })
+            lesson_id += 1
+    counts["lessons"] = insert_many(db, InteractiveLesson, lessons, chunk_size=chunk_size)
+
+    exercise_id = _next_id(db, Exercise)
+    exercises = []
+    for lesson in lessons:
+        for _ in range(scale.exercises_per_lesson):
+            exercises.append(_exercise(rng, exercise_id, lesson["id"], now))
+            exercise_id += 1
+    counts["exercises"] = insert_many(db, Exercise, exercises, chunk_size=chunk_size)
+
+    def attempts() -> Iterator[Dict[str, Any]]:
+        for user_id in user_ids:
+            for _ in range(scale.attempts_per_user):
+                exercise = rng.choice(exercises)
+                correct = rng.random() < 0.7
+                answer = exercise["correct_answer"]
+                yield {"user_id": user_id, "exercise_id": exercise["id"],
+                       "user_answer": answer if correct else _wrong_answer(answer),
+                       "is_correct": correct, "score": 1.0 if correct else 0.0, "time_spent": rng.randint(3, 120),
+                       "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))}
+    counts["exercise_attempts"] = insert_many(db, ExerciseAttempt, attempts(), chunk_size=chunk_size) if exercises else 0
+
+    insert_ignore(db, ForumCategory, [{"name": name, "description": f"{name} discussions"} for name in FORUM_CATEGORIES],
+                  index_elements=["name"])
+    category_ids = list(db.execute(
+        select(ForumCategory.id).where(ForumCategory.name.in_(FORUM_CATEGORIES)).order_by(ForumCategory.id)
+    ).scalars())
+    first_topic = _next_id(db, ForumTopic)
+    topic_ids = list(range(first_topic, first_topic + scale.topics))
+    counts["forum_topics"] = insert_many(db, ForumTopic, (
+        {"id": topic_id, "title": _sentence(rng, 6), "description": _sentence(rng, 20),
+         "author_id": rng.choice(user_ids), "category_id": rng.choice(category_ids),
+         "created_at": now - timedelta(minutes=scale.topics - n)}
+        for n, topic_id in enumerate(topic_ids)
+    ), chunk_size=chunk_size)
+    counts["forum_posts"] = insert_many(db, ForumPost, (
+        {"content": _sentence(rng, 30), "topic_id": topic_id, "author_id": rng.choice(user_ids),
+         "created_at": now - timedelta(seconds=scale.posts_per_topic - n)}
+        for topic_id in topic_ids for n in range(scale.posts_per_topic)
+    ), chunk_size=chunk_size)
+
+    counts["notifications"] = insert_many(db, Notification, (
+        {"user_id": user_id, "title": _sentence(rng, 3), "message": _sentence(rng, 15),
+         "is_read": rng.random() < 0.6, "notification_type": rng.choice(("general", "system", "forum_new_reply")),
+         "data": {}, "created_at": now - timedelta(minutes=n)}
+        for user_id in user_ids for n in range(scale.notifications_per_user)
+    ), chunk_size=chunk_size)
+
+    _sync_sequences(db, (User, Course, InteractiveLesson, Exercise, ForumTopic))
+    db.commit()
+    counts["words"] = load_words(db, (_word(rng, i) for i in range(scale.words)), chunk_size=chunk_size)
+
+    platform_stats.reconcile(db)
+    search_index.rebuild(db)
+    content_catalog.invalidate()
+    logger.info(f"Generated bench dataset: {counts}")
+    return counts
+
+
+def load_dataset(db: Session, *, limit: int = 5000) -> Dataset:
+    """The generated users, content and forum topics (up to ``limit`` of each) for scenarios to use."""
+    users = db.execute(
+        select(User.id, User.email).where(User.email.like(f"{USER_PREFIX}%@example.com")).order_by(User.id).limit(limit)
+    ).all()
+    course_ids = list(db.execute(
+        select(Course.id).where(Course.title.like(f"{COURSE_PREFIX} %")).order_by(Course.id).limit(limit)
+    ).scalars())
+    lesson_ids = list(db.execute(
+        select(InteractiveLesson.id).where(InteractiveLesson.course_id.in_(course_ids), InteractiveLesson.is_premium.is_(False))
+        .order_by(InteractiveLesson.id).limit(limit)
+    ).scalars())
+    exercises = [
+        (exercise_id, correct, _wrong_answer(correct))
+        for exercise_id, correct in db.execute(
+            select(Exercise.id, Exercise.correct_answer)
+            .where(Exercise.lesson_id.in_(lesson_ids), Exercise.exercise_type == ExerciseType.MULTIPLE_CHOICE)
+            .order_by(Exercise.id).limit(limit)
+        )
+    ]
+    return Dataset(
+        user_ids=[u.id for u in users],
+        emails=[u.email for u in users],
+        course_ids=course_ids,
+        lesson_ids=lesson_ids,
+        exercises=exercises,
+        words=list(db.execute(select(Word.word).order_by(Word.id.desc()).limit(limit)).scalars()),
+        topic_ids=list(db.execute(select(ForumTopic.id).order_by(ForumTopic.id.desc()).limit(limit)).scalars()),
+    )
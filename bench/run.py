@@ -0,0 +1,133 @@
+"""
+Run the load scenarios against the app in-process and write a JSON report.
+
+Builds a fresh SQLite database (or uses ``--database-url``), loads the
+synthetic dataset for ``--scale`` and runs each scenario with
+``--concurrency`` virtual users against the ASGI app, AI providers stubbed.
+The app runs with ``TESTING`` set, as under the test suite: no startup
+seeding, no AI quota checks, jobs run inline and every response carries its
+SQL statement count.
+
+The report has p50/p95/p99 latency, requests per second and SQL statements
+per request for each scenario and each endpoint it hit, and is written to
+``bench/results/<commit>.json`` so runs on two commits can be put side by
+side with ``python -m bench.compare``. Compare runs made on the same machine
+with the same arguments.
+
+Usage:
+    python -m bench.run --scale small
+    python -m bench.run --scale medium --scenarios lesson_browsing chat --concurrency 16 --iterations 500
+    python -m bench.run --database-url postgresql://... --skip-generate
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS = ROOT / "bench" / "results"
+SCENARIO_NAMES = ("login_storm", "lesson_browsing", "exercise_answering", "chat", "forum_browsing")
+
+
+def git_revision() -> Optional[str]:
+    """Short commit hash, with ``-dirty`` if tracked files have changes."""
+    try:
+        sha = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{sha}-dirty" if dirty else sha
+
+
+def _configure(database_url: str) -> None:
+    """Environment for the app; must run before anything under ``app`` is imported."""
+    os.environ["TESTING"] = "1"
+    os.environ["DATABASE_URL"] = database_url
+    for flag in ("DISABLE_GEMINI", "DISABLE_WHISPER", "DISABLE_TTS"):
+        os.environ.setdefault(flag, "1")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="small", help="tiny, small, medium or large (see bench.generate.SCALES)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIO_NAMES, default=list(SCENARIO_NAMES))
+    parser.add_argument("--concurrency", type=int, default=8, help="virtual users per scenario")
+    parser.add_argument("--iterations", type=int, default=200, help="user flows per scenario")
+    parser.add_argument("--warmup", type=int, default=10, help="unrecorded flows before each scenario")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="seconds the stubbed AI providers take")
+    parser.add_argument("--database-url", help="database to use instead of a fresh SQLite file")
+    parser.add_argument("--skip-generate", action="store_true", help="the database already has the dataset")
+    parser.add_argument("--output", help=f"report path (default: {RESULTS.relative_to(ROOT)}/<commit>.json)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    _configure(args.database_url or f"sqlite:///{workdir}/bench.db")
+    sys.path.insert(0, str(ROOT))
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("app.middleware.query_budget").setLevel(logging.ERROR)  # counts are in the report
+
+    from app.db.base_class import Base
+    from app.db.session import SessionLocal, engine
+    from bench.generate import SCALES, generate, load_dataset
+    from bench.scenarios import run_scenario, stub_ai_providers
+    from main import app
+
+    scale = SCALES[args.scale]
+    db = SessionLocal()
+    try:
+        if not args.skip_generate:
+            Base.metadata.create_all(bind=engine)
+            started = time.perf_counter()
+            counts = generate(db, scale, seed=args.seed)
+            print(f"generated {args.scale} dataset in {time.perf_counter() - started:.1f}s: {counts}")
+        data = load_dataset(db)
+    finally:
+        db.close()
+
+    revision = git_revision()
+    report = {
+        "revision": revision,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "scale": {"name": args.scale, **asdict(scale)},
+        "settings": {key: getattr(args, key) for key in ("seed", "concurrency", "iterations", "warmup", "ai_latency")},
+        "scenarios": {},
+    }
+    with stub_ai_providers(args.ai_latency), open(os.devnull, "w") as devnull:
+        for name in args.scenarios:
+            with contextlib.redirect_stdout(devnull):  # the auth dependencies print per request
+                result = asyncio.run(run_scenario(
+                    app, name, data, concurrency=args.concurrency, iterations=args.iterations,
+                    warmup=args.warmup, seed=args.seed,
+                ))
+            report["scenarios"][name] = result
+            latency = result["latency_ms"]
+            print(f"{name:<20} {result['requests']:>6} req {result['requests_per_second']:>8.1f} req/s  "
+                  f"p50 {latency['p50']:>7.1f}ms  p95 {latency['p95']:>7.1f}ms  p99 {latency['p99']:>7.1f}ms  "
+                  f"{result['queries_per_request']['mean']:>5.1f} queries/req  {result['errors']} errors")
+
+    output = Path(args.output) if args.output else RESULTS / f"{revision or 'unknown'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"report written to {output}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
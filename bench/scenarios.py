@@ -0,0 +1,216 @@
+"""
+Load scenarios: user flows driven in-process against the ASGI app.
+
+Each scenario is one iteration of a user flow (``SCENARIOS``).
+``run_scenario`` runs it with ``concurrency`` virtual users, each with its
+own ``httpx.AsyncClient`` over ``ASGITransport`` and an access token minted
+for a generated user, and records the latency and SQL statement count
+(``X-Query-Count``, set by ``QueryBudgetMiddleware``) of every request per
+route template.
+
+The AI providers are replaced by ``stub_ai_providers`` for the duration of
+a run, so chat measures our code plus a fixed, configurable provider delay.
+"""
+import asyncio
+import math
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.services import ai_service
+from bench.generate import PASSWORD, Dataset
+
+API = settings.API_V1_STR
+OK = 400  # status codes below this count as successful
+
+
+@dataclass
+class Sample:
+    ms: float
+    queries: int
+    status: int
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(samples: List[Sample], elapsed: Optional[float] = None) -> Dict[str, Any]:
+    latencies = sorted(s.ms for s in samples)
+    queries = [s.queries for s in samples]
+    summary = {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s.status >= OK),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else 0.0,
+            "max": max(queries, default=0),
+        },
+    }
+    if elapsed:
+        summary["requests_per_second"] = round(len(samples) / elapsed, 1)
+    return summary
+
+
+@dataclass
+class Recorder:
+    """Samples per endpoint (``"METHOD /route/{template}"``)."""
+    samples: Dict[str, List[Sample]] = field(default_factory=lambda: defaultdict(list))
+    enabled: bool = True
+
+    def add(self, endpoint: str, sample: Sample) -> None:
+        if self.enabled:
+            self.samples[endpoint].append(sample)
+
+    def report(self, elapsed: float, iterations: int) -> Dict[str, Any]:
+        everything = [s for samples in self.samples.values() for s in samples]
+        return {
+            **summarize(everything, elapsed),
+            "iterations": iterations,
+            "seconds": round(elapsed, 3),
+            "endpoints": {endpoint: summarize(samples) for endpoint, samples in sorted(self.samples.items())},
+        }
+
+
+class VirtualUser:
+    def __init__(self, app, recorder: Recorder, data: Dataset, index: int, rng: random.Random):
+        self.recorder, self.data, self.rng = recorder, data, rng
+        self.user_id = data.user_ids[index % len(data.user_ids)]
+        self.headers = {"Authorization": f"Bearer {create_access_token(subject=str(self.user_id))}"}
+        # An unhandled exception is recorded as the 500 a real client would get
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        self.client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+    async def request(self, method: str, route: str, *, path: Optional[Dict[str, Any]] = None,
+                      auth: bool = True, **kwargs) -> httpx.Response:
+        url = API + route.format(**(path or {}))
+        started = time.perf_counter()
+        response = await self.client.request(method, url, headers=self.headers if auth else None, **kwargs)
+        self.recorder.add(f"{method} {route}", Sample(
+            ms=(time.perf_counter() - started) * 1000,
+            queries=int(response.headers.get("X-Query-Count", 0)),
+            status=response.status_code,
+        ))
+        self.client.cookies.clear()  # the login cookie would stand in for the bearer token
+        return response
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+async def login_storm(user: VirtualUser) -> None:
+    email = user.rng.choice(user.data.emails)
+    await user.request("POST", "/login/access-token", auth=False, data={"username": email, "password": PASSWORD})
+
+
+async def lesson_browsing(user: VirtualUser) -> None:
+    rng, data = user.rng, user.data
+    await user.request("GET", "/courses/", params={"limit": 20})
+    await user.request("GET", "/courses/{id}", path={"id": rng.choice(data.course_ids)})
+    await user.request("GET", "/lessons/", params={"skip": rng.randrange(len(data.lesson_ids)), "limit": 20})
+    for _ in range(2):
+        await user.request("GET", "/lessons/{id}", path={"id": rng.choice(data.lesson_ids)})
+    await user.request("GET", "/words/", params={"limit": 50})
+    await user.request("GET", "/words/suggest", params={"q": rng.choice(data.words)[:5]})
+
+
+async def exercise_answering(user: VirtualUser) -> None:
+    rng, data = user.rng, user.data
+    await user.request("GET", "/lessons/{id}", path={"id": rng.choice(data.lesson_ids)})
+    for _ in range(3):
+        exercise_id, correct, wrong = rng.choice(data.exercises)
+        answer = correct if rng.random() < 0.7 else wrong
+        await user.request("POST", "/exercises/{id}/check-answer", path={"id": exercise_id},
+                           json={"answer": answer, "language": "en"})
+    await user.request("GET", "/notifications/unread-count")
+
+
+async def chat(user: VirtualUser) -> None:
+    session = (await user.request("POST", "/ai-sessions/sessions", params={"title": "Bench chat"})).json()
+    for text in ("Hello, how are you?", "Can you explain the past simple?", "Give me an example, please."):
+        await user.request("POST", "/ai-sessions/sessions/{id}/messages", path={"id": session["id"]}, data={"text": text})
+    await user.request("GET", "/ai-sessions/sessions/{id}/messages", path={"id": session["id"]}, params={"limit": 20})
+
+
+async def forum_browsing(user: VirtualUser) -> None:
+    rng, data = user.rng, user.data
+    await user.request("GET", "/forum/topics/", params={"limit": 20})
+    await user.request("GET", "/forum/topics/{id}/posts", path={"id": rng.choice(data.topic_ids)}, params={"limit": 20})
+    await user.request("GET", "/notifications/", params={"limit": 20})
+
+
+Scenario = Callable[[VirtualUser], Awaitable[None]]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "login_storm": login_storm,
+    "lesson_browsing": lesson_browsing,
+    "exercise_answering": exercise_answering,
+    "chat": chat,
+    "forum_browsing": forum_browsing,
+}
+
+
+@contextmanager
+def stub_ai_providers(latency: float = 0.0) -> Iterator[None]:
+    """Replace the LLM and speech-to-text calls with canned answers after ``latency`` seconds."""
+    async def chat_completion(history):
+        await asyncio.sleep(latency)
+        yield f"Stub reply to: {history[-1]['parts'][0]['text'][:100]}"
+
+    async def transcribe(file_content: bytes) -> str:
+        await asyncio.sleep(latency)
+        return "stub transcription"
+
+    originals = ai_service.get_chat_completion, ai_service.transcribe_audio_file
+    ai_service.get_chat_completion, ai_service.transcribe_audio_file = chat_completion, transcribe
+    try:
+        yield
+    finally:
+        ai_service.get_chat_completion, ai_service.transcribe_audio_file = originals
+
+
+async def run_scenario(app, name: str, data: Dataset, *, concurrency: int = 8, iterations: int = 100,
+                       warmup: int = 0, seed: int = 42) -> Dict[str, Any]:
+    """
+    Run ``iterations`` of scenario ``name`` spread over ``concurrency``
+    virtual users, after ``warmup`` unrecorded ones; returns its report.
+    """
+    scenario = SCENARIOS[name]
+    recorder = Recorder()
+    users = [VirtualUser(app, recorder, data, i, random.Random(f"{seed}:{name}:{i}")) for i in range(concurrency)]
+    try:
+        recorder.enabled = False
+        for i in range(warmup):
+            await scenario(users[i % concurrency])
+        recorder.enabled = True
+
+        remaining = iterations
+
+        async def worker(user: VirtualUser) -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await scenario(user)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(user) for user in users))
+        return recorder.report(time.perf_counter() - started, iterations)
+    finally:
+        for user in users:
+            await user.close()
@@ -1,5 +1,6 @@
 import sys
 from pathlib import Path
+import asyncio
 import inspect
 import logging
 
@@ -29,9 +30,18 @@ import redis.asyncio as redis
 from contextlib import asynccontextmanager
 
 from app.api.api_v1.api import api_router
+from app.core import monitoring
 from app.core.config import settings
 from app.core.limiter import limiter
+from app.core.registry import services
+from app.core.responses import ORJSONResponse
+from app.crud.base import InvalidCursorError
 from app.db.session import SessionLocal
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.services.content_catalog import content_catalog
+from app.services.search import search_index, vocabulary_index
+from app.services.tts_executor import tts_executor
 from app.db.initial_data import init_db
 from app import schemas
 
@@ -52,6 +62,9 @@ async def lifespan(app: FastAPI):
                 db = SessionLocal()
                 init_db(db)
                 logger.info("DB seeding finished.")
+                content_catalog.warm(db)
+                search_index.ensure_populated(db)
+                vocabulary_index.warm(db)
             except Exception as e:
                 logger.exception(f"DB seeding error: {e}")
 
@@ -60,6 +73,11 @@ async def lifespan(app: FastAPI):
             Thread(target=_seed_db, daemon=True).start()
         except Exception as e:
             logger.exception(f"Failed to start DB seeding thread: {e}")
+
+        # Cloud clients, Gemini/Stripe SDKs and the Whisper model are built on
+        # first use; build them off the request path so that use is cheap
+        if settings.WARM_SERVICES_ON_STARTUP:
+            Thread(target=services.warm, daemon=True, name="warm-services").start()
     else:
         logger.info("TESTING mode detected - skipping DB seeding.")
 
@@ -72,9 +90,16 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.exception(f"Model rebuild error: {e}")
 
+    metrics_task = None
+    if settings.ENABLE_MONITORING and not settings.TESTING:
+        metrics_task = asyncio.create_task(monitoring.periodic_metrics(), name="db-metrics")
+
     logger.info("Startup complete.")
     yield
     logger.info("Shutting down...")
+    if metrics_task is not None:
+        metrics_task.cancel()
+    tts_executor.shutdown()
 
 # Conditionally add rate limiting middleware if not in testing mode
 if not settings.TESTING:
@@ -130,6 +155,7 @@ if not settings.TESTING:
             "url": "https://oquv-platforma.uz/license",
         },
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 else:
     app = FastAPI(
@@ -184,6 +210,7 @@ else:
             "url": "https://oquv-platforma.uz/license",
         },
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
 # Create static directory if it doesn't exist
@@ -206,9 +233,22 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
 
+if settings.QUERY_BUDGET_ENABLED or settings.TESTING:
+    app.add_middleware(QueryBudgetMiddleware)
+
+if settings.REQUEST_PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(exc)})
+
+
 def add_rate_limiter(app: FastAPI):
     """Add rate limiting middleware to the application."""
     app.state.limiter = limiter
@@ -0,0 +1,195 @@
+"""
+AI session storage benchmark: one JSON blob per session vs per-user index +
+message log.
+
+Seeds N sessions (default 100,000) spread over many users, one of whom has a
+long conversation, then times listing that user's sessions, posting a
+message (user + assistant turn) and reading the chat history window with:
+
+- ``legacy``: a JSON blob per session (SETEX), listed with KEYS + GET of
+  every session, rewritten in full on every message;
+- ``store``: ``app.services.ai_session_store`` (ZSET index, metadata hash,
+  capped message list).
+
+Against Redis (``--redis-url``, use an empty database: the seeded keys are
+deleted afterwards) or, by default, the in-process fallback of both layouts.
+
+Usage:
+    python scripts/bench_ai_sessions.py [--sessions 100000] [--messages 200]
+    python scripts/bench_ai_sessions.py --redis-url redis://localhost:6379/15
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services import ai_session_store as store_module  # noqa: E402
+from app.services.ai_session_store import AISessionStore  # noqa: E402
+
+LEGACY_PREFIX = "ai_session"
+SESSIONS_PER_USER = 10
+TARGET_USER = 1
+HISTORY = 6
+
+
+class _Unavailable:
+    def __getattr__(self, name):
+        raise ConnectionError("no redis")
+
+
+def _message(role: str, i: int) -> dict:
+    return {"role": role, "text": f"{role} message {i} " * 8, "audio_url": None,
+            "analysis": {"score": 80, "tips": ["a", "b"]} if role == "user" else None,
+            "created_at": datetime.utcnow().isoformat() + "Z"}
+
+
+def _sessions(count: int):
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        user_id = TARGET_USER if i % 5000 == 0 else 2 + i // SESSIONS_PER_USER
+        created = start + timedelta(seconds=i)
+        yield {"id": uuid.uuid4().hex, "user_id": user_id, "title": f"Session {i}", "status": "idle",
+               "created_at": created.isoformat() + "Z"}, created.timestamp()
+
+
+class Legacy:
+    def __init__(self, client):
+        self.client, self.memory = client, {}
+
+    def seed(self, sessions, messages: int) -> str:
+        target = None
+        pipe = self.client.pipeline(transaction=False) if self.client else None
+        for n, (session, _) in enumerate(sessions):
+            session = {**session, "messages": []}
+            if session["user_id"] == TARGET_USER and target is None:
+                target = session["id"]
+                session["messages"] = [_message("user" if i % 2 == 0 else "assistant", i) for i in range(messages)]
+            if pipe is None:
+                self.memory[session["id"]] = session
+            else:
+                pipe.setex(f"{LEGACY_PREFIX}:{session['id']}", 3600, json.dumps(session))
+                if n % 5000 == 4999:
+                    pipe.execute()
+        if pipe is not None:
+            pipe.execute()
+        return target
+
+    def list(self, user_id: int) -> list:
+        if self.client is None:
+            found = [s for s in self.memory.values() if s.get("user_id") == user_id]
+        else:
+            found = []
+            for key in self.client.keys(f"{LEGACY_PREFIX}:*"):
+                session = json.loads(self.client.get(key))
+                if session.get("user_id") == user_id:
+                    found.append(session)
+        return sorted(found, key=lambda s: s.get("created_at") or "", reverse=True)
+
+    def _load(self, session_id: str) -> dict:
+        if self.client is None:
+            return json.loads(json.dumps(self.memory[session_id]))  # the blob round trip the endpoint paid
+        return json.loads(self.client.get(f"{LEGACY_PREFIX}:{session_id}"))
+
+    def post(self, session_id: str, i: int) -> None:
+        session = self._load(session_id)
+        session["messages"] += [_message("user", i), _message("assistant", i)]
+        if self.client is None:
+            self.memory[session_id] = json.loads(json.dumps(session))
+        else:
+            self.client.setex(f"{LEGACY_PREFIX}:{session_id}", 3600, json.dumps(session))
+
+    def history(self, session_id: str) -> list:
+        return self._load(session_id)["messages"][-HISTORY:]
+
+
+class Store:
+    def __init__(self, client):
+        self.client, self.store = client, AISessionStore()
+
+    def seed(self, sessions, messages: int) -> dict:
+        target = None
+        pipe = self.client.pipeline(transaction=False) if self.client else None
+        for n, (session, score) in enumerate(sessions):
+            if pipe is None:
+                self.store._meta[session["id"]] = session
+                self.store._by_user.setdefault(session["user_id"], {})[session["id"]] = score
+            else:
+                pipe.hset(self.store._meta_key(session["id"]), mapping=session)
+                pipe.zadd(self.store._user_key(session["user_id"]), {session["id"]: score})
+                if n % 5000 == 4999:
+                    pipe.execute()
+            if session["user_id"] == TARGET_USER and target is None:
+                target = session
+        if pipe is not None:
+            pipe.execute()
+        log = [_message("user" if i % 2 == 0 else "assistant", i) for i in range(messages)]
+        self.store.append_messages(target, log)
+        return target
+
+    def list(self, user_id: int) -> list:
+        return self.store.list_for_user(user_id)[0]
+
+    def post(self, session: dict, i: int) -> None:
+        self.store.history(session["id"], HISTORY - 1)
+        self.store.append_messages(session, [_message("user", i), _message("assistant", i)])
+
+    def history(self, session_id: str) -> list:
+        return self.store.history(session_id, HISTORY)
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--messages", type=int, default=200, help="messages in the timed conversation")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--redis-url", help="Redis database to use (default: in-process fallback)")
+    args = parser.parse_args()
+
+    client = redis.Redis.from_url(args.redis_url, decode_responses=True) if args.redis_url else None
+    store_module.redis_client = client or _Unavailable()
+    settings.AI_SESSION_MAX_MESSAGES = max(settings.AI_SESSION_MAX_MESSAGES, args.messages + 2 * args.repeat)
+
+    legacy, store = Legacy(client), Store(client)
+    started = time.perf_counter()
+    legacy_target = legacy.seed(_sessions(args.sessions), args.messages)
+    store_target = store.seed(_sessions(args.sessions), args.messages)
+    backend = "redis" if client else "in-process fallback"
+    print(f"{args.sessions} sessions, {args.messages}-message conversation, {backend} "
+          f"(seeded in {time.perf_counter() - started:.1f}s); median of {args.repeat}")
+
+    rows = {
+        "list user's sessions": (lambda i: legacy.list(TARGET_USER), lambda i: store.list(TARGET_USER)),
+        "post message": (lambda i: legacy.post(legacy_target, i), lambda i: store.post(store_target, i)),
+        f"history (last {HISTORY})": (lambda i: legacy.history(legacy_target), lambda i: store.history(store_target["id"])),
+    }
+    print(f"{'':<24}{'legacy':>12}{'store':>12}")
+    for label, (old, new) in rows.items():
+        print(f"{label:<24}{_median_ms(old, args.repeat):10.2f}ms{_median_ms(new, args.repeat):10.2f}ms")
+
+    if client is not None:
+        for pattern in (f"{LEGACY_PREFIX}:*", "ai_session_meta:*", "ai_session_messages:*", "ai_sessions_by_user:*"):
+            keys = list(client.scan_iter(pattern, count=10_000))
+            for start in range(0, len(keys), 10_000):
+                client.delete(*keys[start:start + 10_000])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Content lesson storage benchmark: one JSON file vs the ``content_lessons`` table.
+
+Seeds N lessons (default 5,000) and times reading one lesson, patching one
+lesson and exporting everything with:
+
+- ``file``: ``uploads/content/lessons.json`` as the endpoints used to keep it
+  (parse the whole file per request, rewrite it atomically per write);
+- ``table``: ``app.crud.content_lesson`` against a throwaway SQLite database.
+
+Usage:
+    python scripts/bench_content_store.py [--lessons 5000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import crud  # noqa: E402
+from app.core.responses import dumps  # noqa: E402
+from app.models.content_lesson import ContentLesson  # noqa: E402
+
+
+def _lesson(i: int) -> dict:
+    return {"id": i + 1, "title": f"Lesson {i}", "video": f"lesson_{i}.mp4", "level": "A1",
+            "text": "Lorem ipsum dolor sit amet " * 20, "exercises": [{"q": f"q{n}", "a": n} for n in range(5)]}
+
+
+class FileStore:
+    def __init__(self, path: Path, lessons: int):
+        self.path = path
+        self._save({"version": 1, "lessons": [_lesson(i) for i in range(lessons)]})
+
+    def _load(self) -> dict:
+        return json.loads(self.path.read_text(encoding="utf-8"))
+
+    def _save(self, data: dict) -> None:
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def get(self, lesson_id: int) -> dict:
+        return next(l for l in self._load()["lessons"] if l["id"] == lesson_id)
+
+    def patch(self, lesson_id: int, fields: dict) -> None:
+        data = self._load()
+        for i, lesson in enumerate(data["lessons"]):
+            if lesson["id"] == lesson_id:
+                data["lessons"][i] = {**lesson, **fields}
+        self._save(data)
+
+    def export(self) -> bytes:
+        return json.dumps(self._load()).encode()
+
+
+class TableStore:
+    def __init__(self, url: str, lessons: int):
+        engine = create_engine(url)
+        ContentLesson.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+        importer = crud.content_lesson.start_import(self.db)
+        for i in range(lessons):
+            importer.add(_lesson(i))
+        importer.finish()
+
+    def get(self, lesson_id: int) -> dict:
+        self.db.expire_all()
+        return crud.content_lesson.get(self.db, lesson_id).to_dict()
+
+    def patch(self, lesson_id: int, fields: dict) -> None:
+        crud.content_lesson.update(self.db, lesson_id=lesson_id, document=fields, partial=True)
+
+    def export(self) -> bytes:
+        return b",".join(dumps(doc) for doc in crud.content_lesson.iter_documents(self.db))
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lessons", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_store = FileStore(Path(tmp) / "lessons.json", args.lessons)
+        table_store = TableStore(f"sqlite:///{tmp}/content.db", args.lessons)
+        middle = args.lessons // 2
+        print(f"{args.lessons} lessons; median of {args.repeat}")
+        rows = {
+            "get one": lambda store: lambda i: store.get(middle),
+            "patch one": lambda store: lambda i: store.patch(middle, {"level": f"B{i}"}),
+            "export all": lambda store: lambda i: store.export(),
+        }
+        print(f"{'':<14}{'file':>12}{'table':>12}")
+        for label, op in rows.items():
+            print(f"{label:<14}{_median_ms(op(file_store), args.repeat):10.2f}ms"
+                  f"{_median_ms(op(table_store), args.repeat):10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
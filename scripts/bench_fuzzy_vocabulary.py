@@ -0,0 +1,145 @@
+"""
+Fuzzy vocabulary lookup benchmark.
+
+Seeds N synthetic words (default 100,000) with translations, then times
+building the trigram index, /words/suggest lookups (default distance) of
+misspelled words with 1 and 2 edits, the incremental refresh after one word changes, and, for
+comparison, a linear ``levenshtein_distance`` scan over every word.
+
+Usage:
+    python scripts/bench_fuzzy_vocabulary.py [--words 100000] [--queries 200]
+    python scripts/bench_fuzzy_vocabulary.py --database-url postgresql://...   # existing empty database
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import models  # noqa: E402
+from app.core.text_utils import levenshtein_distance, normalize_text  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.services.content_catalog import content_catalog  # noqa: E402
+from app.services.search.fuzzy import VocabularyIndex  # noqa: E402
+
+CONSONANTS = list("bdfghjklmnpqrstvxyz") + ["sh", "ch", "ng", "g'"]
+VOWELS = list("aeiou") + ["o'"]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _word(rng: random.Random) -> str:
+    """Pronounceable pseudo-word of 2-4 syllables (consonant + vowel, sometimes a closing consonant)."""
+    syllables = []
+    for _ in range(rng.randint(2, 4)):
+        syllables.append(rng.choice(CONSONANTS) + rng.choice(VOWELS))
+        if rng.random() < 0.3:
+            syllables.append(rng.choice(CONSONANTS))
+    return "".join(syllables)
+
+
+def _misspell(rng: random.Random, word: str, edits: int) -> str:
+    for _ in range(edits):
+        i = rng.randrange(len(word))
+        op = rng.choice(("substitute", "insert", "delete"))
+        if op == "substitute":
+            word = word[:i] + rng.choice(LETTERS) + word[i + 1:]
+        elif op == "insert":
+            word = word[:i] + rng.choice(LETTERS) + word[i:]
+        elif len(word) > 3:
+            word = word[:i] + word[i + 1:]
+    return word
+
+
+def _seed(session, count: int, rng: random.Random) -> list:
+    batch = 20_000
+    words = [(_word(rng), f"{_word(rng)}, {_word(rng)}") for _ in range(count)]
+    for start in range(0, count, batch):
+        session.execute(
+            insert(models.Word),
+            [{"word": word, "translation": translation, "is_active": True}
+             for word, translation in words[start:start + batch]],
+        )
+        session.commit()
+    return [word for word, _ in words]
+
+
+def _timings_ms(fn, args) -> list:
+    timings = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{label:<28} median {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--linear-queries", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tmp_dir = None
+    url = args.database_url
+    if not url:
+        tmp_dir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmp_dir.name, 'bench.db')}"
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    words = _seed(session, args.words, rng)
+    print(f"seeded {args.words} words in {time.perf_counter() - start:.1f}s ({url.split(':')[0]})")
+
+    start = time.perf_counter()
+    catalog_words = content_catalog.words(session)
+    loaded = time.perf_counter()
+    index = VocabularyIndex()
+    index.load(catalog_words)
+    built = time.perf_counter()
+    print(f"catalog load {(loaded - start) * 1000:.0f} ms, index build {(built - loaded) * 1000:.0f} ms: {index.describe()}")
+
+    for edits in (1, 2):
+        queries = [_misspell(rng, rng.choice(words), edits) for _ in range(args.queries)]
+        _report(f"suggest, {edits} edit(s)", _timings_ms(lambda q: index.suggest(session, q, limit=10), queries))
+
+    # One edited word: the next lookup re-indexes just that word
+    target = session.query(models.Word).first()
+    target.translation = "freshly edited"
+    session.commit()
+    start = time.perf_counter()
+    matches = index.suggest(session, "freshly editd")
+    print(f"{'refresh after 1 edit + query':<28} {(time.perf_counter() - start) * 1000:8.2f} ms "
+          f"(found: {bool(matches and matches[0].word_id == target.id)})")
+
+    normalized = [normalize_text(word) for word in words]
+    queries = [normalize_text(_misspell(rng, rng.choice(words), 1)) for _ in range(args.linear_queries)]
+    _report("linear levenshtein scan", _timings_ms(
+        lambda q: sorted((levenshtein_distance(q, word), word) for word in normalized)[:10], queries
+    ))
+
+    session.close()
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+OFFSET vs keyset pagination benchmark.
+
+Seeds one user's notification feed with N rows (default 1,000,000) and times
+page 1 and a deep page (default 1000) of 100 rows with both strategies.
+
+Usage:
+    python scripts/bench_pagination.py [--rows 1000000] [--page 1000]
+    python scripts/bench_pagination.py --database-url postgresql://...   # existing empty database
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app import models  # noqa: E402
+from app.crud.base import encode_cursor  # noqa: E402
+from app.crud.crud_notification import notification as crud_notification  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+def _seed(session, rows: int) -> int:
+    user = models.User(email="bench@example.com", username="bench", hashed_password="x")
+    session.add(user)
+    session.commit()
+    batch = 50_000
+    for start in range(0, rows, batch):
+        session.execute(
+            insert(models.Notification),
+            [
+                {"user_id": user.id, "title": "Bench", "message": f"Notification {i}", "is_read": False,
+                 "notification_type": "general", "data": {}}
+                for i in range(start, min(start + batch, rows))
+            ],
+        )
+        session.commit()
+    return user.id
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    url = args.database_url
+    if not url:
+        tmp_dir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmp_dir.name, 'bench.db')}"
+
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    start = time.perf_counter()
+    user_id = _seed(session, args.rows)
+    print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f}s ({url.split(':')[0]})")
+
+    # Cursor pointing at the start of the deep page (what a client would hold after paging there)
+    boundary = (
+        session.query(models.Notification.id)
+        .filter(models.Notification.user_id == user_id)
+        .order_by(models.Notification.id.desc())
+        .offset((args.page - 1) * PAGE_SIZE - 1)
+        .limit(1)
+        .scalar()
+    )
+    deep_cursor = encode_cursor("id:desc", [boundary])
+
+    for page, cursor in ((1, None), (args.page, deep_cursor)):
+        offset_ms = _median_ms(
+            lambda: crud_notification.get_multi_by_user(
+                session, user_id=user_id, skip=(page - 1) * PAGE_SIZE, limit=PAGE_SIZE
+            ),
+            args.repeat,
+        )
+        keyset_ms = _median_ms(
+            lambda: crud_notification.get_page_by_user(session, user_id=user_id, cursor=cursor, limit=PAGE_SIZE),
+            args.repeat,
+        )
+        print(f"page {page:>5}:  OFFSET {offset_ms:8.2f} ms   keyset {keyset_ms:8.2f} ms")
+
+    session.close()
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
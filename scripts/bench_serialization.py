@@ -0,0 +1,109 @@
+"""
+Response serialization benchmark.
+
+Serializes 1,000-item lists (default) of lessons, words and homework the way
+the list endpoints do:
+
+- ``fastapi``: FastAPI's response pipeline (validate against the
+  ``response_model``, dump to Python objects) rendered by ``JSONResponse``;
+- ``orjson``: the same pipeline rendered by the default ``ORJSONResponse``;
+- ``json_list``: one ``TypeAdapter`` validation and ``dump_json`` (the fast
+  path used by ``GET /lessons/``, ``/words/`` and ``/homework/``).
+
+No database is needed: rows are transient ORM objects (homework rows are
+the dicts the endpoint builds).
+
+Usage:
+    python scripts/bench_serialization.py [--items 1000] [--repeat 50]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app import models, schemas  # noqa: E402
+from app.core.responses import ORJSONResponse, json_list  # noqa: E402
+
+
+def _lessons(count: int) -> list:
+    return [
+        models.InteractiveLesson(
+            id=i, course_id=1 + i % 20, title=f"Lesson {i}", order=i, is_premium=i % 3 == 0,
+            video_url=f"https://cdn.example.com/videos/{i}.mp4",
+            content={"sections": [{"type": "text", "body": "Salom! " * 20}, {"type": "quiz", "questions": [1, 2, 3]}]},
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _words(count: int) -> list:
+    return [
+        models.Word(id=i, word=f"word{i}", translation=f"so'z {i}", ipa_pronunciation="/wɜːd/", lesson_id=1 + i % 50)
+        for i in range(1, count + 1)
+    ]
+
+
+def _homework(count: int) -> list:
+    now = datetime(2025, 9, 1, 9, 30)
+    return [
+        {
+            "id": i, "title": f"Homework {i}", "description": "Write a short essay " * 5, "instructions": "300 words",
+            "homework_type": "written", "course_id": 1, "lesson_id": i, "teacher_id": 7, "created_by": 7,
+            "due_date": now + timedelta(days=7), "max_score": 100, "is_published": True,
+            "metadata": {"tags": ["essay", "b1"]}, "created_at": now, "updated_at": now, "submissions": [],
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def _pipeline(schema, items, response_class) -> bytes:
+    field = create_model_field(name="Response", type_=List[schema], mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=items, is_coroutine=False))
+    return response_class(content).body
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    datasets = (
+        ("lessons", schemas.Lesson, _lessons(args.items)),
+        ("words", schemas.Word, _words(args.items)),
+        ("homework", schemas.Homework, _homework(args.items)),
+    )
+    print(f"{args.items} items, median of {args.repeat} runs")
+    for name, schema, items in datasets:
+        fast = json_list(schema, items).body
+        assert len(fast) == len(_pipeline(schema, items, JSONResponse)), f"{name}: outputs differ"
+        timings = {
+            "fastapi": _median_ms(lambda: _pipeline(schema, items, JSONResponse), args.repeat),
+            "orjson": _median_ms(lambda: _pipeline(schema, items, ORJSONResponse), args.repeat),
+            "json_list": _median_ms(lambda: json_list(schema, items).body, args.repeat),
+        }
+        print(f"{name:<9}" + "".join(f"  {label} {ms:7.2f} ms" for label, ms in timings.items())
+              + f"  ({len(fast) // 1024} KiB)")
+
+
+if __name__ == "__main__":
+    main()
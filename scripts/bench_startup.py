@@ -0,0 +1,74 @@
+"""
+Startup benchmark: time to first request.
+
+Starts the application in fresh interpreters and times ``import main``, the
+``lifespan`` startup and the first ``GET /health``. ``lazy`` is the default
+behaviour (SDK clients and models built in the background after startup);
+``eager`` builds every registered service before the first request, which
+is what importing the application used to cost.
+
+Runs against the configured environment (``DATABASE_URL``, ``DISABLE_WHISPER``
+and friends), so set ``DISABLE_WHISPER=1`` on machines without the model.
+
+Usage:
+    python scripts/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+from app.core.registry import services
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    if sys.argv[1] == "eager":
+        services.warm()
+    warmed = time.perf_counter()
+    assert client.get("/health").status_code == 200
+    served = time.perf_counter()
+print(json.dumps({
+    "import": imported - started, "startup": ready - imported, "warm": warmed - ready,
+    "first_request": served - started,
+}))
+"""
+
+
+def _run(mode: str) -> dict:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, mode], cwd=ROOT, capture_output=True, text=True, timeout=600,
+    )
+    if result.returncode != 0:
+        raise SystemExit(result.stderr[-2000:])
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process"] = time.perf_counter() - started
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} runs (seconds)")
+    print(f"{'mode':<6} {'import':>7} {'startup':>8} {'warm':>6} {'first request':>14} {'process':>8}")
+    for mode in ("lazy", "eager"):
+        runs = [_run(mode) for _ in range(args.runs)]
+        median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+        print(f"{mode:<6} {median['import']:7.2f} {median['startup']:8.2f} {median['warm']:6.2f} "
+              f"{median['first_request']:14.2f} {median['process']:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
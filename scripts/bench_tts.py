@@ -0,0 +1,81 @@
+"""
+TTS benchmark: blocking synthesis vs ``app.services.tts_executor``.
+
+Synthesizes replies of increasing length and reports time to first audio,
+time to the whole reply and the longest event-loop stall (measured by a
+ticker coroutine) for:
+
+- ``blocking``: the provider called on the event loop for the whole text,
+  as the endpoints used to call gTTS;
+- ``executor``: ``tts_executor.stream`` (sentences synthesized ahead in the
+  TTS thread pool and yielded in order).
+
+The provider is simulated (one 150 ms round trip per 100 characters, like
+gTTS) unless ``--gtts`` is given, which calls Google.
+
+Usage:
+    python scripts/bench_tts.py [--sentences 5 20 60] [--gtts]
+"""
+import argparse
+import asyncio
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.tts_executor import gtts_provider, tts_executor  # noqa: E402
+
+SENTENCE = "This is a reasonably ordinary sentence from an assistant reply."
+
+
+def simulated(text: str) -> bytes:
+    time.sleep(0.15 * math.ceil(len(text) / 100))  # gTTS: one ~150ms request per 100 characters
+    return b"\xff" * len(text)
+
+
+async def _measure(run) -> dict:
+    stalls, last = [0.0], time.perf_counter()
+
+    async def ticker():
+        nonlocal last
+        while True:
+            await asyncio.sleep(0.005)
+            now = time.perf_counter()
+            stalls.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    first = None
+    async for _ in run():
+        first = first or time.perf_counter() - started
+    total = time.perf_counter() - started
+    await asyncio.sleep(0.01)  # let the ticker see a stall that ended with the last chunk
+    task.cancel()
+    return {"first": first, "total": total, "stall": max(stalls)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sentences", type=int, nargs="+", default=[5, 20, 60])
+    parser.add_argument("--gtts", action="store_true", help="call gTTS instead of the simulated provider")
+    args = parser.parse_args()
+    provider = gtts_provider("en") if args.gtts else simulated
+
+    async def blocking(text):
+        yield provider(text)
+
+    print(f"{'sentences':>9} {'mode':<9} {'first audio':>12} {'total':>8} {'max loop stall':>15}")
+    for count in args.sentences:
+        text = " ".join([SENTENCE] * count)
+        for mode, run in (("blocking", lambda: blocking(text)), ("executor", lambda: tts_executor.stream(text, provider))):
+            result = asyncio.run(_measure(run))
+            print(f"{count:>9} {mode:<9} {result['first']:11.2f}s {result['total']:7.2f}s {result['stall']:14.2f}s")
+    tts_executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
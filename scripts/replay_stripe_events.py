@@ -0,0 +1,71 @@
+"""
+Replay stored Stripe webhook events.
+
+Puts the matching ``stripe_events`` rows back to ``pending`` and processes
+them again, per customer and in order: queued as ``payments.process_stripe_events``
+jobs, or in this process with ``--inline``. ``--list`` only shows the
+matching events.
+
+Usage:
+    python scripts/replay_stripe_events.py --status failed --list
+    python scripts/replay_stripe_events.py --status failed
+    python scripts/replay_stripe_events.py --event evt_123 --event evt_456 --inline
+    python scripts/replay_stripe_events.py --customer cus_ABC --since 2025-09-01
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import crud  # noqa: E402
+from app.core.jobs import enqueue  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services import stripe_events  # noqa: E402
+from app.tasks.payments import process_stripe_events  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--event", action="append", dest="event_ids", help="event id (repeatable)")
+    parser.add_argument("--customer", help="customer key (Stripe customer id, user:<id> or event:<id>)")
+    parser.add_argument("--status", help="only events in this status, e.g. failed")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only events received at or after this time")
+    parser.add_argument("--list", action="store_true", help="show the matching events and stop")
+    parser.add_argument("--inline", action="store_true", help="process here instead of queueing jobs")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.list:
+            events = crud.stripe_event.get_multi(db, status=args.status, customer=args.customer, limit=1000)
+            for event in events:
+                if args.event_ids and event.id not in args.event_ids:
+                    continue
+                if args.since and event.received_at < args.since:
+                    continue
+                print(f"{event.received_at:%Y-%m-%d %H:%M:%S} {event.id} {event.type} {event.customer} "
+                      f"{event.status} attempts={event.attempts} {event.error or ''}")
+            return
+        try:
+            customers = crud.stripe_event.replay(
+                db, event_ids=args.event_ids, customer=args.customer, status=args.status, since=args.since,
+            )
+        except ValueError as e:
+            raise SystemExit(str(e))
+        for customer in customers:
+            if args.inline:
+                try:
+                    print(customer, stripe_events.process_customer(db, customer))
+                except Exception as e:
+                    print(customer, f"failed: {e}")
+            else:
+                print(customer, enqueue(process_stripe_events, customer)["id"])
+        print(f"replayed events of {len(customers)} customer(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Seed the configured database and optionally bulk-load fixture data.
+
+Runs ``init_db`` (a no-op when the database is already at the current seed
+version, unless ``--force``), then loads vocabulary for load testing: from a
+JSON array / NDJSON file of word objects, or ``--words N`` generated ones.
+Loads skip words that already exist, so they can be re-run.
+
+Usage:
+    python scripts/seed_db.py
+    python scripts/seed_db.py --words 100000
+    python scripts/seed_db.py --words-file fixtures/words.ndjson --skip-search-index
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+from typing import Any, Dict, Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.crud.crud_platform_stats import platform_stats  # noqa: E402
+from app.db.initial_data import init_db, load_words  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.search import search_index  # noqa: E402
+
+LEVELS = ("A1", "A2", "B1", "B2", "C1", "C2")
+PARTS_OF_SPEECH = ("noun", "verb", "adjective", "adverb")
+
+
+def generated_words(count: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for i in range(count):
+        stem = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+        yield {
+            "word": f"{stem}{i}",
+            "translation": f"{stem[::-1]} {i}",
+            "level": rng.choice(LEVELS),
+            "part_of_speech": rng.choice(PARTS_OF_SPEECH),
+        }
+
+
+def file_words(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from json.load(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="seed even if the database is at the current version")
+    parser.add_argument("--words", type=int, default=0, help="generate and load this many words")
+    parser.add_argument("--words-file", help="JSON array or NDJSON file of word objects to load")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--skip-search-index", action="store_true", help="do not rebuild the search index after a load")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        seeded = init_db(db, force=args.force)
+        print(f"init_db: {'seeded' if seeded else 'already at the current version'} "
+              f"({time.perf_counter() - started:.2f}s)")
+
+        sources = []
+        if args.words_file:
+            sources.append(file_words(args.words_file))
+        if args.words:
+            sources.append(generated_words(args.words))
+        if not sources:
+            return
+        for words in sources:
+            started = time.perf_counter()
+            inserted = load_words(db, words, chunk_size=args.chunk_size)
+            print(f"loaded {inserted} words in {time.perf_counter() - started:.2f}s")
+        platform_stats.reconcile(db)
+        if not args.skip_search_index:
+            started = time.perf_counter()
+            search_index.rebuild(db)
+            print(f"search index rebuilt in {time.perf_counter() - started:.2f}s")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
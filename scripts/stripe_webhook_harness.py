@@ -0,0 +1,60 @@
+"""
+Deliver Stripe webhook fixtures to a running API, signed like Stripe does.
+
+Stands in for Stripe (or ``stripe listen``) in local development: each
+fixture in ``tests/test_data/stripe_events`` is signed with the webhook
+secret and POSTed to ``/api/v1/subscriptions/stripe-webhook``, optionally
+several times to exercise duplicate deliveries.
+
+Usage:
+    python scripts/stripe_webhook_harness.py --user-id 5 --plan-id 2
+    python scripts/stripe_webhook_harness.py checkout.session.completed --repeat 3 --fresh-ids
+    python scripts/stripe_webhook_harness.py --base-url http://localhost:8002 --secret whsec_...
+"""
+import argparse
+import os
+import sys
+import uuid
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.utils.stripe_events import FIXTURES, load_event, signed_request  # noqa: E402
+
+WEBHOOK_PATH = "/api/v1/subscriptions/stripe-webhook"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="*", help="event types to send (default: every fixture)")
+    parser.add_argument("--base-url", default=os.environ.get("BASE_URL", "http://localhost:8002"))
+    parser.add_argument("--secret", default=os.environ.get("STRIPE_WEBHOOK_SECRET"))
+    parser.add_argument("--user-id", help="metadata.user_id for checkout sessions")
+    parser.add_argument("--plan-id", help="metadata.plan_id for checkout sessions")
+    parser.add_argument("--customer", help="Stripe customer id for every event")
+    parser.add_argument("--repeat", type=int, default=1, help="deliveries of each event (duplicates share the id)")
+    parser.add_argument("--fresh-ids", action="store_true", help="give each run new event ids")
+    args = parser.parse_args()
+    if not args.secret:
+        raise SystemExit("set STRIPE_WEBHOOK_SECRET or pass --secret")
+
+    names = args.fixtures or sorted(path.stem for path in FIXTURES.glob("*.json"))
+    for name in names:
+        overrides = {}
+        if args.customer:
+            overrides["customer"] = args.customer
+        event = load_event(name, **overrides)
+        if args.fresh_ids:
+            event["id"] = f"{event['id']}_{uuid.uuid4().hex[:8]}"
+        metadata = event["data"]["object"].get("metadata")
+        if metadata is not None:
+            metadata.update({k: v for k, v in (("user_id", args.user_id), ("plan_id", args.plan_id)) if v})
+        for attempt in range(args.repeat):
+            payload, headers = signed_request(event, args.secret)
+            response = requests.post(args.base_url.rstrip("/") + WEBHOOK_PATH, data=payload, headers=headers, timeout=30)
+            print(f"{event['id']} {event['type']} #{attempt + 1}: {response.status_code} {response.text[:200]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ setup(
         "alembic>=1.7.0",
         "psycopg2-binary>=2.9.0",
         "httpx>=0.19.0",
+        "orjson>=3.8.0",
     ],
     extras_require={
         "test": [
@@ -413,6 +413,7 @@ def user_token_headers(test_user_token_headers):
 from app.db.session import SessionLocal, engine
 from app.db.base import Base
 from app.db.initial_data import init_db
+from app.services.content_catalog import content_catalog
 
 
 @pytest.fixture(scope="function")
@@ -420,6 +421,8 @@ def session() -> Generator:
     """Create a fresh database session for each test."""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Tables were recreated behind the ORM's back
+    content_catalog.invalidate()
     
     connection = engine.connect()
     transaction = connection.begin()
@@ -567,3 +570,36 @@ def authentication_token_from_email(
     )
     headers = {"Authorization": f"Bearer {access_token}"}
     return headers
+
+
+# --- N+1 guard -------------------------------------------------------------
+# QueryBudgetMiddleware (enabled under TESTING) records the SQL statement count
+# of every request. A test fails if one of its requests exceeds the budget;
+# raise it for a specific test with @pytest.mark.query_budget(n).
+from app.db.query_counter import query_report
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "query_budget(n): allow up to n SQL statements per request")
+
+
+@pytest.fixture(autouse=True)
+def query_budget(request):
+    seen = len(query_report.violations)
+    yield
+    marker = request.node.get_closest_marker("query_budget")
+    budget = marker.args[0] if marker else settings.QUERY_BUDGET_PER_REQUEST
+    over = [v for v in query_report.violations[seen:] if v[1] > budget]
+    if over:
+        endpoint, count, statements = max(over, key=lambda v: v[1])
+        pytest.fail(
+            f"{endpoint} ran {count} SQL statements (budget {budget}); first statements:\n  "
+            + "\n  ".join(s.splitlines()[0][:160] for s in statements[:15]),
+            pytrace=False,
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    if query_report.endpoints:
+        terminalreporter.section("SQL statements per request (worst endpoints)")
+        terminalreporter.write_line(query_report.format(limit=10))
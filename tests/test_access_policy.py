@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.crud import loaders
+from app.db.query_counter import count_queries
+from app.schemas.course import CourseCreate
+from app.schemas.lesson import LessonCreate
+from app.services.access_policy import Entitlements, LessonMeta, access_policy
+from tests.utils.user import create_random_user
+
+
+def _course(db: Session, instructor_id: int) -> models.Course:
+    return crud.course.create(
+        db, obj_in=CourseCreate(title="Policy Course", description="d", difficulty_level="A1", instructor_id=instructor_id)
+    )
+
+
+def _lesson(db: Session, course_id: int, *, is_premium: bool, order: int = 1) -> models.InteractiveLesson:
+    return crud.lesson.create(
+        db,
+        obj_in=LessonCreate(
+            title=f"Policy Lesson {order}", content="c", course_id=course_id, order=order,
+            is_premium=is_premium, avatar_id=1,
+        ),
+    )
+
+
+def test_entitlements_rules():
+    free, premium = LessonMeta(1, 10, False, 1), LessonMeta(2, 10, True, 2)
+    now = datetime.utcnow()
+
+    nobody = Entitlements(user_id=1)
+    assert nobody.can_access(free) and not nobody.can_access(premium)
+    assert Entitlements(user_id=1, course_ids=frozenset({10})).can_access(premium)
+    assert Entitlements(user_id=1, full_access=True).can_access(premium)
+    assert Entitlements(user_id=1, premium_until=now + timedelta(days=1)).can_access(premium, now)
+    # The window is evaluated at check time, so expiry needs no invalidation
+    assert not Entitlements(user_id=1, premium_until=now - timedelta(seconds=1)).can_access(premium, now)
+
+    restored = Entitlements.from_json(Entitlements(user_id=3, premium_until=now, course_ids=frozenset({4})).to_json())
+    assert restored.premium_until == now and restored.course_ids == {4}
+
+
+def test_catalog_follows_committed_lesson_changes(db: Session):
+    instructor, student = create_random_user(db), create_random_user(db)
+    lesson = _lesson(db, _course(db, instructor.id).id, is_premium=False)
+    assert crud.lesson.can_access_lesson(db, user=student, lesson_id=lesson.id)
+
+    crud.lesson.update(db, db_obj=lesson, obj_in={"is_premium": True})
+    assert not crud.lesson.can_access_lesson(db, user=student, lesson_id=lesson.id)
+    assert crud.lesson.can_access_lesson(db, user=instructor, lesson_id=lesson.id)
+
+
+def test_instructor_change_moves_entitlements(db: Session):
+    first, second = create_random_user(db), create_random_user(db)
+    course = _course(db, first.id)
+    premium = _lesson(db, course.id, is_premium=True)
+    _lesson(db, course.id, is_premium=False, order=2)
+
+    db.expire_all()
+    course.instructor_id = second.id
+    db.commit()
+    assert not crud.lesson.can_access_lesson(db, user_id=first.id, lesson_id=premium.id)
+    assert crud.lesson.can_access_lesson(db, user_id=second.id, lesson_id=premium.id)
+    listed = crud.lesson.get_accessible_lessons(db, user=second, course_id=course.id)
+    assert {lesson.id for lesson in listed} >= {premium.id}
+
+
+def test_access_check_is_in_memory(db: Session):
+    user = create_random_user(db)
+    lesson = _lesson(db, _course(db, user.id).id, is_premium=True)
+    access_policy.catalog.lesson(db, lesson.id)  # warm the catalog
+    user = crud.user.get(db, id=user.id, profile=loaders.AUTH)
+
+    with count_queries() as counter:
+        for _ in range(10):
+            assert crud.lesson.can_access_lesson(db, user=user, lesson_id=lesson.id)
+    assert counter.count == 0
@@ -0,0 +1,63 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.crud.crud_user_ai_usage import FREE_QUOTAS, PREMIUM_FALLBACK_QUOTAS
+from app.tasks import quotas as quota_tasks
+from tests.utils.user import create_random_user
+
+
+def _premium(db: Session, plan=None) -> models.User:
+    user = create_random_user(db)
+    user.roles.append(crud.role.get_by_name(db, name="premium"))
+    if plan is not None:
+        db.add(models.Subscription(user_id=user.id, plan_id=plan.id, end_date=datetime.utcnow() + timedelta(days=30)))
+    db.commit()
+    return user
+
+
+def _quotas(db: Session, user: models.User) -> dict:
+    db.expire_all()
+    usage = db.query(models.UserAIUsage).filter_by(user_id=user.id).one()
+    return {field: getattr(usage, field) for field in FREE_QUOTAS}
+
+
+def test_reset_all_applies_tier_quotas_once_per_period(db: Session):
+    plan = crud.subscription.get_subscription_plan_by_name(db, name="Monthly")
+    free, subscribed, lapsed = create_random_user(db), _premium(db, plan), _premium(db)
+    crud.user_ai_usage.get_or_create(db, user_id=subscribed.id)
+    crud.user_ai_usage.decrement(db, user_id=subscribed.id, field="tts_chars_left", amount=100)
+
+    progress = []
+    stats = crud.user_ai_usage.reset_all(db, period="2030-01", chunk_size=2, on_progress=progress.append)
+    assert stats["chunks_done"] == stats["chunks"] == len(progress) > 1
+    assert stats["created"] >= 2 and stats["plan"] == 1 and stats["premium"] >= 1
+    assert _quotas(db, free) == FREE_QUOTAS
+    assert _quotas(db, lapsed) == PREMIUM_FALLBACK_QUOTAS
+    assert _quotas(db, subscribed)["tts_chars_left"] == plan.tts_chars_quota
+
+    # Same period again: nothing left to do, spent quota stays spent
+    crud.user_ai_usage.decrement(db, user_id=free.id, field="tts_chars_left", amount=10)
+    again = crud.user_ai_usage.reset_all(db, period="2030-01", chunk_size=2)
+    assert (again["created"], again["plan"], again["premium"], again["free"]) == (0, 0, 0, 0)
+    assert _quotas(db, free)["tts_chars_left"] == FREE_QUOTAS["tts_chars_left"] - 10
+
+    assert crud.user_ai_usage.reset_all(db, period="2030-02")["free"] >= 1
+    assert _quotas(db, free) == FREE_QUOTAS
+
+
+def test_reset_all_endpoint_queues_one_job_per_period(client, superuser_token_headers, db: Session, monkeypatch):
+    @contextmanager
+    def _test_session():
+        yield db
+
+    monkeypatch.setattr(quota_tasks, "job_session", _test_session)
+    url = f"{settings.API_V1_STR}/ai/usage/reset-all"
+    job = client.post(url, params={"period": "2030-03"}, headers=superuser_token_headers).json()
+    assert job["state"] == "succeeded" and job["result"]["period"] == "2030-03"
+    assert job["progress"]["chunks_done"] == job["progress"]["chunks"] > 0
+    assert client.post(url, params={"period": "2030-03"}, headers=superuser_token_headers).json()["id"] == job["id"]
+    assert client.post(url, params={"period": "March"}, headers=superuser_token_headers).status_code == 422
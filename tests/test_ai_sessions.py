@@ -0,0 +1,157 @@
+import pytest
+
+from app.core.config import settings
+from app.services import ai_service
+from app.services import ai_session_store as store_module
+from app.services.ai_session_store import AISessionStore
+
+URL = f"{settings.API_V1_STR}/ai-sessions/sessions"
+
+
+def _range(items, start, end):
+    n = len(items)
+    start, end = (start + n if start < 0 else start), (end + n if end < 0 else end)
+    return items[max(start, 0):end + 1]
+
+
+class _Redis:
+    """Just enough of Redis for session hashes, user indexes and message lists."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def expire(self, key, seconds):
+        pass
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        values = self.data.setdefault(key, {})
+        values.update({k: str(v) for k, v in (mapping or {field: value}).items()})
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def zcard(self, key):
+        return len(self.data.get(key, {}))
+
+    def zrevrange(self, key, start, end):
+        members = sorted(self.data.get(key, {}).items(), key=lambda item: item[1], reverse=True)
+        return [member for member, _ in _range(members, start, end)]
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.data.get(key, {}).pop(member, None)
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+
+    def ltrim(self, key, start, end):
+        self.data[key] = _range(self.data.get(key, []), start, end)
+
+    def lrange(self, key, start, end):
+        return _range(self.data.get(key, []), start, end)
+
+    def llen(self, key):
+        return len(self.data.get(key, []))
+
+    def keys(self, pattern):
+        raise AssertionError("listing must not scan the keyspace")
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self.redis, self.queued = redis, []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.queued.append((getattr(self.redis, name), args, kwargs))
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.queued]
+
+
+@pytest.fixture(params=["redis", "memory"])
+def store(request, monkeypatch):
+    if request.param == "redis":
+        monkeypatch.setattr(store_module, "redis_client", _Redis())
+    else:
+        monkeypatch.setattr(store_module.redis_client, "pipeline", lambda *a, **k: 1 / 0)
+        for name in ("hgetall", "lrange", "delete"):
+            monkeypatch.setattr(store_module.redis_client, name, lambda *a, **k: 1 / 0)
+    fresh = AISessionStore()
+    monkeypatch.setattr(store_module, "ai_session_store", fresh)
+    return fresh
+
+
+def test_user_index_lists_newest_first_and_log_is_capped(store, monkeypatch):
+    monkeypatch.setattr(settings, "AI_SESSION_MAX_MESSAGES", 5)
+    first = store.create(1, "first")
+    second = store.create(1, "second")
+    store.create(2, "someone else's")
+
+    for i in range(4):
+        store.append_messages(first, [{"role": "user", "text": f"q{i}"}, {"role": "assistant", "text": f"a{i}"}])
+    assert [m["text"] for m in store.history(first["id"], 3)] == ["a2", "q3", "a3"]
+    messages, total = store.messages(first["id"], offset=1, limit=2)
+    assert total == 5 and [m["text"] for m in messages] == ["q2", "a2"]
+
+    sessions, total = store.list_for_user(1, limit=1)
+    assert total == 2 and [s["id"] for s in sessions] == [second["id"]]
+    sessions, _ = store.list_for_user(1, limit=10)
+    assert [(s["title"], s["message_count"], s["user_id"]) for s in sessions] == [("second", 0, 1), ("first", 5, 1)]
+
+    store.delete(second)
+    assert store.get(second["id"]) is None
+    assert store.list_for_user(1)[1] == 1
+
+
+def test_expired_sessions_leave_the_index(monkeypatch):
+    redis = _Redis()
+    monkeypatch.setattr(store_module, "redis_client", redis)
+    store = AISessionStore()
+    kept, expired = store.create(1, "kept"), store.create(1, "expired")
+    redis.delete(store._meta_key(expired["id"]))
+
+    sessions, total = store.list_for_user(1)
+    assert [s["id"] for s in sessions] == [kept["id"]] and total == 1
+    assert expired["id"] not in redis.data[store._user_key(1)]
+
+
+def test_session_endpoints(client, store, test_user_token_headers, monkeypatch):
+    async def completion(history):
+        assert len(history) <= 7  # level instruction + last 6 messages
+        yield f"reply to {history[-1]['parts'][0]['text']}"
+
+    monkeypatch.setattr(ai_service, "get_chat_completion", completion)
+    form_headers = {"Authorization": test_user_token_headers["Authorization"]}  # without the JSON content type
+    session = client.post(URL, params={"title": "Chat"}, headers=test_user_token_headers).json()
+    assert session["messages"] == []
+
+    for text in ("salom", "qalaysiz"):
+        r = client.post(f"{URL}/{session['id']}/messages", data={"text": text}, headers=form_headers)
+        assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["assistant"]["text"] == "reply to qalaysiz"
+    assert [m["text"] for m in body["session"]["messages"]][-2:] == ["qalaysiz", "reply to qalaysiz"]
+
+    r = client.get(f"{URL}/{session['id']}/messages", params={"limit": 2, "offset": 1}, headers=test_user_token_headers)
+    assert r.json()["total"] == 4 and [m["role"] for m in r.json()["items"]] == ["assistant", "user"]
+
+    listing = client.get(URL, headers=test_user_token_headers).json()
+    assert listing["count"] == 1 and listing["sessions"][0]["message_count"] == 4
+
+    r = client.patch(f"{URL}/{session['id']}", data={"title": "Renamed"}, headers=form_headers)
+    assert r.json()["title"] == "Renamed"
+    assert client.post(f"{URL}/{session['id']}/reset", headers=test_user_token_headers).json()["messages"] == []
+    assert client.get(f"{URL}/{session['id']}", headers=test_user_token_headers).json()["messages"] == []
+
+    assert client.delete(f"{URL}/{session['id']}", headers=test_user_token_headers).status_code == 200
+    assert client.get(f"{URL}/{session['id']}", headers=test_user_token_headers).status_code == 404
@@ -0,0 +1,29 @@
+import asyncio
+
+from sqlalchemy.orm import Session
+
+from bench.generate import SCALES, generate, load_dataset
+from bench.scenarios import SCENARIOS, percentile, run_scenario, stub_ai_providers
+
+
+def test_percentile_is_nearest_rank():
+    ordered = [float(i) for i in range(1, 101)]
+    assert [percentile(ordered, q) for q in (50, 95, 99)] == [50.0, 95.0, 99.0]
+    assert percentile([], 95) == 0.0
+
+
+def test_generated_dataset_drives_every_scenario(client, db: Session):
+    scale = SCALES["tiny"]
+    counts = generate(db, scale, seed=7)
+    assert counts["users"] == scale.users
+    assert counts["exercise_attempts"] == scale.users * scale.attempts_per_user
+    assert counts["forum_posts"] == scale.topics * scale.posts_per_topic
+
+    data = load_dataset(db)
+    assert len(data.user_ids) == scale.users and data.exercises and data.topic_ids
+
+    with stub_ai_providers():
+        for name in SCENARIOS:
+            result = asyncio.run(run_scenario(client.app, name, data, concurrency=1, iterations=2))
+            assert result["requests"] and result["errors"] == 0, (name, result["endpoints"])
+            assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
@@ -0,0 +1,144 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.core.config import settings
+from app.core.jobs import job_store
+from app.services.certificate_renderer import CertificateFields, CertificateRenderer, CertificateTemplate, _register_fonts
+from app.tasks import certificates as certificate_tasks
+
+FIELDS = CertificateFields(
+    user_name="Test User",
+    course_name="English A1",
+    issue_date="2025-01-01",
+    verification_code="abc-123",
+    level_completed="A1",
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_idempotency_keys(monkeypatch: pytest.MonkeyPatch):
+    # Certificate ids repeat across test databases; in-memory render keys must not
+    monkeypatch.setattr(job_store, "_memory_keys", {})
+
+
+def _page_content(pdf: bytes) -> bytes:
+    # Drop the metadata/trailer, which contain timestamps and a document id
+    return pdf[:pdf.index(b"/Author")]
+
+
+def test_cached_template_matches_full_render(tmp_path):
+    renderer = CertificateRenderer(str(tmp_path))
+    assert renderer.template.static_layer() is not None
+    cached = renderer.render(FIELDS)
+
+    uncached = CertificateRenderer(str(tmp_path))
+    uncached.template._replay_static = lambda c: False
+    assert cached.startswith(b"%PDF")
+    assert _page_content(cached) == _page_content(uncached.render(FIELDS))
+
+
+def test_template_draws_the_layer_if_reportlab_internals_changed(tmp_path, monkeypatch):
+    renderer = CertificateRenderer(str(tmp_path))
+    expected = _page_content(renderer.render(FIELDS))
+
+    def changed_internals(self):
+        raise AttributeError("'Canvas' object has no attribute '_code'")
+
+    template = CertificateTemplate(renderer.template.font, renderer.template.font_bold)
+    monkeypatch.setattr(CertificateTemplate, "static_layer", changed_internals)
+    assert _page_content(template.render(FIELDS)) == expected
+    assert _page_content(template.render(FIELDS)) == expected  # no second attempt
+    assert template._replayable is False
+
+
+@pytest.mark.skipif(not os.path.exists("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"), reason="DejaVu fonts")
+def test_cached_template_with_embedded_truetype_fonts():
+    fonts = _register_fonts("/usr/share/fonts/truetype/dejavu")
+    assert fonts == ("DejaVu", "DejaVu-Bold")
+    template = CertificateTemplate(*fonts)
+    uncached = CertificateTemplate(*fonts)
+    uncached._replay_static = lambda c: False
+    replay, replayed = template._replay_static, []
+    template._replay_static = lambda c: replayed.append(replay(c)) or replayed[-1]
+
+    fields = CertificateFields(**{**FIELDS.__dict__, "user_name": "Oʻtkir Ğayratov"})
+    for _ in range(2):  # the second render replays the layer into a document with fresh subsets
+        cached = template.render(fields)
+        assert _page_content(cached) == _page_content(uncached.render(fields))
+    assert replayed == [True, True]
+
+
+def test_render_to_file(tmp_path):
+    renderer = CertificateRenderer(str(tmp_path))
+    path = renderer.render_to_file(7, FIELDS)
+    assert path == str(tmp_path / "certificate_7.pdf")
+    assert open(path, "rb").read().startswith(b"%PDF")
+
+
+def test_issued_certificate_is_rendered_by_job_and_cached_on_download(
+    db: Session, client, test_user: models.User, test_user_token_headers,
+    tmp_path, monkeypatch: pytest.MonkeyPatch,
+):
+    @contextmanager
+    def _test_session():
+        yield db
+
+    monkeypatch.setattr(certificate_tasks, "job_session", _test_session)
+    monkeypatch.setattr(certificate_tasks.certificate_renderer, "storage_dir", str(tmp_path))
+
+    certificate = crud.certificate.create_with_pdf(
+        db,
+        obj_in=schemas.CertificateCreate(
+            title="Certificate for English A1",
+            user_id=test_user.id,
+            course_name="English A1",
+            level_completed="A1",
+        ),
+        user=test_user,
+    )
+    db.refresh(certificate)
+    assert certificate.file_path == str(tmp_path / f"certificate_{certificate.id}.pdf")
+
+    r = client.get(
+        f"{settings.API_V1_STR}/certificates/{certificate.id}/download", headers=test_user_token_headers
+    )
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "application/pdf"
+    assert "immutable" in r.headers["cache-control"]
+    assert r.content.startswith(b"%PDF")
+
+
+def test_render_is_queued_again_after_the_job_failed_or_the_file_was_removed(
+    db: Session, test_user: models.User, tmp_path, monkeypatch: pytest.MonkeyPatch,
+):
+    @contextmanager
+    def _test_session():
+        yield db
+
+    monkeypatch.setattr(certificate_tasks, "job_session", _test_session)
+    renderer = certificate_tasks.certificate_renderer
+    monkeypatch.setattr(renderer, "storage_dir", str(tmp_path))
+    render_to_file = renderer.render_to_file
+    monkeypatch.setattr(renderer, "render_to_file", lambda *args: (_ for _ in ()).throw(OSError("disk full")))
+
+    certificate = crud.certificate.create_with_pdf(  # queues a render that fails
+        db,
+        obj_in=schemas.CertificateCreate(title="Certificate", user_id=test_user.id, course_name="English A1"),
+        user=test_user,
+    )
+    db.refresh(certificate)
+    assert certificate.file_path is None
+
+    monkeypatch.setattr(renderer, "render_to_file", render_to_file)
+    retried = certificate_tasks.schedule_render(certificate)
+    assert retried["state"] == "succeeded", retried
+    db.refresh(certificate)
+    assert os.path.exists(certificate.file_path)
+
+    os.remove(certificate.file_path)
+    again = certificate_tasks.schedule_render(certificate)
+    assert again["id"] != retried["id"] and os.path.exists(certificate.file_path)
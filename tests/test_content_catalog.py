@@ -0,0 +1,103 @@
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.db.query_counter import count_queries
+from app.schemas.course import CourseCreate
+from app.schemas.lesson import LessonCreate
+from app.services import content_catalog as catalog_module
+from app.services.content_catalog import ContentCatalog, content_catalog
+from tests.utils.user import create_random_user
+
+
+def _course(db: Session, level: str = "B2") -> models.Course:
+    instructor = create_random_user(db)
+    return crud.course.create(
+        db, obj_in=CourseCreate(title="Catalog Course", description="d", difficulty_level=level, instructor_id=instructor.id)
+    )
+
+
+def _lesson(db: Session, course_id: int, order: int) -> models.InteractiveLesson:
+    return crud.lesson.create(
+        db,
+        obj_in=LessonCreate(title=f"Catalog {order}", content="c", course_id=course_id, order=order, avatar_id=1),
+    )
+
+
+class _Redis:
+    """Just enough of Redis for the version counter and change log."""
+
+    def __init__(self):
+        self.values, self.lists = {}, {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:end + 1 if end != -1 else None]
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start:end + 1 if end != -1 else None]
+
+
+def test_lessons_are_linked_in_course_order(db: Session):
+    course = _course(db)
+    third, first, second = _lesson(db, course.id, 3), _lesson(db, course.id, 1), _lesson(db, course.id, 2)
+
+    assert [m.id for m in content_catalog.ordered(db, course.id)] == [first.id, second.id, third.id]
+    assert content_catalog.next_lesson(db, first.id).id == second.id
+    assert content_catalog.previous_lesson(db, second.id).id == first.id
+    assert content_catalog.next_lesson(db, third.id) is None
+    assert [m.id for m in content_catalog.lessons_by_difficulty(db, "B2")] == [first.id, second.id, third.id]
+    assert content_catalog.courses_taught_by(db, course.instructor_id) == {course.id}
+
+
+def test_commits_refresh_only_changed_rows(db: Session):
+    course = _course(db)
+    lesson = _lesson(db, course.id, 1)
+    content_catalog.warm(db)
+    loads = content_catalog.stats.loads
+
+    moved = _lesson(db, course.id, 0)
+    lesson.title = "Renamed"
+    db.add(models.Word(word="catalog", lesson_id=lesson.id))
+    db.commit()
+    lesson_id, moved_id = lesson.id, moved.id
+
+    with count_queries() as counter:
+        assert content_catalog.lesson(db, lesson_id).title == "Renamed"
+    assert counter.count == 2  # changed lessons + changed words, nothing else
+    assert content_catalog.stats.loads == loads
+    assert content_catalog.next_lesson(db, moved_id).id == lesson_id
+    assert [w.word for w in content_catalog.words_for_lesson(db, lesson_id)] == ["catalog"]
+
+
+def test_other_workers_apply_published_changes(db: Session, monkeypatch):
+    monkeypatch.setattr(catalog_module, "redis_client", _Redis())
+    monkeypatch.setattr(catalog_module.settings, "CONTENT_CATALOG_RECHECK", 0)
+    course = _course(db)
+    lesson = _lesson(db, course.id, 1)
+    other = ContentCatalog()  # another API worker
+    other.warm(db)
+
+    crud.lesson.update(db, db_obj=lesson, obj_in={"is_premium": True})
+    assert other.lesson(db, lesson.id).is_premium
+    assert (other.stats.loads, other.stats.refreshes) == (1, 1)
+
+
+def test_lesson_content_is_cached_until_the_lesson_changes(db: Session):
+    lesson = _lesson(db, _course(db).id, 1)
+    assert content_catalog.lesson_content(db, lesson.id) == "c"
+    with count_queries() as counter:
+        assert content_catalog.lesson_content(db, lesson.id) == "c"
+    assert counter.count == 0
+
+    crud.lesson.update(db, db_obj=lesson, obj_in={"content": "new"})
+    assert content_catalog.lesson_content(db, lesson.id) == "new"
+    assert content_catalog.describe()["memory_bytes"] > 0
@@ -0,0 +1,95 @@
+import json
+
+from app import crud
+from app.core.config import settings
+from app.crud import crud_content_lesson
+
+URL = f"{settings.API_V1_STR}/content"
+
+
+def test_lesson_writes_are_conditional_on_the_version(client, superuser_token_headers):
+    created = client.post(f"{URL}/lessons", json={"title": "Greetings", "video": "https://x/v.mp4"},
+                          headers=superuser_token_headers)
+    assert created.status_code == 201, created.text
+    lesson = created.json()
+    assert lesson["version"] == 1 and created.headers["etag"] == '"1"'
+
+    r = client.put(f"{URL}/lessons/{lesson['id']}", json={"title": "Hello"},
+                   headers={**superuser_token_headers, "If-Match": '"1"'})
+    assert r.json() == {"id": lesson["id"], "title": "Hello", "version": 2}
+
+    stale = client.patch(f"{URL}/lessons/{lesson['id']}", json={"title": "Hi", "version": 1},
+                         headers=superuser_token_headers)
+    assert stale.status_code == 409 and stale.json()["detail"]["current"]["title"] == "Hello"
+
+    r = client.patch(f"{URL}/lessons/{lesson['id']}", json={"level": "A1"},
+                     headers={**superuser_token_headers, "If-Match": 'W/"2"'})
+    assert r.json() == {"id": lesson["id"], "title": "Hello", "level": "A1", "version": 3}
+    assert client.get(f"{URL}/lessons/{lesson['id']}", headers=superuser_token_headers).headers["etag"] == '"3"'
+
+    assert client.delete(f"{URL}/lessons/{lesson['id']}", headers={**superuser_token_headers, "If-Match": "2"}
+                         ).status_code == 409
+    r = client.delete(f"{URL}/lessons/{lesson['id']}", headers={**superuser_token_headers, "If-Match": "3"})
+    assert r.json() == {"status": "deleted", "id": lesson["id"], "title": "Hello"}
+    assert client.get(f"{URL}/lessons/{lesson['id']}", headers=superuser_token_headers).status_code == 404
+
+
+def test_bulk_import_and_streaming_export(client, superuser_token_headers, monkeypatch):
+    monkeypatch.setattr(crud_content_lesson, "IMPORT_CHUNK_SIZE", 2)
+    payload = {"version": 7, "lessons": [{"id": 10, "title": "a"}, {"title": "b", "audio": "b.mp3"}, {"id": 3, "title": "c"}]}
+    r = client.post(f"{URL}/lessons/bulk-import", json=payload, headers=superuser_token_headers)
+    assert r.json() == {"status": "ok", "count": 3}
+
+    exported = client.get(f"{URL}/lessons/export", headers=superuser_token_headers).json()
+    assert exported["version"] == 1
+    assert [(l["id"], l["title"]) for l in exported["lessons"]] == [(10, "a"), (11, "b"), (3, "c")]
+    assert client.get(f"{URL}/lessons-json", headers=superuser_token_headers).json() == exported
+    assert [l["title"] for l in client.get(f"{URL}/lessons", params={"skip": 1, "limit": 1},
+                                           headers=superuser_token_headers).json()] == ["b"]
+
+    validation = client.get(f"{URL}/lessons/validate", headers=superuser_token_headers).json()
+    assert validation == {"valid": False, "errors": ["lessons[1].audio: file not found 'b.mp3'"], "count": 3}
+
+    ndjson_headers = {"Authorization": superuser_token_headers["Authorization"], "Content-Type": "application/x-ndjson"}
+    lines = "\n".join(json.dumps({"title": f"n{i}", "order": i}) for i in range(5))
+    r = client.post(f"{URL}/lessons/bulk-import", content=lines.encode(), headers=ndjson_headers)
+    assert r.json() == {"status": "ok", "count": 5}
+    streamed = client.get(f"{URL}/lessons/export", params={"format": "ndjson"}, headers=superuser_token_headers)
+    assert [json.loads(line)["order"] for line in streamed.text.splitlines()] == [0, 1, 2, 3, 4]
+
+
+def test_import_numbers_lessons_without_id_after_all_explicit_ids(session, monkeypatch):
+    monkeypatch.setattr(crud_content_lesson, "IMPORT_CHUNK_SIZE", 1)
+    importer = crud.content_lesson.start_import(session)
+    # The id-less lesson is inserted before ids 1 and 2 are seen
+    for document in ({"title": "a"}, {"id": 1, "title": "b"}, {"id": 2, "title": "c"}, {"title": "d"}):
+        importer.add(document)
+    assert importer.finish() == 4
+
+    assert [(l["id"], l["title"]) for l in crud.content_lesson.get_multi(session)] == [
+        (3, "a"), (1, "b"), (2, "c"), (4, "d")
+    ]
+
+
+def test_failed_import_keeps_the_previous_lessons(client, superuser_token_headers, monkeypatch):
+    monkeypatch.setattr(crud_content_lesson, "IMPORT_CHUNK_SIZE", 1)
+    client.put(f"{URL}/lessons-json", json={"lessons": [{"title": "kept"}]}, headers=superuser_token_headers)
+    ndjson_headers = {"Authorization": superuser_token_headers["Authorization"], "Content-Type": "application/x-ndjson"}
+
+    r = client.post(f"{URL}/lessons/bulk-import", content=b'{"title": "x"}\n{"title": \n', headers=ndjson_headers)
+    assert r.status_code == 400 and "line 2" in r.json()["detail"]
+    r = client.put(f"{URL}/lessons-json", json={"lessons": [{"id": 1, "title": "x"}, {"id": 1, "title": "y"}]},
+                   headers=superuser_token_headers)
+    assert r.status_code == 400
+    assert client.put(f"{URL}/lessons-json", json={}, headers=superuser_token_headers).status_code == 400
+
+    assert [l["title"] for l in client.get(f"{URL}/lessons", headers=superuser_token_headers).json()] == ["kept"]
+
+
+def test_legacy_lessons_json_is_imported_once(session, tmp_path):
+    legacy = tmp_path / "lessons.json"
+    legacy.write_text(json.dumps({"version": 4, "lessons": [{"id": 5, "title": "old", "video": "v.mp4"}]}))
+
+    assert crud.content_lesson.import_legacy_file(session, legacy) == 1
+    assert not legacy.exists() and (tmp_path / "lessons.json.imported").exists()
+    assert crud.content_lesson.get_multi(session) == [{"id": 5, "title": "old", "video": "v.mp4", "version": 1}]
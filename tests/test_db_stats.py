@@ -0,0 +1,28 @@
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.core import monitoring
+from app.db import stats
+
+
+def test_sqlite_stats_and_missing_foreign_key_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA journal_mode=WAL"))
+        conn.execute(text("CREATE TABLE exercise_attempts (id INTEGER PRIMARY KEY, user_id INTEGER, exercise_id INTEGER)"))
+        conn.execute(text("CREATE TABLE user_lesson_completions (id INTEGER PRIMARY KEY, user_id INTEGER, lesson_id INTEGER)"))
+        conn.execute(text("CREATE INDEX ix_completions_user_lesson ON user_lesson_completions (user_id, lesson_id)"))
+        conn.execute(text("CREATE INDEX ix_attempts_exercise_user ON exercise_attempts (exercise_id, user_id)"))
+        conn.execute(text("INSERT INTO exercise_attempts (user_id, exercise_id) VALUES (1, 1), (1, 2)"))
+
+    collected = monitoring.log_database_metrics(engine)
+
+    assert collected["dialect"] == "sqlite"
+    assert collected["page_count"] > 0 and collected["size_bytes"] == collected["page_count"] * collected["page_size"]
+    assert collected["wal_bytes"] > 0
+    # user_id is second in the attempts index; notifications does not exist here
+    assert collected["missing_fk_indexes"] == [("exercise_attempts", "user_id")]
+    assert REGISTRY.get_sample_value("db_missing_fk_index", {"table": "exercise_attempts", "column": "user_id"}) == 1
+    assert REGISTRY.get_sample_value("db_missing_fk_index", {"table": "user_lesson_completions", "column": "user_id"}) == 0
+    assert REGISTRY.get_sample_value("db_sqlite_wal_bytes") == collected["wal_bytes"]
+    engine.dispose()
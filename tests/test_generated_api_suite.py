@@ -82,6 +82,8 @@ def test_update_user_by_admin(client: TestClient, superuser_token_headers: dict,
     assert r.json()["email"] == new_email
 
 
+# Deleting a user cascades to every table that references it
+@pytest.mark.query_budget(40)
 def test_delete_user(client: TestClient, superuser_token_headers: dict, db_session: Session) -> None:
     user = create_random_user(db_session)
     response = client.delete(f"{settings.API_V1_STR}/users/{user.id}", headers=superuser_token_headers)
@@ -0,0 +1,166 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.celery_app import celery_app, is_eager
+from app.core.config import settings
+from app.core.jobs import JobState, JobTask, enqueue, job_store
+from app.core.progress import STAGE_DONE, progress_bus
+from app.models.homework import HomeworkStatus
+from app.services import homework_service
+from app.tasks import homework as homework_tasks
+from tests.utils.course import create_test_course
+from tests.utils.homework import create_random_homework
+from tests.utils.lesson import create_test_lesson
+
+CALLS = {"flaky": 0}
+
+
+@celery_app.task(base=JobTask, name="tests.add")
+def add(x: int, y: int) -> int:
+    return x + y
+
+
+@celery_app.task(base=JobTask, name="tests.flaky", retry_backoff=False)
+def flaky() -> str:
+    CALLS["flaky"] += 1
+    if CALLS["flaky"] < 2:
+        raise RuntimeError("temporary failure")
+    return "ok"
+
+
+@celery_app.task(base=JobTask, name="tests.broken", max_retries=1, retry_backoff=False)
+def broken() -> None:
+    raise RuntimeError("always fails")
+
+
+def test_jobs_run_eagerly_in_tests():
+    assert is_eager()
+    job = enqueue(add, 2, 3, owner_id=1)
+    assert job["state"] == JobState.SUCCEEDED.value
+    assert job["result"] == 5
+    assert job["attempts"] == 1
+
+
+def test_idempotency_key_returns_existing_job():
+    first = enqueue(add, 1, 1, idempotency_key="tests:add:once")
+    second = enqueue(add, 1, 1, idempotency_key="tests:add:once")
+    assert first["id"] == second["id"]
+
+
+def test_failed_job_is_retried():
+    CALLS["flaky"] = 0
+    job = enqueue(flaky)
+    assert CALLS["flaky"] == 2
+    assert job_store.get(job["id"])["state"] == JobState.SUCCEEDED.value
+
+
+def test_job_fails_after_max_retries():
+    job = enqueue(broken)
+    record = job_store.get(job["id"])
+    assert record["state"] == JobState.FAILED.value
+    assert "always fails" in record["error"]
+
+
+def test_failed_job_releases_its_idempotency_key():
+    first = enqueue(broken, idempotency_key="tests:broken:once")
+    second = enqueue(broken, idempotency_key="tests:broken:once")
+    assert first["id"] != second["id"]
+
+
+def test_owner_index_lists_jobs():
+    job = enqueue(add, 4, 4, owner_id=987654)
+    ids = [j["id"] for j in job_store.list_for_owner(987654)]
+    assert ids[0] == job["id"]
+
+
+def test_auto_grade_job_uses_its_own_session(
+    db: Session, power_user: models.User, monkeypatch: pytest.MonkeyPatch
+):
+    course = create_test_course(db, instructor_id=power_user.id)
+    lesson = create_test_lesson(db, course_id=course.id)
+    homework = create_random_homework(db, lesson_id=lesson.id, course_id=course.id, teacher_id=power_user.id)
+    homework.instructions = "I like to read books every day"
+    submission = models.HomeworkSubmission(
+        homework_id=homework.id,
+        student_id=power_user.id,
+        content="I like to read books every day",
+        status=HomeworkStatus.SUBMITTED,
+    )
+    db.add(submission)
+    db.commit()
+
+    @contextmanager
+    def _test_session():
+        yield db
+
+    async def _no_ai(request):
+        raise RuntimeError("AI provider disabled in tests")
+
+    monkeypatch.setattr(homework_tasks, "job_session", _test_session)
+    monkeypatch.setattr(homework_service.ai_feedback_service, "generate_feedback", _no_ai)
+
+    job = enqueue(homework_tasks.auto_grade_submission, submission.id, owner_id=power_user.id)
+    assert job["state"] == JobState.SUCCEEDED.value, job
+    db.refresh(submission)
+    assert submission.status == HomeworkStatus.GRADED
+    assert submission.score == 100
+
+
+def test_job_status_endpoint(client, test_user, test_user_token_headers):
+    job = enqueue(add, 1, 2, owner_id=test_user.id)
+    r = client.get(f"{settings.API_V1_STR}/jobs/{job['id']}", headers=test_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["state"] == "succeeded"
+
+    other = enqueue(add, 1, 2, owner_id=test_user.id + 1000)
+    r = client.get(f"{settings.API_V1_STR}/jobs/{other['id']}", headers=test_user_token_headers)
+    assert r.status_code == 404
+
+
+def test_job_with_resource_publishes_progress():
+    job = enqueue(add, 2, 2, owner_id=42, resource="tests_resource:1")
+    event = progress_bus.last("tests_resource:1")
+    assert event["stage"] == STAGE_DONE
+    assert event["job_id"] == job["id"]
+    assert event["owner_id"] == 42
+
+
+def test_progress_subscribe_receives_live_events():
+    async def _run():
+        received = []
+
+        async def _consume():
+            async for event in progress_bus.subscribe("tests_resource:live", heartbeat=1):
+                if event:
+                    received.append(event["stage"])
+
+        consumer = asyncio.create_task(_consume())
+        await asyncio.sleep(0.05)
+        progress_bus.publish("tests_resource:live", "grading", owner_id=1)
+        progress_bus.publish("tests_resource:live", STAGE_DONE)
+        await asyncio.wait_for(consumer, timeout=5)
+        return received
+
+    assert asyncio.run(_run()) == ["grading", STAGE_DONE]
+
+
+def test_progress_endpoints(client, test_user, test_user_token_headers):
+    resource = f"tests_resource:user{test_user.id}"
+    enqueue(add, 1, 1, owner_id=test_user.id, resource=resource)
+
+    r = client.get(f"{settings.API_V1_STR}/jobs/progress/{resource}", headers=test_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["stage"] == STAGE_DONE
+
+    r = client.get(f"{settings.API_V1_STR}/jobs/progress/{resource}/events", headers=test_user_token_headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert '"stage": "done"' in r.text
+
+    progress_bus.publish("tests_resource:other", STAGE_DONE, owner_id=test_user.id + 1000)
+    r = client.get(f"{settings.API_V1_STR}/jobs/progress/tests_resource:other", headers=test_user_token_headers)
+    assert r.status_code == 404
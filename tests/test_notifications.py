@@ -0,0 +1,94 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.db.query_counter import count_queries
+from app.models.notification import NotificationType
+from app.services.notification_service import NotificationService
+from tests.utils.user import create_random_user
+
+
+def _count_inserts(db: Session):
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO NOTIFICATIONS"):
+            statements.append(statement)
+
+    engine = db.get_bind().engine
+    event.listen(engine, "before_cursor_execute", _before)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _before)
+
+
+def test_fan_out_to_user_ids_renders_once_and_inserts_in_bulk(db: Session):
+    users = [create_random_user(db) for _ in range(5)]
+    service = NotificationService(db)
+
+    statements, stop = _count_inserts(db)
+    try:
+        created = service.fan_out(
+            [u.id for u in users] + [users[0].id],
+            title="New lesson: {lesson}",
+            message="'{lesson}' is now available.",
+            notification_type=NotificationType.SYSTEM,
+            context={"lesson": "Past Simple"},
+        )
+    finally:
+        stop()
+
+    assert created == 5
+    assert len(statements) == 1
+    for user in users:
+        notifications = crud.notification.get_multi_by_user(db, user_id=user.id)
+        assert [n.title for n in notifications] == ["New lesson: Past Simple"]
+        assert notifications[0].notification_type == NotificationType.SYSTEM.value
+        assert crud.notification.get_unread_count(db, user_id=user.id) == 1
+
+
+def test_fan_out_to_audience_query(db: Session):
+    users = [create_random_user(db) for _ in range(3)]
+    audience = select(models.User.id).where(models.User.id.in_([u.id for u in users]))
+
+    created = NotificationService(db).fan_out(
+        audience, title="Maintenance", message="Back soon", data={"window": "02:00"}
+    )
+
+    assert created == 3
+    for user in users:
+        [notification] = crud.notification.get_multi_by_user(db, user_id=user.id)
+        assert notification.data == {"window": "02:00"}
+        assert notification.is_read is False
+
+
+def test_audience_insert_returns_the_inserted_recipients(db: Session):
+    users = [create_random_user(db) for _ in range(3)]
+    audience = select(models.User.id).where(models.User.id.in_([u.id for u in users]))
+
+    with count_queries() as counter:
+        user_ids = crud.notification.create_for_audience(db, audience=audience, values={"message": "Hi"})
+
+    # One INSERT ... SELECT ... RETURNING: no second read of a possibly changed audience
+    assert [s.split()[0] for s in counter.statements] == ["INSERT"]
+    assert sorted(user_ids) == sorted(u.id for u in users)
+
+
+def test_unread_count_follows_reads(db: Session):
+    user = create_random_user(db)
+    NotificationService(db).fan_out([user.id], title="A", message="a")
+    NotificationService(db).fan_out([user.id], title="B", message="b")
+    assert crud.notification.get_unread_count(db, user_id=user.id) == 2
+
+    first = crud.notification.get_multi_by_user(db, user_id=user.id)[0]
+    crud.notification.mark_as_read(db, notification_id=first.id)
+    assert crud.notification.get_unread_count(db, user_id=user.id) == 1
+
+    crud.notification.mark_all_as_read(db, user_id=user.id)
+    assert crud.notification.get_unread_count(db, user_id=user.id) == 0
+
+
+def test_unread_count_endpoint(client, db: Session, test_user, test_user_token_headers):
+    NotificationService(db).fan_out([test_user.id], title="Hi", message="hello")
+    r = client.get(f"{settings.API_V1_STR}/notifications/unread-count", headers=test_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert r.json() == {"unread_count": 1}
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.crud.crud_platform_stats import platform_stats
+from tests.utils.user import create_random_user
+
+
+def _value(db: Session, name: str) -> float:
+    return platform_stats.read(db)[name].value
+
+
+def test_counters_follow_writes_without_recount(db: Session):
+    platform_stats.reconcile(db)
+    users = _value(db, "users_total")
+
+    user = create_random_user(db)
+    assert _value(db, "users_total") == users + 1
+
+    plan = db.query(models.SubscriptionPlan).first()
+    active, revenue = _value(db, "subscriptions_active"), _value(db, "revenue_total")
+    subscription = models.Subscription(
+        user_id=user.id, plan_id=plan.id, end_date=datetime.utcnow() + timedelta(days=30), amount_paid=10.0
+    )
+    db.add(subscription)
+    db.commit()
+    assert _value(db, "subscriptions_active") == active + 1
+    assert _value(db, "revenue_total") == revenue + 10.0
+
+    subscription.is_active = False
+    db.commit()
+    assert _value(db, "subscriptions_active") == active
+    assert _value(db, "revenue_total") == revenue
+
+    tts = _value(db, "ai_tts_characters")
+    crud.user_ai_usage.increment(db, user_id=user.id, field="tts_characters", amount=120)
+    crud.user_ai_usage.increment(db, user_id=user.id, field="tts_characters", amount=30)
+    assert _value(db, "ai_tts_characters") == tts + 150
+
+    # Whatever the events did must agree with a recount from source
+    computed = platform_stats.compute(db)
+    for name, row in platform_stats.read(db).items():
+        if not isinstance(computed[name], list):
+            assert row.value == computed[name], name
+
+
+def test_reconcile_corrects_drift(db: Session):
+    platform_stats.reconcile(db)
+    db.get(models.PlatformCounter, "users_total").value = 999
+    db.commit()
+    create_random_user(db)  # pending in a shard on top of the drifted value
+
+    platform_stats.reconcile(db)
+    assert _value(db, "users_total") == db.query(models.User).count()
+    assert not any(shard.value for shard in db.query(models.PlatformCounterShard))
+
+
+def test_reconcile_keeps_deltas_committed_after_its_snapshot(db: Session, monkeypatch):
+    platform_stats.reconcile(db)
+    create_random_user(db)  # seen by the recount and its shard delta
+    snapshot = platform_stats._snapshot
+
+    def snapshot_then_write(db):
+        taken = snapshot(db)
+        create_random_user(db)  # commits between the recount and the shard update
+        return taken
+
+    monkeypatch.setattr(platform_stats, "_snapshot", snapshot_then_write)
+    platform_stats.reconcile(db)
+    assert _value(db, "users_total") == db.query(models.User).count()
+
+
+def test_deltas_go_to_shards_not_the_counter_row(db: Session):
+    platform_stats.reconcile(db)
+    users = _value(db, "users_total")
+
+    for _ in range(8):
+        create_random_user(db)
+
+    shards = db.query(models.PlatformCounterShard).filter(models.PlatformCounterShard.name == "users_total").all()
+    assert len(shards) == settings.STATS_COUNTER_SHARDS
+    assert sum(shard.value for shard in shards) == 8
+    assert db.get(models.PlatformCounter, "users_total").value == users  # base row untouched
+    assert _value(db, "users_total") == users + 8
+
+
+def test_daily_rollup(db: Session):
+    user = create_random_user(db)
+    today = datetime.utcnow().date()
+
+    row = platform_stats.rollup_day(db, day=today)
+    assert row.new_users >= 1
+    assert row.gemini_requests == 0  # no previous snapshot yet
+
+    crud.user_ai_usage.increment(db, user_id=user.id, field="gemini_requests", amount=4)
+    row = platform_stats.rollup_day(db, day=today + timedelta(days=1))
+    assert row.gemini_requests == 4
+
+
+def test_dashboard_endpoints_read_counters(client, db: Session, superuser_token_headers):
+    r = client.get(f"{settings.API_V1_STR}/admin/statistics", headers=superuser_token_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["total_users"] == db.query(models.User).count()
+
+    platform_stats.rollup_day(db, day=datetime.utcnow().date())
+    r = client.get(f"{settings.API_V1_STR}/admin/statistics/daily", headers=superuser_token_headers)
+    assert r.status_code == 200, r.text
+    assert len(r.json()) == 1
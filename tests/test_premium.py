@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from tests.utils.user import create_random_user
+
+
+def _subscribe(db: Session, user: models.User, days: int) -> models.Subscription:
+    plan = db.query(models.SubscriptionPlan).first()
+    subscription = models.Subscription(
+        user_id=user.id, plan_id=plan.id, end_date=datetime.utcnow() + timedelta(days=days)
+    )
+    db.add(subscription)
+    db.commit()
+    return subscription
+
+
+def test_premium_until_follows_subscriptions(db: Session):
+    user = create_random_user(db)
+    assert user.premium_until is None and not user.is_premium
+
+    short = _subscribe(db, user, 5)
+    long = _subscribe(db, user, 30)
+    db.refresh(user)
+    assert user.premium_until == long.end_date
+
+    long.is_active = False
+    db.commit()
+    db.refresh(user)
+    assert user.premium_until == short.end_date
+
+    db.delete(short)
+    db.commit()
+    db.refresh(user)
+    assert user.premium_until is None
+
+
+def test_is_premium_reads_columns_only(db: Session):
+    user = create_random_user(db)
+    _subscribe(db, user, 30)
+    db.expire_all()
+
+    user = db.get(models.User, user.id)
+    assert user.is_premium
+    assert "subscriptions" not in user.__dict__
+
+
+def test_is_premium_sql_expression(db: Session):
+    subscriber, trial, free = (create_random_user(db) for _ in range(3))
+    _subscribe(db, subscriber, 30)
+    trial.trial_ends_at = datetime.utcnow() + timedelta(days=1)
+    free.trial_ends_at = datetime.utcnow() - timedelta(days=1)
+    db.commit()
+
+    ids = {subscriber.id, trial.id, free.id}
+    premium = {u.id for u in crud.user.get_multi_filtered(db, is_premium=True, limit=1000)}
+    regular = {u.id for u in crud.user.get_multi_filtered(db, is_premium=False, limit=1000)}
+    assert premium & ids == {subscriber.id, trial.id}
+    assert regular & ids == {free.id}
@@ -0,0 +1,106 @@
+import time
+
+import httpx
+import redis
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core import profiling
+from app.core.config import settings
+from app.db.session import engine
+from app.middleware.profiling import ProfilingMiddleware
+
+
+def _app(**options) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, **options)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        try:
+            redis.Redis(port=1, socket_connect_timeout=0.1).get("key")
+        except redis.RedisError:
+            pass
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+        async with httpx.AsyncClient(transport=transport, event_hooks=profiling.httpx_event_hooks("ai")) as client:
+            await client.post("https://provider.example/v1/generate")
+        return {"id": item_id}
+
+    @app.get("/stream")
+    def stream():
+        def chunks():
+            for part in (b"a", b"b"):
+                with profiling.track("ai"):
+                    time.sleep(0.05)
+                yield part
+        return StreamingResponse(chunks())
+
+    @app.get("/slow")
+    def slow():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        return {}
+
+    return app
+
+
+def _histogram_count(name: str, endpoint: str) -> float:
+    return REGISTRY.get_sample_value(f"{name}_count", {"method": "GET", "endpoint": endpoint}) or 0
+
+
+def test_requests_get_server_timing_and_route_histograms():
+    before = _histogram_count("http_request_db_statements", "/items/{item_id}")
+    r = TestClient(_app(sample_rate=0.0)).get("/items/7")
+    assert r.status_code == 200, r.text
+
+    metrics = {m.split(";")[0]: m for m in r.headers["server-timing"].split(", ")}
+    assert set(metrics) == {"db", "redis", "ai", "total"}
+    assert 'desc="2 calls"' in metrics["db"]
+    assert 'desc="1 calls"' in metrics["redis"] and 'desc="1 calls"' in metrics["ai"]
+    assert "x-profile-file" not in r.headers
+    assert _histogram_count("http_request_db_statements", "/items/{item_id}") == before + 1
+    assert REGISTRY.get_sample_value(
+        "http_request_db_statements_bucket", {"method": "GET", "endpoint": "/items/{item_id}", "le": "2.0"}
+    ) >= 1
+
+
+def test_streamed_body_is_observed_when_it_finishes():
+    before = REGISTRY.get_sample_value("http_request_ai_seconds_sum", {"method": "GET", "endpoint": "/stream"}) or 0
+    r = TestClient(_app(sample_rate=0.0)).get("/stream")
+    assert r.content == b"ab"
+
+    assert _histogram_count("http_request_ai_seconds", "/stream") >= 1
+    ai = REGISTRY.get_sample_value("http_request_ai_seconds_sum", {"method": "GET", "endpoint": "/stream"}) - before
+    assert ai >= 0.1
+
+
+def test_failed_statement_does_not_leak_its_start_time():
+    profile = profiling.RequestProfile()
+    with profiling.activate(profile), engine.connect() as conn:
+        try:
+            conn.execute(text("SELECT * FROM no_such_table"))
+        except OperationalError:
+            conn.rollback()
+        conn.execute(text("SELECT 1"))
+        assert not conn.info.get("profile_started")
+    assert profile.timings["db"].calls == 2
+
+
+def test_profile_header_dumps_collapsed_stacks(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL", 0.002)
+    client = TestClient(_app(sample_rate=0.0, token="s3cret"))
+
+    assert "x-profile-file" not in client.get("/slow", headers={"X-Profile": "guess"}).headers
+    r = client.get("/slow", headers={"X-Profile": "s3cret"})
+    lines = (tmp_path / r.headers["x-profile-file"]).read_text().splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("slow (tests/test_profiling.py" in line for line in lines)
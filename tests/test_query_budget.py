@@ -0,0 +1,41 @@
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.crud import loaders
+from app.db.query_counter import count_queries, query_report
+from tests.utils.user import create_random_user
+
+
+def test_auth_profile_loads_roles_with_the_user(db: Session, test_user):
+    user_id = test_user.id
+    db.expire_all()
+    with count_queries() as lazy:
+        user = crud.user.get(db, id=user_id)
+        [role.name for role in user.roles]
+    db.expire_all()
+    with count_queries() as eager:
+        user = crud.user.get(db, id=user_id, profile=loaders.AUTH)
+        [role.name for role in user.roles]
+    assert (lazy.count, eager.count) == (2, 1)
+
+
+def test_user_listing_does_not_grow_with_users(db: Session):
+    def _listing_queries() -> int:
+        db.expire_all()
+        with count_queries() as counter:
+            for user in crud.user.get_multi(db, limit=1000):
+                [role.name for role in user.roles]
+        return counter.count
+
+    before = _listing_queries()
+    for _ in range(5):
+        create_random_user(db)
+    assert _listing_queries() == before == 2
+
+
+def test_requests_are_counted_per_endpoint(client, test_user_token_headers):
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=test_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert 0 < int(r.headers["x-query-count"]) <= settings.QUERY_BUDGET_PER_REQUEST
+    assert query_report.endpoints[f"GET {settings.API_V1_STR}/users/me"].calls >= 1
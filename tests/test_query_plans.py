@@ -0,0 +1,105 @@
+"""
+The hot per-user and per-course queries must be served by an index.
+
+Each query runs through its CRUD function on seeded data; every SELECT or
+UPDATE it issues is then put through ``EXPLAIN QUERY PLAN`` and the test
+fails if SQLite plans a full scan (``SCAN <table>``, with or without a
+covering index) of one of the tables the query is about.
+"""
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.crud.crud_subscription import refresh_premium_until
+from app.models.exercise import DifficultyLevel, ExerciseType
+from tests.utils.user import create_random_user
+
+
+@contextmanager
+def captured_statements(db: Session) -> Iterator[List[Tuple[str, tuple]]]:
+    statements: List[Tuple[str, tuple]] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")):
+            statements.append((statement, parameters))
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+
+def full_scans(db: Session, statements, tables) -> List[str]:
+    scans = []
+    for statement, parameters in statements:
+        for row in db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            match = re.match(r"SCAN (\w+)", row[-1])
+            if match and match.group(1) in tables:
+                scans.append(f"{row[-1]}  <-  {' '.join(statement.split())}")
+    return scans
+
+
+@pytest.fixture
+def seeded(db: Session):
+    user = create_random_user(db)
+    lessons = db.query(models.InteractiveLesson).all()
+    assert lessons, "init_db seeds courses and lessons"
+    exercises = [
+        models.Exercise(
+            question=f"Question {n}", exercise_type=ExerciseType.MULTIPLE_CHOICE,
+            difficulty=list(DifficultyLevel)[n % len(DifficultyLevel)], correct_answer="a",
+            options=["a", "b"], lesson_id=lessons[n % len(lessons)].id,
+        )
+        for n in range(20)
+    ]
+    db.add_all(exercises)
+    db.flush()
+    for n, exercise in enumerate(exercises):
+        db.add(models.ExerciseAttempt(user_id=user.id, exercise_id=exercise.id, user_answer="a",
+                                      is_correct=n % 2 == 0, score=1.0 if n % 2 == 0 else 0.0))
+    for lesson in lessons[:3]:
+        db.add(models.UserLessonCompletion(user_id=user.id, lesson_id=lesson.id))
+    for n in range(10):
+        db.add(models.Notification(user_id=user.id, title=f"Notice {n}", message="Hello",
+                                   created_at=datetime.utcnow() - timedelta(hours=n)))
+    db.commit()
+    return user, lessons[0], exercises[0]
+
+
+def test_hot_queries_use_indexes(db: Session, seeded):
+    user, lesson, exercise = seeded
+    cases = [
+        ("exercise_attempt.get_by_user_and_exercise", {"exercise_attempts"},
+         lambda: crud.exercise_attempt.get_by_user_and_exercise(db, user_id=user.id, exercise_id=exercise.id)),
+        ("exercise_attempt.get_last_attempt", {"exercise_attempts"},
+         lambda: crud.exercise_attempt.get_last_attempt(db, user_id=user.id, exercise_id=exercise.id)),
+        ("course.is_course_completed", {"interactive_lessons", "user_lesson_completions"},
+         lambda: crud.course.is_course_completed(db, user_id=user.id, course_id=lesson.course_id)),
+        ("lesson.get_multi_by_course", {"interactive_lessons"},
+         lambda: crud.lesson.get_multi_by_course(db, course_id=lesson.course_id)),
+        ("exercise.get_multi_filtered (recommendations)", {"exercises"},
+         lambda: crud.exercise.get_multi_filtered(db, difficulty=exercise.difficulty, is_active=True)),
+        ("subscription.refresh_premium_until", {"subscriptions", "users"},
+         lambda: refresh_premium_until(db, user.id)),
+        ("subscription.get_user_subscriptions", {"subscriptions"},
+         lambda: crud.subscription.get_user_subscriptions(db, user.id)),
+        ("notification.get_multi_by_user", {"notifications"},
+         lambda: crud.notification.get_multi_by_user(db, user_id=user.id)),
+    ]
+
+    failures = []
+    for name, tables, run in cases:
+        db.expire_all()
+        with captured_statements(db) as statements:
+            run()
+        assert statements, f"{name} issued no statements"
+        failures += [f"{name}: {scan}" for scan in full_scans(db, statements, tables)]
+    assert not failures, "\n".join(failures)
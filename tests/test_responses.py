@@ -0,0 +1,59 @@
+import asyncio
+import enum
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import List
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.core.config import settings
+from app.core.responses import ORJSONResponse, json_list
+
+
+class _Level(enum.Enum):
+    B1 = "B1"
+
+
+def _pipeline(schema, items):
+    field = create_model_field(name="Response", type_=List[schema], mode="serialization")
+    return asyncio.run(serialize_response(field=field, response_content=items, is_coroutine=False))
+
+
+def test_orjson_response_encodes_what_jsonable_encoder_does():
+    body = ORJSONResponse({
+        "price": Decimal("19.90"), "count": Decimal("3"), "level": _Level.B1, "tags": {"a"},
+        "at": datetime(2025, 9, 1, 9, 30), 1: "int key",
+    }).body
+    assert json.loads(body) == {
+        "price": 19.9, "count": 3, "level": "B1", "tags": ["a"], "at": "2025-09-01T09:30:00", "1": "int key",
+    }
+
+
+def test_json_list_matches_the_response_model_pipeline():
+    now = datetime(2025, 9, 1, 9, 30)
+    homework = [{
+        "id": 1, "title": "Essay", "description": "d", "instructions": "i", "homework_type": "written",
+        "course_id": 1, "lesson_id": 2, "teacher_id": 7, "created_by": 7, "due_date": now, "max_score": 100,
+        "is_published": True, "metadata": {"tags": ["b1"]}, "created_at": now, "updated_at": now, "submissions": [],
+    }]
+    words = [models.Word(id=1, word="olma", translation="apple", lesson_id=3, is_active=True)]
+    for schema, items in ((schemas.Homework, homework), (schemas.Word, words)):
+        assert json.loads(json_list(schema, items).body) == json.loads(ORJSONResponse(_pipeline(schema, items)).body)
+
+
+def test_word_list_keeps_the_cursor_header(client, db: Session):
+    db.add_all([models.Word(word=f"cursor-{i}", translation=f"t{i}") for i in range(3)])
+    db.commit()
+    url = f"{settings.API_V1_STR}/words/"
+
+    r = client.get(url, params={"limit": 2})
+    assert r.status_code == 200, r.text
+    assert r.headers["content-type"] == "application/json"
+    assert len(r.json()) == 2
+    r = client.get(url, params={"limit": 2, "cursor": r.headers["x-next-cursor"]})
+    assert r.status_code == 200, r.text
+    assert r.json()
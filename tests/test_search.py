@@ -0,0 +1,113 @@
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.models.forum import ForumCategory
+from app.schemas.course import CourseCreate
+from app.schemas.lesson import LessonCreate
+from app.services.search import normalize, search_index, tokens
+from tests.utils.user import create_random_user
+
+
+def _ids(db: Session, query: str, **kwargs):
+    return [(row.doc_type, row.doc_id) for row in search_index.search(db, query, **kwargs)[1]]
+
+
+def _word(db: Session, word: str, translation: str, definition: str = "") -> models.Word:
+    obj = models.Word(word=word, translation=translation)
+    if definition:
+        obj.definitions.append(models.WordDefinition(definition=definition))
+    db.add(obj)
+    db.commit()
+    return obj
+
+
+def test_normalization_unifies_scripts_and_apostrophes():
+    assert normalize("Oʻzbekiston") == normalize("O'zbekiston") == normalize("Ўзбекистон") == "ozbekiston"
+    assert tokens("G‘isht, kitob!") == ["gisht", "kitob"]
+
+
+def test_words_are_indexed_with_their_definitions(db: Session):
+    word = _word(db, "bookshelf", "kitob javoni", definition="A shelf for storing books")
+
+    assert _ids(db, "kitob") == [("word", word.id)]
+    assert _ids(db, "storing") == [("word", word.id)]
+    assert _ids(db, "booksh") == [("word", word.id)]  # prefix on the last term
+    assert _ids(db, "booksh", prefix=False) == []
+    assert _ids(db, "китоб") == [("word", word.id)]  # Cyrillic query, Latin text
+
+
+def test_index_follows_updates_and_deletes(db: Session):
+    word = _word(db, "o‘rdak", "duck")
+    assert _ids(db, "ordak") == [("word", word.id)]
+
+    word.translation = "mallard"
+    db.commit()
+    assert _ids(db, "duck") == []
+    assert _ids(db, "mallard") == [("word", word.id)]
+
+    db.delete(word)
+    db.commit()
+    assert _ids(db, "mallard") == []
+
+    # Rolled back writes never reach the index
+    db.add(models.Word(word="ephemeral", translation="x"))
+    db.flush()
+    db.rollback()
+    assert _ids(db, "ephemeral") == []
+
+
+def test_forum_posts_go_with_their_topic(db: Session):
+    author = create_random_user(db)
+    category = ForumCategory(name="Grammar questions")
+    db.add(category)
+    db.flush()
+    topic = models.ForumTopic(title="Present perfect", description="When to use it", category_id=category.id,
+                              author_id=author.id)
+    db.add(topic)
+    db.flush()
+    post = models.ForumPost(content="Use it for experiences", topic_id=topic.id, author_id=author.id)
+    db.add(post)
+    db.commit()
+
+    assert _ids(db, "experiences") == [("forum_post", post.id)]
+    assert _ids(db, "perfect", types=["forum_topic"]) == [("forum_topic", topic.id)]
+
+    db.delete(topic)
+    db.commit()
+    assert _ids(db, "experiences") == []
+
+
+def test_search_endpoint_ranks_and_locks_premium_lessons(client, db: Session, test_user_token_headers):
+    course = crud.course.create(db, obj_in=CourseCreate(
+        title="Search course", description="d", difficulty_level="A1", instructor_id=create_random_user(db).id
+    ))
+    lesson_in = dict(course_id=course.id, avatar_id=1, order=1)
+    free = crud.lesson.create(db, obj_in=LessonCreate(title="Pronouns", content="zephyrine basics", **lesson_in))
+    premium = crud.lesson.create(db, obj_in=LessonCreate(
+        title="Zephyrine advanced", content="zephyrine in depth", is_premium=True, **lesson_in
+    ))
+    url = f"{settings.API_V1_STR}/search/"
+
+    r = client.get(url, params={"q": "zephyr", "type": "lesson", "limit": 1}, headers=test_user_token_headers)
+    assert r.status_code == 200, r.text
+    first = r.json()
+    assert [hit["id"] for hit in first["items"]] == [premium.id]  # title match ranks first
+    assert first["items"][0]["locked"] is True and first["items"][0]["snippet"] is None
+    assert first["next_offset"] == 1
+
+    r = client.get(url, params={"q": "zephyr", "type": "lesson", "offset": 1}, headers=test_user_token_headers)
+    page = r.json()
+    assert [hit["id"] for hit in page["items"]] == [free.id]
+    assert "zephyrine basics" in page["items"][0]["snippet"]
+    assert page["next_offset"] is None
+
+    r = client.get(f"{url}autocomplete", params={"q": "zeph"}, headers=test_user_token_headers)
+    assert [s["title"] for s in r.json()] == ["Zephyrine advanced"]
+
+
+def test_rebuild_reindexes_everything(db: Session):
+    word = _word(db, "lighthouse", "mayoq")
+    counts = search_index.rebuild(db)
+    assert counts["word"] >= 1 and counts["lesson"] >= 1  # seeded lessons
+    assert _ids(db, "mayoq") == [("word", word.id)]
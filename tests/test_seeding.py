@@ -0,0 +1,55 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.db import initial_data
+from app.db.initial_data import SEED_VERSION, init_db, load_words
+from app.db.query_counter import count_queries
+from app.models.user import user_role
+from app.services.content_catalog import content_catalog
+
+
+def _counts(db: Session) -> dict:
+    tables = {
+        "roles": models.Role, "plans": models.SubscriptionPlan, "users": models.User,
+        "avatars": models.AIAvatar, "courses": models.Course, "lessons": models.InteractiveLesson,
+    }
+    counts = {name: db.scalar(select(func.count()).select_from(model)) for name, model in tables.items()}
+    counts["user_roles"] = db.scalar(select(func.count()).select_from(user_role))
+    return counts
+
+
+def test_seeding_is_versioned_and_idempotent(db: Session, monkeypatch):
+    # The fixture database was seeded by init_db already
+    assert db.get(models.SeedState, "initial_data").version == SEED_VERSION
+    seeded = _counts(db)
+    assert seeded["roles"] == len(initial_data.ROLE_NAMES) and seeded["lessons"] == 3
+
+    with count_queries() as counter:
+        assert init_db(db) is False
+    assert counter.count <= 2, counter.statements  # the version lookup (+ the legacy lessons.json check)
+
+    assert init_db(db, force=True) is True
+    monkeypatch.setattr(initial_data, "SEED_VERSION", SEED_VERSION + 1)
+    assert init_db(db) is True
+    assert _counts(db) == seeded
+    assert db.get(models.SeedState, "initial_data").version == SEED_VERSION + 1
+
+    superuser = db.scalars(select(models.User).where(models.User.email == settings.FIRST_SUPERUSER)).one()
+    assert [role.name for role in superuser.roles] == ["superadmin"]
+
+
+def test_load_words_in_chunks_skipping_existing(db: Session):
+    words = [{"word": f"w{i:05d}", "translation": f"t{i}", "level": "A1"} for i in range(1200)]
+    assert load_words(db, words, chunk_size=500) == 1200
+    assert load_words(db, words[1000:] + [{"word": "w01200"}, {"word": "w00001", "language": "uz"}]) == 2
+    rows = db.execute(select(models.Word.word, models.Word.language, models.Word.is_active).where(
+        models.Word.word.in_(["w00001", "w01200"]))).all()
+    assert sorted(rows) == [("w00001", "en", True), ("w00001", "uz", True), ("w01200", "en", True)]
+
+
+def test_load_words_reloads_the_content_catalog(db: Session):
+    content_catalog.warm(db)
+    load_words(db, [{"word": "catalogued", "translation": "t", "level": "A1"}])
+    assert "catalogued" in {meta.word for meta in content_catalog.words(db).values()}
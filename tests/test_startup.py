@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core.registry import ServiceRegistry
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Importing the app must not load these; they are built on first use (app.core.registry)
+LAZY_MODULES = {"torch", "whisper", "stripe", "google.generativeai", "aiohttp"}
+IMPORT_BUDGET_SECONDS = 7.0  # cumulative `import main`; about 4s locally, 9.5s when torch was imported eagerly
+
+
+def _import_times(statement: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env={**os.environ, "DISABLE_WHISPER": "1"}, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_importing_the_app_stays_within_budget():
+    times = _import_times("import main")
+    assert not LAZY_MODULES & set(times), sorted(LAZY_MODULES & set(times))
+    assert times["main"] < IMPORT_BUDGET_SECONDS, f"import main took {times['main']:.2f}s"
+
+
+def test_lazy_services_are_built_once_on_first_use():
+    registry = ServiceRegistry()
+    built = []
+
+    class Client:
+        timeout = 5
+
+    def provider():
+        built.append(1)
+        return Client()
+
+    client = registry.lazy("client", provider)
+    assert not registry.resolved("client") and not built
+
+    threads = [threading.Thread(target=lambda: client.timeout) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1
+
+    client.timeout = 30
+    assert registry.get("client").timeout == 30
+    assert registry.describe()["client"]["resolved"] is True
+
+    registry.reset("client")
+    assert client.timeout == 5 and len(built) == 2
+
+
+def test_warm_logs_failing_providers_instead_of_raising():
+    registry = ServiceRegistry()
+    registry.register("broken", lambda: 1 / 0)
+    registry.register("disabled", lambda: None)
+    disabled = registry.lazy("disabled", lambda: None)
+
+    timings = registry.warm()
+    assert set(timings) == {"disabled"} and not disabled
+    with pytest.raises(ZeroDivisionError):
+        registry.get("broken")
+    with pytest.raises(KeyError):
+        registry.get("missing")
@@ -0,0 +1,166 @@
+from contextlib import contextmanager
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services import stripe_events
+from app.tasks import payments as payment_tasks
+from tests.utils.stripe_events import load_event, signed_request
+from tests.utils.user import create_random_user
+
+URL = f"{settings.API_V1_STR}/subscriptions/stripe-webhook"
+SECRET = "whsec_test_secret"
+
+
+
+@pytest.fixture
+def deliver(client, db: Session, monkeypatch):
+    """POST a signed event; jobs run in their own session on the test connection."""
+    @contextmanager
+    def _job_session():
+        job_db = SessionLocal(bind=db.connection(), join_transaction_mode="create_savepoint")
+        try:
+            yield job_db
+        finally:
+            job_db.close()
+
+    monkeypatch.setattr(settings, "STRIPE_WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(payment_tasks, "job_session", _job_session)
+
+    def post(event, secret=SECRET):
+        payload, headers = signed_request(event, secret)
+        return client.post(URL, content=payload, headers=headers)
+
+    return post
+
+
+@pytest.mark.query_budget(60)  # the subscription is started inside the request (jobs run inline)
+def test_webhook_stores_events_once_and_processes_them(deliver, db: Session):
+    user = create_random_user(db)
+    plan = crud.subscription.get_subscription_plan_by_name(db, name="Monthly")
+    checkout = load_event(
+        "checkout.session.completed", customer="cus_once", metadata={"user_id": str(user.id), "plan_id": str(plan.id)},
+    )
+
+    assert deliver(checkout, secret="whsec_wrong").status_code == 400
+    assert crud.stripe_event.get(db, checkout["id"]) is None
+
+    first, again = deliver(checkout), deliver(checkout)
+    assert first.json() == {"status": "success", "duplicate": False}
+    assert again.json() == {"status": "success", "duplicate": True}
+    assert deliver(load_event("customer.subscription.updated", customer="cus_once")).status_code == 200
+
+    db.expire_all()
+    events = crud.stripe_event.get_multi(db, customer="cus_once")
+    assert sorted((e.type, e.status, e.attempts) for e in events) == [
+        ("checkout.session.completed", "processed", 1), ("customer.subscription.updated", "ignored", 1),
+    ]
+    subscriptions = db.query(models.Subscription).filter_by(payment_id=checkout["data"]["object"]["id"]).all()
+    assert [(s.user_id, s.plan_id, s.amount_paid, s.payment_method) for s in subscriptions] == [
+        (user.id, plan.id, 9.99, "stripe"),
+    ]
+    assert "premium" in {role.name for role in user.roles}
+    payment = _payment(db, checkout["data"]["object"]["id"])
+    assert (payment.payment_status, payment.amount, payment.user_id) == ("completed", 999, user.id)
+
+
+def _payment(db: Session, payment_id: str) -> models.Notification:
+    db.expire_all()
+    return db.query(models.Notification).filter_by(payment_id=payment_id, notification_type="payment").one()
+
+
+def _paid_checkout(db: Session, **fields):
+    user = create_random_user(db)
+    plan = crud.subscription.get_subscription_plan_by_name(db, name="Monthly")
+    checkout = load_event(
+        "checkout.session.completed", customer="cus_intent", payment_intent="pi_3PqTestPaymentIntent01",
+        metadata={"user_id": str(user.id), "plan_id": str(plan.id)}, **fields,
+    )
+    return user, checkout
+
+
+@pytest.mark.query_budget(60)  # the subscription is started inside the request (jobs run inline)
+def test_payment_intent_succeeded_starts_an_unpaid_checkout(deliver, db: Session):
+    user, checkout = _paid_checkout(db, payment_status="unpaid")
+    deliver(checkout)
+    assert _payment(db, "pi_3PqTestPaymentIntent01").payment_status == "pending"
+    assert db.query(models.Subscription).filter_by(user_id=user.id).count() == 0
+
+    succeeded = load_event("payment_intent.succeeded", customer="cus_intent")
+    deliver(succeeded)
+    deliver({**succeeded, "id": "evt_redelivered_as_new"})
+    payment = _payment(db, "pi_3PqTestPaymentIntent01")
+    assert (payment.payment_status, payment.receipt_url) == (
+        "completed", "https://pay.stripe.com/receipts/test_receipt_01",
+    )
+    subscriptions = db.query(models.Subscription).filter_by(user_id=user.id).all()
+    assert [(s.payment_id, s.amount_paid) for s in subscriptions] == [(checkout["data"]["object"]["id"], 9.99)]
+    assert "premium" in {role.name for role in user.roles}
+
+
+def test_payment_intent_failed_marks_the_payment_failed(deliver, db: Session):
+    user, checkout = _paid_checkout(db, payment_status="unpaid")
+    deliver(checkout)
+    deliver(load_event("payment_intent.payment_failed", customer="cus_intent"))
+
+    assert _payment(db, "pi_3PqTestPaymentIntent01").payment_status == "failed"
+    assert db.query(models.Subscription).filter_by(user_id=user.id).count() == 0
+
+
+@pytest.mark.query_budget(60)  # the subscription is started inside the request (jobs run inline)
+def test_charge_refunded_marks_the_payment_refunded(deliver, db: Session):
+    user, checkout = _paid_checkout(db)
+    deliver(checkout)
+    assert _payment(db, "pi_3PqTestPaymentIntent01").payment_status == "completed"
+    deliver(load_event("charge.refunded", customer="cus_intent"))
+
+    assert _payment(db, "pi_3PqTestPaymentIntent01").payment_status == "refunded"
+    db.expire_all()
+    assert {e.status for e in crud.stripe_event.get_multi(db, customer="cus_intent")} == {"processed"}
+
+
+@pytest.mark.query_budget(50)  # the failing event's retries run inside the request (jobs run inline)
+def test_events_are_processed_in_order_per_customer(deliver, db: Session, monkeypatch):
+    handled, failures = [], {"first": 1}
+
+    def handler(name):
+        def handle(db, event):
+            if failures.get(name):
+                failures[name] -= 1
+                raise RuntimeError(f"{name} is broken")
+            handled.append(name)
+        return handle
+
+    monkeypatch.setattr(stripe_events, "HANDLERS", {f"test.{name}": handler(name) for name in ("first", "second", "third")})
+
+    def event(name, created):
+        event = load_event("customer.subscription.updated", id=f"evt_{name}", created=created, customer="cus_order")
+        return {**event, "type": f"test.{name}"}
+
+    deliver(event("first", 100))  # fails once, then the job's retry processes it
+    db.expire_all()
+    first = crud.stripe_event.get(db, "evt_first")
+    assert (first.status, first.attempts, handled) == ("processed", 2, ["first"])
+
+    failures["second"] = settings.JOBS_MAX_RETRIES
+    failed_before = REGISTRY.get_sample_value("stripe_events_failed_total", {"type": "test.second"}) or 0
+    deliver(event("second", 200))
+    deliver(event("third", 300))  # held back behind the failed event
+    db.expire_all()
+    second, third = crud.stripe_event.get(db, "evt_second"), crud.stripe_event.get(db, "evt_third")
+    assert (second.status, second.attempts, third.status) == ("failed", settings.JOBS_MAX_RETRIES, "pending")
+    assert "second is broken" in second.error
+    assert REGISTRY.get_sample_value("stripe_events_failed_total", {"type": "test.second"}) == failed_before + 1
+    assert payment_tasks.sweep_stripe_events.apply().get() == {"customers": 1}
+    db.expire_all()
+    assert (crud.stripe_event.get(db, "evt_second").status, handled) == ("failed", ["first"])
+
+    assert crud.stripe_event.replay(db, status="failed") == ["cus_order"]
+    assert payment_tasks.sweep_stripe_events.apply().get() == {"customers": 1}
+    db.expire_all()
+    assert handled == ["first", "second", "third"]
+    assert {e.status for e in crud.stripe_event.get_multi(db, customer="cus_order")} == {"processed"}
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import tts_executor as tts_module
+from app.services.tts_executor import TTSExecutor, split_sentences
+
+
+def test_split_sentences():
+    text = "Salom! Bugun havo yaxshi.  Qalaysiz?\nMen yaxshiman"
+    assert split_sentences(text) == ["Salom!", "Bugun havo yaxshi.", "Qalaysiz?", "Men yaxshiman"]
+    long = "word " * 20
+    assert all(len(segment) <= 24 for segment in split_sentences(long, max_chars=24))
+    assert split_sentences("  \n ") == []
+
+
+def test_stream_synthesizes_ahead_in_the_pool_and_yields_in_order():
+    delays = {"Birinchi.": 0.3, "Ikkinchi.": 0.1, "Uchinchi.": 0.1, "To'rtinchi.": 0.1}
+    threads = set()
+
+    def provider(segment):
+        threads.add(threading.current_thread().name)
+        time.sleep(delays[segment])
+        return segment.encode()
+
+    async def _run():
+        ticks, received = [], []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        async for audio in TTSExecutor(max_workers=4).stream(" ".join(delays), provider, ahead=4):
+            received.append((audio, time.perf_counter() - started))
+        task.cancel()
+        return received, ticks
+
+    received, ticks = asyncio.run(_run())
+    assert [audio.decode() for audio, _ in received] == list(delays)
+    assert received[-1][1] < 0.45  # 0.6s one after another
+    assert len(ticks) > 10  # the event loop kept running meanwhile
+    assert threads and all(name.startswith("tts") for name in threads)
+
+
+def test_a_failed_segment_stops_the_stream(monkeypatch):
+    calls = []
+
+    def provider(segment):
+        calls.append(segment)
+        if segment == "b.":
+            raise RuntimeError("provider down")
+        return b"x"
+
+    async def _run():
+        async for _ in TTSExecutor(max_workers=1).stream("a. b. c. d. e. f.", provider, ahead=2):
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(_run())
+    assert "f." not in calls
+
+
+def test_tts_stream_endpoint(client, test_user_token_headers, monkeypatch):
+    monkeypatch.setattr(tts_module, "gtts_mp3", lambda text, lang, slow=False: f"[{lang}:{text}]".encode())
+    text = "Hello there. " * 40
+    r = client.post(f"{settings.API_V1_STR}/ai/tts/stream", json={"text": text, "language": "en-US"},
+                    headers=test_user_token_headers)
+    assert r.status_code == 200 and r.headers["content-type"] == "audio/mpeg"
+    assert r.content.count(b"[en:") == 40
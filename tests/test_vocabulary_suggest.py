@@ -0,0 +1,99 @@
+import random
+
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import settings
+from app.core.text_utils import bounded_levenshtein, levenshtein_distance
+from app.services.content_catalog import WordMeta
+from app.services.search import vocabulary_index
+from app.services.search.fuzzy import VocabularyIndex, normalize_term
+
+
+def _word(db: Session, word: str, translation: str, **kwargs) -> models.Word:
+    obj = models.Word(word=word, translation=translation, **kwargs)
+    db.add(obj)
+    db.commit()
+    return obj
+
+
+def _suggest(db: Session, text: str, **kwargs):
+    return [(m.word_id, m.field, m.distance) for m in vocabulary_index.suggest(db, text, **kwargs)]
+
+
+def test_bounded_levenshtein_agrees_with_the_full_distance():
+    rng = random.Random(3)
+    for _ in range(500):
+        a = "".join(rng.choice("abc'") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("abc'") for _ in range(rng.randint(0, 7)))
+        limit = rng.randint(0, 3)
+        assert bounded_levenshtein(a, b, limit) == min(levenshtein_distance(a, b), limit + 1)
+
+
+def test_index_matches_a_linear_scan():
+    rng = random.Random(5)
+    words = {
+        i: WordMeta(i, "".join(rng.choice("abcdeo'") for _ in range(rng.randint(3, 9))), None, None, True)
+        for i in range(1, 400)
+    }
+    index = VocabularyIndex()
+    index.load(words)
+    for _ in range(100):
+        query = normalize_term("".join(rng.choice("abcdeo'") for _ in range(rng.randint(3, 9))))
+        for k in (1, 2, 3):
+            found = index._search(query, k, (0,), limit=len(words))
+            expected = {
+                wid for wid, meta in words.items() if levenshtein_distance(query, normalize_term(meta.word)) <= k
+            }
+            assert set(found) == expected, (query, k)
+
+
+def test_suggest_tolerates_typos_and_apostrophe_variants(db: Session):
+    ordak = _word(db, "o‘rdak", "duck")
+    _word(db, "o'rdakcha", "duckling")
+    sparrow = _word(db, "chumchuq", "sparrow, house sparrow")
+
+    assert _suggest(db, "oʻrdak")[0] == (ordak.id, "word", 0)
+    assert _suggest(db, "ordak")[0] == (ordak.id, "word", 0)  # apostrophe left out
+    assert _suggest(db, "chumchug") == [(sparrow.id, "word", 1)]
+    assert _suggest(db, "house sparow") == [(sparrow.id, "translation", 1)]  # each translation variant is a term
+    assert _suggest(db, "sparow", fields=["word"]) == []
+    assert _suggest(db, "ordakchalar", max_distance=0) == []
+
+    closest = vocabulary_index.closest(db, "dukc", max_distance=2)
+    assert (closest.word_id, closest.word, closest.distance) == (ordak.id, "o‘rdak", 2)
+
+
+def test_suggest_follows_edits_and_skips_inactive_words(db: Session):
+    word = _word(db, "qaldirg'och", "swallow")
+    _word(db, "qaldirg'ochlar", "swallows", is_active=False)
+    assert _suggest(db, "qaldirgoch") == [(word.id, "word", 0)]
+
+    word.word = "kaldirgoch"
+    db.commit()
+    assert _suggest(db, "qaldirgoch") == [(word.id, "word", 1)]
+    assert _suggest(db, "kaldirgoch") == [(word.id, "word", 0)]
+
+    db.delete(word)
+    db.commit()
+    assert _suggest(db, "kaldirgoch") == []
+
+
+def test_suggest_endpoint(client, db: Session):
+    word = _word(db, "kapalak", "butterfly")
+    r = client.get(f"{settings.API_V1_STR}/words/suggest", params={"q": "Kapalk", "limit": 3})
+    assert r.status_code == 200, r.text
+    assert r.json()[0] == {
+        "id": word.id, "word": "kapalak", "translation": "butterfly", "matched": "word", "distance": 1,
+    }
+
+
+def test_suggest_normalizes_cyrillic_like_search(client, db: Session):
+    salom = _word(db, "salom", "hello")
+    qoshiq = _word(db, "qo‘shiq", "song")
+
+    assert _suggest(db, "салом")[0] == (salom.id, "word", 0)
+    assert _suggest(db, "қўшиқ")[0] == (qoshiq.id, "word", 0)
+    r = client.get(f"{settings.API_V1_STR}/words/suggest", params={"q": "салом"})
+    assert r.status_code == 200, r.text
+    assert r.json()[0]["id"] == salom.id
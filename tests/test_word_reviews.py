@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud, models
+from app.core.config import settings
+from app.crud import crud_word_review as review_module
+from app.crud.crud_word_review import word_review
+from app.db.query_counter import count_queries
+from app.schemas.course import CourseCreate
+from app.schemas.lesson import LessonCreate
+from app.services.spaced_repetition import MIN_EASE, ReviewState, schedule
+from tests.utils.user import create_random_user
+
+NOW = datetime(2025, 9, 9, 12, 0)
+
+
+class _Redis:
+    """Just enough of Redis for cached due queues (sorted sets)."""
+
+    def __init__(self):
+        self.sets = {}
+
+    def exists(self, key):
+        return int(key in self.sets)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def delete(self, key):
+        self.sets.pop(key, None)
+
+    def expire(self, key, seconds):
+        pass
+
+    def zadd(self, key, mapping):
+        self.sets.setdefault(key, {}).update({str(member): float(score) for member, score in mapping.items()})
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.sets.get(key, {}).pop(str(member), None)
+
+    def zrangebyscore(self, key, low, high, start=0, num=None):
+        items = sorted((score, member) for member, score in self.sets.get(key, {}).items() if score <= float(high))
+        return [member for _, member in items[start:start + num]]
+
+    def eval(self, script, numkeys, key, *args):
+        assert script == review_module._ZADD_IF_CACHED
+        if key in self.sets:
+            self.zadd(key, dict(zip(args[1::2], args[0::2])))
+
+
+def _words(db: Session, count: int):
+    words = [models.Word(word=f"review-{i}", translation=f"t{i}") for i in range(count)]
+    db.add_all(words)
+    db.commit()
+    return [word.id for word in words]
+
+
+def test_sm2_schedule():
+    state = ReviewState()
+    intervals = []
+    for _ in range(4):
+        state = schedule(state, 4, NOW)
+        intervals.append(state.interval)
+    assert intervals == [1, 6, 15, 38]
+    assert state.next_due_at == NOW + timedelta(days=38)
+
+    forgotten = schedule(state, 1, NOW)
+    assert (forgotten.repetitions, forgotten.lapses, forgotten.interval) == (0, 1, 0)
+    assert forgotten.next_due_at == NOW + timedelta(minutes=settings.REVIEW_RELEARN_MINUTES)
+    assert forgotten.ease < state.ease
+
+    for _ in range(10):
+        state = schedule(state, 0, NOW)
+    assert state.ease == MIN_EASE
+
+    with pytest.raises(ValueError):
+        schedule(state, 6, NOW)
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_due_queue_and_bulk_submit(db: Session, monkeypatch, cached):
+    if cached:
+        monkeypatch.setattr(review_module, "redis_client", _Redis())
+    user = create_random_user(db)
+    word_ids = _words(db, 30)
+
+    assert word_review.add_words(db, user_id=user.id, word_ids=word_ids[:25], now=NOW) == word_ids[:25]
+    assert word_review.add_words(db, user_id=user.id, word_ids=word_ids, now=NOW) == word_ids[25:]
+
+    due = word_review.due(db, user_id=user.id, limit=20, now=NOW)
+    assert len(due) == 20 and due[0]["word"] == "review-0"
+
+    grades = {word_id: 5 for word_id in word_ids[:20]}
+    grades[word_ids[0]] = 1
+    with count_queries() as counter:
+        states = word_review.submit(db, user_id=user.id, grades=grades, now=NOW)
+    assert counter.count == 2  # current states + one upsert for all 20 words
+    assert states[word_ids[1]].next_due_at == NOW + timedelta(days=1)
+
+    later = NOW + timedelta(hours=1)
+    assert [item["word_id"] for item in word_review.due(db, user_id=user.id, limit=20, now=later)] == (
+        word_ids[20:] + [word_ids[0]]  # never reviewed, then relearning
+    )
+    tomorrow = NOW + timedelta(days=1)
+    assert len(word_review.due(db, user_id=user.id, limit=100, now=tomorrow)) == 30
+
+
+def test_deleted_words_leave_the_cached_queue(db: Session, monkeypatch):
+    redis = _Redis()
+    monkeypatch.setattr(review_module, "redis_client", redis)
+    user = create_random_user(db)
+    first, second = _words(db, 2)
+    word_review.add_words(db, user_id=user.id, word_ids=[first, second], now=NOW)
+    assert len(word_review.due(db, user_id=user.id, now=NOW)) == 2
+
+    db.query(models.WordReviewState).filter_by(word_id=first).delete()
+    db.commit()
+    assert [item["word_id"] for item in word_review.due(db, user_id=user.id, now=NOW)] == [second]
+    assert str(first) not in redis.sets[f"review_queue:{user.id}"]
+
+
+def test_review_endpoints(client, db: Session, test_user_token_headers):
+    word_ids = _words(db, 3)
+    url = f"{settings.API_V1_STR}/reviews"
+
+    r = client.post(f"{url}/", json={"reviews": [{"word_id": word_ids[0], "grade": 4}]},
+                    headers=test_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()[0]["interval"] == 1
+
+    r = client.post(f"{url}/", json={"reviews": [{"word_id": 10 ** 9, "grade": 4}]}, headers=test_user_token_headers)
+    assert r.status_code == 404
+
+    r = client.post(f"{url}/", json={"reviews": [{"word_id": word_ids[1], "grade": 7}]},
+                    headers=test_user_token_headers)
+    assert r.status_code == 422
+
+    r = client.get(f"{url}/due", headers=test_user_token_headers)
+    assert r.status_code == 200
+    assert word_ids[0] not in [item["word_id"] for item in r.json()]  # due tomorrow
+
+
+def test_lesson_vocabulary_is_added_once(client, db: Session, test_user_token_headers):
+    course = crud.course.create(db, obj_in=CourseCreate(
+        title="Review course", description="d", difficulty_level="A1", instructor_id=create_random_user(db).id
+    ))
+    lesson = crud.lesson.create(db, obj_in=LessonCreate(
+        title="Animals", content="c", course_id=course.id, avatar_id=1, order=1
+    ))
+    db.add_all([models.Word(word=w, translation=w, lesson_id=lesson.id) for w in ("it", "mushuk")])
+    db.commit()
+    url = f"{settings.API_V1_STR}/reviews/lessons/{lesson.id}"
+
+    r = client.post(url, headers=test_user_token_headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["added"] == 2
+    assert client.post(url, headers=test_user_token_headers).json()["added"] == 0